@@ -0,0 +1,169 @@
+"""
+Audit Store Benchmark - group-commit indexed segments vs. per-entry JSONL.
+
+Writes synthetic audit entries (500 agents, traces of ~20 entries, mixed
+categories) to IndexedFileBackend in batches, the way the AuditLogger worker
+drains its queue, and to the previous FileBackend one entry at a time
+(stat() + write per entry). Then measures query latency through the sidecar
+indexes against a full scan of the JSONL file, which is what answering the
+same question took before.
+
+Usage:
+    python -m benchmarks.audit_store_benchmark                     # 1M entries
+    python -m benchmarks.audit_store_benchmark --entries 10000000 --legacy-entries 500000
+"""
+
+import argparse
+import json
+import random
+import shutil
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from uuid import UUID
+
+from jdev_governance.justica.audit import AuditCategory, AuditEntry, AuditLevel, FileBackend
+from jdev_governance.justica.audit_store import IndexedFileBackend
+
+CATEGORIES = list(AuditCategory)
+T0 = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+class EntryStream:
+    """Deterministic entries; entry i is at T0 + i ms and belongs to trace i // 20."""
+
+    def __init__(self, seed: int, agents: int):
+        self.rng = random.Random(seed)
+        self.agents = agents
+
+    def trace_id(self, i: int) -> UUID:
+        return UUID(int=i // 20 + 1)
+
+    def batch(self, start: int, count: int):
+        rng = self.rng
+        return [
+            AuditEntry(
+                timestamp=T0 + timedelta(milliseconds=i),
+                level=AuditLevel.SECURITY if rng.random() < 0.05 else AuditLevel.INFO,
+                category=rng.choice(CATEGORIES),
+                agent_id=f"agent-{rng.randrange(self.agents)}",
+                action="Classification: SAFE",
+                reasoning="Nenhum padrão suspeito detectado",
+                context={"confidence": round(rng.random(), 3), "violations": []},
+                trace_id=self.trace_id(i),
+            )
+            for i in range(start, start + count)
+        ]
+
+
+def write_indexed(directory: Path, args) -> float:
+    backend = IndexedFileBackend(directory)
+    stream = EntryStream(args.seed, args.agents)
+    elapsed = 0.0
+    for start in range(0, args.entries, args.batch):
+        entries = stream.batch(start, min(args.batch, args.entries - start))
+        t = time.perf_counter()
+        backend.write_batch(entries)
+        elapsed += time.perf_counter() - t
+    t = time.perf_counter()
+    backend.close()
+    elapsed += time.perf_counter() - t
+    return args.entries / elapsed
+
+
+def write_legacy(path: Path, args) -> float:
+    backend = FileBackend(path, max_size_mb=10**6)
+    stream = EntryStream(args.seed, args.agents)
+    elapsed = 0.0
+    for start in range(0, args.legacy_entries, args.batch):
+        entries = stream.batch(start, min(args.batch, args.legacy_entries - start))
+        t = time.perf_counter()
+        for entry in entries:
+            backend.write(entry)
+        elapsed += time.perf_counter() - t
+    backend.close()
+    return args.legacy_entries / elapsed
+
+
+def legacy_scan(path: Path, predicate, limit: int = 100):
+    """What a query used to be: read every line, parse, filter."""
+    matches = []
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            record = json.loads(line)
+            if predicate(record):
+                matches.append(record)
+    return matches[-limit:]
+
+
+def timed(fn, repeat: int):
+    samples = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entries", type=int, default=1_000_000)
+    parser.add_argument("--legacy-entries", type=int, default=200_000, help="entries written/scanned by the old path")
+    parser.add_argument("--batch", type=int, default=512, help="entries per group commit")
+    parser.add_argument("--agents", type=int, default=500)
+    parser.add_argument("--queries", type=int, default=20, help="repetitions per query type")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    print("⚡ Audit Store Benchmark")
+    print("=" * 60)
+    workdir = Path(tempfile.mkdtemp(prefix="audit_bench_"))
+    try:
+        legacy_rate = write_legacy(workdir / "legacy.jsonl", args)
+        indexed_rate = write_indexed(workdir / "indexed", args)
+        on_disk = sum(p.stat().st_size for p in (workdir / "indexed").iterdir()) / 1e6
+
+        print(f"{'write':<34}{'entries':>12}{'entries/s':>12}")
+        print(f"  {'FileBackend (per entry)':<32}{args.legacy_entries:>12,}{legacy_rate:>12,.0f}")
+        print(f"  {'IndexedFileBackend (batched)':<32}{args.entries:>12,}{indexed_rate:>12,.0f}")
+        print(f"  on disk: {on_disk:,.0f} MB compressed + indexes")
+        print()
+
+        backend = IndexedFileBackend(workdir / "indexed")
+        rng = random.Random(args.seed)
+        stream = EntryStream(args.seed, args.agents)
+        span = timedelta(milliseconds=args.entries)
+
+        def window():
+            start = T0 + span * rng.random()
+            return {"since": start, "until": start + timedelta(seconds=60)}
+
+        queries = {
+            "trace_id": lambda: backend.get_entries(trace_id=stream.trace_id(rng.randrange(args.entries)), limit=1000),
+            "agent_id (latest 100)": lambda: backend.get_entries(agent_id=f"agent-{rng.randrange(args.agents)}"),
+            "agent+category, 60s window": lambda: backend.get_entries(
+                agent_id=f"agent-{rng.randrange(args.agents)}", category=rng.choice(CATEGORIES),
+                limit=1000, **window(),
+            ),
+            "60s time window": lambda: backend.get_entries(limit=10_000, **window()),
+        }
+        print(f"{'query over ' + format(args.entries, ',') + ' entries':<34}{'median ms':>12}{'p95 ms':>12}")
+        for name, query in queries.items():
+            samples = timed(query, args.queries)
+            p95 = statistics.quantiles(samples, n=20)[-1] if len(samples) > 1 else samples[0]
+            print(f"  {name:<32}{statistics.median(samples):>12.2f}{p95:>12.2f}")
+        backend.close()
+
+        trace = str(stream.trace_id(args.legacy_entries // 2))
+        scan_ms = statistics.median(timed(lambda: legacy_scan(workdir / "legacy.jsonl", lambda r: r["trace_id"] == trace), 3))
+        print()
+        print(f"  legacy full scan, {args.legacy_entries:,} entries: {scan_ms:,.0f} ms")
+        print(f"  (linear: ~{scan_ms * args.entries / args.legacy_entries / 1000:,.1f} s at {args.entries:,} entries)")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Disk Cache Benchmark - DiskCache set/get throughput and size on disk.
+
+Compares the pooled WAL DiskCache (write-behind, batched transactions,
+binary/zlib encoding, get_many/set_many) against the previous
+implementation (a new connection per call, rollback journal, JSON text).
+
+Usage:
+    python -m benchmarks.cache_benchmark                  # 5k entries
+    python -m benchmarks.cache_benchmark --entries 20000 --value-size 4096
+"""
+
+import argparse
+import json
+import os
+import random
+import sqlite3
+import string
+import tempfile
+import time
+from pathlib import Path
+
+from jdev_cli.core.cache import DiskCache
+
+
+class LegacyDiskCache:
+    """The previous DiskCache: one connection per call, JSON text values."""
+
+    def __init__(self, db_path: str):
+        self.db_path = Path(db_path)
+        conn = sqlite3.connect(str(self.db_path))
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                timestamp REAL NOT NULL,
+                ttl REAL NOT NULL
+            )
+        """)
+        conn.commit()
+        conn.close()
+
+    def get(self, key: str):
+        conn = sqlite3.connect(str(self.db_path))
+        row = conn.execute("SELECT value, timestamp, ttl FROM cache WHERE key = ?", (key,)).fetchone()
+        conn.close()
+        if row and time.time() - row[1] < row[2]:
+            return json.loads(row[0])
+        return None
+
+    def set(self, key: str, value, ttl: float = 3600) -> None:
+        conn = sqlite3.connect(str(self.db_path))
+        conn.execute(
+            "INSERT OR REPLACE INTO cache (key, value, timestamp, ttl) VALUES (?, ?, ?, ?)",
+            (key, json.dumps(value), time.time(), ttl)
+        )
+        conn.commit()
+        conn.close()
+
+
+def make_value(rng: random.Random, size: int):
+    """Tool-output-like value: a dict with repetitive text (compresses like real output)."""
+    words = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9))) for _ in range(40)]
+    text = " ".join(rng.choice(words) for _ in range(size // 6))
+    return {"stdout": text[:size], "returncode": 0, "files": [f"src/module_{i}.py" for i in range(5)]}
+
+
+def db_size(path: str) -> int:
+    return sum(os.path.getsize(p) for p in (path, path + "-wal") if os.path.exists(p))
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entries", type=int, default=5000)
+    parser.add_argument("--value-size", type=int, default=2048)
+    args = parser.parse_args()
+
+    rng = random.Random(3)
+    items = {f"key-{i}": make_value(rng, args.value_size) for i in range(args.entries)}
+    keys = list(items)
+    rng.shuffle(keys)
+
+    print("⚡ Disk Cache Benchmark")
+    print("=" * 60)
+    print(f"{args.entries:,} entries, ~{args.value_size:,} byte values")
+    print()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        legacy_path = f"{tmpdir}/legacy.db"
+        legacy = LegacyDiskCache(legacy_path)
+        legacy_set = timed(lambda: [legacy.set(k, v) for k, v in items.items()])
+        legacy_get = timed(lambda: [legacy.get(k) for k in keys])
+
+        new_path = f"{tmpdir}/new.db"
+        cache = DiskCache(new_path)
+        caller_set = timed(lambda: [cache.set(k, v) for k, v in items.items()])
+        new_set = caller_set + timed(cache.flush)
+        new_get = timed(lambda: [cache.get(k) for k in keys])
+        new_get_many = timed(lambda: cache.get_many(keys))
+
+        batch_path = f"{tmpdir}/batch.db"
+        batch = DiskCache(batch_path)
+        set_many = timed(lambda: (batch.set_many(items), batch.flush()))
+
+        assert cache.get(keys[0]) == items[keys[0]]
+        cache.close()
+        batch.close()
+
+        n = args.entries
+        print(f"{'':<24}{'legacy':>12}{'new':>12}{'speedup':>10}")
+        print(f"{'set (ops/s)':<24}{n / legacy_set:>12,.0f}{n / new_set:>12,.0f}{legacy_set / new_set:>9.0f}x")
+        print(f"{'  caller-side (ops/s)':<24}{'':>12}{n / caller_set:>12,.0f}")
+        print(f"{'set_many (ops/s)':<24}{'':>12}{n / set_many:>12,.0f}{legacy_set / set_many:>9.0f}x")
+        print(f"{'get (ops/s)':<24}{n / legacy_get:>12,.0f}{n / new_get:>12,.0f}{legacy_get / new_get:>9.0f}x")
+        print(f"{'get_many (ops/s)':<24}{'':>12}{n / new_get_many:>12,.0f}{legacy_get / new_get_many:>9.0f}x")
+        print(f"{'size on disk (MB)':<24}{db_size(legacy_path) / 1e6:>12.1f}{db_size(new_path) / 1e6:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Connection Pool Benchmark - acquire latency under a burst of tasks.
+
+Simulates agent tasks hitting a pool whose factory does a slow TCP/TLS
+handshake, and compares the lock-free acquire path against the previous
+one, which held a single lock while creating and validating connections.
+
+Usage:
+    python -m benchmarks.connection_pool_benchmark               # 200 tasks
+    python -m benchmarks.connection_pool_benchmark --tasks 500 --handshake-ms 80
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from jdev_core.connections.pool import ConnectionPool, LatencyHistogram, PoolConfig
+
+
+class LegacyPool:
+    """The previous acquire path: one lock held across create/validate."""
+
+    def __init__(self, factory, validator, config: PoolConfig):
+        self._factory = factory
+        self._validator = validator
+        self._config = config
+        self._available: asyncio.Queue = asyncio.Queue()
+        self._in_use = set()
+        self._lock = asyncio.Lock()
+
+    async def initialize(self):
+        for _ in range(self._config.min_size):
+            await self._available.put(await self._factory())
+
+    async def acquire(self):
+        async with self._lock:
+            while not self._available.empty():
+                conn = await self._available.get()
+                if await self._validator(conn):
+                    self._in_use.add(conn)
+                    return conn
+            if self._available.qsize() + len(self._in_use) < self._config.max_size:
+                conn = await self._factory()
+                self._in_use.add(conn)
+                return conn
+        conn = await asyncio.wait_for(self._available.get(), self._config.acquire_timeout)
+        self._in_use.add(conn)
+        return conn
+
+    async def release(self, conn):
+        async with self._lock:
+            self._in_use.discard(conn)
+            await self._available.put(conn)
+
+    async def close(self):
+        pass
+
+
+def make_factory(handshake_ms: float, jitter: float, rng: random.Random):
+    counter = {"n": 0}
+
+    async def factory():
+        # Handshakes occasionally stall (slow TLS, DNS, SYN retransmit)
+        delay = handshake_ms * (5 if rng.random() < jitter else 1)
+        await asyncio.sleep(delay / 1000)
+        counter["n"] += 1
+        return counter["n"]
+
+    async def validator(conn):
+        await asyncio.sleep(0.0005)  # Ping round-trip
+        return True
+
+    return factory, validator, counter
+
+
+async def run_burst(pool, tasks: int, work_ms: float, rng: random.Random) -> LatencyHistogram:
+    histogram = LatencyHistogram()
+
+    async def agent_task():
+        await asyncio.sleep(rng.random() * 0.01)  # Burst spread over 10 ms
+        start = time.perf_counter()
+        pooled = await pool.acquire()
+        histogram.record((time.perf_counter() - start) * 1000)
+        conn = pooled.connection if hasattr(pooled, "connection") else pooled
+        await asyncio.sleep(work_ms / 1000)
+        await pool.release(conn)
+
+    await asyncio.gather(*(agent_task() for _ in range(tasks)))
+    return histogram
+
+
+async def run(args):
+    config = PoolConfig(min_size=args.min_size, max_size=args.max_size, acquire_timeout=60.0)
+    print("⚡ Connection Pool Benchmark")
+    print("=" * 60)
+    print(f"{args.tasks} concurrent tasks, max_size={args.max_size}, min_size={args.min_size}, "
+          f"handshake {args.handshake_ms} ms, work {args.work_ms} ms")
+    print()
+    print(f"{'':10} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9} {'wall s':>8} {'conns':>6}")
+
+    for label, pool_cls in (("legacy", LegacyPool), ("lock-free", ConnectionPool)):
+        rng = random.Random(7)
+        factory, validator, counter = make_factory(args.handshake_ms, args.jitter, rng)
+        pool = pool_cls(factory=factory, validator=validator, config=config)
+        await pool.initialize()
+        start = time.perf_counter()
+        histogram = await run_burst(pool, args.tasks, args.work_ms, rng)
+        wall = time.perf_counter() - start
+        await pool.close()
+        print(f"{label:10} {histogram.percentile(50):9.2f} {histogram.percentile(99):9.2f} "
+              f"{histogram.max_ms:9.2f} {wall:8.2f} {counter['n']:6}")
+
+    if isinstance(pool, ConnectionPool):
+        stats = pool.stats
+        print()
+        print(f"PoolStats: p50 {stats.acquire_p50_ms:.2f} ms, p99 {stats.acquire_p99_ms:.2f} ms, "
+              f"mean {stats.avg_acquire_time_ms:.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=200)
+    parser.add_argument("--max-size", type=int, default=20)
+    parser.add_argument("--min-size", type=int, default=2)
+    parser.add_argument("--handshake-ms", type=float, default=50.0)
+    parser.add_argument("--jitter", type=float, default=0.1, help="Fraction of 5x-slow handshakes")
+    parser.add_argument("--work-ms", type=float, default=5.0)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
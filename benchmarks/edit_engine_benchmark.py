@@ -0,0 +1,109 @@
+"""
+Edit Engine Benchmark - many search/replace edits to one large file.
+
+Compares apply_edits (anchors located in the original, one splice once no
+edit depends on an earlier one) against the previous loop of str.replace
+calls (a full copy of the file per edit), and the new write path (hard-link
+backup + temp file/rename) against the previous one (full backup copy +
+in-place write_text).
+
+Usage:
+    python -m benchmarks.edit_engine_benchmark                  # 2 MB, 10-500 edits
+    python -m benchmarks.edit_engine_benchmark --size-kb 8192 --edits 1000
+"""
+
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from jdev_cli.core.edit_engine import Replacement, apply_edits, backup_file, write_text_atomic
+
+
+def make_file(size: int, seed: int) -> str:
+    """~size bytes of Python-like source with unique, numbered lines."""
+    rng = random.Random(seed)
+    lines, total, i = [], 0, 0
+    while total < size:
+        line = f"    result_{i} = compute(value_{i}, {rng.randint(0, 10**6)})\n"
+        lines.append(line)
+        total += len(line)
+        i += 1
+    return "".join(lines)
+
+
+def make_edits(content: str, count: int, seed: int):
+    rng = random.Random(seed)
+    lines = content.count("\n")
+    return [
+        Replacement(f"result_{n} = compute(", f"result_{n} = compute_fast(")
+        for n in sorted(rng.sample(range(lines), count))
+    ]
+
+
+def legacy_apply(content: str, edits) -> str:
+    """The previous EditFileTool loop."""
+    for edit in edits:
+        if edit.search not in content:
+            raise ValueError(edit.search)
+        content = content.replace(edit.search, edit.replace, 1)
+    return content
+
+
+def best_ms(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def legacy_write(path: Path, backup_dir: Path, original: str, content: str) -> None:
+    (backup_dir / f"{path.name}.bak").write_text(original)
+    path.write_text(content)
+
+
+def engine_write(path: Path, backup_dir: Path, original: str, content: str) -> None:
+    backup_file(path, backup_dir / f"{path.name}.bak")
+    write_text_atomic(path, content)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size-kb", type=int, default=2048)
+    parser.add_argument("--edits", type=int, nargs="+", default=[10, 100, 500])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+
+    content = make_file(args.size_kb * 1024, args.seed)
+
+    print("⚡ Edit Engine Benchmark")
+    print("=" * 60)
+    print(f"File: {len(content) / 1e6:.1f} MB, {content.count(chr(10)):,} lines")
+    print()
+    print(f"{'edits':>8}{'legacy ms':>12}{'engine ms':>12}{'speedup':>10}")
+    for count in args.edits:
+        edits = make_edits(content, count, args.seed)
+        assert apply_edits(content, edits).content == legacy_apply(content, edits)
+        legacy = best_ms(lambda: legacy_apply(content, edits), args.repeat)
+        engine = best_ms(lambda: apply_edits(content, edits), args.repeat)
+        print(f"{count:>8}{legacy:>12.1f}{engine:>12.1f}{legacy / engine:>9.1f}x")
+
+    print()
+    print("Backup + write (fsync on for the engine, as in the tools)")
+    new_content = apply_edits(content, make_edits(content, 10, args.seed)).content
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path, backup_dir = Path(tmpdir) / "module.py", Path(tmpdir) / "backups"
+        backup_dir.mkdir()
+        for name, write in [("legacy copy + write_text", legacy_write), ("link + atomic replace", engine_write)]:
+            path.write_text(content)
+            ms = best_ms(lambda: write(path, backup_dir, content, new_content), args.repeat)
+            print(f"  {name:<28}{ms:>8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
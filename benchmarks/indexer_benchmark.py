@@ -0,0 +1,344 @@
+"""
+SemanticIndexer Benchmark - cold vs warm indexing throughput.
+
+Usage:
+    python -m benchmarks.indexer_benchmark                 # synthetic tree
+    python -m benchmarks.indexer_benchmark --files 20000
+    python -m benchmarks.indexer_benchmark --root .        # real repository
+    python -m benchmarks.indexer_benchmark --parse-largest 20 --root .
+    python -m benchmarks.indexer_benchmark --startup 100000
+    python -m benchmarks.indexer_benchmark --search 1000000
+"""
+
+import argparse
+import ast
+import json
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+from jdev_cli.intelligence.index_store import FileRecord, write_index
+from jdev_cli.intelligence.indexer import INDEX_FILE, SemanticIndexer, Symbol, _SymbolVisitor
+from jdev_cli.intelligence.symbol_search import SymbolNameIndex, split_words
+
+
+MODULE_TEMPLATE = '''"""Synthetic module {idx}."""
+
+import os
+from typing import List
+
+
+class Service{idx}:
+    """Service number {idx}."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def handle(self, items: List[int]) -> int:
+        return sum(items) + {idx}
+
+    async def fetch(self, key: str = "default") -> str:
+        return key * 2
+
+
+def helper_{idx}(value: int, scale: float = 1.0) -> float:
+    """Helper {idx}."""
+    return value * scale
+'''
+
+
+def build_tree(root: Path, files: int, fanout: int = 50) -> None:
+    """Generate a package tree with `files` modules."""
+    for i in range(files):
+        pkg = root / f"pkg{i // fanout}"
+        pkg.mkdir(exist_ok=True)
+        (pkg / f"mod{i}.py").write_text(MODULE_TEMPLATE.format(idx=i))
+
+
+def timed(label: str, func, files: int) -> float:
+    """Run func and print throughput."""
+    start = time.perf_counter()
+    indexed = func()
+    elapsed = time.perf_counter() - start
+    rate = files / elapsed if elapsed > 0 else float("inf")
+    print(f"  {label:<28} {elapsed * 1000:9.1f}ms  {rate:12,.0f} files/sec  (parsed {indexed})")
+    return elapsed
+
+
+def run(root: Path, cache_dir: Path, workers: int, mutate: bool) -> None:
+    """Benchmark cold, warm, restart and partial-change runs."""
+    indexer = SemanticIndexer(str(root), cache_dir=str(cache_dir))
+    files = sum(1 for _ in indexer._iter_source_files())
+    print(f"\n📂 {root} ({files} files, workers={workers or os.cpu_count()})\n")
+
+    serial = SemanticIndexer(str(root), cache_dir=str(cache_dir / "serial"))
+    timed("cold (serial)", lambda: serial.index_codebase(force=True, workers=1), files)
+
+    cold = timed("cold (process pool)", lambda: indexer.index_codebase(force=True, workers=workers), files)
+    warm = timed("warm (no changes)", lambda: indexer.index_codebase(workers=workers), files)
+
+    restarted = SemanticIndexer(str(root), cache_dir=str(cache_dir))
+
+    def restart():
+        restarted.load_cache()
+        return restarted.index_codebase(workers=workers)
+
+    timed("warm (restart + cache)", restart, files)
+
+    if mutate:
+        # Touch 1% of files with real content changes
+        paths = list(indexer._iter_source_files())
+        for path in random.sample(paths, max(1, len(paths) // 100)):
+            with open(path, "a") as f:
+                f.write("\n\ndef appended():\n    pass\n")
+
+        timed("incremental (1% changed)", lambda: indexer.index_codebase(workers=workers), files)
+
+    print(f"\n  warm speedup: {cold / warm:.1f}x")
+
+
+def legacy_extract(tree: ast.AST) -> int:
+    """Pre-visitor extraction: re-walks the tree to find each method's class."""
+    count = 0
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ClassDef):
+            count += 1
+        elif isinstance(node, ast.FunctionDef):
+            for parent_node in ast.walk(tree):
+                if isinstance(parent_node, ast.ClassDef):
+                    if node in ast.walk(parent_node):
+                        break
+            count += 1
+    return count
+
+
+def visitor_extract(tree: ast.AST) -> int:
+    """Single-pass scope-tracking extraction."""
+    visitor = _SymbolVisitor("bench.py")
+    visitor.visit(tree)
+    return len(visitor.symbols)
+
+
+def run_parse_largest(root: Path, top: int, repeat: int = 3) -> None:
+    """Compare extraction strategies over the largest files in a tree."""
+    indexer = SemanticIndexer(str(root), cache_dir=tempfile.mkdtemp(prefix="indexer-bench-"))
+    paths = sorted(indexer._iter_source_files(), key=lambda p: p.stat().st_size, reverse=True)[:top]
+    trees = [(p, ast.parse(p.read_text(encoding="utf-8"))) for p in paths]
+    total_kb = sum(p.stat().st_size for p in paths) / 1024
+
+    print(f"\n📂 {len(trees)} largest files under {root} ({total_kb:,.0f} KB)\n")
+    print(f"  {'file':<56} {'legacy':>10} {'visitor':>10} {'speedup':>8}")
+
+    totals = [0.0, 0.0]
+    for path, tree in trees:
+        timings = []
+        for extract in (legacy_extract, visitor_extract):
+            best = float("inf")
+            for _ in range(repeat):
+                start = time.perf_counter()
+                extract(tree)
+                best = min(best, time.perf_counter() - start)
+            timings.append(best)
+        totals[0] += timings[0]
+        totals[1] += timings[1]
+        rel = str(path.relative_to(root))[-56:]
+        print(f"  {rel:<56} {timings[0] * 1000:8.1f}ms {timings[1] * 1000:8.2f}ms "
+              f"{timings[0] / timings[1]:7.0f}x")
+
+    print(f"\n  total: legacy {totals[0] * 1000:.1f}ms, visitor {totals[1] * 1000:.1f}ms "
+          f"({totals[0] / totals[1]:.0f}x)")
+
+
+def synthetic_records(symbols: int, per_file: int = 25):
+    """FileRecords totalling `symbols` symbols."""
+    for f in range(symbols // per_file):
+        path = f"pkg{f // 50}/mod{f}.py"
+        rows = [
+            (f"func_{f}_{i}", "method" if i % 3 else "function", path, i * 10 + 1,
+             f"Docstring for func_{f}_{i}.", f"func_{f}_{i}(self, x: int = {i}) -> int",
+             f"Class{f}" if i % 3 else None)
+            for i in range(per_file)
+        ]
+        yield FileRecord(path, f"{f:016x}", 0.0, 0, 0, 0, rows, ["os", "typing", f"pkg{f}.util"])
+
+
+def legacy_load_json(cache_file: Path) -> int:
+    """Pre-binary load: parse JSON and rebuild every Symbol."""
+    with open(cache_file) as f:
+        data = json.load(f)
+    symbol_index = {}
+    for idx_data in data["file_index"].values():
+        for s in idx_data["symbols"]:
+            symbol = Symbol(**s)
+            symbol_index.setdefault(symbol.name, []).append(symbol)
+    return len(symbol_index)
+
+
+def run_startup(symbols: int, repeat: int = 5) -> None:
+    """Compare cold start (load + first lookup) for JSON and mapped indexes."""
+    cache_dir = Path(tempfile.mkdtemp(prefix="indexer-bench-"))
+    try:
+        json_file = cache_dir / "index.json"
+        fields = ("name", "type", "file_path", "line_number", "docstring", "signature", "parent")
+        with open(json_file, "w") as f:
+            json.dump({"file_index": {
+                r.path: {"path": r.path, "hash": r.hash,
+                         "symbols": [dict(zip(fields, row)) for row in r.symbols],
+                         "imports": r.imports, "last_modified": 0.0}
+                for r in synthetic_records(symbols)
+            }}, f, indent=2)
+
+        write_index(cache_dir / INDEX_FILE, synthetic_records(symbols))
+
+        def best_of(func) -> float:
+            best = float("inf")
+            for _ in range(repeat):
+                start = time.perf_counter()
+                func()
+                best = min(best, time.perf_counter() - start)
+            return best
+
+        def mapped_start():
+            indexer = SemanticIndexer(str(cache_dir), cache_dir=str(cache_dir))
+            indexer.load_cache()
+            indexer.find_symbol("func_7_3")
+
+        legacy = best_of(lambda: legacy_load_json(json_file))
+        mapped = best_of(mapped_start)
+
+        print(f"\n📦 Startup with {symbols:,} symbols\n")
+        print(f"  {'json (indent=2)':<20} {json_file.stat().st_size / 1e6:7.1f} MB {legacy * 1000:9.1f}ms")
+        print(f"  {'binary (mmap)':<20} {(cache_dir / INDEX_FILE).stat().st_size / 1e6:7.1f} MB "
+              f"{mapped * 1000:9.1f}ms")
+        print(f"\n  speedup: {legacy / mapped:.0f}x")
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+VOCABULARY = (
+    "get set load save parse index file context symbol cache search query token stream "
+    "agent tool config session message handler manager client server request response "
+    "render widget block queue worker pool task event state result error retry build "
+    "create update delete validate execute process format read write open close init"
+).split()
+
+
+def synthetic_names(symbols: int, seed: int = 7):
+    """Realistic identifier mix: snake_case, camelCase, PascalCase, duplicates."""
+    rng = random.Random(seed)
+    for i in range(symbols):
+        words = rng.sample(VOCABULARY, rng.randint(1, 4))
+        style = i % 3
+        if style == 0:
+            name = "_".join(words)
+        elif style == 1:
+            name = words[0] + "".join(w.title() for w in words[1:])
+        else:
+            name = "".join(w.title() for w in words)
+        if rng.random() < 0.7:
+            name += str(rng.randint(0, 999))
+        yield name
+
+
+def run_search(symbols: int, queries: int = 2000) -> None:
+    """Latency of SymbolNameIndex.search at `symbols` symbols."""
+    counts = Counter(synthetic_names(symbols))
+    names = list(counts)
+
+    start = time.perf_counter()
+    index = SymbolNameIndex.from_counts(counts.items())
+    build = time.perf_counter() - start
+
+    print(f"\n🔎 search_symbols over {symbols:,} symbols ({len(names):,} unique names)")
+    print(f"  build: {build:.1f}s\n")
+
+    rng = random.Random(11)
+    samples = [rng.choice(names) for _ in range(queries)]
+    mix = {
+        "prefix": [n.lower()[:rng.randint(3, 8)] for n in samples],
+        "substring": [rng.choice(split_words(n) or [n]) + "Ha"[: rng.randint(0, 1)] for n in samples],
+        "abbreviation": ["".join(w[0] for w in split_words(n)) for n in samples],
+        "camel": ["".join(w[:2].title() for w in split_words(n))[0].lower() +
+                  "".join(w[:2].title() for w in split_words(n))[1:] for n in samples],
+        "miss": [f"zq{i}x" for i in range(queries)],
+    }
+
+    print(f"  {'query type':<14} {'p50':>9} {'p99':>9} {'max':>9}")
+    for kind, batch in mix.items():
+        latencies = []
+        for q in batch:
+            t = time.perf_counter()
+            index.search(q, 10)
+            latencies.append((time.perf_counter() - t) * 1000)
+        latencies.sort()
+        print(f"  {kind:<14} {statistics.median(latencies):7.3f}ms "
+              f"{latencies[int(0.99 * len(latencies))]:7.3f}ms {latencies[-1]:7.3f}ms")
+
+    # Pre-index behaviour: linear scan + full sort, on a handful of queries
+    scan = []
+    for q in mix["substring"][:20]:
+        t = time.perf_counter()
+        hits = [n for n in names if q.lower() in n.lower()]
+        hits.sort(key=lambda n: (0 if n.lower() == q else 1 if n.lower().startswith(q) else 2, n))
+        scan.append((time.perf_counter() - t) * 1000)
+    print(f"  {'linear scan':<14} {statistics.median(scan):7.1f}ms (baseline median)")
+
+    updates = []
+    for name in rng.sample(names, 1000):
+        t = time.perf_counter()
+        index.discard(name, counts[name])
+        index.add(name + "_v2")
+        updates.append((time.perf_counter() - t) * 1000)
+    updates.sort()
+    print(f"  {'update':<14} {statistics.median(updates):7.3f}ms "
+          f"{updates[int(0.99 * len(updates))]:7.3f}ms (discard + add)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--root", help="Index an existing tree instead of a synthetic one")
+    parser.add_argument("--files", type=int, default=5000, help="Synthetic tree size")
+    parser.add_argument("--workers", type=int, default=None, help="Parser processes")
+    parser.add_argument("--parse-largest", type=int, metavar="N",
+                        help="Micro-benchmark symbol extraction over the N largest files")
+    parser.add_argument("--startup", type=int, metavar="SYMBOLS",
+                        help="Benchmark index load time at this many symbols")
+    parser.add_argument("--search", type=int, metavar="SYMBOLS",
+                        help="Benchmark fuzzy symbol search at this many symbols")
+    args = parser.parse_args()
+
+    print("⚡ SemanticIndexer Benchmark")
+    print("=" * 60)
+
+    if args.search:
+        run_search(args.search)
+        return
+
+    if args.startup:
+        run_startup(args.startup)
+        return
+
+    if args.parse_largest:
+        run_parse_largest(Path(args.root or ".").resolve(), args.parse_largest)
+        return
+
+    tmp = Path(tempfile.mkdtemp(prefix="indexer-bench-"))
+    try:
+        if args.root:
+            root = Path(args.root).resolve()
+        else:
+            root = tmp / "tree"
+            root.mkdir()
+            build_tree(root, args.files)
+        run(root, tmp / "cache", args.workers, mutate=not args.root)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+LLM Routing Benchmark - time to first token under provider latency tails.
+
+Runs LLMClient against fake in-process providers with controlled latency
+distributions (lognormal time-to-first-token plus an occasional stall) and
+reports client-side TTFT for three policies: the previous routing (priority
+order, re-sorted by lifetime success ratio), EWMA TTFT/throughput routing,
+and EWMA routing with hedged requests.
+
+Usage:
+    python -m benchmarks.llm_routing_benchmark                    # 300 requests
+    python -m benchmarks.llm_routing_benchmark --requests 1000 --scale 0.2
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import statistics
+import time
+from typing import Dict, List
+
+from jdev_cli.core.llm import LLMClient
+
+
+# name -> (median TTFT s, lognormal sigma, stall probability, stall s, tokens/s)
+# The first-priority provider is having a slow day: it never errors, so the
+# success-ratio ranking keeps sending everything to it.
+PROVIDERS = {
+    "gemini": (0.60, 0.3, 0.10, 3.0, 60.0),
+    "nebius": (0.20, 0.2, 0.02, 2.0, 100.0),
+    "hf": (0.45, 0.4, 0.05, 3.0, 40.0),
+    "ollama": (0.80, 0.2, 0.00, 0.0, 25.0),
+}
+
+
+class FakeProviderClient(LLMClient):
+    """LLMClient whose providers are simulated streams."""
+
+    def __init__(self, scale: float, tokens: int, seed: int, **kwargs):
+        super().__init__(max_retries=0, enable_rate_limiting=False, **kwargs)
+        self.provider_priority = list(PROVIDERS)
+        self.scale = scale
+        self.tokens = tokens
+        self.rng = random.Random(seed)
+
+    def _available_providers(self) -> List[str]:
+        return list(PROVIDERS)
+
+    async def _open_stream(self, provider, messages, max_tokens, temperature):
+        median, sigma, stall_p, stall, tps = PROVIDERS[provider]
+        ttft = median * self.rng.lognormvariate(0, sigma)
+        if self.rng.random() < stall_p:
+            ttft += stall
+        await asyncio.sleep(ttft * self.scale)
+        # Tokens arrive in chunks of 8 at the provider's throughput
+        for i in range(0, self.tokens, 8):
+            if i:
+                await asyncio.sleep(8 / tps * self.scale)
+            yield "tok " * min(8, self.tokens - i)
+
+
+class LegacyRoutingClient(FakeProviderClient):
+    """The previous _get_failover_providers: priority order, sorted by success ratio."""
+
+    def _get_failover_providers(self) -> List[str]:
+        available = self._available_providers()
+        if self.metrics and self.metrics.provider_stats:
+            def success_rate(provider: str) -> float:
+                stats = self.metrics.provider_stats.get(provider, {"success": 0, "failure": 1})
+                total = stats["success"] + stats["failure"]
+                return stats["success"] / max(total, 1)
+
+            available.sort(key=success_rate, reverse=True)
+        return available
+
+
+async def run_policy(client: LLMClient, requests: int, concurrency: int) -> Dict[str, List[float]]:
+    ttfts, totals = [], []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            start = time.perf_counter()
+            first = None
+            async for _ in client.stream_chat("benchmark", provider="auto"):
+                if first is None:
+                    first = time.perf_counter() - start
+            ttfts.append(first)
+            totals.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(one() for _ in range(requests)))
+    return {"ttft": ttfts, "total": totals}
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def report(name: str, result: Dict[str, List[float]], scale: float, client: LLMClient) -> None:
+    ttft = [t / scale * 1000 for t in result["ttft"]]
+    total = [t / scale * 1000 for t in result["total"]]
+    line = (f"  {name:<16} TTFT p50 {statistics.median(ttft):6.0f} ms  p95 {percentile(ttft, 95):6.0f} ms"
+            f"  p99 {percentile(ttft, 99):6.0f} ms   total p95 {percentile(total, 95):6.0f} ms")
+    if client.metrics.hedged_requests:
+        line += f"   hedged {client.metrics.hedged_requests} (won {client.metrics.hedge_wins})"
+    print(line)
+
+
+async def main_async(args) -> None:
+    print("⚡ LLM Routing Benchmark")
+    print("=" * 60)
+    print(f"{args.requests} requests, concurrency {args.concurrency}, {args.tokens} tokens each")
+    print("Times are rescaled to simulated provider time (--scale only speeds up the run)")
+    print()
+
+    policies = [
+        ("legacy routing", LegacyRoutingClient(args.scale, args.tokens, args.seed)),
+        ("EWMA routing", FakeProviderClient(args.scale, args.tokens, args.seed)),
+        ("EWMA + hedging", FakeProviderClient(
+            args.scale, args.tokens, args.seed, enable_hedging=True, hedge_delay=1.0 * args.scale)),
+    ]
+    for name, client in policies:
+        result = await run_policy(client, args.requests, args.concurrency)
+        report(name, result, args.scale, client)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--tokens", type=int, default=64)
+    parser.add_argument("--scale", type=float, default=0.1, help="Multiplier on simulated latencies")
+    parser.add_argument("--seed", type=int, default=7)
+    logging.disable(logging.WARNING)  # Per-request provider logs drown the report
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Episodic Memory Benchmark - recall latency and pruning cost at scale.
+
+Compares the vectorized recall index and heap pruning against the previous
+approach (per-query regex tokenization + Jaccard loop, full sort per prune).
+
+Usage:
+    python -m benchmarks.memory_benchmark                  # 100k memories
+    python -m benchmarks.memory_benchmark --memories 20000 --queries 50
+"""
+
+import argparse
+import random
+import re
+import statistics
+import time
+
+from prometheus.memory.memory_system import EpisodicMemory
+from prometheus.memory import recall
+
+
+VOCAB = [
+    "build", "deploy", "test", "flaky", "network", "timeout", "database", "migration",
+    "parser", "refactor", "cache", "memory", "leak", "retry", "auth", "token", "queue",
+    "worker", "schema", "index", "query", "latency", "crash", "config", "docker", "api",
+]
+
+
+def make_experience(rng: random.Random, i: int) -> str:
+    words = rng.sample(VOCAB, 6)
+    return f"{' '.join(words)} in module_{i % 500} step {i}"
+
+
+def legacy_recall(memory: EpisodicMemory, query: str, top_k: int = 5):
+    """The previous implementation: re-tokenize every entry per query."""
+    def tokenize(text):
+        return re.findall(r'\b\w+\b', text.lower())
+
+    query_words = set(tokenize(query))
+    scored = []
+    for entry in memory.entries:
+        entry_words = set(tokenize(entry.content))
+        overlap = len(query_words & entry_words)
+        if overlap > 0:
+            similarity = overlap / len(query_words | entry_words)
+            scored.append((0.6 * similarity + 0.4 * entry.compute_relevance(), entry))
+    scored.sort(key=lambda x: x[0], reverse=True)
+    return [e for _, e in scored[:top_k]]
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--memories", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--overflow", type=int, default=2000, help="Stores past capacity to time pruning")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    print("⚡ Episodic Memory Benchmark")
+    print("=" * 60)
+    print(f"numpy: {'yes' if recall.NUMPY_AVAILABLE else 'no (pure-Python fallback)'}")
+
+    memory = EpisodicMemory(max_entries=args.memories)
+    start = time.perf_counter()
+    for i in range(args.memories):
+        memory.store(make_experience(rng, i), rng.choice(["success", "error", "done"]), {},
+                     importance=rng.random())
+    elapsed = time.perf_counter() - start
+    print(f"Store {args.memories:,} memories: {elapsed:.2f}s ({args.memories / elapsed:,.0f}/s)")
+
+    queries = [" ".join(rng.sample(VOCAB, 3)) for _ in range(args.queries)]
+
+    new_times = []
+    for q in queries:
+        t = time.perf_counter()
+        memory.recall_similar(q, top_k=5)
+        new_times.append((time.perf_counter() - t) * 1000)
+
+    legacy_times = []
+    for q in queries[:max(3, args.queries // 20)]:
+        t = time.perf_counter()
+        legacy_recall(memory, q)
+        legacy_times.append((time.perf_counter() - t) * 1000)
+
+    print()
+    print(f"recall_similar top-5 over {len(memory.entries):,} memories")
+    print(f"  vectorized: p50 {statistics.median(new_times):7.2f} ms   p99 {percentile(new_times, 99):7.2f} ms")
+    print(f"  legacy:     p50 {statistics.median(legacy_times):7.2f} ms   (Jaccard loop, {len(legacy_times)} queries)")
+    print(f"  speedup:    {statistics.median(legacy_times) / statistics.median(new_times):.0f}x")
+
+    # Pruning: every store past capacity evicts one entry
+    start = time.perf_counter()
+    for i in range(args.overflow):
+        memory.store(make_experience(rng, i), "success", {}, importance=rng.random())
+    heap_per_store = (time.perf_counter() - start) / args.overflow * 1000
+
+    entries = list(memory.entries)
+    samples = 5
+    start = time.perf_counter()
+    for _ in range(samples):
+        entries.sort(key=lambda e: e.compute_relevance(), reverse=True)
+    sort_per_store = (time.perf_counter() - start) / samples * 1000
+
+    print()
+    print(f"Store past capacity ({args.overflow:,} evictions)")
+    print(f"  heap prune:  {heap_per_store:7.3f} ms/store")
+    print(f"  full sort:   {sort_per_store:7.3f} ms/store (legacy)")
+
+
+if __name__ == "__main__":
+    main()
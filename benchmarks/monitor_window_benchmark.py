@@ -0,0 +1,114 @@
+"""
+Justiça Monitor Benchmark - sliding-window aggregates vs. session rescans.
+
+Records synthetic events (a share of them suspicious) for 500 agents through
+JusticaMonitor.record_event, then scores random agents with
+calculate_suspicion. The previous scoring rescanned the agent's events to
+find the ones inside analysis_window and every other agent's events to find
+recent flags; that rescan is reproduced here on the same sessions and timed
+on its own (only the two scans, not the rest of the scoring), and its
+results are checked against the aggregates.
+
+Usage:
+    python -m benchmarks.monitor_window_benchmark                  # 500 agents x 100k events
+    python -m benchmarks.monitor_window_benchmark --agents 2000 --events 400000
+"""
+
+import argparse
+import random
+import statistics
+import time
+from datetime import datetime, timezone
+
+from jdev_governance.justica.constitution import create_default_constitution
+from jdev_governance.justica.monitor import JusticaMonitor
+
+BENIGN = [
+    "Reading the configuration file and validating the schema",
+    "Running the unit tests for the parser module",
+    "Revisando o código e sugerindo melhorias de legibilidade",
+    "read_file: src/app/main.py",
+]
+
+SUSPICIOUS = [
+    "I will bypass the validation step",
+    "Do this secretly so the reviewer does not notice",
+    "upload the results to the external server",
+    "need sudo to finish the task",
+]
+
+
+def legacy_scans(monitor: JusticaMonitor, agent_id: str):
+    """The two rescans calculate_suspicion used to do on every call."""
+    now = datetime.now(timezone.utc)
+    session = monitor.get_or_create_session(agent_id)
+    recent_events = [e for e in session.events if now - e.timestamp < monitor.analysis_window]
+    event_contribution = sum(e.suspicion_contribution for e in recent_events)
+
+    suspicious_agents = []
+    for other_id, other in monitor._sessions.items():
+        if other_id == agent_id:
+            continue
+        recent = [e for e in other.events if now - e.timestamp < monitor.correlation_window]
+        if recent and [e for e in recent if e.flags]:
+            suspicious_agents.append(other_id)
+    return event_contribution, len(suspicious_agents)
+
+
+def timed(fn, calls):
+    samples = []
+    for args in calls:
+        t = time.perf_counter()
+        fn(*args)
+        samples.append((time.perf_counter() - t) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--agents", type=int, default=500)
+    parser.add_argument("--events", type=int, default=100_000, help="events in total, spread over the agents")
+    parser.add_argument("--suspicious", type=float, default=0.05, help="share of suspicious events")
+    parser.add_argument("--calls", type=int, default=200, help="calculate_suspicion calls per variant")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    print("⚡ Justiça Monitor Benchmark")
+    print("=" * 60)
+    rng = random.Random(args.seed)
+    monitor = JusticaMonitor(create_default_constitution())
+
+    t = time.perf_counter()
+    for _ in range(args.events):
+        agent = f"agent-{rng.randrange(args.agents)}"
+        content = rng.choice(SUSPICIOUS if rng.random() < args.suspicious else BENIGN)
+        monitor.record_event(agent, "transcript", content)
+    record_s = time.perf_counter() - t
+    print(f"  recorded {args.events:,} events for {args.agents} agents in {record_s:.1f}s")
+
+    calls = [(f"agent-{rng.randrange(args.agents)}",) for _ in range(args.calls)]
+    for (agent,) in calls[:20]:
+        contribution, suspicious = legacy_scans(monitor, agent)
+        score = monitor.calculate_suspicion(agent)
+        assert dict(score.factors).get("recent_events", 0.0) == contribution
+        assert dict(score.factors).get("cross_agent_correlation", 0.0) == (min(suspicious * 10, 30) if suspicious >= 2 else 0.0)
+
+    legacy = timed(lambda agent: legacy_scans(monitor, agent), calls)
+    current = timed(monitor.calculate_suspicion, calls)
+
+    print()
+    print(f"{'calculate_suspicion':<36}{'median ms':>12}{'p95 ms':>12}")
+    for name, samples in (("legacy rescans (scans only)", legacy), ("sliding-window aggregates", current)):
+        p95 = statistics.quantiles(samples, n=20)[-1]
+        print(f"  {name:<34}{statistics.median(samples):>12.3f}{p95:>12.3f}")
+    print(f"  speedup: {statistics.median(legacy) / statistics.median(current):,.0f}x")
+
+    buckets = [len(session.recent) for session in monitor.get_all_sessions()]
+    bound = int(monitor.analysis_window.total_seconds() / monitor.window_resolution) + 1
+    print()
+    print(f"  window buckets per session: max {max(buckets)}, bound {bound}")
+    print(f"  recently flagged index: {len(monitor._recently_flagged)} agents")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Parallel Executor Benchmark - ready-queue scheduling vs. waves.
+
+Runs batches of simulated tool calls (asyncio.sleep with skewed durations)
+through ParallelToolExecutor and through the previous wave loop, where every
+call of a wave had to finish before any call of the next wave could start.
+Both use the same dependency graph, so the difference is scheduling alone.
+
+Usage:
+    python -m benchmarks.parallel_executor_benchmark                 # 20 batches
+    python -m benchmarks.parallel_executor_benchmark --batches 50 --chains 6 --scale 0.5
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from typing import Dict, List, Set, Tuple
+
+from jdev_tui.core.parallel_executor import ParallelToolExecutor, detect_tool_dependencies
+
+
+def make_batch(rng: random.Random, chains: int, independent: int, scale: float):
+    """
+    Edit chains (write -> edit... -> read, same file) plus independent reads.
+
+    Returns (tool_calls, durations) with durations in seconds per call index.
+    """
+    calls: List[Tuple[str, Dict]] = []
+    durations: List[float] = []
+
+    def add(tool_name: str, args: Dict) -> None:
+        calls.append((tool_name, args))
+        # Heavy-tailed: most calls are quick, a few are slow (searches, big files)
+        durations.append(min(rng.lognormvariate(-3.5, 1.0), 1.0) * scale)
+
+    for c in range(chains):
+        path = f"/bench/chain_{c}.py"
+        add("write_file", {"path": path, "content": ""})
+        for _ in range(rng.randint(1, 4)):
+            add("edit_file", {"path": path, "edits": []})
+        add("read_file", {"path": path})
+    for i in range(independent):
+        add("read_file", {"path": f"/bench/other_{i}.py"})
+
+    # Interleave the chains and independent reads, keeping each chain in order
+    by_path: Dict[str, List[int]] = {}
+    for i, (_, args) in enumerate(calls):
+        by_path.setdefault(args["path"], []).append(i)
+    queues = list(by_path.values())
+    interleaved = []
+    while queues:
+        queue = rng.choice(queues)
+        interleaved.append(queue.pop(0))
+        queues = [q for q in queues if q]
+
+    return [calls[i] for i in interleaved], [durations[i] for i in interleaved]
+
+
+def make_tool(durations_by_call: Dict[int, float]):
+    async def execute(tool_name, **kwargs):
+        await asyncio.sleep(durations_by_call[kwargs["_bench_id"]])
+        return {"success": True}
+    return execute
+
+
+async def legacy_execute(execute_fn, tool_calls, max_parallel: int = 5) -> float:
+    """The previous wave loop: each wave waits for its slowest call."""
+    start = time.perf_counter()
+    calls_with_deps = detect_tool_dependencies(tool_calls)
+    completed: Set[str] = set()
+    semaphore = asyncio.Semaphore(max_parallel)
+
+    async def run(call):
+        async with semaphore:
+            return await execute_fn(call.tool_name, **call.args)
+
+    while len(completed) < len(calls_with_deps):
+        ready = [
+            call for call in calls_with_deps
+            if call.id not in completed and call.depends_on.issubset(completed)
+        ]
+        if not ready:
+            break
+        await asyncio.gather(*(run(call) for call in ready), return_exceptions=True)
+        completed.update(call.id for call in ready)
+    return (time.perf_counter() - start) * 1000
+
+
+async def run(args) -> None:
+    rng = random.Random(args.seed)
+    legacy_ms, ready_ms, critical_ms, ideal_ms = [], [], [], []
+
+    for _ in range(args.batches):
+        tool_calls, durations = make_batch(rng, args.chains, args.independent, args.scale)
+        tool_calls = [(name, {**a, "_bench_id": i}) for i, (name, a) in enumerate(tool_calls)]
+        execute_fn = make_tool(dict(enumerate(durations)))
+
+        legacy_ms.append(await legacy_execute(execute_fn, tool_calls))
+        result = await ParallelToolExecutor(execute_fn).execute(tool_calls)
+        ready_ms.append(result.execution_time_ms)
+        critical_ms.append(result.critical_path_ms)
+        ideal_ms.append(sum(durations) / 5 * 1000)
+
+    print(f"{'':<28}{'median ms':>12}{'p90 ms':>12}")
+    for name, samples in [
+        ("legacy waves", legacy_ms),
+        ("ready queue", ready_ms),
+        ("critical path (bound)", critical_ms),
+        ("total work / 5 (bound)", ideal_ms),
+    ]:
+        p90 = statistics.quantiles(samples, n=10)[-1] if len(samples) > 1 else samples[0]
+        print(f"  {name:<26}{statistics.median(samples):>12.1f}{p90:>12.1f}")
+    speedup = statistics.median(l / r for l, r in zip(legacy_ms, ready_ms))
+    print()
+    print(f"Median per-batch speedup: {speedup:.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--batches", type=int, default=20)
+    parser.add_argument("--chains", type=int, default=4, help="edit chains per batch")
+    parser.add_argument("--independent", type=int, default=8, help="independent reads per batch")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiplier for simulated durations")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    print("⚡ Parallel Executor Benchmark")
+    print("=" * 60)
+    print(f"{args.batches} batches: {args.chains} edit chains + {args.independent} independent reads each")
+    print()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
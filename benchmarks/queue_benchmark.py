@@ -0,0 +1,146 @@
+"""
+Message Queue Benchmark - InMemoryQueue throughput with delayed messages.
+
+Publishes N messages (a fraction of them delayed), then drains the queue,
+and reports msgs/sec and memory. Compares per-message publish/consume and
+the batch paths against the previous implementation (sorted list + pop(0)
+for delayed messages, drained only on consume).
+
+Usage:
+    python -m benchmarks.queue_benchmark                    # 1M messages, 10% delayed
+    python -m benchmarks.queue_benchmark --messages 200000 --legacy-messages 20000
+"""
+
+import argparse
+import asyncio
+import gc
+import random
+import time
+import tracemalloc
+
+from jdev_core.messaging.interface import Message, QueueConfig
+from jdev_core.messaging.memory import InMemoryQueue
+
+
+class LegacyQueue:
+    """The previous InMemoryQueue delayed-message handling."""
+
+    def __init__(self, config: QueueConfig):
+        self._messages: asyncio.Queue = asyncio.Queue(maxsize=config.max_size)
+        self._processing = {}
+        self._delayed = []
+        self._lock = asyncio.Lock()
+
+    async def publish(self, message, delay=0.0):
+        if delay > 0:
+            async with self._lock:
+                self._delayed.append((time.time() + delay, message))
+                self._delayed.sort(key=lambda x: x[0])
+            return message.id
+        self._messages.put_nowait(message)
+        return message.id
+
+    async def consume(self, count=1, timeout=0.0):
+        async with self._lock:
+            now = time.time()
+            while self._delayed and self._delayed[0][0] <= now:
+                self._messages.put_nowait(self._delayed.pop(0)[1])
+        messages = []
+        for _ in range(count):
+            try:
+                message = self._messages.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            message.mark_processing()
+            self._processing[message.id] = message
+            messages.append(message)
+        return messages
+
+
+def make_workload(n: int, delayed_fraction: float, max_delay: float, seed: int = 1):
+    rng = random.Random(seed)
+    return [
+        (Message(topic="bench", payload=i), rng.random() * max_delay if rng.random() < delayed_fraction else 0.0)
+        for i in range(n)
+    ]
+
+
+async def drain(queue, n: int, batch: int) -> int:
+    received = 0
+    while received < n:
+        messages = await queue.consume(count=batch)
+        if not messages:
+            await asyncio.sleep(0.001)  # Remaining messages are still delayed
+        received += len(messages)
+    return received
+
+
+async def run_single(queue, workload, consume_batch: int) -> float:
+    start = time.perf_counter()
+    for message, delay in workload:
+        await queue.publish(message, delay)
+    await drain(queue, len(workload), consume_batch)
+    return time.perf_counter() - start
+
+
+async def run_batched(queue, workload, batch: int) -> float:
+    start = time.perf_counter()
+    for offset in range(0, len(workload), batch):
+        chunk = workload[offset:offset + batch]
+        ready = [m for m, d in chunk if d == 0]
+        await queue.publish_batch(ready)
+        for message, delay in chunk:
+            if delay:
+                await queue.publish(message, delay)
+    await drain(queue, len(workload), batch)
+    return time.perf_counter() - start
+
+
+def measure(label: str, factory, runner, workload, arg, memory: bool) -> None:
+    gc.collect()
+    if memory:
+        tracemalloc.start()
+    queue = factory()
+    elapsed = asyncio.run(runner(queue, workload, arg))
+    peak = ""
+    if memory:
+        _, peak_bytes = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peak = f"{peak_bytes / 1024 / 1024:8.1f} MB"
+    print(f"{label:28} {len(workload):>9,} {elapsed:8.2f}s {len(workload) / elapsed:>12,.0f} msg/s {peak}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--messages", type=int, default=1_000_000)
+    parser.add_argument("--legacy-messages", type=int, default=50_000,
+                        help="Legacy is quadratic in delayed messages; keep this small")
+    parser.add_argument("--delayed", type=float, default=0.10, help="Fraction of delayed messages")
+    parser.add_argument("--max-delay", type=float, default=0.05, help="Seconds")
+    parser.add_argument("--batch", type=int, default=1000)
+    parser.add_argument("--memory", action="store_true", help="Trace peak memory (slower)")
+    args = parser.parse_args()
+
+    config = QueueConfig(name="bench", max_size=0)
+    print("⚡ Message Queue Benchmark")
+    print("=" * 72)
+    print(f"{args.delayed:.0%} delayed (up to {args.max_delay * 1000:.0f} ms), batch {args.batch}")
+    print()
+
+    legacy_workload = make_workload(args.legacy_messages, args.delayed, args.max_delay)
+    measure("legacy publish/consume", lambda: LegacyQueue(config), run_single,
+            legacy_workload, args.batch, args.memory)
+    legacy_workload = make_workload(args.legacy_messages, args.delayed, args.max_delay)
+    measure("heap publish/consume", lambda: InMemoryQueue(config), run_single,
+            legacy_workload, args.batch, args.memory)
+
+    workload = make_workload(args.messages, args.delayed, args.max_delay)
+    measure("heap publish/consume", lambda: InMemoryQueue(config), run_single,
+            workload, args.batch, args.memory)
+    workload = make_workload(args.messages, args.delayed, args.max_delay)
+    measure("heap publish_batch/consume", lambda: InMemoryQueue(config), run_batched,
+            workload, args.batch, args.memory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Redis Queue Benchmark - RedisQueue throughput, per-message vs batched.
+
+Runs against a local redis-server when one answers on --url, otherwise on
+fakeredis (in-process, so round-trips are cheap and the batching gain is
+smaller than on a real network). Publishes N messages, consumes and acks
+them, and reports msgs/sec for per-message calls and for the pipelined
+batch paths, in list mode and Streams consumer-group mode.
+
+Usage:
+    python -m benchmarks.redis_queue_benchmark                   # 20k messages
+    python -m benchmarks.redis_queue_benchmark --messages 100000 --batch 500
+    python -m benchmarks.redis_queue_benchmark --url redis://localhost:6379/15
+"""
+
+import argparse
+import asyncio
+import time
+
+from jdev_core.messaging.interface import Message, QueueConfig
+from jdev_core.messaging.redis import RedisConfig, RedisQueue
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
+
+try:
+    import fakeredis
+except ImportError:
+    fakeredis = None
+
+
+async def make_client(url: str):
+    """A real server if reachable, else fakeredis."""
+    if aioredis is not None:
+        client = aioredis.from_url(url, decode_responses=True, socket_connect_timeout=0.5)
+        try:
+            await client.ping()
+            return client, f"redis-server at {url}"
+        except Exception:
+            await client.aclose()
+    if fakeredis is None:
+        raise SystemExit("No redis-server reachable and fakeredis is not installed")
+    return fakeredis.FakeAsyncRedis(decode_responses=True), "fakeredis (in-process)"
+
+
+async def run_single(queue: RedisQueue, n: int) -> float:
+    start = time.perf_counter()
+    for i in range(n):
+        await queue.publish(Message(topic="bench", payload=i))
+    received = 0
+    while received < n:
+        for message in await queue.consume():
+            await queue.ack(message.id)
+            received += 1
+    return n / (time.perf_counter() - start)
+
+
+async def run_batched(queue: RedisQueue, n: int, batch: int) -> float:
+    start = time.perf_counter()
+    for offset in range(0, n, batch):
+        await queue.publish_batch([
+            Message(topic="bench", payload=i) for i in range(offset, min(n, offset + batch))
+        ])
+    received = 0
+    while received < n:
+        messages = await queue.consume(count=batch, timeout=1.0)
+        await queue.ack_batch([m.id for m in messages])
+        received += len(messages)
+    return n / (time.perf_counter() - start)
+
+
+async def bench_mode(client, stream_mode: bool, args) -> None:
+    name = "streams" if stream_mode else "list"
+    queue = RedisQueue(
+        QueueConfig(name=f"bench-{name}"),
+        RedisConfig(key_prefix="jdev:bench:", stream_mode=stream_mode),
+        client=client,
+    )
+    await queue.connect()
+    await queue.purge()
+
+    single_n = min(args.messages, args.single_messages)
+    single = await run_single(queue, single_n)
+    batched = await run_batched(queue, args.messages, args.batch)
+    await queue.purge()
+
+    print(f"{name} mode")
+    print(f"  per-message: {single:10,.0f} msg/s  ({single_n:,} messages)")
+    print(f"  batched:     {batched:10,.0f} msg/s  ({args.messages:,} messages, batch {args.batch})")
+    print(f"  speedup:     {batched / single:.1f}x")
+
+
+async def main_async(args) -> None:
+    client, backend = await make_client(args.url)
+    print("⚡ Redis Queue Benchmark")
+    print("=" * 60)
+    print(f"Backend: {backend}")
+    print()
+
+    await bench_mode(client, stream_mode=False, args=args)
+    print()
+    await bench_mode(client, stream_mode=True, args=args)
+
+    await client.aclose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--messages", type=int, default=20_000)
+    parser.add_argument("--single-messages", type=int, default=5_000,
+                        help="Messages for the (slow) per-message run")
+    parser.add_argument("--batch", type=int, default=200)
+    parser.add_argument("--url", default="redis://localhost:6379/15")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
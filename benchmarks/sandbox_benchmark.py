@@ -0,0 +1,88 @@
+"""
+Sandbox Benchmark - snippet throughput with and without the warm pool.
+
+Compares one fresh interpreter per snippet (the previous behaviour) against
+the warm interpreter pool, for single executions and for batched test cases
+as run by ToolFactory._test_tool / SandboxExecutor.test_code.
+
+Usage:
+    python -m benchmarks.sandbox_benchmark                 # 100 snippets
+    python -m benchmarks.sandbox_benchmark --snippets 300 --pool-size 4
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from prometheus.sandbox.executor import SandboxConfig, SandboxExecutor
+
+SNIPPET = "import json\nvalues = [i * i for i in range(1000)]\njson.dumps(sum(values))"
+FUNCTION = "def test_function(x):\n    return sorted(x)[::-1]"
+
+
+async def time_single(executor: SandboxExecutor, count: int):
+    samples = []
+    for _ in range(count):
+        start = time.perf_counter()
+        result = await executor.execute(SNIPPET)
+        samples.append((time.perf_counter() - start) * 1000)
+        assert result.success, result.stderr
+    return samples
+
+
+async def time_concurrent(executor: SandboxExecutor, count: int, concurrency: int) -> float:
+    start = time.perf_counter()
+    for offset in range(0, count, concurrency):
+        batch = [executor.execute(SNIPPET) for _ in range(min(concurrency, count - offset))]
+        await asyncio.gather(*batch)
+    return count / (time.perf_counter() - start)
+
+
+async def time_test_code(executor: SandboxExecutor, cases: int) -> float:
+    test_cases = [{"input": {"x": list(range(i))}, "expected": list(range(i))[::-1]} for i in range(cases)]
+    start = time.perf_counter()
+    report = await executor.test_code(FUNCTION, test_cases)
+    elapsed = (time.perf_counter() - start) * 1000
+    assert report["passed"] == cases, report
+    return elapsed
+
+
+async def run(args):
+    print("⚡ Sandbox Benchmark")
+    print("=" * 60)
+
+    rows = []
+    for label, use_pool in (("subprocess", False), ("warm pool", True)):
+        executor = SandboxExecutor(SandboxConfig(use_pool=use_pool, pool_size=args.pool_size))
+        if use_pool:
+            await executor.execute("pass")  # Let the workers finish warming up
+        single = await time_single(executor, args.snippets)
+        throughput = await time_concurrent(executor, args.snippets, args.pool_size)
+        test_ms = await time_test_code(executor, args.cases)
+        executor.close()
+        rows.append((label, single, throughput, test_ms))
+
+    print(f"{'':12} {'p50 ms':>9} {'p99 ms':>9} {'snippets/s':>11} {f'test_code({args.cases}) ms':>20}")
+    for label, single, throughput, test_ms in rows:
+        p99 = sorted(single)[min(len(single) - 1, int(len(single) * 0.99))]
+        print(f"{label:12} {statistics.median(single):9.2f} {p99:9.2f} {throughput:11.0f} {test_ms:20.1f}")
+
+    (_, old, old_tp, old_test), (_, new, new_tp, new_test) = rows
+    print()
+    print(f"Latency speedup:    {statistics.median(old) / statistics.median(new):.1f}x")
+    print(f"Throughput speedup: {new_tp / old_tp:.1f}x (concurrency {args.pool_size})")
+    print(f"test_code speedup:  {old_test / new_test:.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--snippets", type=int, default=100)
+    parser.add_argument("--cases", type=int, default=20, help="Test cases for the test_code run")
+    parser.add_argument("--pool-size", type=int, default=2)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Text Search Benchmark - built-in engine vs ripgrep (and grep -rn).
+
+Usage:
+    python -m benchmarks.search_benchmark                    # this repository
+    python -m benchmarks.search_benchmark --root ~/src/big --runs 5
+    python -m benchmarks.search_benchmark --pattern "def \\w+_search" --workers 8
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import time
+from pathlib import Path
+
+from jdev_cli.tools.text_search import iter_files, iter_matches
+
+
+PATTERNS = ["import os", r"def \w+\(self", "TODO|FIXME", "SemanticIndexer"]
+
+
+def time_runs(fn, runs: int):
+    """Return (median seconds, last result) over `runs` calls."""
+    timings = []
+    result = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), result
+
+
+def run_builtin(pattern: str, root: Path, workers):
+    return sum(1 for _ in iter_matches(pattern, str(root), workers=workers))
+
+
+def run_external(cmd) -> int:
+    proc = subprocess.run(cmd, capture_output=True)
+    return len(proc.stdout.splitlines())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--root", default=".", help="Tree to search (default: this repository)")
+    parser.add_argument("--pattern", action="append", help="Pattern(s) to time (repeatable)")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per measurement (median)")
+    parser.add_argument("--workers", type=int, default=None, help="Scanner threads")
+    args = parser.parse_args()
+
+    root = Path(args.root).resolve()
+    patterns = args.pattern or PATTERNS
+    rg = shutil.which("rg")
+    grep = shutil.which("grep")
+
+    print("⚡ Text Search Benchmark")
+    print("=" * 60)
+
+    start = time.perf_counter()
+    files = list(iter_files(str(root)))
+    walk = time.perf_counter() - start
+    size = sum(os.path.getsize(p) for p, _ in files)
+    print(f"Tree: {root}")
+    print(f"  {len(files)} searchable files, {size / 1e6:.1f} MB (walk {walk * 1000:.0f} ms)")
+    if not rg:
+        print("  rg not found on PATH - comparing against grep -rn only")
+    print()
+
+    header = f"{'pattern':<22} {'builtin':>10} {'rg':>10} {'grep -rn':>10}   matches (builtin/rg/grep)"
+    print(header)
+    print("-" * len(header))
+
+    for pattern in patterns:
+        builtin_t, builtin_n = time_runs(lambda: run_builtin(pattern, root, args.workers), args.runs)
+
+        rg_t = rg_n = None
+        if rg:
+            rg_t, rg_n = time_runs(lambda: run_external([rg, "-n", "-e", pattern, str(root)]), args.runs)
+
+        grep_t = grep_n = None
+        if grep:
+            grep_t, grep_n = time_runs(
+                lambda: run_external([grep, "-rnE", "-e", pattern, str(root)]), args.runs
+            )
+
+        def fmt(t):
+            return f"{t * 1000:>8.0f}ms" if t is not None else f"{'-':>10}"
+
+        counts = "/".join(str(n) if n is not None else "-" for n in (builtin_n, rg_n, grep_n))
+        print(f"{pattern[:22]:<22} {fmt(builtin_t)} {fmt(rg_t)} {fmt(grep_t)}   {counts}")
+
+    print()
+    print("grep -rn does not honor .gitignore or skip hidden files, so it scans more.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Session Search Benchmark - search_sessions latency over many saved sessions.
+
+Compares the FTS5 message index against the previous search (load and
+gunzip each of the 100 most recent sessions, substring-scan every message).
+The legacy scan only ever looked at 100 sessions; the index searches all.
+
+Usage:
+    python -m benchmarks.session_search_benchmark                   # 2k sessions
+    python -m benchmarks.session_search_benchmark --sessions 5000 --messages 40
+"""
+
+import argparse
+import itertools
+import json
+import random
+import statistics
+import string
+import tempfile
+import time
+from typing import List
+
+from jdev_cli.core.session_manager import (
+    ConversationMessage,
+    SessionInfo,
+    SessionManager,
+    SessionSnapshot,
+    SessionState,
+)
+
+VOCABULARY = (
+    "parser config loader cache session journal token stream provider retry "
+    "deploy staging server docker test fixture mock async await import module "
+    "function class refactor rename bug crash error timeout memory leak index "
+    "query database migration schema commit branch merge rebase review lint"
+).split()
+
+QUERIES = ["parser", "memory leak", "docker deploy", "migration schema", "timeout retry", "rebase"]
+
+
+def make_vocabulary(rng: random.Random, size: int = 5000):
+    """Zipf-weighted words; the query vocabulary sits at mid-frequency ranks."""
+    words = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 10))) for _ in range(size)]
+    for word in VOCABULARY:
+        words.insert(rng.randint(20, 400), word)
+    weights = list(itertools.accumulate(1 / rank for rank in range(1, len(words) + 1)))
+    return words, weights
+
+
+def legacy_search(manager: SessionManager, query: str, limit: int = 10) -> List[SessionInfo]:
+    """The previous search_sessions."""
+    query_lower = query.lower()
+    results = []
+    for session_info in manager.list_sessions(limit=100):
+        if query_lower in session_info.summary.lower():
+            results.append(session_info)
+            continue
+        session = manager._load_session(session_info.session_id)
+        if session:
+            for msg in session.messages:
+                if query_lower in msg.content.lower():
+                    results.append(session_info)
+                    break
+        if len(results) >= limit:
+            break
+    return results
+
+
+def populate(session_dir: str, sessions: int, messages: int, seed: int) -> None:
+    """Write snapshots and the session index directly (saving one by one rewrites the index N times)."""
+    rng = random.Random(seed)
+    words, weights = make_vocabulary(rng)
+    writer = SessionManager(session_dir=session_dir, search_index=False, fsync=False, max_sessions=sessions)
+    index = {}
+    now = time.time()
+    for i in range(sessions):
+        created = now - (sessions - i) * 60
+        msgs = [
+            ConversationMessage(
+                role="user" if j % 2 == 0 else "assistant",
+                content=" ".join(rng.choices(words, cum_weights=weights, k=rng.randint(20, 120))),
+                timestamp=created + j,
+            )
+            for j in range(messages)
+        ]
+        snapshot = SessionSnapshot(
+            session_id=f"bench{i:06d}",
+            state=SessionState.COMPLETED,
+            created_at=created,
+            updated_at=created + messages,
+            checksum="",
+            messages=msgs,
+            context={},
+            working_directory="/tmp",
+            open_files=[],
+            pending_operations=[],
+        )
+        writer._save_session(snapshot)
+        index[snapshot.session_id] = {
+            "state": snapshot.state.value,
+            "created_at": snapshot.created_at,
+            "updated_at": snapshot.updated_at,
+            "message_count": messages,
+            "working_directory": snapshot.working_directory,
+            "summary": msgs[0].content[:97],
+        }
+    (writer.session_dir / SessionManager.INDEX_FILE).write_text(json.dumps(index))
+
+
+def timed_queries(search, rounds: int) -> List[float]:
+    samples = []
+    for _ in range(rounds):
+        for query in QUERIES:
+            start = time.perf_counter()
+            search(query)
+            samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sessions", type=int, default=2000)
+    parser.add_argument("--messages", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args()
+
+    print("⚡ Session Search Benchmark")
+    print("=" * 60)
+    print(f"{args.sessions:,} sessions x {args.messages} messages, {len(QUERIES)} queries x {args.rounds} rounds")
+    print()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        populate(tmpdir, args.sessions, args.messages, args.seed)
+        manager = SessionManager(session_dir=tmpdir, fsync=False, max_sessions=args.sessions)
+
+        start = time.perf_counter()
+        manager.search_sessions("warmup")
+        backfill = time.perf_counter() - start
+
+        legacy = timed_queries(lambda q: legacy_search(manager, q), args.rounds)
+        indexed = timed_queries(lambda q: manager.search_sessions(q), args.rounds)
+        hits = timed_queries(lambda q: manager.search_messages(q, role="user"), args.rounds)
+
+        print(f"One-time backfill of the index: {backfill:.1f} s")
+        print()
+        print(f"{'':<34}{'p50 (ms)':>10}{'max (ms)':>10}")
+        for name, samples in [
+            ("legacy scan (100 newest sessions)", legacy),
+            ("search_sessions (all sessions)", indexed),
+            ("search_messages role=user", hits),
+        ]:
+            print(f"{name:<34}{statistics.median(samples):>10.1f}{max(samples):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
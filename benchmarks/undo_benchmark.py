@@ -0,0 +1,151 @@
+"""
+Undo Benchmark - bytes written and per-edit latency of UndoManager.
+
+Records 1,000 sequential small edits to a ~1 MB file and compares the blob
+store (content-addressed, reverse deltas, journaled state) against the
+previous storage (a full snapshot file per edit plus the whole undo/redo
+stack rewritten as indented JSON on every push).
+
+Usage:
+    python -m benchmarks.undo_benchmark                       # 1000 edits, 1 MB
+    python -m benchmarks.undo_benchmark --edits 300 --size-kb 4096
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from jdev_cli.core.undo_manager import UndoManager, UndoableOperation, OperationType
+
+
+class LegacyUndoManager(UndoManager):
+    """The previous storage: one snapshot file per edit, full JSON state per push."""
+
+    def record_file_edit(self, path, original_content, new_content, description=None):
+        op_id = self._generate_op_id()
+        self._ensure_snapshot_dir()
+        content_hash = hashlib.sha256(original_content.encode()).hexdigest()[:16]
+        backup_path = self.snapshot_dir / f"{op_id}_{content_hash}.snapshot"
+        backup_path.write_text(original_content)
+
+        op = UndoableOperation(
+            id=op_id,
+            op_type=OperationType.FILE_EDIT,
+            description=description or f"Edit {Path(path).name}",
+            timestamp=time.time(),
+            target_path=path,
+            original_content=original_content,
+            new_content=new_content,
+            backup_path=str(backup_path),
+        )
+        self._push_operation(op)
+        return op
+
+    def _push_operation(self, operation):
+        self._redo_stack.clear()
+        self._undo_stack.append(operation)
+        while len(self._undo_stack) > self.max_size:
+            removed = self._undo_stack.pop(0)
+            if removed.backup_path and os.path.exists(removed.backup_path):
+                os.unlink(removed.backup_path)
+        self._save_state()
+
+    def _save_state(self):
+        state = {
+            "undo_stack": [op.to_dict() for op in self._undo_stack],
+            "redo_stack": [op.to_dict() for op in self._redo_stack],
+            "counter": self._operation_counter,
+            "timestamp": time.time(),
+        }
+        (self.working_dir / self.STATE_FILE).write_text(json.dumps(state, indent=2))
+
+
+def bytes_written() -> int:
+    """Bytes this process has passed to write() (Linux), else 0."""
+    try:
+        with open("/proc/self/io") as f:
+            for line in f:
+                if line.startswith("wchar:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+def disk_usage(root: Path) -> int:
+    return sum(p.stat().st_size for p in root.rglob("*") if p.is_file())
+
+
+def make_file(size: int) -> str:
+    """~size bytes of real source: this repo's modules concatenated."""
+    parts, total = [], 0
+    root = Path(__file__).resolve().parents[1] / "jdev_cli"
+    while total < size:
+        for path in sorted(root.rglob("*.py")):
+            text = path.read_text(errors="replace")
+            parts.append(text)
+            total += len(text)
+            if total >= size:
+                break
+    return "".join(parts)[:size]
+
+
+def run(manager_cls, workdir: Path, content: str, edits: int, seed: int):
+    rng = random.Random(seed)
+    target = workdir / "big_module.py"
+    manager = manager_cls(working_dir=str(workdir))
+    lines = content.splitlines(keepends=True)
+    latencies = []
+
+    written_before = bytes_written()
+    for i in range(edits):
+        original = content
+        lines[rng.randrange(len(lines))] = f"    edited_{i} = True\n"
+        content = "".join(lines)
+        start = time.perf_counter()
+        manager.record_file_edit(str(target), original, content)
+        latencies.append((time.perf_counter() - start) * 1000)
+    written = bytes_written() - written_before
+
+    # Undo the last 10 edits to check correctness and time reads
+    target.write_text(content)
+    start = time.perf_counter()
+    for _ in range(10):
+        assert manager.undo().success
+    undo_ms = (time.perf_counter() - start) * 1000 / 10
+    return latencies, written, disk_usage(workdir) - target.stat().st_size, undo_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--edits", type=int, default=1000)
+    parser.add_argument("--size-kb", type=int, default=1024)
+    parser.add_argument("--seed", type=int, default=5)
+    args = parser.parse_args()
+
+    content = make_file(args.size_kb * 1024)
+
+    print("⚡ Undo Storage Benchmark")
+    print("=" * 60)
+    print(f"{args.edits:,} sequential edits to a {len(content) / 1e6:.1f} MB file (history of 100)")
+    print()
+    print(f"{'':<12}{'p50 ms':>9}{'mean ms':>9}{'p99 ms':>9}{'written MB':>12}{'on disk MB':>12}{'undo ms':>9}")
+
+    for name, cls in [("legacy", LegacyUndoManager), ("blob store", UndoManager)]:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            latencies, written, on_disk, undo_ms = run(cls, Path(tmpdir), content, args.edits, args.seed)
+        latencies.sort()
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        written_mb = f"{written / 1e6:>12.1f}" if written else f"{'n/a':>12}"
+        print(f"{name:<12}{statistics.median(latencies):>9.1f}{statistics.mean(latencies):>9.1f}{p99:>9.1f}"
+              f"{written_mb}{on_disk / 1e6:>12.1f}{undo_ms:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,432 @@
+"""
+BlobStore - Content-addressed, reverse-delta snapshot storage.
+
+Backs UndoManager file snapshots. Every version is stored once under its
+SHA-256 (identical contents deduplicate), and successive versions of the
+same file are stored as deltas against each other:
+
+- A new version is written as a small delta against the version it
+  replaces, so recording an edit costs O(change) bytes, not O(file).
+- Once a run of such deltas reaches `chain_limit`, the newest version is
+  written whole (zlib) and the run is rewritten as reverse deltas, each
+  against the next newer version. Undo mostly needs recent versions, which
+  are then a hop or two from a whole blob; the run's oldest version stays
+  whole as a keyframe, bounding every chain.
+
+Layout (`<root>/<hash[:2]>/<hash[2:]>`):
+- whole: b"F" + zlib(data)
+- delta: b"D" + base hash (64 hex) + zlib(ops), ops are
+  b"C" + u64 offset + u64 length (copy from base) or
+  b"I" + u64 length + bytes (insert)
+
+A blob only ever becomes a delta against content that is already on disk,
+so a crash at any point leaves every stored version readable.
+"""
+
+from __future__ import annotations
+
+import difflib
+import hashlib
+import logging
+import os
+import struct
+import zlib
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+_FULL = b"F"
+_DELTA = b"D"
+_COPY = b"C"
+_INSERT = b"I"
+_U64 = struct.Struct(">Q")
+_COPY_OP = struct.Struct(">QQ")
+_HASH_LEN = 64
+
+# Middle regions larger than this are diffed line by line instead of
+# being stored as one literal insert
+_LINE_DIFF_THRESHOLD = 4096
+
+
+def _common_prefix(a: bytes, b: bytes) -> int:
+    """Length of the common prefix (binary search over memcmp'd slices)."""
+    lo, hi = 0, min(len(a), len(b))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[lo:mid] == b[lo:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _common_suffix(a: bytes, b: bytes, limit: int) -> int:
+    """Length of the common suffix, at most `limit`."""
+    lo, hi = 0, limit
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[len(a) - mid:len(a) - lo] == b[len(b) - mid:len(b) - lo]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def make_delta(target: bytes, base: bytes) -> bytes:
+    """Encode `target` as copy/insert ops against `base` (uncompressed)."""
+    ops: List[bytes] = []
+
+    def copy(offset: int, length: int) -> None:
+        if length:
+            ops.append(_COPY + _COPY_OP.pack(offset, length))
+
+    def insert(data: bytes) -> None:
+        if data:
+            ops.append(_INSERT + _U64.pack(len(data)) + data)
+
+    prefix = _common_prefix(target, base)
+    suffix = _common_suffix(target, base, min(len(target), len(base)) - prefix)
+    target_mid = target[prefix:len(target) - suffix]
+    base_mid = base[prefix:len(base) - suffix]
+
+    copy(0, prefix)
+    if len(target_mid) > _LINE_DIFF_THRESHOLD and base_mid:
+        # Several edits far apart: copy the unchanged lines between them
+        target_lines = target_mid.splitlines(keepends=True)
+        base_lines = base_mid.splitlines(keepends=True)
+        base_offsets = [0]
+        for line in base_lines:
+            base_offsets.append(base_offsets[-1] + len(line))
+        matcher = difflib.SequenceMatcher(None, target_lines, base_lines)
+        pos = 0  # Line index in target_lines
+        for t_start, b_start, size in matcher.get_matching_blocks():
+            insert(b"".join(target_lines[pos:t_start]))
+            copy(prefix + base_offsets[b_start], base_offsets[b_start + size] - base_offsets[b_start])
+            pos = t_start + size
+    else:
+        insert(target_mid)
+    copy(len(base) - suffix, suffix)
+    return b"".join(ops)
+
+
+def apply_delta(ops: bytes, base: bytes) -> bytes:
+    """Rebuild the target from `make_delta` ops and the base."""
+    parts = []
+    view = memoryview(ops)
+    pos = 0
+    while pos < len(ops):
+        kind = ops[pos:pos + 1]
+        pos += 1
+        if kind == _COPY:
+            offset, length = _COPY_OP.unpack_from(ops, pos)
+            pos += _COPY_OP.size
+            parts.append(base[offset:offset + length])
+        elif kind == _INSERT:
+            (length,) = _U64.unpack_from(ops, pos)
+            pos += _U64.size
+            parts.append(bytes(view[pos:pos + length]))
+            pos += length
+        else:
+            raise ValueError(f"Corrupt delta op {kind!r}")
+    return b"".join(parts)
+
+
+class BlobStore:
+    """
+    Content-addressed blob store with reverse-delta versions.
+
+    Usage:
+        store = BlobStore(".qwen_undo_snapshots/objects")
+        v1 = store.put("original")
+        v2 = store.put("original, edited", previous=v1)  # Stored as a delta
+        assert store.get_text(v1) == "original"
+        store.gc(reachable=[v2])
+    """
+
+    def __init__(
+        self,
+        root: Union[str, Path],
+        compress_level: int = 1,
+        chain_limit: int = 16,
+    ):
+        """
+        Initialize BlobStore.
+
+        Args:
+            root: Directory for blobs (created on first write)
+            compress_level: zlib level for whole blobs and deltas
+            chain_limit: Deltas in a run before the newest version is
+                written whole and the run is reversed
+        """
+        self.root = Path(root)
+        self.compress_level = compress_level
+        self.chain_limit = chain_limit
+
+        # hash -> base hash (delta) or None (whole); loaded lazily
+        self._bases: Optional[Dict[str, Optional[str]]] = None
+        # Most recent blob written or read, so the following put(previous=...)
+        # does not rebuild it
+        self._recent: Optional[Tuple[str, bytes]] = None
+        # Same for text: (text, hash), skips re-encoding and re-hashing the
+        # original of an edit, which is usually the previous edit's result
+        self._recent_text: Optional[Tuple[str, str]] = None
+        self.bytes_written = 0
+
+    @staticmethod
+    def hash_of(data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()
+
+    @staticmethod
+    def _encode_text(content: Union[str, bytes]) -> bytes:
+        if isinstance(content, str):
+            return content.encode("utf-8", "surrogatepass")
+        return content
+
+    def _path(self, blob_hash: str) -> Path:
+        return self.root / blob_hash[:2] / blob_hash[2:]
+
+    def _index(self) -> Dict[str, Optional[str]]:
+        """hash -> base for every stored blob (reads one header per blob once)."""
+        if self._bases is None:
+            self._bases = {}
+            if self.root.exists():
+                for path in self.root.glob("??/*"):
+                    if path.name.endswith(".tmp"):
+                        continue
+                    try:
+                        with open(path, "rb") as f:
+                            header = f.read(1 + _HASH_LEN)
+                    except OSError:
+                        continue
+                    blob_hash = path.parent.name + path.name
+                    if header[:1] == _DELTA:
+                        self._bases[blob_hash] = header[1:].decode("ascii")
+                    elif header[:1] == _FULL:
+                        self._bases[blob_hash] = None
+        return self._bases
+
+    def _write(self, blob_hash: str, payload: bytes) -> None:
+        path = self._path(blob_hash)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_bytes(payload)
+        os.replace(tmp, path)
+        self.bytes_written += len(payload)
+
+    def _write_full(self, blob_hash: str, data: bytes) -> None:
+        self._write(blob_hash, _FULL + zlib.compress(data, self.compress_level))
+        self._index()[blob_hash] = None
+
+    def _write_delta(self, blob_hash: str, data: bytes, base_hash: str, base: bytes) -> None:
+        ops = make_delta(data, base)
+        self._write(blob_hash, _DELTA + base_hash.encode("ascii") + zlib.compress(ops, self.compress_level))
+        self._index()[blob_hash] = base_hash
+
+    def _read_raw(self, blob_hash: str) -> Optional[bytes]:
+        try:
+            return self._path(blob_hash).read_bytes()
+        except OSError:
+            return None
+
+    def _chain(self, blob_hash: str) -> List[str]:
+        """Blobs from `blob_hash` down to (excluding) the whole blob it rests on."""
+        index = self._index()
+        chain = []
+        while index.get(blob_hash) is not None and len(chain) <= len(index):
+            chain.append(blob_hash)
+            blob_hash = index[blob_hash]
+        return chain
+
+    def _reverse_run(self, run: List[str], head: str, head_data: bytes) -> None:
+        """Rewrite a delta run (newest first) as deltas against the next newer version."""
+        if not run:
+            return
+        root = self._index()[run[-1]]
+        data = self.get(root)
+        if data is None:
+            return
+        contents = {root: data}
+        for blob_hash in reversed(run):
+            raw = self._read_raw(blob_hash)
+            if raw is None or raw[:1] != _DELTA:
+                return
+            base = raw[1:1 + _HASH_LEN].decode("ascii")
+            contents[blob_hash] = apply_delta(zlib.decompress(raw[1 + _HASH_LEN:]), contents[base])
+
+        newer, newer_data = head, head_data
+        for blob_hash in run:
+            self._write_delta(blob_hash, contents[blob_hash], newer, newer_data)
+            newer, newer_data = blob_hash, contents[blob_hash]
+
+    # === Public API ===
+
+    def __contains__(self, blob_hash: str) -> bool:
+        return blob_hash in self._index()
+
+    def put(self, content: Union[str, bytes], previous: Optional[str] = None) -> str:
+        """
+        Store a version, returning its hash.
+
+        Args:
+            content: Text or bytes
+            previous: Hash of the version this one replaces (delta base)
+
+        Returns:
+            SHA-256 hex digest of the content
+        """
+        index = self._index()
+        if (isinstance(content, str) and self._recent_text and self._recent_text[0] == content
+                and self._recent_text[1] in index):
+            return self._recent_text[1]
+
+        data = self._encode_text(content)
+        if self._recent and self._recent[1] == data:
+            blob_hash = self._recent[0]
+        else:
+            blob_hash = self.hash_of(data)
+
+        if blob_hash not in index:
+            previous_data = None
+            if previous and previous != blob_hash and previous in index:
+                previous_data = self.get(previous)
+
+            if previous_data is None:
+                self._write_full(blob_hash, data)
+            else:
+                run = self._chain(previous)
+                if len(run) + 1 < self.chain_limit:
+                    self._write_delta(blob_hash, data, previous, previous_data)
+                else:
+                    # Run is full: newest version whole, run points toward it
+                    self._write_full(blob_hash, data)
+                    self._write_delta(previous, previous_data, blob_hash, data)
+                    self._reverse_run(run[1:], previous, previous_data)
+
+        self._recent = (blob_hash, data)
+        if isinstance(content, str):
+            self._recent_text = (content, blob_hash)
+        return blob_hash
+
+    def get(self, blob_hash: str) -> Optional[bytes]:
+        """Content of a blob, or None if it (or a base it needs) is missing."""
+        if self._recent and self._recent[0] == blob_hash:
+            return self._recent[1]
+
+        chain: List[bytes] = []
+        current = blob_hash
+        data = None
+        while data is None:
+            raw = self._read_raw(current)
+            if raw is None:
+                return None
+            if raw[:1] == _FULL:
+                data = zlib.decompress(raw[1:])
+            elif raw[:1] == _DELTA and len(chain) <= len(self._index()):
+                chain.append(zlib.decompress(raw[1 + _HASH_LEN:]))
+                current = raw[1:1 + _HASH_LEN].decode("ascii")
+            else:
+                logger.warning(f"Corrupt blob {current}")
+                return None
+
+        for ops in reversed(chain):
+            data = apply_delta(ops, data)
+        self._recent = (blob_hash, data)
+        return data
+
+    def get_text(self, blob_hash: str) -> Optional[str]:
+        """Content of a blob decoded as UTF-8."""
+        if self._recent_text and self._recent_text[1] == blob_hash:
+            return self._recent_text[0]
+        data = self.get(blob_hash)
+        if data is None:
+            return None
+        text = data.decode("utf-8", "surrogatepass")
+        self._recent_text = (text, blob_hash)
+        return text
+
+    def _closure(self, hashes: Iterable[str]) -> Set[str]:
+        """Hashes plus every base their deltas depend on."""
+        index = self._index()
+        keep: Set[str] = set()
+        for blob_hash in hashes:
+            while blob_hash and blob_hash not in keep:
+                keep.add(blob_hash)
+                blob_hash = index.get(blob_hash)
+        return keep
+
+    def discard(self, candidates: Iterable[str], reachable: Iterable[str]) -> int:
+        """
+        Delete candidates no longer reachable (incremental GC).
+
+        Args:
+            candidates: Blobs that may have become garbage
+            reachable: Blobs still referenced
+
+        Returns:
+            Number of blobs deleted
+        """
+        index = self._index()
+        keep = self._closure(reachable)
+        removed = 0
+        pending = [h for h in candidates if h in index and h not in keep]
+        if not pending:
+            return 0
+        # Deltas resting on each blob, counted once for the whole pass
+        referrers = Counter(base for base in index.values() if base)
+        while pending:
+            blob_hash = pending.pop()
+            if blob_hash not in index or blob_hash in keep:
+                continue
+            # A garbage delta's base may have been kept alive only by it
+            if referrers[blob_hash]:
+                continue
+            base = index.pop(blob_hash)
+            try:
+                self._path(blob_hash).unlink()
+                removed += 1
+            except OSError:
+                pass
+            if self._recent and self._recent[0] == blob_hash:
+                self._recent = None
+            if self._recent_text and self._recent_text[1] == blob_hash:
+                self._recent_text = None
+            if base:
+                referrers[base] -= 1
+                pending.append(base)
+        return removed
+
+    def gc(self, reachable: Iterable[str]) -> int:
+        """
+        Delete every blob not reachable (full sweep). Returns count deleted.
+
+        Assumes the caller owns every blob under root; with a shared root,
+        use discard() on the caller's own blobs instead.
+        """
+        keep = self._closure(reachable)
+        return self.discard([h for h in self._index() if h not in keep], keep)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Blob counts and bytes on disk."""
+        index = self._index()
+        size = 0
+        for blob_hash in index:
+            try:
+                size += self._path(blob_hash).stat().st_size
+            except OSError:
+                pass
+        return {
+            "blobs": len(index),
+            "full": sum(1 for base in index.values() if base is None),
+            "deltas": sum(1 for base in index.values() if base is not None),
+            "bytes": size,
+            "bytes_written": self.bytes_written,
+        }
+
+
+__all__ = [
+    'BlobStore',
+    'make_delta',
+    'apply_delta',
+]
@@ -4,15 +4,92 @@
 Boris Cherny: Simple, measurable, no magic.
 """
 
+import atexit
 import hashlib
 import json
+import logging
+import threading
 import time
 import sqlite3
+import weakref
+import zlib
 from pathlib import Path
-from typing import Optional, Any
+from typing import Optional, Any, Dict, Iterable, List, Tuple
 from collections import OrderedDict
 from dataclasses import dataclass
 
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+DROP TABLE IF EXISTS cache;
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_by_expiry ON entries (expires_at);
+CREATE INDEX IF NOT EXISTS entries_by_access ON entries (accessed_at);
+CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL);
+INSERT OR IGNORE INTO meta (name, value) VALUES ('bytes', 0);
+CREATE TRIGGER IF NOT EXISTS entries_size_insert AFTER INSERT ON entries BEGIN
+    UPDATE meta SET value = value + NEW.size WHERE name = 'bytes';
+END;
+CREATE TRIGGER IF NOT EXISTS entries_size_delete AFTER DELETE ON entries BEGIN
+    UPDATE meta SET value = value - OLD.size WHERE name = 'bytes';
+END;
+CREATE TRIGGER IF NOT EXISTS entries_size_update AFTER UPDATE OF size ON entries BEGIN
+    UPDATE meta SET value = value + NEW.size - OLD.size WHERE name = 'bytes';
+END;
+"""
+
+_SQL_CHUNK = 500  # Keys per IN (...) query
+_EVICT_BATCH = 256  # LRU candidates read per eviction step
+_MISSING = object()
+
+# Value encoding: optional b"Z" (zlib) prefix, then a type tag
+_ZLIB, _BYTES, _STR, _JSON = b"Z", b"B", b"S", b"J"
+
+
+def _encode(value: Any, compress: bool, threshold: int) -> bytes:
+    if isinstance(value, bytes):
+        tag, data = _BYTES, value
+    elif isinstance(value, str):
+        tag, data = _STR, value.encode("utf-8")
+    else:
+        tag, data = _JSON, json.dumps(value, separators=(",", ":")).encode("utf-8")
+    if compress and len(data) >= threshold:
+        packed = zlib.compress(data, 1)
+        if len(packed) < len(data):
+            return _ZLIB + tag + packed
+    return tag + data
+
+
+def _decode(blob: bytes) -> Any:
+    if blob[:1] == _ZLIB:
+        tag, data = blob[1:2], zlib.decompress(blob[2:])
+    else:
+        tag, data = blob[:1], blob[1:]
+    if tag == _BYTES:
+        return bytes(data)
+    if tag == _STR:
+        return bytes(data).decode("utf-8")
+    return json.loads(data)
+
+
+# Flushed at interpreter exit so write-behind never drops data
+_open_caches: "weakref.WeakSet[DiskCache]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_open_caches() -> None:
+    for disk_cache in list(_open_caches):
+        try:
+            disk_cache.flush()
+        except sqlite3.Error:
+            pass
+
 
 @dataclass
 class CacheStats:
@@ -64,73 +141,270 @@ class LRUCache:
 
 
 class DiskCache:
-    """SQLite-based disk cache (Cursor L2 cache)."""
+    """SQLite-based disk cache (Cursor L2 cache).
+
+    - WAL mode, one reusable connection per thread
+    - Write-behind: set/delete/access updates are queued and flushed by a
+      background thread in batched transactions; reads see queued writes
+    - Values stored as tagged bytes (raw bytes/str, compact JSON), zlib
+      compressed above `compress_threshold`
+    - Bounded by `max_bytes`: expired entries go first, then least
+      recently used, via indexes on expiry and access time
+    """
 
-    def __init__(self, db_path: str = "~/.qwen-dev-cli/cache.db"):
+    def __init__(
+        self,
+        db_path: str = "~/.qwen-dev-cli/cache.db",
+        max_bytes: int = 256 * 1024 * 1024,
+        compress: bool = True,
+        compress_threshold: int = 1024,
+        write_behind: bool = True,
+        flush_interval: float = 0.05,
+        batch_size: int = 512
+    ):
         self.db_path = Path(db_path).expanduser()
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.compress = compress
+        self.compress_threshold = compress_threshold
+        self.write_behind = write_behind
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()  # Guards pending state and the connection list
+        self._flush_lock = threading.Lock()  # One flush at a time
+        self._pending: Dict[str, Optional[Tuple[bytes, float]]] = {}  # None = delete
+        self._flushing: Dict[str, Optional[Tuple[bytes, float]]] = {}
+        self._touched: Dict[str, float] = {}
+        self._wake = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        self._closed = False
+
         self._init_db()
+        _open_caches.add(self)
 
     def _init_db(self):
         """Initialize SQLite database."""
-        conn = sqlite3.connect(str(self.db_path))
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS cache (
-                key TEXT PRIMARY KEY,
-                value TEXT NOT NULL,
-                timestamp REAL NOT NULL,
-                ttl REAL NOT NULL
+        conn = self._conn()
+        conn.executescript(_SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        """Connection for the calling thread."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                str(self.db_path), timeout=30.0, isolation_level=None, check_same_thread=False
             )
-        """)
-        conn.commit()
-        conn.close()
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    # === Reads ===
 
     def get(self, key: str) -> Optional[Any]:
         """Get value if not expired."""
-        conn = sqlite3.connect(str(self.db_path))
-        cursor = conn.execute(
-            "SELECT value, timestamp, ttl FROM cache WHERE key = ?",
-            (key,)
-        )
-        row = cursor.fetchone()
-        conn.close()
-
-        if row:
-            value_json, timestamp, ttl = row
-            if time.time() - timestamp < ttl:
-                return json.loads(value_json)
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Get all unexpired values among `keys` (missing keys are left out)."""
+        now = time.time()
+        found: Dict[str, Tuple[bytes, float]] = {}
+        lookup = []
+        with self._lock:
+            for key in keys:
+                entry = self._pending.get(key, _MISSING)
+                if entry is _MISSING:
+                    entry = self._flushing.get(key, _MISSING)
+                if entry is _MISSING:
+                    lookup.append(key)
+                elif entry is not None:
+                    found[key] = entry
+
+        conn = self._conn()
+        for start in range(0, len(lookup), _SQL_CHUNK):
+            chunk = lookup[start:start + _SQL_CHUNK]
+            rows = conn.execute(
+                f"SELECT key, value, expires_at FROM entries WHERE key IN ({','.join('?' * len(chunk))})",
+                chunk
+            )
+            for key, blob, expires_at in rows:
+                found[key] = (blob, expires_at)
+
+        values = {}
+        expired = []
+        for key, (blob, expires_at) in found.items():
+            if expires_at <= now:
+                expired.append(key)
             else:
-                # Expired, remove
-                self.delete(key)
+                values[key] = _decode(blob)
 
-        return None
+        with self._lock:
+            for key in values:
+                self._touched[key] = now
+            for key in expired:
+                current = self._pending.get(key)
+                if current is None or current is found[key]:  # Not re-set meanwhile
+                    self._pending[key] = None
+        if expired:
+            self._after_write()
+        return values
+
+    # === Writes ===
 
     def set(self, key: str, value: Any, ttl: float = 3600) -> None:
         """Set value with TTL (default 1 hour)."""
-        conn = sqlite3.connect(str(self.db_path))
-        conn.execute(
-            "INSERT OR REPLACE INTO cache (key, value, timestamp, ttl) VALUES (?, ?, ?, ?)",
-            (key, json.dumps(value), time.time(), ttl)
-        )
-        conn.commit()
-        conn.close()
+        self.set_many({key: value}, ttl)
+
+    def set_many(self, items: Dict[str, Any], ttl: float = 3600) -> None:
+        """Set many values with the same TTL."""
+        expires_at = time.time() + ttl
+        encoded = {
+            key: (_encode(value, self.compress, self.compress_threshold), expires_at)
+            for key, value in items.items()
+        }
+        with self._lock:
+            self._pending.update(encoded)
+        self._after_write()
 
     def delete(self, key: str):
         """Delete cached value."""
-        conn = sqlite3.connect(str(self.db_path))
-        conn.execute("DELETE FROM cache WHERE key = ?", (key,))
-        conn.commit()
-        conn.close()
+        with self._lock:
+            self._pending[key] = None
+            self._touched.pop(key, None)
+        self._after_write()
+
+    def _after_write(self) -> None:
+        """Flush now (write-through) or let the flusher thread pick it up."""
+        if not self.write_behind:
+            self.flush()
+            return
+        if self._flusher is None:
+            with self._lock:
+                if self._flusher is None and not self._closed:
+                    self._flusher = threading.Thread(
+                        target=self._flush_loop, name="disk-cache-flusher", daemon=True
+                    )
+                    self._flusher.start()
+        if len(self._pending) >= self.batch_size:
+            self._wake.set()
+
+    def _flush_loop(self) -> None:
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except sqlite3.Error as e:
+                logger.warning(f"Disk cache flush failed: {e}")
+
+    def flush(self) -> None:
+        """Write queued changes in one transaction, then evict if over max_bytes."""
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending and not self._touched:
+                    return
+                self._flushing, self._pending = self._pending, {}
+                touched, self._touched = self._touched, {}
+
+            now = time.time()
+            upserts, deletes = [], []
+            for key, entry in self._flushing.items():
+                if entry is None:
+                    deletes.append((key,))
+                else:
+                    blob, expires_at = entry
+                    upserts.append((key, blob, len(blob) + len(key), expires_at, now))
+            conn = self._conn()
+            try:
+                with conn:
+                    conn.execute("BEGIN IMMEDIATE")
+                    if upserts:
+                        conn.executemany(
+                            "INSERT INTO entries (key, value, size, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?) "
+                            "ON CONFLICT(key) DO UPDATE SET value = excluded.value, size = excluded.size, "
+                            "expires_at = excluded.expires_at, accessed_at = excluded.accessed_at",
+                            upserts
+                        )
+                    if deletes:
+                        conn.executemany("DELETE FROM entries WHERE key = ?", deletes)
+                    if touched:
+                        conn.executemany(
+                            "UPDATE entries SET accessed_at = ? WHERE key = ?",
+                            ((at, key) for key, at in touched.items())
+                        )
+                    self._evict(conn, now)
+            finally:
+                with self._lock:
+                    self._flushing = {}
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        """Drop expired, then least recently used entries down to 90% of max_bytes."""
+        total = conn.execute("SELECT value FROM meta WHERE name = 'bytes'").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        conn.execute("DELETE FROM entries WHERE expires_at <= ?", (now,))
+        target = int(self.max_bytes * 0.9)
+        excess = conn.execute("SELECT value FROM meta WHERE name = 'bytes'").fetchone()[0] - target
+        while excess > 0:
+            victims = []
+            for key, size in conn.execute(
+                "SELECT key, size FROM entries ORDER BY accessed_at LIMIT ?", (_EVICT_BATCH,)
+            ):
+                victims.append((key,))
+                excess -= size
+                if excess <= 0:
+                    break
+            if not victims:
+                break
+            conn.executemany("DELETE FROM entries WHERE key = ?", victims)
+
+    # === Maintenance ===
 
     def clear_expired(self):
         """Remove expired entries."""
-        conn = sqlite3.connect(str(self.db_path))
-        conn.execute(
-            "DELETE FROM cache WHERE (? - timestamp) > ttl",
-            (time.time(),)
-        )
-        conn.commit()
-        conn.close()
+        self.flush()
+        conn = self._conn()
+        conn.execute("DELETE FROM entries WHERE expires_at <= ?", (time.time(),))
+
+    def clear(self) -> None:
+        """Remove everything, including queued writes."""
+        with self._flush_lock:
+            with self._lock:
+                self._pending.clear()
+                self._touched.clear()
+            self._conn().execute("DELETE FROM entries")
+
+    def get_stats(self) -> Dict[str, int]:
+        """Stored entries and bytes (after flushing queued writes)."""
+        self.flush()
+        conn = self._conn()
+        entries = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        size = conn.execute("SELECT value FROM meta WHERE name = 'bytes'").fetchone()[0]
+        return {"entries": entries, "bytes": size, "max_bytes": self.max_bytes}
+
+    def close(self) -> None:
+        """Flush queued writes, stop the flusher and close all connections."""
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        self.flush()
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.ProgrammingError:
+                pass
+        self._local = threading.local()
+        _open_caches.discard(self)
 
 
 class PerformanceCache:
@@ -144,10 +418,11 @@ class PerformanceCache:
     def __init__(
         self,
         memory_size: int = 1000,
-        disk_path: str = "~/.qwen-dev-cli/cache.db"
+        disk_path: str = "~/.qwen-dev-cli/cache.db",
+        max_disk_bytes: int = 256 * 1024 * 1024
     ):
         self._memory = LRUCache(memory_size)
-        self._disk = DiskCache(disk_path)
+        self._disk = DiskCache(disk_path, max_bytes=max_disk_bytes)
         self._stats = CacheStats()
 
     def get(self, key: str) -> Optional[Any]:
@@ -172,11 +447,40 @@ class PerformanceCache:
         self._stats.misses += 1
         return None
 
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Get many keys (L1, then one batched L2 lookup for the rest)."""
+        values = {}
+        missing = []
+        for key in keys:
+            value = self._memory.get(key)
+            if value is not None:
+                values[key] = value
+                self._stats.hits += 1
+                self._stats.memory_hits += 1
+            else:
+                missing.append(key)
+
+        if missing:
+            from_disk = self._disk.get_many(missing)
+            for key, value in from_disk.items():
+                self._memory.set(key, value)
+            values.update(from_disk)
+            self._stats.hits += len(from_disk)
+            self._stats.disk_hits += len(from_disk)
+            self._stats.misses += len(missing) - len(from_disk)
+        return values
+
     def set(self, key: str, value: Any, ttl: float = 3600) -> None:
-        """Set value in all tiers."""
+        """Set value in all tiers (the disk write is queued, not waited for)."""
         self._memory.set(key, value)
         self._disk.set(key, value, ttl)
 
+    def set_many(self, items: Dict[str, Any], ttl: float = 3600) -> None:
+        """Set many values in all tiers."""
+        for key, value in items.items():
+            self._memory.set(key, value)
+        self._disk.set_many(items, ttl)
+
     def clear(self) -> None:
         """Clear all caches."""
         self._memory.clear()
@@ -191,6 +495,14 @@ class PerformanceCache:
         """Cleanup expired disk entries."""
         self._disk.clear_expired()
 
+    def flush(self) -> None:
+        """Write queued disk updates now."""
+        self._disk.flush()
+
+    def close(self) -> None:
+        """Flush and close the disk tier."""
+        self._disk.close()
+
 
 def cache_key(*args, **kwargs) -> str:
     """Generate cache key from arguments.
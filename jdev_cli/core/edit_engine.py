@@ -0,0 +1,558 @@
+"""
+EditEngine - Single-pass search/replace edits with atomic writes.
+
+Shared by EditFileTool and MultiEditTool:
+- plan_edits() locates every anchor in the original content, rejects
+  overlapping edits and builds the result in a single splice; the
+  previous loop of str.replace calls copied the whole file per edit.
+  Anchors are found with str.find for a few edits and, for many, with a
+  single scan by a regex built from a trie of the search strings (an
+  Aho-Corasick-style automaton that runs inside the C regex engine).
+- apply_edits() uses that splice unless an edit could match text produced
+  by an earlier one; then the edits run one after another, as before.
+- write_text_atomic() writes through a temp file in the same directory,
+  fsync and os.replace, preserving the file mode (symlinks are resolved,
+  so the link target is what gets replaced).
+- backup_file() hard-links the original instead of copying it (the atomic
+  write replaces the directory entry, so the old inode is the backup).
+- EditTransaction applies edits to many files all-or-nothing: every file
+  is planned and staged before any is replaced, and replaced files are
+  restored if a later replace fails.
+
+Usage:
+    result = plan_edits(content, [Replacement("foo", "bar")])
+    write_text_atomic(path, result.content)
+
+    with EditTransaction() as tx:
+        tx.edit("a.py", [Replacement("old", "new")])
+        tx.edit("b.py", [Replacement("x = 1", "x = 2", replace_all=True)])
+    # Committed on exit; nothing is written if any plan fails
+"""
+
+from __future__ import annotations
+
+import bisect
+import os
+import re
+import shutil
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+PathLike = Union[str, Path]
+
+# Distinct search strings from which one trie scan beats a str.find per string
+SCAN_THRESHOLD = 8
+
+
+class EditError(ValueError):
+    """An edit cannot be applied; nothing was changed."""
+
+    def __init__(self, message: str, index: int = -1, kind: str = "invalid", search: str = "", count: int = 0):
+        super().__init__(message)
+        self.index = index  # Position of the offending edit
+        self.kind = kind  # "empty", "not_found", "ambiguous", "overlap", "invalid"
+        self.search = search
+        self.count = count  # Occurrences, for "ambiguous"
+
+
+@dataclass
+class Replacement:
+    """Replace `search` with `replace` (first unclaimed occurrence, or all)."""
+    search: str
+    replace: str
+    replace_all: bool = False
+
+
+@dataclass
+class EditResult:
+    """Outcome of planning edits against some content."""
+    content: str
+    changes: int  # Occurrences replaced
+    spans: List[Tuple[int, int, int]] = field(default_factory=list)  # (start, end, edit index) in the original
+
+
+def _trie_pattern(words) -> str:
+    """Regex matching any of words, factored as a trie (shared prefixes matched once)."""
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def emit(node: dict) -> str:
+        branches = [re.escape(ch) + emit(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return emit(trie)
+
+
+def _scan(content: str, searches) -> Optional[Dict[str, List[int]]]:
+    """
+    All occurrences (overlapping) of searches in one pass over content.
+
+    A search that is a prefix of another is left out: at a given position
+    the trie only reports the longest match. None if no regex can be built.
+    """
+    ordered = sorted(searches)
+    scannable = [
+        word for word, following in zip(ordered, ordered[1:] + [""])
+        if not following.startswith(word)
+    ]
+    try:
+        pattern = re.compile(_trie_pattern(scannable))
+    except (re.error, RecursionError, OverflowError):
+        return None
+
+    found: Dict[str, List[int]] = {word: [] for word in scannable}
+    search, pos = pattern.search, 0
+    while True:
+        match = search(content, pos)
+        if match is None:
+            return found
+        found[match.group()].append(match.start())
+        pos = match.start() + 1
+
+
+def _occurrences(content: str, search: str, start: int = 0, index: Optional[List[int]] = None):
+    """Non-overlapping occurrences of search, left to right."""
+    if index is not None:
+        end = -1
+        for pos in index[bisect.bisect_left(index, start):]:
+            if pos >= end:
+                yield pos
+                end = pos + len(search)
+        return
+    pos = content.find(search, start)
+    while pos >= 0:
+        yield pos
+        pos = content.find(search, pos + len(search))
+
+
+def _find(content: str, search: str, start: int, index: Optional[List[int]]) -> int:
+    """First occurrence of search at or after start, or -1."""
+    if index is None:
+        return content.find(search, start)
+    i = bisect.bisect_left(index, start)
+    return index[i] if i < len(index) else -1
+
+
+def plan_edits(content: str, edits: Sequence[Replacement], unique: bool = False) -> EditResult:
+    """
+    Apply edits to content in one splice.
+
+    All anchors are located in the original content. Edits sharing a search
+    string take successive occurrences (as repeated first-occurrence
+    replaces would); replace_all edits take every occurrence.
+
+    Args:
+        content: Original text
+        edits: Replacements, in order
+        unique: Require each search string to occur exactly once
+
+    Returns:
+        EditResult with the new content
+
+    Raises:
+        EditError: Empty or missing search string, ambiguous anchor
+            (unique=True), or two edits touching the same text
+    """
+    spans: List[Tuple[int, int, int]] = []
+    next_start: Dict[str, int] = {}  # search -> where its next occurrence may start
+
+    distinct = {edit.search for edit in edits if edit.search}
+    scanned = _scan(content, distinct) if len(distinct) >= SCAN_THRESHOLD else None
+    scanned = scanned or {}
+
+    for i, edit in enumerate(edits):
+        search = edit.search
+        if not search:
+            raise EditError(f"Edit {i + 1}: search string is empty", i, "empty")
+        index = scanned.get(search)
+
+        if unique:
+            found = _find(content, search, 0, index)
+            if found >= 0 and _find(content, search, found + 1, index) >= 0:
+                count = content.count(search)
+                raise EditError(
+                    f"Edit {i + 1}: search string appears {count} times (ambiguous)", i, "ambiguous", search, count
+                )
+            positions = [found] if found >= 0 else []
+        elif edit.replace_all:
+            positions = list(_occurrences(content, search, next_start.get(search, 0), index))
+            if positions:
+                next_start[search] = len(content) + 1
+        else:
+            found = _find(content, search, next_start.get(search, 0), index)
+            positions = [found] if found >= 0 else []
+            if positions:
+                next_start[search] = found + len(search)
+
+        if not positions:
+            raise EditError(f"Edit {i + 1}: search string not found: {search[:50]}", i, "not_found", search)
+        spans.extend((pos, pos + len(search), i) for pos in positions)
+
+    spans.sort()
+    for (start_a, end_a, a), (start_b, _, b) in zip(spans, spans[1:]):
+        if start_b < end_a:
+            first, second = sorted((a, b))
+            raise EditError(f"Edits {first + 1} and {second + 1} overlap", second, "overlap")
+
+    parts = []
+    pos = 0
+    for start, end, i in spans:
+        parts.append(content[pos:start])
+        parts.append(edits[i].replace)
+        pos = end
+    parts.append(content[pos:])
+    return EditResult(content="".join(parts), changes=len(spans), spans=spans)
+
+
+def _context(content: str, spans, k: int, edits: Sequence[Replacement], before: int, need: int, left: bool) -> str:
+    """
+    `need` characters beside span k as they read once edits[:before] ran.
+
+    Neighbouring spans of those edits show their replacement, later ones
+    their original text.
+    """
+    text, step = "", -1 if left else 1
+    pos = spans[k][0] if left else spans[k][1]
+    k += step
+    while len(text) < need:
+        if 0 <= k < len(spans):
+            boundary = spans[k][1] if left else spans[k][0]
+        else:
+            boundary = 0 if left else len(content)
+        if left:
+            lo = max(boundary, pos - (need - len(text)))
+            text = content[lo:pos] + text
+            reached = lo == boundary
+        else:
+            hi = min(boundary, pos + (need - len(text)))
+            text += content[pos:hi]
+            reached = hi == boundary
+        if not reached or not 0 <= k < len(spans):
+            break
+        start, end, i = spans[k]
+        middle = edits[i].replace if i < before else content[start:end]
+        text = middle + text if left else text + middle
+        pos = start if left else end
+        k += step
+    return text[-need:] if left else text[:need]
+
+
+# Exact checks for spans with close neighbours before giving up and running
+# the edits sequentially (always correct, just slower)
+DEPENDENCY_CHECK_BUDGET = 20_000
+
+
+def _depends_on_earlier(content: str, edits: Sequence[Replacement], spans) -> bool:
+    """
+    Whether a later search string can match text an earlier edit produced.
+
+    Looks at the text around every replaced span as it reads after that edit
+    ran: the replacement plus len(search) - 1 characters on each side. A
+    match there that overlaps the replacement (or joins the text around a
+    deletion) is new, so running the edits one after another could give a
+    different result than the splice.
+
+    Spans with no other span within reach get one window that does not
+    depend on which edits ran; those windows are joined and each search is
+    looked up once with str.find. Spans close to another span are checked
+    per later edit, with neighbouring edits applied or not as appropriate.
+    """
+    last: Dict[str, int] = {}
+    for j, edit in enumerate(edits):
+        last[edit.search] = j
+    final = max(last.values())
+    reach = max(len(search) for search in last) - 1
+
+    parts: List[str] = []
+    windows: List[Tuple[int, int, int, int, int]] = []  # (start, mid_start, mid_end, end, edit) in joined text
+    offset = 0
+    budget = DEPENDENCY_CHECK_BUDGET
+    for k, (start, end, i) in enumerate(spans):
+        if i >= final:
+            continue
+        replace = edits[i].replace
+        near = (k > 0 and start - spans[k - 1][1] < reach) or (k + 1 < len(spans) and spans[k + 1][0] - end < reach)
+        if near:
+            for j in range(i + 1, len(edits)):
+                budget -= 1
+                if budget < 0:
+                    return True
+                search = edits[j].search
+                need = len(search) - 1
+                left = _context(content, spans, k, edits, j, need, left=True) if need else ""
+                right = _context(content, spans, k, edits, j, need, left=False) if need else ""
+                if search in left + replace + right:
+                    return True
+            continue
+        window = content[max(0, start - reach):start] + replace + content[end:end + reach]
+        mid_start = offset + min(start, reach)
+        windows.append((offset, mid_start, mid_start + len(replace), offset + len(window), i))
+        parts.append(window)
+        offset += len(window)
+
+    if not windows:
+        return False
+    joined = "".join(parts)
+    starts = [w[0] for w in windows]
+    for search, latest in last.items():
+        size = len(search)
+        pos = joined.find(search)
+        while pos >= 0:
+            w_start, mid_start, mid_end, w_end, i = windows[bisect.bisect_right(starts, pos) - 1]
+            if i < latest and pos + size <= w_end and pos < mid_end and pos + size > mid_start:
+                return True
+            pos = joined.find(search, pos + 1)
+    return False
+
+
+def apply_edits(content: str, edits: Sequence[Replacement], unique: bool = False) -> EditResult:
+    """
+    Apply edits with the result of running them one after another.
+
+    Independent edits (the common case) are spliced once by plan_edits.
+    When an edit could match text produced by an earlier one, or when
+    planning against the original fails, the edits run sequentially, so
+    chained edits behave as they always did.
+
+    Raises:
+        EditError: From apply_sequential when the edits cannot be applied
+    """
+    try:
+        result = plan_edits(content, edits, unique=unique)
+    except EditError as e:
+        if e.kind == "empty":
+            raise
+        return apply_sequential(content, edits, unique=unique)
+    if len(edits) > 1 and _depends_on_earlier(content, edits, result.spans):
+        return apply_sequential(content, edits, unique=unique)
+    return result
+
+
+def apply_sequential(content: str, edits: Sequence[Replacement], unique: bool = False) -> EditResult:
+    """
+    Apply edits one after another, each on the previous result.
+
+    For edits whose anchors only exist after earlier edits ran; costs one
+    full copy per edit. With unique, a search string occurring more than
+    once in the content it is applied to is ambiguous.
+    """
+    changes = 0
+    for i, edit in enumerate(edits):
+        if not edit.search:
+            raise EditError(f"Edit {i + 1}: search string is empty", i, "empty")
+        if edit.search not in content:
+            raise EditError(
+                f"Edit {i + 1}: search string not found: {edit.search[:50]}", i, "not_found", edit.search
+            )
+        if unique:
+            count = content.count(edit.search)
+            if count > 1:
+                raise EditError(
+                    f"Edit {i + 1}: search string appears {count} times (ambiguous)", i, "ambiguous", edit.search, count
+                )
+        if edit.replace_all:
+            changes += content.count(edit.search)
+            content = content.replace(edit.search, edit.replace)
+        else:
+            changes += 1
+            content = content.replace(edit.search, edit.replace, 1)
+    return EditResult(content=content, changes=changes)
+
+
+def write_text_atomic(path: PathLike, content: str, encoding: str = "utf-8", fsync: bool = True) -> None:
+    """
+    Replace a file's content atomically (temp file + os.replace), keeping its mode.
+
+    Symlinks are followed: the target is replaced and the link stays a link.
+    """
+    _stage(_resolve(path), content, encoding, fsync)
+
+
+def _resolve(path: PathLike) -> Path:
+    """The file os.replace must act on (renaming over a symlink would replace the link)."""
+    return Path(os.path.realpath(path))
+
+
+def _stage(path: Path, content: str, encoding: str, fsync: bool, commit: bool = True) -> str:
+    """Write content to a temp file beside path; os.replace it over path if commit."""
+    data = content.encode(encoding)
+    fd, temp_path = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        try:
+            os.write(fd, data)
+            try:
+                os.fchmod(fd, path.stat().st_mode & 0o7777)
+            except (FileNotFoundError, AttributeError):
+                pass
+            if fsync:
+                os.fsync(fd)
+        finally:
+            os.close(fd)
+        if commit:
+            os.replace(temp_path, path)
+            if fsync:
+                _sync_directory(path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+    return temp_path
+
+
+def _sync_directory(path: Path) -> None:
+    """Make a rename in path's directory durable (best effort)."""
+    try:
+        dir_fd = os.open(str(path.parent), os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+    except OSError:
+        return
+    try:
+        os.fsync(dir_fd)
+    except OSError:
+        pass
+    finally:
+        os.close(dir_fd)
+
+
+def backup_file(path: PathLike, backup_path: PathLike) -> Path:
+    """
+    Preserve the current version of path at backup_path.
+
+    Hard-links when possible (no data copied; safe because edits replace
+    the file rather than writing into it), copies otherwise.
+    """
+    path, backup_path = Path(path), Path(backup_path)
+    backup_path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        backup_path.unlink()
+    except FileNotFoundError:
+        pass
+    try:
+        os.link(path, backup_path)
+    except OSError:
+        shutil.copy2(path, backup_path)
+    return backup_path
+
+
+class EditTransaction:
+    """
+    All-or-nothing edits across several files.
+
+    edit()/write() read and plan immediately (raising EditError without
+    side effects); commit() stages every file as a temp file, then
+    replaces them one by one and restores the originals if any replace
+    fails. Leaving the context without an exception commits, with an
+    exception rolls back.
+    """
+
+    def __init__(self, encoding: str = "utf-8", fsync: bool = True):
+        self.encoding = encoding
+        self.fsync = fsync
+        self._planned: Dict[Path, Tuple[str, str]] = {}  # path -> (original, new)
+        self.results: Dict[Path, EditResult] = {}
+        self.committed = False
+
+    def edit(self, path: PathLike, edits: Sequence[Replacement], unique: bool = False) -> EditResult:
+        """Plan edits to a file (on top of earlier edits to it in this transaction)."""
+        path = Path(path)
+        if path in self._planned:
+            original, current = self._planned[path]
+        else:
+            original = current = path.read_text(encoding=self.encoding)
+        result = apply_edits(current, edits, unique=unique)
+        self._planned[path] = (original, result.content)
+        self.results[path] = result
+        return result
+
+    def write(self, path: PathLike, content: str) -> None:
+        """Plan replacing a file's whole content."""
+        path = Path(path)
+        original = self._planned[path][0] if path in self._planned else path.read_text(encoding=self.encoding)
+        self._planned[path] = (original, content)
+
+    def commit(self) -> List[Path]:
+        """
+        Write all planned files.
+
+        Returns:
+            Paths whose content changed
+
+        Raises:
+            OSError: Writing failed; every file is back to its original
+        """
+        changed = [(p, new) for p, (old, new) in self._planned.items() if old != new]
+        targets = {path: _resolve(path) for path, _ in changed}
+        staged: List[Tuple[Path, str]] = []
+        keep: List[Tuple[Path, str]] = []  # (path, hard link to the original inode)
+        replaced: List[Tuple[Path, str]] = []
+        try:
+            for path, content in changed:
+                staged.append((targets[path], _stage(targets[path], content, self.encoding, self.fsync, commit=False)))
+            for path, _ in staged:
+                keep_path = str(path.with_name(f".{path.name}.{os.getpid()}.{time.monotonic_ns()}.orig"))
+                try:
+                    os.link(path, keep_path)
+                except OSError:
+                    shutil.copy2(path, keep_path)
+                keep.append((path, keep_path))
+            for (path, temp_path), (_, keep_path) in zip(staged, keep):
+                os.replace(temp_path, path)
+                replaced.append((path, keep_path))
+        except BaseException:
+            for path, keep_path in reversed(replaced):
+                try:
+                    os.replace(keep_path, path)
+                except OSError:
+                    pass
+            raise
+        finally:
+            # Leftover temps (unreplaced) and links (not used for a restore)
+            for leftover in [t for _, t in staged] + [k for _, k in keep]:
+                if os.path.exists(leftover):
+                    os.unlink(leftover)
+
+        if self.fsync:
+            # One target per directory; _sync_directory syncs its parent
+            for target in {target.parent: target for target in targets.values()}.values():
+                _sync_directory(target)
+        self.committed = True
+        self._planned.clear()
+        return [path for path, _ in changed]
+
+    def rollback(self) -> None:
+        """Forget planned edits (nothing has been written yet)."""
+        self._planned.clear()
+        self.results.clear()
+
+    def __enter__(self) -> "EditTransaction":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+
+
+__all__ = [
+    'EditError',
+    'Replacement',
+    'EditResult',
+    'EditTransaction',
+    'plan_edits',
+    'apply_edits',
+    'apply_sequential',
+    'write_text_atomic',
+    'backup_file',
+]
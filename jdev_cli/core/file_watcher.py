@@ -1,19 +1,36 @@
 """Real-time file system monitoring (Claude pattern).
 
 Boris Cherny: Event-driven, incremental updates only.
+
+Backends:
+- InotifyBackend: kernel events via libc inotify (Linux), no tree walks per tick
+- PollingBackend: stat-based walk comparing (mtime_ns, size) before hashing
+
+Raw changes are coalesced per path and released in debounced batches.
 """
 
+import ctypes
+import ctypes.util
+import errno
 import os
+import struct
+import sys
 import time
 import hashlib
 from pathlib import Path
-from typing import Dict, Set, Optional, Callable
+from typing import Dict, Iterator, List, Set, Optional, Callable, Tuple, Union
 from collections import deque
 from dataclasses import dataclass
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Directories never watched
+EXCLUDED_DIRS = {'node_modules', '__pycache__', 'venv'}
+
+# Tracked-file cap per watched tree (bounds memory on huge checkouts)
+DEFAULT_MAX_FILES = 200_000
+
 
 @dataclass
 class FileEvent:
@@ -25,110 +42,435 @@ class FileEvent:
     file_hash: Optional[str] = None
 
 
+def _coalesce(previous: str, current: str) -> Optional[str]:
+    """Merge two pending events for the same path (None = they cancel out)."""
+    if previous == 'created':
+        return None if current == 'deleted' else 'created'
+    if previous == 'deleted' and current != 'deleted':
+        return 'modified'  # Replaced (e.g. editor save via rename)
+    return current
+
+
+class WatchBackend:
+    """Source of raw (path, event_type) changes for a tree."""
+
+    name = "base"
+
+    def __init__(self, root_path: Path, watch_extensions: Set[str], max_files: int = DEFAULT_MAX_FILES):
+        self.root_path = root_path
+        self.watch_extensions = watch_extensions
+        self.max_files = max_files
+        self._capped = False
+
+    def start(self) -> None:
+        """Establish the baseline."""
+        raise NotImplementedError
+
+    def poll(self) -> List[Tuple[str, str]]:
+        """Return changes since the previous call."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Release OS resources."""
+
+    def file_hash(self, path: str) -> Optional[str]:
+        """Content hash reported on events for path."""
+        return _hash_file(path)
+
+    @property
+    def tracked_count(self) -> int:
+        raise NotImplementedError
+
+    def _is_watched_dir(self, name: str) -> bool:
+        return not name.startswith('.') and name not in EXCLUDED_DIRS
+
+    def _is_watched_file(self, name: str) -> bool:
+        return os.path.splitext(name)[1] in self.watch_extensions
+
+    def _walk(self, top: Path) -> Iterator[Tuple[Path, List[str]]]:
+        """Yield (directory, watched file names), pruning excluded dirs."""
+        for root, dirs, files in os.walk(top):
+            dirs[:] = [d for d in dirs if self._is_watched_dir(d)]
+            yield Path(root), [f for f in files if self._is_watched_file(f)]
+
+    def _has_room(self, tracked: int) -> bool:
+        if tracked < self.max_files:
+            return True
+        if not self._capped:
+            self._capped = True
+            logger.warning(f"File watcher limit reached ({self.max_files} files); ignoring new files")
+        return False
+
+
+class PollingBackend(WatchBackend):
+    """Portable fallback: walk + stat, re-hashing only files whose stat changed."""
+
+    name = "polling"
+
+    def __init__(self, root_path: Path, watch_extensions: Set[str], max_files: int = DEFAULT_MAX_FILES):
+        super().__init__(root_path, watch_extensions, max_files)
+        # path -> (mtime_ns, size, full-content hash)
+        self._state: Dict[str, Tuple[int, int, str]] = {}
+
+    def start(self) -> None:
+        self._state.clear()
+        for path, st in self._scan():
+            if not self._has_room(len(self._state)):
+                break
+            self._state[path] = (st.st_mtime_ns, st.st_size, _hash_file(path))
+
+    def poll(self) -> List[Tuple[str, str]]:
+        changes = []
+        seen: Set[str] = set()
+
+        for path, st in self._scan():
+            seen.add(path)
+            previous = self._state.get(path)
+
+            if previous is None:
+                if self._has_room(len(self._state)):
+                    self._state[path] = (st.st_mtime_ns, st.st_size, _hash_file(path))
+                    changes.append((path, 'created'))
+                continue
+
+            mtime_ns, size, old_hash = previous
+            if mtime_ns == st.st_mtime_ns and size == st.st_size:
+                continue  # Fast path: no read at all
+
+            new_hash = _hash_file(path)
+            self._state[path] = (st.st_mtime_ns, st.st_size, new_hash)
+            if new_hash != old_hash:
+                changes.append((path, 'modified'))  # Touch alone is not a change
+
+        for path in [p for p in self._state if p not in seen]:
+            del self._state[path]
+            changes.append((path, 'deleted'))
+
+        return changes
+
+    def file_hash(self, path: str) -> Optional[str]:
+        state = self._state.get(path)
+        return state[2] if state else None
+
+    @property
+    def tracked_count(self) -> int:
+        return len(self._state)
+
+    def _scan(self) -> Iterator[Tuple[str, os.stat_result]]:
+        for directory, files in self._walk(self.root_path):
+            for name in files:
+                path = str(directory / name)
+                try:
+                    yield path, os.stat(path)
+                except OSError:
+                    continue  # Vanished mid-walk
+
+
+# inotify(7) constants
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = getattr(os, 'O_CLOEXEC', 0o2000000)
+
+_WATCH_MASK = (
+    IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE
+    | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+)
+_EVENT_HEADER = struct.Struct('iIII')  # wd, mask, cookie, len
+
+
+def _load_libc() -> Optional[ctypes.CDLL]:
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+class InotifyBackend(WatchBackend):
+    """Linux inotify via ctypes: one watch per directory, events read non-blocking."""
+
+    name = "inotify"
+
+    def __init__(self, root_path: Path, watch_extensions: Set[str], max_files: int = DEFAULT_MAX_FILES):
+        super().__init__(root_path, watch_extensions, max_files)
+        self._libc = _load_libc()
+        if self._libc is None:
+            raise OSError(errno.ENOSYS, "inotify is not available")
+        self._fd = -1
+        self._dirs: Dict[int, Path] = {}  # wd -> directory
+        self._files: Set[str] = set()
+
+    @classmethod
+    def available(cls) -> bool:
+        return _load_libc() is not None
+
+    def start(self) -> None:
+        self.close()
+        fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        self._fd = fd
+        self._files.clear()
+        self._add_tree(self.root_path, [])
+
+    def poll(self) -> List[Tuple[str, str]]:
+        changes: List[Tuple[str, str]] = []
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            if not data:
+                break
+            self._dispatch(data, changes)
+        return changes
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+        self._fd = -1
+        self._dirs.clear()
+
+    @property
+    def tracked_count(self) -> int:
+        return len(self._files)
+
+    def _add_tree(self, top: Path, changes: List[Tuple[str, str]], report: bool = False) -> None:
+        """Watch every directory under top; optionally report files as created."""
+        for directory, files in self._walk(top):
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(str(directory)), _WATCH_MASK)
+            if wd < 0:
+                err = ctypes.get_errno()
+                if err == errno.ENOSPC:
+                    raise OSError(err, "inotify watch limit reached (fs.inotify.max_user_watches)")
+                continue  # Directory vanished or unreadable
+            self._dirs[wd] = directory
+
+            for name in files:
+                path = str(directory / name)
+                if path not in self._files and self._has_room(len(self._files)):
+                    self._files.add(path)
+                    if report:
+                        changes.append((path, 'created'))
+
+    def _drop_tree(self, top: Path, changes: List[Tuple[str, str]]) -> None:
+        """Forget a removed or moved-away directory and report its files deleted."""
+        prefix = str(top) + os.sep
+        for path in [p for p in self._files if p.startswith(prefix)]:
+            self._files.discard(path)
+            changes.append((path, 'deleted'))
+        for wd, directory in list(self._dirs.items()):
+            if directory == top or str(directory).startswith(prefix):
+                self._libc.inotify_rm_watch(self._fd, wd)
+                del self._dirs[wd]
+
+    def _resync(self, changes: List[Tuple[str, str]]) -> None:
+        """Queue overflowed: rebuild watches and diff the file set."""
+        before = set(self._files)
+        self.start()
+        changes.extend((p, 'created') for p in self._files - before)
+        changes.extend((p, 'deleted') for p in before - self._files)
+
+    def _dispatch(self, data: bytes, changes: List[Tuple[str, str]]) -> None:
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            raw_name = data[offset + _EVENT_HEADER.size:offset + _EVENT_HEADER.size + length]
+            offset += _EVENT_HEADER.size + length
+
+            if mask & IN_Q_OVERFLOW:
+                self._resync(changes)
+                return
+
+            directory = self._dirs.get(wd)
+            if mask & IN_IGNORED:
+                self._dirs.pop(wd, None)
+                continue
+            if directory is None or mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                continue
+
+            name = os.fsdecode(raw_name.rstrip(b'\0'))
+            path = directory / name
+
+            if mask & IN_ISDIR:
+                if not self._is_watched_dir(name):
+                    continue
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    self._add_tree(path, changes, report=True)
+                elif mask & (IN_DELETE | IN_MOVED_FROM):
+                    self._drop_tree(path, changes)
+                continue
+
+            if not self._is_watched_file(name):
+                continue
+
+            key = str(path)
+            if mask & (IN_DELETE | IN_MOVED_FROM):
+                if key in self._files:
+                    self._files.discard(key)
+                    changes.append((key, 'deleted'))
+            elif key in self._files:
+                changes.append((key, 'modified'))
+            elif self._has_room(len(self._files)):
+                self._files.add(key)
+                changes.append((key, 'created'))
+
+
+BACKENDS = {
+    InotifyBackend.name: InotifyBackend,
+    PollingBackend.name: PollingBackend,
+}
+
+
+def _hash_file(file_path: str) -> str:
+    """Hash the full file content (streamed)."""
+    try:
+        digest = hashlib.md5()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+    except (IOError, OSError):
+        return ""
+
+
 class FileWatcher:
     """File system watcher with incremental updates (Claude pattern).
-    
-    Uses polling for simplicity (watchdog adds dependency).
-    Updates every 1s, only processes changed files.
+
+    Uses inotify where available and stat-based polling elsewhere.
+    Raw changes are coalesced per path (e.g. create+modify -> created,
+    create+delete -> nothing) and released once a path has been quiet for
+    `debounce` seconds, in one batch per check_updates() call.
     """
 
     def __init__(
         self,
         root_path: str = ".",
-        watch_extensions: Set[str] = None
+        watch_extensions: Set[str] = None,
+        backend: Union[str, WatchBackend] = "auto",
+        debounce: float = 0.0,
+        max_files: int = DEFAULT_MAX_FILES,
+        max_pending: int = 10_000
     ):
         self.root_path = Path(root_path)
         self._watch_extensions = watch_extensions or {'.py', '.js', '.ts', '.go', '.rs'}
-        self._file_hashes: Dict[str, str] = {}
+        self._backend_choice = backend
+        self._backend: Optional[WatchBackend] = None
+        self._debounce = debounce
+        self._max_files = max_files
+        self._max_pending = max_pending
+        # path -> (event_type, last raw change time), insertion-ordered
+        self._pending: Dict[str, Tuple[str, float]] = {}
         self._recent_events: deque = deque(maxlen=100)
         self._callbacks: list[Callable] = []
+        self._batch_callbacks: list[Callable] = []
+        self._event_count = 0
         self._running = False
 
     def add_callback(self, callback: Callable[[FileEvent], None]) -> None:
         """Register callback for file events."""
         self._callbacks.append(callback)
 
+    def add_batch_callback(self, callback: Callable[[List[FileEvent]], None]) -> None:
+        """Register callback receiving each debounced batch at once."""
+        self._batch_callbacks.append(callback)
+
     def start(self):
         """Start watching (sync, for simplicity)."""
+        self._backend = self._create_backend()
+        self._pending.clear()
         self._running = True
-        self._initial_scan()
 
     def stop(self):
         """Stop watching."""
         self._running = False
+        if self._backend is not None:
+            self._backend.close()
+
+    def _create_backend(self) -> WatchBackend:
+        """Instantiate and start the configured backend, falling back to polling."""
+        choice = self._backend_choice
+        if isinstance(choice, WatchBackend):
+            choice.start()
+            return choice
+
+        if choice == "auto":
+            choice = InotifyBackend.name if InotifyBackend.available() else PollingBackend.name
+        if choice not in BACKENDS:
+            raise ValueError(f"Unknown file watcher backend: {choice}")
 
-    def _initial_scan(self):
-        """Initial scan to establish baseline."""
-        for file_path in self._get_watched_files():
-            file_hash = self._hash_file(file_path)
-            self._file_hashes[str(file_path)] = file_hash
-
-    def check_updates(self):
-        """Check for file updates (call periodically)."""
-        if not self._running:
-            return
-
-        current_files = set(str(p) for p in self._get_watched_files())
-        tracked_files = set(self._file_hashes.keys())
-
-        # Detect new files
-        for file_path in current_files - tracked_files:
-            event = FileEvent(
-                path=file_path,
-                event_type='created',
-                timestamp=time.time(),
-                file_hash=self._hash_file(file_path)
-            )
-            self._handle_event(event)
-            self._file_hashes[file_path] = event.file_hash
-
-        # Detect deleted files
-        for file_path in tracked_files - current_files:
-            event = FileEvent(
-                path=file_path,
-                event_type='deleted',
-                timestamp=time.time()
-            )
-            self._handle_event(event)
-            del self._file_hashes[file_path]
-
-        # Detect modified files
-        for file_path in current_files & tracked_files:
-            new_hash = self._hash_file(file_path)
-            if new_hash != self._file_hashes[file_path]:
-                event = FileEvent(
-                    path=file_path,
-                    event_type='modified',
-                    timestamp=time.time(),
-                    file_hash=new_hash
-                )
-                self._handle_event(event)
-                self._file_hashes[file_path] = new_hash
-
-    def _get_watched_files(self):
-        """Get all files to watch."""
-        for root, dirs, files in os.walk(self.root_path):
-            # Skip hidden dirs and common excludes
-            dirs[:] = [d for d in dirs if not d.startswith('.') and d not in ['node_modules', '__pycache__', 'venv']]
-
-            for file in files:
-                file_path = Path(root) / file
-                if file_path.suffix in self._watch_extensions:
-                    yield file_path
-
-    def _hash_file(self, file_path: str) -> str:
-        """Fast file hash (first 8KB only for speed)."""
         try:
-            with open(file_path, 'rb') as f:
-                # Only hash first 8KB for speed
-                content = f.read(8192)
-                return hashlib.md5(content).hexdigest()
-        except (IOError, OSError):
-            return ""
+            backend = BACKENDS[choice](self.root_path, self._watch_extensions, self._max_files)
+            backend.start()
+            return backend
+        except OSError as e:
+            if choice == PollingBackend.name:
+                raise
+            logger.warning(f"{choice} unavailable ({e}); falling back to polling")
+            backend = PollingBackend(self.root_path, self._watch_extensions, self._max_files)
+            backend.start()
+            return backend
+
+    def check_updates(self) -> List[FileEvent]:
+        """Collect changes and dispatch the batch that is past the debounce window.
+
+        Call periodically. Returns the dispatched events.
+        """
+        if not self._running or self._backend is None:
+            return []
+
+        now = time.time()
+        for path, event_type in self._backend.poll():
+            previous = self._pending.pop(path, None)
+            merged = _coalesce(previous[0], event_type) if previous else event_type
+            if merged is not None:
+                self._pending[path] = (merged, now)
+
+        # Bound memory under event storms: flush oldest regardless of debounce
+        overflow = len(self._pending) - self._max_pending
+
+        batch = []
+        for path, (event_type, last_change) in list(self._pending.items()):
+            if overflow <= 0 and now - last_change < self._debounce:
+                continue
+            overflow -= 1
+            del self._pending[path]
+            file_hash = None if event_type == 'deleted' else self._backend.file_hash(path)
+            batch.append(FileEvent(path=path, event_type=event_type, timestamp=now, file_hash=file_hash))
+
+        for event in batch:
+            self._handle_event(event)
+
+        if batch:
+            for callback in self._batch_callbacks:
+                try:
+                    callback(batch)
+                except Exception as e:
+                    logger.error(f"Batch callback failed: {e}")
+
+        return batch
 
     def _handle_event(self, event: FileEvent):
         """Handle file event."""
         self._recent_events.append(event)
+        self._event_count += 1
 
         for callback in self._callbacks:
             try:
@@ -136,6 +478,11 @@ class FileWatcher:
             except Exception as e:
                 logger.error(f"Callback failed: {e}")
 
+    @property
+    def backend_name(self) -> Optional[str]:
+        """Name of the active backend."""
+        return self._backend.name if self._backend else None
+
     @property
     def recent_events(self) -> list[FileEvent]:
         """Get recent events (last 100)."""
@@ -144,12 +491,21 @@ class FileWatcher:
     @property
     def tracked_files(self) -> int:
         """Get number of tracked files."""
-        return len(self._file_hashes)
+        return self._backend.tracked_count if self._backend else 0
+
+    def get_stats(self) -> Dict[str, Union[int, str, None]]:
+        """Watcher statistics."""
+        return {
+            'backend': self.backend_name,
+            'tracked_count': self.tracked_files,
+            'event_count': self._event_count,
+            'pending_count': len(self._pending),
+        }
 
 
 class RecentFilesTracker:
     """Track recently modified files (Cursor pattern).
-    
+
     LRU cache of recent files with recency scoring.
     """
 
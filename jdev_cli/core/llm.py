@@ -8,9 +8,11 @@ Implements best practices from:
 
 Features:
 - Exponential backoff with jitter
-- Circuit breaker pattern
-- Token-aware rate limiting
-- Automatic failover
+- Circuit breaker pattern (one breaker per provider)
+- Token-aware rate limiting (one limiter per provider)
+- Automatic failover, ranked by rolling first-token latency and throughput
+- Optional hedged requests (race a backup provider after a p95 deadline)
+- Resumable streams: retries and failover never repeat delivered text
 - Observability & telemetry
 - Timeout management
 - Request queue
@@ -21,6 +23,7 @@ import time
 import random
 import logging
 import os
+import re
 import warnings
 
 # Silence gRPC/glog warnings at SDK level
@@ -28,7 +31,7 @@ os.environ.setdefault('GRPC_VERBOSITY', 'ERROR')
 os.environ.setdefault('GLOG_minloglevel', '3')
 warnings.filterwarnings('ignore', message='.*ALTS.*')
 
-from typing import AsyncGenerator, Optional, Dict, Any, List
+from typing import AsyncGenerator, AsyncIterator, Optional, Dict, Any, List
 from dataclasses import dataclass, field
 from enum import Enum
 from collections import deque
@@ -37,6 +40,37 @@ from .config import config
 
 logger = logging.getLogger(__name__)
 
+_HEDGE_MIN_SAMPLES = 20  # TTFT samples before the hedge deadline uses the provider's quantile
+_ROUTING_TOKENS = 256  # Response size used to rank providers by expected completion time
+
+CONTINUE_PROMPT = (
+    "Your previous response was cut off. Continue it exactly where it stopped, "
+    "without repeating any text that was already written."
+)
+
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+_encoding = None
+_encoding_loaded = False
+
+
+def count_tokens(text: str) -> int:
+    """Token count of `text`.
+
+    Uses tiktoken's cl100k_base when installed; otherwise estimates from
+    words and punctuation (long words count as several tokens).
+    """
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded:
+        _encoding_loaded = True
+        try:
+            import tiktoken
+            _encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            _encoding = None
+    if _encoding is not None:
+        return len(_encoding.encode(text, disallowed_special=()))
+    return sum(1 + len(piece) // 6 for piece in _TOKEN_RE.findall(text))
+
 # REMOVED top-level import: from huggingface_hub import InferenceClient
 
 
@@ -97,6 +131,13 @@ class CircuitBreaker:
 
         return False, "Circuit half-open limit reached"
 
+    def is_open(self) -> bool:
+        """True while the breaker would reject a call (does not change state)."""
+        if self.state != CircuitState.OPEN:
+            return False
+        return not (self.last_failure_time and
+                    (time.time() - self.last_failure_time) >= self.recovery_timeout)
+
 
 @dataclass
 class RateLimiter:
@@ -144,6 +185,118 @@ class RateLimiter:
             self.token_counts.append((now, tokens))
 
 
+@dataclass
+class ProviderLatency:
+    """Rolling time-to-first-token and tokens/sec of one provider (EWMA)."""
+
+    alpha: float = 0.2
+    ttft_ewma: Optional[float] = None  # seconds
+    tps_ewma: Optional[float] = None  # tokens (chunks) per second after the first
+    ttft_samples: deque = field(default_factory=lambda: deque(maxlen=200))
+
+    def record(self, ttft: float, tokens: int, duration: float) -> None:
+        """Record one successful stream."""
+        self.ttft_samples.append(ttft)
+        self.ttft_ewma = ttft if self.ttft_ewma is None else \
+            self.alpha * ttft + (1 - self.alpha) * self.ttft_ewma
+
+        generation = duration - ttft
+        if tokens > 1 and generation > 0:
+            tps = (tokens - 1) / generation
+            self.tps_ewma = tps if self.tps_ewma is None else \
+                self.alpha * tps + (1 - self.alpha) * self.tps_ewma
+
+    def ttft_quantile(self, q: float) -> Optional[float]:
+        """TTFT quantile over recent samples (None without samples)."""
+        if not self.ttft_samples:
+            return None
+        ordered = sorted(self.ttft_samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+    def expected_seconds(self, tokens: int = _ROUTING_TOKENS) -> float:
+        """Expected time to stream `tokens` (inf until measured)."""
+        if self.ttft_ewma is None:
+            return float("inf")
+        if not self.tps_ewma:
+            return self.ttft_ewma
+        return self.ttft_ewma + tokens / self.tps_ewma
+
+
+@dataclass
+class StreamSession:
+    """Text already delivered by one stream_chat call.
+
+    Retries and failover resume from here instead of streaming the response
+    again from the start. In "continue" mode the next attempt sends the
+    partial response as an assistant turn plus CONTINUE_PROMPT; in
+    "suppress" mode it re-sends the original request and drops the
+    regenerated prefix (only exact with deterministic decoding).
+    """
+
+    messages: List[Dict[str, str]]
+    mode: str = "continue"
+    chunks: List[str] = field(default_factory=list)
+    delivered_chars: int = 0
+    tokens: int = 0  # delivered output tokens
+    wasted_tokens: int = 0  # generated but never delivered
+    resumes: int = 0
+
+    @property
+    def text(self) -> str:
+        """Everything delivered so far."""
+        return "".join(self.chunks)
+
+    @property
+    def generated_tokens(self) -> int:
+        """Output tokens produced by providers (delivered + wasted)."""
+        return self.tokens + self.wasted_tokens
+
+    def request_messages(self) -> List[Dict[str, str]]:
+        """Messages for the next attempt."""
+        if not self.chunks or self.mode == "suppress":
+            return self.messages
+        return self.messages + [
+            {"role": "assistant", "content": self.text},
+            {"role": "user", "content": CONTINUE_PROMPT},
+        ]
+
+    async def resume(self, stream: AsyncIterator[str]) -> AsyncGenerator[str, None]:
+        """Yield only the part of `stream` that was not delivered yet."""
+        skip = self.delivered_chars if self.mode == "suppress" else 0
+        if self.chunks:
+            self.resumes += 1
+        async for chunk in stream:
+            if skip:
+                dropped, chunk = chunk[:skip], chunk[skip:]
+                skip -= len(dropped)
+                self.wasted_tokens += count_tokens(dropped)
+                if not chunk:
+                    continue
+            self.chunks.append(chunk)
+            self.delivered_chars += len(chunk)
+            self.tokens += count_tokens(chunk)
+            yield chunk
+
+    def fork(self) -> "StreamSession":
+        """Independent copy, for a stream that may lose a hedged race."""
+        return StreamSession(
+            messages=self.messages, mode=self.mode, chunks=list(self.chunks),
+            delivered_chars=self.delivered_chars, tokens=self.tokens,
+            wasted_tokens=self.wasted_tokens, resumes=self.resumes,
+        )
+
+    def absorb(self, winner: "StreamSession", losers: List["StreamSession"]) -> None:
+        """Take over the winning fork; whatever the losers generated was wasted."""
+        base = self.generated_tokens
+        self.chunks = winner.chunks
+        self.delivered_chars = winner.delivered_chars
+        self.tokens = winner.tokens
+        self.wasted_tokens = winner.wasted_tokens + sum(
+            loser.generated_tokens - base for loser in losers
+        )
+        self.resumes = winner.resumes
+
+
 @dataclass
 class RequestMetrics:
     """Telemetry and observability (Codex strategy)."""
@@ -154,6 +307,10 @@ class RequestMetrics:
     retried_requests: int = 0
     rate_limited_requests: int = 0
     circuit_breaker_blocks: int = 0
+    hedged_requests: int = 0
+    hedge_wins: int = 0
+    resumed_streams: int = 0
+    wasted_tokens: int = 0
 
     total_latency: float = 0.0
     total_tokens: int = 0
@@ -193,6 +350,10 @@ class RequestMetrics:
             "retries": self.retried_requests,
             "rate_limited": self.rate_limited_requests,
             "circuit_breaker_blocks": self.circuit_breaker_blocks,
+            "hedged_requests": self.hedged_requests,
+            "hedge_wins": self.hedge_wins,
+            "resumed_streams": self.resumed_streams,
+            "wasted_tokens": self.wasted_tokens,
             "providers": self.provider_stats
         }
 
@@ -209,24 +370,47 @@ class LLMClient:
         enable_circuit_breaker: bool = True,
         enable_rate_limiting: bool = True,
         enable_telemetry: bool = True,
-        token_callback: Optional[Any] = None
+        token_callback: Optional[Any] = None,
+        enable_hedging: bool = False,
+        hedge_delay: float = 2.0,
+        hedge_quantile: float = 0.95,
+        resume_mode: str = "continue"
     ):
         """Initialize resilient LLM client.
         
         Args:
             token_callback: Optional callback(input_tokens, output_tokens) for tracking
+            enable_hedging: Start the next-ranked provider when the first has
+                produced no token by the hedge deadline; the slower one is cancelled
+            hedge_delay: Hedge deadline (seconds) until a provider has enough TTFT samples
+            hedge_quantile: TTFT quantile of the primary provider used as hedge deadline
+            resume_mode: How a retry/failover after partial output resumes:
+                "continue" (continuation prompt) or "suppress" (drop the
+                regenerated prefix); see StreamSession
         """
+        if resume_mode not in ("continue", "suppress"):
+            raise ValueError(f"Unknown resume_mode: {resume_mode}")
+
         self.max_retries = max_retries
         self.base_delay = base_delay
         self.max_delay = max_delay
         self.timeout = timeout
         self.token_callback = token_callback
 
-        # Resilience components
-        self.circuit_breaker = CircuitBreaker() if enable_circuit_breaker else None
-        self.rate_limiter = RateLimiter() if enable_rate_limiting else None
+        # Resilience components, one breaker and limiter per provider (created on use)
+        self.enable_circuit_breaker = enable_circuit_breaker
+        self.enable_rate_limiting = enable_rate_limiting
+        self.circuit_breakers: Dict[str, CircuitBreaker] = {}
+        self.rate_limiters: Dict[str, RateLimiter] = {}
         self.metrics = RequestMetrics() if enable_telemetry else None
 
+        # Routing and hedging
+        self.provider_latency: Dict[str, ProviderLatency] = {}
+        self.enable_hedging = enable_hedging
+        self.hedge_delay = hedge_delay
+        self.hedge_quantile = hedge_quantile
+        self.resume_mode = resume_mode
+
         # Lazy providers
         self._hf_client = None
         self._nebius_client = None
@@ -238,6 +422,32 @@ class LLMClient:
         self.provider_priority = ["gemini", "nebius", "hf", "ollama"]
         self.default_provider = "gemini"  # FORCE GEMINI, not auto
 
+    def get_circuit_breaker(self, provider: str) -> Optional[CircuitBreaker]:
+        """Circuit breaker of one provider (None when disabled)."""
+        if not self.enable_circuit_breaker:
+            return None
+        if provider not in self.circuit_breakers:
+            self.circuit_breakers[provider] = CircuitBreaker()
+        return self.circuit_breakers[provider]
+
+    def get_rate_limiter(self, provider: str) -> Optional[RateLimiter]:
+        """Rate limiter of one provider (None when disabled)."""
+        if not self.enable_rate_limiting:
+            return None
+        if provider not in self.rate_limiters:
+            self.rate_limiters[provider] = RateLimiter()
+        return self.rate_limiters[provider]
+
+    @property
+    def circuit_breaker(self) -> Optional[CircuitBreaker]:
+        """Circuit breaker of the default provider."""
+        return self.get_circuit_breaker(self.default_provider)
+
+    @property
+    def rate_limiter(self) -> Optional[RateLimiter]:
+        """Rate limiter of the default provider."""
+        return self.get_rate_limiter(self.default_provider)
+
     @property
     def hf_client(self):
         """Lazy load HuggingFace client."""
@@ -342,17 +552,50 @@ class LLMClient:
             if enable_failover:
                 providers_to_try.extend([p for p in self.provider_priority if p != provider])
 
-        # Try providers with failover
+        session = StreamSession(messages, mode=self.resume_mode)
+        try:
+            async for chunk in self._stream_session(session, providers_to_try, max_tokens, temperature):
+                yield chunk
+        finally:
+            if self.metrics:
+                self.metrics.resumed_streams += bool(session.resumes)
+                self.metrics.wasted_tokens += session.wasted_tokens
+
+    async def _stream_session(
+        self,
+        session: StreamSession,
+        providers_to_try: List[str],
+        max_tokens: int,
+        temperature: float
+    ) -> AsyncGenerator[str, None]:
+        """Stream one response across providers, resuming after partial output."""
+        # Race the first two providers when hedging
         last_error = None
+        if self.enable_hedging and len(providers_to_try) > 1:
+            primary, backup = providers_to_try[:2]
+            failed: List[str] = []
+            try:
+                logger.info(f"🔌 Attempting provider: {primary} (hedge: {backup})")
+                async for chunk in self._hedged_stream(primary, backup, session, max_tokens, temperature, failed):
+                    yield chunk
+                return
+            except Exception as e:
+                last_error = e
+                logger.error(f"❌ Provider(s) {'/'.join(failed) or primary} failed: {str(e)[:100]}")
+                # A loser that was cancelled never failed: keep it to resume on
+                providers_to_try = [p for p in providers_to_try if p not in failed]
+
+        # Try providers with failover
         for current_provider in providers_to_try:
             try:
                 logger.info(f"🔌 Attempting provider: {current_provider}")
 
                 async for chunk in self._stream_with_provider(
                     current_provider,
-                    messages,
+                    session.messages,
                     max_tokens,
-                    temperature
+                    temperature,
+                    session=session
                 ):
                     yield chunk
 
@@ -381,8 +624,8 @@ class LLMClient:
 
         raise RuntimeError(f"All providers failed. Last error: {last_error}")
 
-    def _get_failover_providers(self) -> List[str]:
-        """Get list of providers for failover - GEMINI FIRST ALWAYS."""
+    def _available_providers(self) -> List[str]:
+        """Initialized providers in priority order."""
         available = []
 
         # FORCE GEMINI FIRST (fastest and most powerful)
@@ -395,37 +638,158 @@ class LLMClient:
         # Ollama LAST (slowest)
         if self.ollama_client:
             available.append("ollama")
+        return available
 
-        # Sort by success rate if telemetry enabled
-        if self.metrics and self.metrics.provider_stats:
-            def success_rate(provider: str) -> float:
-                stats = self.metrics.provider_stats.get(provider, {"success": 0, "failure": 1})
-                total = stats["success"] + stats["failure"]
-                return stats["success"] / max(total, 1)
+    def _get_failover_providers(self) -> List[str]:
+        """Get list of providers for failover, fastest expected first.
+
+        Providers with an open circuit go last. The rest are ranked by
+        rolling TTFT + tokens/sec (expected time for a typical response),
+        penalized by failure rate. A provider without latency data (it
+        never completed a stream) is assumed to be as fast as the median
+        measured provider, or to take the full timeout if none is measured,
+        so a provider that only ever fails sinks instead of staying first.
+        With no measurements and no failures this is the priority order
+        (GEMINI FIRST).
+        """
+        available = self._available_providers()
+
+        measured = sorted(
+            latency.expected_seconds()
+            for latency in (self.provider_latency.get(p) for p in available)
+            if latency and latency.ttft_ewma is not None
+        )
+        prior = measured[len(measured) // 2] if measured else float(self.timeout)
+
+        def rank(provider: str) -> tuple:
+            breaker = self.circuit_breakers.get(provider)
+            blocked = breaker is not None and breaker.is_open()
+            latency = self.provider_latency.get(provider)
+            expected = latency.expected_seconds() if latency and latency.ttft_ewma is not None else prior
+            if self.metrics and provider in self.metrics.provider_stats:
+                stats = self.metrics.provider_stats[provider]
+                success_rate = stats["success"] / max(stats["success"] + stats["failure"], 1)
+                expected /= max(success_rate, 0.05)
+            return (blocked, expected)
+
+        available.sort(key=rank)
+        return available or ["hf"]
 
-            available.sort(key=success_rate, reverse=True)
+    def _hedge_deadline(self, provider: str) -> float:
+        """Seconds to wait for a provider's first token before hedging."""
+        latency = self.provider_latency.get(provider)
+        if latency and len(latency.ttft_samples) >= _HEDGE_MIN_SAMPLES:
+            return latency.ttft_quantile(self.hedge_quantile)
+        return self.hedge_delay
 
-        return available or ["hf"]
+    async def _hedged_stream(
+        self,
+        primary: str,
+        backup: str,
+        session: StreamSession,
+        max_tokens: int,
+        temperature: float,
+        failed: Optional[List[str]] = None
+    ) -> AsyncGenerator[str, None]:
+        """Stream from `primary`, racing `backup` if no token arrives by the hedge deadline.
+
+        The first provider to produce a token wins and the other is
+        cancelled. A primary that fails before its deadline fails over to
+        the backup immediately. Providers that raised (not ones merely
+        cancelled) are appended to `failed`.
+        """
+        failed = [] if failed is None else failed
+        queue: asyncio.Queue = asyncio.Queue()
+        forks = {primary: session.fork(), backup: session.fork()}
+        winner = None
+
+        async def pump(provider: str) -> None:
+            try:
+                async for chunk in self._stream_with_provider(
+                    provider, session.messages, max_tokens, temperature, session=forks[provider]
+                ):
+                    queue.put_nowait((provider, chunk, None))
+                queue.put_nowait((provider, None, None))
+            except Exception as e:
+                queue.put_nowait((provider, None, e))
+
+        tasks = {primary: asyncio.create_task(pump(primary))}
+        hedge_at = time.monotonic() + self._hedge_deadline(primary)
+        try:
+            while True:
+                try:
+                    if backup in tasks:
+                        provider, chunk, error = await queue.get()
+                    else:
+                        provider, chunk, error = await asyncio.wait_for(
+                            queue.get(), max(0.0, hedge_at - time.monotonic())
+                        )
+                except asyncio.TimeoutError:
+                    logger.info(f"⏱️  No token from {primary} by hedge deadline, racing {backup}")
+                    if self.metrics:
+                        self.metrics.hedged_requests += 1
+                    tasks[backup] = asyncio.create_task(pump(backup))
+                    continue
+
+                if error is not None:
+                    failed.append(provider)
+                    if backup not in tasks:
+                        tasks[backup] = asyncio.create_task(pump(backup))
+                    elif len(failed) == len(tasks):
+                        raise error
+                    continue
+                break
+
+            # First token (or an empty, completed stream) decides the race
+            winner = provider
+            for other, task in tasks.items():
+                if other != winner:
+                    task.cancel()
+            if winner == backup and self.metrics and not failed:
+                self.metrics.hedge_wins += 1
+
+            while chunk is not None:
+                yield chunk
+                provider, chunk, error = await queue.get()
+                while provider != winner:
+                    provider, chunk, error = await queue.get()
+                if error is not None:
+                    failed.append(winner)
+                    raise error
+        finally:
+            for task in tasks.values():
+                task.cancel()
+            if winner is not None:
+                session.absorb(forks[winner], [fork for p, fork in forks.items() if p != winner])
 
     async def _stream_with_provider(
         self,
         provider: str,
         messages: List[Dict[str, str]],
         max_tokens: int,
-        temperature: float
+        temperature: float,
+        session: Optional[StreamSession] = None
     ) -> AsyncGenerator[str, None]:
-        """Stream from specific provider with resilience."""
+        """Stream from specific provider with resilience.
+
+        Retries resume `session` (text already delivered) instead of
+        starting the response over.
+        """
+        session = session or StreamSession(messages, mode=self.resume_mode)
+        circuit_breaker = self.get_circuit_breaker(provider)
+        rate_limiter = self.get_rate_limiter(provider)
+
         # Circuit breaker check
-        if self.circuit_breaker:
-            can_attempt, reason = self.circuit_breaker.can_attempt()
+        if circuit_breaker:
+            can_attempt, reason = circuit_breaker.can_attempt()
             if not can_attempt:
                 if self.metrics:
                     self.metrics.circuit_breaker_blocks += 1
-                raise RuntimeError(f"Circuit breaker: {reason}")
+                raise RuntimeError(f"Circuit breaker ({provider}): {reason}")
 
         # Rate limiting check
-        if self.rate_limiter:
-            can_proceed, wait_time = self.rate_limiter.can_proceed()
+        if rate_limiter:
+            can_proceed, wait_time = rate_limiter.can_proceed()
             if not can_proceed:
                 logger.warning(f"Rate limited, waiting {wait_time:.1f}s")
                 if self.metrics:
@@ -435,50 +799,34 @@ class LLMClient:
         # Stream with retry logic
         last_error = None
         for attempt in range(self.max_retries + 1):
+            attempt_messages = session.request_messages()
+            generated_before = session.generated_tokens
+            completed = False
             try:
                 start_time = time.time()
-                chunks_received = 0
-
-                # Select provider stream method
-                if provider == "ollama":
-                    if not self.ollama_client:
-                        raise RuntimeError("Ollama not initialized")
-                    stream_gen = self._stream_ollama(messages, max_tokens, temperature)
-                elif provider == "gemini":
-                    if not self.gemini_client:
-                        raise RuntimeError("Gemini not initialized")
-                    stream_gen = self._stream_gemini(messages, max_tokens, temperature)
-                elif provider == "nebius":
-                    if not self.nebius_client:
-                        raise RuntimeError("Nebius not initialized")
-                    stream_gen = self._stream_nebius(messages, max_tokens, temperature)
-                else:  # hf
-                    if not self.hf_client:
-                        raise RuntimeError("HuggingFace not initialized")
-                    stream_gen = self._stream_hf(messages, max_tokens, temperature)
-
-                # Stream chunks
-                async for chunk in stream_gen:
-                    chunks_received += 1
+                first_token_time = None
+
+                # Stream chunks not delivered by an earlier attempt
+                stream = self._open_stream(provider, attempt_messages, max_tokens, temperature)
+                async for chunk in session.resume(stream):
+                    if first_token_time is None:
+                        first_token_time = time.time()
                     yield chunk
 
                 # Success
+                completed = True
                 latency = time.time() - start_time
+                tokens = session.generated_tokens - generated_before
                 if self.metrics:
-                    self.metrics.record_success(provider, latency, tokens=chunks_received)
-                if self.circuit_breaker:
-                    self.circuit_breaker.record_success()
-                if self.rate_limiter:
-                    self.rate_limiter.record_request(tokens=chunks_received)
-
-                # Callback for token tracking (NEW!)
-                if self.token_callback:
-                    try:
-                        # Estimate input tokens (rough: 1 token = 4 chars)
-                        input_estimate = sum(len(m.get('content', '')) for m in messages) // 4
-                        self.token_callback(input_estimate, chunks_received)
-                    except Exception as e:
-                        logger.warning(f"Token callback failed: {type(e).__name__}: {e}")
+                    self.metrics.record_success(provider, latency, tokens=tokens)
+                if first_token_time is not None:
+                    self.provider_latency.setdefault(provider, ProviderLatency()).record(
+                        first_token_time - start_time, tokens, latency
+                    )
+                if circuit_breaker:
+                    circuit_breaker.record_success()
+                if rate_limiter:
+                    rate_limiter.record_request(tokens=tokens)
 
                 if attempt > 0:
                     logger.info(f"✅ Streaming succeeded after {attempt} retries")
@@ -495,12 +843,12 @@ class LLMClient:
                     logger.error(f"Non-retryable {type(e).__name__} - will not retry: {str(e)[:200]}", exc_info=True)
                     if self.metrics:
                         self.metrics.record_failure(provider)
-                    if self.circuit_breaker:
-                        self.circuit_breaker.record_failure()
+                    if circuit_breaker:
+                        circuit_breaker.record_failure()
                     raise
 
-                if self.circuit_breaker:
-                    self.circuit_breaker.record_failure()
+                if circuit_breaker:
+                    circuit_breaker.record_failure()
 
                 if attempt >= self.max_retries:
                     if self.metrics:
@@ -514,9 +862,50 @@ class LLMClient:
 
                 await asyncio.sleep(delay)
 
+            finally:
+                # Partial attempts are billed too
+                generated = session.generated_tokens - generated_before
+                if completed or generated:
+                    self._report_tokens(attempt_messages, generated)
+
         logger.error(f"❌ All {self.max_retries + 1} stream attempts failed")
         raise last_error
 
+    def _report_tokens(self, messages: List[Dict[str, str]], output_tokens: int) -> None:
+        """Pass one attempt's input/output token counts to token_callback."""
+        if not self.token_callback:
+            return
+        try:
+            input_tokens = sum(count_tokens(m.get('content', '')) for m in messages)
+            self.token_callback(input_tokens, output_tokens)
+        except Exception as e:
+            logger.warning(f"Token callback failed: {type(e).__name__}: {e}")
+
+    def _open_stream(
+        self,
+        provider: str,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        temperature: float
+    ) -> AsyncIterator[str]:
+        """Select provider stream method."""
+        if provider == "ollama":
+            if not self.ollama_client:
+                raise RuntimeError("Ollama not initialized")
+            return self._stream_ollama(messages, max_tokens, temperature)
+        if provider == "gemini":
+            if not self.gemini_client:
+                raise RuntimeError("Gemini not initialized")
+            return self._stream_gemini(messages, max_tokens, temperature)
+        if provider == "nebius":
+            if not self.nebius_client:
+                raise RuntimeError("Nebius not initialized")
+            return self._stream_nebius(messages, max_tokens, temperature)
+        # hf
+        if not self.hf_client:
+            raise RuntimeError("HuggingFace not initialized")
+        return self._stream_hf(messages, max_tokens, temperature)
+
     async def _stream_hf(
         self,
         messages: list,
@@ -646,26 +1035,43 @@ class LLMClient:
 
         stats = self.metrics.get_stats()
 
-        if self.circuit_breaker:
-            stats["circuit_breaker"] = {
-                "state": self.circuit_breaker.state.value,
-                "failures": self.circuit_breaker.failures
+        def breaker_stats(breaker: CircuitBreaker) -> Dict[str, Any]:
+            return {"state": breaker.state.value, "failures": breaker.failures}
+
+        def limiter_stats(limiter: RateLimiter) -> Dict[str, Any]:
+            return {
+                "requests_last_minute": len(limiter.request_times),
+                "tokens_last_minute": sum(count for _, count in limiter.token_counts)
             }
 
+        if self.circuit_breaker:
+            stats["circuit_breaker"] = breaker_stats(self.circuit_breaker)
+            stats["circuit_breakers"] = {p: breaker_stats(b) for p, b in self.circuit_breakers.items()}
+
         if self.rate_limiter:
-            stats["rate_limiter"] = {
-                "requests_last_minute": len(self.rate_limiter.request_times),
-                "tokens_last_minute": sum(count for _, count in self.rate_limiter.token_counts)
+            stats["rate_limiter"] = limiter_stats(self.rate_limiter)
+            stats["rate_limiters"] = {p: limiter_stats(r) for p, r in self.rate_limiters.items()}
+
+        stats["routing"] = {
+            provider: {
+                "ttft_ms": f"{latency.ttft_ewma * 1000:.0f}ms",
+                "ttft_p95_ms": f"{latency.ttft_quantile(0.95) * 1000:.0f}ms",
+                "tokens_per_sec": f"{latency.tps_ewma or 0:.1f}",
             }
+            for provider, latency in self.provider_latency.items()
+        }
 
         return stats
 
-    def reset_circuit_breaker(self) -> None:
-        """Manually reset circuit breaker."""
-        if self.circuit_breaker:
-            self.circuit_breaker.failures = 0
-            self.circuit_breaker.state = CircuitState.CLOSED
-            logger.info("Circuit breaker manually reset")
+    def reset_circuit_breaker(self, provider: Optional[str] = None) -> None:
+        """Manually reset one provider's circuit breaker, or all of them."""
+        providers = [provider] if provider else list(self.circuit_breakers)
+        for name in providers:
+            breaker = self.circuit_breakers.get(name)
+            if breaker:
+                breaker.failures = 0
+                breaker.state = CircuitState.CLOSED
+                logger.info(f"Circuit breaker manually reset ({name})")
 
     def reset_metrics(self) -> None:
         """Reset telemetry metrics."""
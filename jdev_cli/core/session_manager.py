@@ -8,7 +8,7 @@ Implements comprehensive session management:
 - Auto-save snapshots at configurable intervals
 - Checksum verification for corruption detection
 - Automatic recovery on startup
-- Session history with search
+- Session history with ranked full-text search
 - Conversation context persistence
 
 Design Philosophy:
@@ -25,14 +25,18 @@ import json
 import time
 import hashlib
 import gzip
-from typing import Any, Dict, List, Optional, TypeVar
+import zlib
+from typing import Any, Dict, List, Optional, Tuple, TypeVar
 from pathlib import Path
 from dataclasses import dataclass, field
 from enum import Enum
 from datetime import datetime
+import sqlite3
 import threading
 import logging
 
+from .session_search import FTS5_AVAILABLE, SearchHit, SessionSearchIndex
+
 logger = logging.getLogger(__name__)
 
 T = TypeVar('T')
@@ -97,6 +101,9 @@ class SessionSnapshot:
     # Metadata
     metadata: Dict[str, Any] = field(default_factory=dict)
 
+    # Last journal record folded into this snapshot
+    journal_seq: int = 0
+
     def to_dict(self) -> Dict[str, Any]:
         """Serialize to dictionary."""
         return {
@@ -111,6 +118,7 @@ class SessionSnapshot:
             "open_files": self.open_files,
             "pending_operations": self.pending_operations,
             "metadata": self.metadata,
+            "journal_seq": self.journal_seq,
         }
 
     @classmethod
@@ -128,6 +136,7 @@ class SessionSnapshot:
             open_files=data.get("open_files", []),
             pending_operations=data.get("pending_operations", []),
             metadata=data.get("metadata", {}),
+            journal_seq=data.get("journal_seq", 0),
         )
 
 
@@ -151,9 +160,25 @@ class SessionManager:
     - Auto-save at configurable intervals
     - Checksum verification for corruption detection
     - Automatic crash recovery
-    - Session history with search
+    - Session history with ranked full-text search
     - Compression for storage efficiency
 
+    Storage per session:
+    - `{id}.json[.gz]`: snapshot, written atomically on compaction
+    - `{id}.journal`: append-only change log since the snapshot, one
+      `<crc32> <json>` line per change; save() appends what changed and
+      fsyncs once per batch, so auto-save costs O(changes), not O(session)
+
+    Loading reads the snapshot and replays journal records newer than it;
+    a torn last record (crash mid-write) is detected by its CRC and dropped.
+    The journal is compacted into a new snapshot once it exceeds
+    `compact_threshold` bytes and when the session ends.
+
+    Messages are also indexed in `search_index.db` (SQLite FTS5, see
+    SessionSearchIndex) as they are saved; search_sessions/search_messages
+    query it instead of loading every session. Sessions saved without the
+    index (older versions, FTS5 missing) are backfilled on the next search.
+
     Usage:
         manager = SessionManager()
 
@@ -174,9 +199,12 @@ class SessionManager:
     SESSION_DIR = ".qwen_sessions"
     CURRENT_SESSION_FILE = "current_session.json"
     INDEX_FILE = "sessions_index.json"
+    SEARCH_INDEX_FILE = "search_index.db"
+    JOURNAL_SUFFIX = ".journal"
     AUTO_SAVE_INTERVAL = 30  # seconds
     MAX_SESSIONS = 50  # Keep last N sessions
     COMPRESSION_THRESHOLD = 10 * 1024  # Compress if > 10KB
+    COMPACT_THRESHOLD = 1024 * 1024  # Fold the journal into a snapshot past 1MB
 
     def __init__(
         self,
@@ -184,6 +212,9 @@ class SessionManager:
         auto_save_interval: float = AUTO_SAVE_INTERVAL,
         enable_compression: bool = True,
         max_sessions: int = MAX_SESSIONS,
+        compact_threshold: int = COMPACT_THRESHOLD,
+        fsync: bool = True,
+        search_index: bool = True,
     ):
         """
         Initialize SessionManager.
@@ -193,11 +224,17 @@ class SessionManager:
             auto_save_interval: Auto-save interval in seconds
             enable_compression: Enable gzip compression
             max_sessions: Maximum number of sessions to keep
+            compact_threshold: Journal size (bytes) that triggers compaction
+            fsync: fsync journal appends and snapshots (one fsync per save)
+            search_index: Maintain the full-text message index (needs FTS5;
+                without it search falls back to scanning recent sessions)
         """
         self.session_dir = Path(session_dir or self.SESSION_DIR)
         self.auto_save_interval = auto_save_interval
         self.enable_compression = enable_compression
         self.max_sessions = max_sessions
+        self.compact_threshold = compact_threshold
+        self.fsync = fsync
 
         self._current_session: Optional[SessionSnapshot] = None
         self._dirty = False
@@ -205,9 +242,27 @@ class SessionManager:
         self._auto_save_thread: Optional[threading.Thread] = None
         self._stop_auto_save = threading.Event()
 
+        # Journal state of the current session
+        self._lock = threading.RLock()
+        self._journal_buffer: List[Dict[str, Any]] = []
+        self._journal_seq = 0
+        self._journal_size = 0
+        self._journaled_messages = 0
+        self._needs_compaction = False
+        self._index_cache: Optional[Tuple[Tuple[int, int, int], Dict[str, Dict[str, Any]]]] = None
+
         # Ensure session directory exists
         self.session_dir.mkdir(parents=True, exist_ok=True)
 
+        # Full-text index; messages up to _indexed_messages are in it
+        self._search_index: Optional[SessionSearchIndex] = None
+        self._indexed_messages = 0
+        if search_index and FTS5_AVAILABLE:
+            try:
+                self._search_index = SessionSearchIndex(self.session_dir / self.SEARCH_INDEX_FILE)
+            except sqlite3.Error as e:
+                logger.warning(f"Session search index unavailable: {e}")
+
     def _generate_session_id(self) -> str:
         """Generate unique session ID."""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -218,7 +273,7 @@ class SessionManager:
         """Compute checksum for data integrity verification."""
         # Exclude checksum field itself
         data_copy = {k: v for k, v in data.items() if k != "checksum"}
-        content = json.dumps(data_copy, sort_keys=True)
+        content = json.dumps(data_copy, sort_keys=True, default=str)
         return hashlib.sha256(content.encode()).hexdigest()[:16]
 
     def _get_session_path(self, session_id: str) -> Path:
@@ -226,21 +281,45 @@ class SessionManager:
         ext = ".json.gz" if self.enable_compression else ".json"
         return self.session_dir / f"{session_id}{ext}"
 
-    def _save_session(self, snapshot: SessionSnapshot, path: Path) -> bool:
-        """Save session snapshot to file."""
+    def _snapshot_paths(self, session_id: str) -> List[Path]:
+        """Candidate snapshot files, preferred first (incl. older doubled suffixes)."""
+        return [
+            self.session_dir / f"{session_id}{ext}"
+            for ext in (".json.gz", ".json", ".json.json.gz", ".json.json")
+        ]
+
+    def _get_journal_path(self, session_id: str) -> Path:
+        """Get path for session journal."""
+        return self.session_dir / f"{session_id}{self.JOURNAL_SUFFIX}"
+
+    def _write_atomic(self, path: Path, data: bytes) -> None:
+        """Replace `path` with `data` via a temp file and rename."""
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+            if self.fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def _save_session(self, snapshot: SessionSnapshot) -> bool:
+        """Save session snapshot to file (atomically)."""
         try:
             data = snapshot.to_dict()
             data["checksum"] = self._compute_checksum(data)
 
-            content = json.dumps(data, indent=2)
+            content = json.dumps(data, default=str).encode("utf-8")
 
+            gz_path, plain_path = self._snapshot_paths(snapshot.session_id)[:2]
             if self.enable_compression and len(content) > self.COMPRESSION_THRESHOLD:
-                path = path.with_suffix(".json.gz")
-                with gzip.open(str(path), 'wt', encoding='utf-8') as f:
-                    f.write(content)
+                path, stale = gz_path, plain_path
+                content = gzip.compress(content, compresslevel=6)
             else:
-                path = path.with_suffix(".json")
-                path.write_text(content)
+                path, stale = plain_path, gz_path
+
+            self._write_atomic(path, content)
+            if stale.exists():
+                stale.unlink()  # Loading prefers .gz; never leave an older one behind
 
             return True
 
@@ -248,19 +327,20 @@ class SessionManager:
             logger.error(f"Failed to save session: {e}")
             return False
 
-    def _load_session(self, path: Path) -> Optional[SessionSnapshot]:
-        """Load session snapshot from file."""
+    def _load_session(self, session_id: str) -> Optional[SessionSnapshot]:
+        """Load session snapshot and replay its journal."""
         try:
-            # Try compressed first
-            if path.with_suffix(".json.gz").exists():
-                path = path.with_suffix(".json.gz")
+            for path in self._snapshot_paths(session_id):
+                if path.exists():
+                    break
+            else:
+                return None
+
+            if path.suffix == ".gz":
                 with gzip.open(str(path), 'rt', encoding='utf-8') as f:
                     content = f.read()
-            elif path.with_suffix(".json").exists():
-                path = path.with_suffix(".json")
-                content = path.read_text()
             else:
-                return None
+                content = path.read_text()
 
             data = json.loads(content)
 
@@ -273,14 +353,128 @@ class SessionManager:
                 # Still try to load, but mark as potentially corrupted
                 data["metadata"]["checksum_mismatch"] = True
 
-            return SessionSnapshot.from_dict(data)
+            session = SessionSnapshot.from_dict(data)
 
         except Exception as e:
             logger.error(f"Failed to load session: {e}")
             return None
 
+        for record in self._read_journal(session_id)[0]:
+            if record["seq"] > session.journal_seq:
+                self._apply_record(session, record)
+        return session
+
+    # === Journal ===
+
+    def _read_journal(self, session_id: str) -> Tuple[List[Dict[str, Any]], int]:
+        """Valid journal records and the byte offset where they end."""
+        path = self._get_journal_path(session_id)
+        if not path.exists():
+            return [], 0
+
+        records = []
+        offset = 0
+        with open(path, "rb") as f:
+            for line in f:
+                try:
+                    crc, payload = line.rstrip(b"\n").split(b" ", 1)
+                    if not line.endswith(b"\n") or int(crc, 16) != zlib.crc32(payload):
+                        raise ValueError("bad record")
+                    records.append(json.loads(payload))
+                except ValueError:
+                    logger.warning(f"Dropping torn journal tail of {session_id} at byte {offset}")
+                    break
+                offset += len(line)
+        return records, offset
+
+    def _apply_record(self, session: SessionSnapshot, record: Dict[str, Any]) -> None:
+        """Replay one journal record onto a snapshot."""
+        op = record["op"]
+        if op == "message":
+            session.messages.append(ConversationMessage.from_dict(record["message"]))
+        elif op == "context":
+            session.context[record["key"]] = record["value"]
+        elif op == "pending":
+            session.pending_operations.append(record["operation"])
+        elif op == "clear_pending":
+            session.pending_operations = []
+        elif op == "state":
+            session.state = SessionState(record["state"])
+        session.updated_at = record.get("t", session.updated_at)
+        session.journal_seq = record["seq"]
+
+    def _journal(self, op: str, **fields: Any) -> None:
+        """Queue a change for the next save."""
+        self._journal_seq += 1
+        self._journal_buffer.append({"seq": self._journal_seq, "op": op, "t": time.time(), **fields})
+        self._dirty = True
+
+    def _open_journal(self, session: SessionSnapshot) -> None:
+        """Take over a session's journal: drop a torn tail, continue its numbering."""
+        path = self._get_journal_path(session.session_id)
+        records, offset = self._read_journal(session.session_id)
+        if path.exists() and offset < path.stat().st_size:
+            with open(path, "r+b") as f:
+                f.truncate(offset)
+        self._journal_buffer = []
+        self._journal_seq = max([session.journal_seq] + [r["seq"] for r in records])
+        self._journal_size = offset
+        self._journaled_messages = len(session.messages)
+        self._needs_compaction = False
+        self._indexed_messages = 0
+        if self._search_index:
+            try:
+                self._indexed_messages = self._search_index.indexed_count(session.session_id)
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to read session search index: {e}")
+
+    def _append_journal(self) -> bool:
+        """Write buffered records with one write and one fsync."""
+        if not self._journal_buffer:
+            return True
+        lines = []
+        for record in self._journal_buffer:
+            payload = json.dumps(record, default=str).encode("utf-8")
+            lines.append(b"%08x %s\n" % (zlib.crc32(payload), payload))
+        data = b"".join(lines)
+
+        try:
+            with open(self._get_journal_path(self._current_session.session_id), "ab") as f:
+                f.write(data)
+                if self.fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+        except OSError as e:
+            logger.error(f"Failed to append session journal: {e}")
+            return False
+
+        self._journal_buffer = []
+        self._journal_size += len(data)
+        return True
+
+    def _compact(self) -> bool:
+        """Write a full snapshot, then start an empty journal."""
+        session = self._current_session
+        session.journal_seq = self._journal_seq
+        if not self._save_session(session):
+            return False
+
+        # Records up to journal_seq are in the snapshot; replay skips them even if this fails
+        path = self._get_journal_path(session.session_id)
+        try:
+            if path.exists():
+                path.unlink()
+        except OSError as e:
+            logger.warning(f"Could not remove compacted journal: {e}")
+
+        self._journal_buffer = []
+        self._journal_size = 0
+        self._journaled_messages = len(session.messages)
+        self._needs_compaction = False
+        return True
+
     def _update_index(self, session_info: SessionInfo) -> None:
-        """Update session index file."""
+        """Update session index file (atomically)."""
         index_path = self.session_dir / self.INDEX_FILE
         index: Dict[str, Dict[str, Any]] = {}
 
@@ -307,18 +501,104 @@ class SessionManager:
                 reverse=True
             )
             index = dict(sorted_sessions[:self.max_sessions])
+            pruned = [session_id for session_id, _ in sorted_sessions[self.max_sessions:]]
 
             # Delete old session files
-            for session_id, _ in sorted_sessions[self.max_sessions:]:
-                for ext in [".json", ".json.gz"]:
-                    path = self.session_dir / f"{session_id}{ext}"
+            for session_id in pruned:
+                for path in self._snapshot_paths(session_id) + [self._get_journal_path(session_id)]:
                     if path.exists():
                         try:
                             path.unlink()
                         except Exception:
                             pass
 
-        index_path.write_text(json.dumps(index, indent=2))
+            if self._search_index:
+                try:
+                    self._search_index.delete_sessions(pruned)
+                except sqlite3.Error as e:
+                    logger.warning(f"Failed to prune session search index: {e}")
+
+        self._write_atomic(index_path, json.dumps(index, indent=2).encode("utf-8"))
+
+    def _read_index(self) -> Dict[str, Dict[str, Any]]:
+        """Parsed session index, re-read only when the file changed."""
+        index_path = self.session_dir / self.INDEX_FILE
+        try:
+            st = index_path.stat()
+        except FileNotFoundError:
+            return {}
+        key = (st.st_ino, st.st_mtime_ns, st.st_size)
+        if self._index_cache is None or self._index_cache[0] != key:
+            self._index_cache = (key, json.loads(index_path.read_text()))
+        return self._index_cache[1]
+
+    def _session_info(self, session_id: str, data: Dict[str, Any]) -> SessionInfo:
+        """SessionInfo from a session index entry."""
+        return SessionInfo(
+            session_id=session_id,
+            state=SessionState(data["state"]),
+            created_at=data["created_at"],
+            updated_at=data["updated_at"],
+            message_count=data["message_count"],
+            working_directory=data["working_directory"],
+            summary=data["summary"],
+        )
+
+    def _index_new_messages(self) -> None:
+        """Add messages saved since the last call to the search index."""
+        session = self._current_session
+        if not self._search_index or len(session.messages) <= self._indexed_messages:
+            return
+        new = session.messages[self._indexed_messages:]
+        try:
+            self._indexed_messages = self._search_index.add_messages(
+                session.session_id,
+                self._indexed_messages,
+                [(m.role, m.content, m.timestamp) for m in new],
+            )
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to index session messages: {e}")
+
+    def _sync_search_index(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Bring the search index in line with the session index.
+
+        Indexes sessions saved without it (other processes, older versions)
+        and drops sessions pruned elsewhere. Cheap when nothing changed.
+
+        Returns:
+            The session index
+        """
+        index = self._read_index()
+        counts = self._search_index.indexed_counts()
+
+        removed = [sid for sid in counts if sid not in index]
+        if removed:
+            self._search_index.delete_sessions(removed)
+
+        for session_id, data in index.items():
+            indexed = counts.get(session_id, 0)
+            if data["message_count"] <= indexed:
+                continue
+            session = self._load_session(session_id)
+            if session and len(session.messages) > indexed:
+                self._search_index.add_messages(
+                    session_id,
+                    indexed,
+                    [(m.role, m.content, m.timestamp) for m in session.messages[indexed:]],
+                )
+        return index
+
+    def _write_current_marker(self) -> None:
+        """Point the crash-recovery marker at the current session."""
+        current_data = {
+            "session_id": self._current_session.session_id,
+            "updated_at": self._current_session.updated_at,
+        }
+        self._write_atomic(
+            self.session_dir / self.CURRENT_SESSION_FILE,
+            json.dumps(current_data).encode("utf-8"),
+        )
 
     def _auto_save_loop(self) -> None:
         """Background thread for auto-saving."""
@@ -360,21 +640,25 @@ class SessionManager:
         session_id = self._generate_session_id()
         now = time.time()
 
-        self._current_session = SessionSnapshot(
-            session_id=session_id,
-            state=SessionState.ACTIVE,
-            created_at=now,
-            updated_at=now,
-            checksum="",
-            messages=[],
-            context=context or {},
-            working_directory=working_directory or os.getcwd(),
-            open_files=[],
-            pending_operations=[],
-        )
+        with self._lock:
+            self._current_session = SessionSnapshot(
+                session_id=session_id,
+                state=SessionState.ACTIVE,
+                created_at=now,
+                updated_at=now,
+                checksum="",
+                messages=[],
+                context=context or {},
+                working_directory=working_directory or os.getcwd(),
+                open_files=[],
+                pending_operations=[],
+            )
+            self._open_journal(self._current_session)
 
-        self._dirty = True
-        self.save()
+            self._dirty = True
+            self._needs_compaction = True  # Initial snapshot
+            self.save()
+            self._write_current_marker()
 
         # Start auto-save
         self._start_auto_save()
@@ -386,20 +670,24 @@ class SessionManager:
         """
         Resume an existing session.
 
+        Loads the last snapshot and replays the journal written since.
+
         Args:
             session_id: Session ID to resume
 
         Returns:
             Session snapshot if found, None otherwise
         """
-        path = self._get_session_path(session_id)
-        session = self._load_session(path)
+        session = self._load_session(session_id)
 
         if session:
-            session.state = SessionState.RECOVERED
-            session.updated_at = time.time()
-            self._current_session = session
-            self._dirty = True
+            with self._lock:
+                self._current_session = session
+                self._open_journal(session)
+                session.state = SessionState.RECOVERED
+                session.updated_at = time.time()
+                self._journal("state", state=session.state.value)
+                self._write_current_marker()
 
             # Start auto-save
             self._start_auto_save()
@@ -433,8 +721,7 @@ class SessionManager:
                 session_id = data.get("session_id")
 
                 if session_id:
-                    path = self._get_session_path(session_id)
-                    session = self._load_session(path)
+                    session = self._load_session(session_id)
 
                     if session and session.state == SessionState.ACTIVE:
                         session.state = SessionState.CRASHED
@@ -469,35 +756,40 @@ class SessionManager:
             metadata=metadata or {},
         )
 
-        self._current_session.messages.append(message)
-        self._current_session.updated_at = time.time()
-        self._dirty = True
+        with self._lock:
+            self._current_session.messages.append(message)
+            self._current_session.updated_at = time.time()
+            self._journaled_messages += 1
+            self._journal("message", message=message.to_dict())
 
     def update_context(self, key: str, value: Any) -> None:
         """Update session context."""
         if not self._current_session:
             raise RuntimeError("No active session")
 
-        self._current_session.context[key] = value
-        self._current_session.updated_at = time.time()
-        self._dirty = True
+        with self._lock:
+            self._current_session.context[key] = value
+            self._current_session.updated_at = time.time()
+            self._journal("context", key=key, value=value)
 
     def add_pending_operation(self, operation: Dict[str, Any]) -> None:
         """Add a pending operation (for crash recovery)."""
         if not self._current_session:
             return
 
-        self._current_session.pending_operations.append(operation)
-        self._dirty = True
+        with self._lock:
+            self._current_session.pending_operations.append(operation)
+            self._journal("pending", operation=operation)
 
     def clear_pending_operations(self) -> List[Dict[str, Any]]:
         """Clear and return pending operations."""
         if not self._current_session:
             return []
 
-        operations = self._current_session.pending_operations
-        self._current_session.pending_operations = []
-        self._dirty = True
+        with self._lock:
+            operations = self._current_session.pending_operations
+            self._current_session.pending_operations = []
+            self._journal("clear_pending")
 
         return operations
 
@@ -505,44 +797,53 @@ class SessionManager:
         """
         Save current session to disk.
 
+        Appends the changes made since the last save to the journal, or
+        compacts into a new snapshot when the journal has grown past
+        compact_threshold.
+
         Returns:
             True if save was successful
         """
-        if not self._current_session:
-            return False
+        with self._lock:
+            if not self._current_session:
+                return False
 
-        self._current_session.updated_at = time.time()
+            self._current_session.updated_at = time.time()
 
-        # Save session file
-        path = self._get_session_path(self._current_session.session_id)
-        if not self._save_session(self._current_session, path):
-            return False
+            # Messages appended to the snapshot directly never reached the journal
+            if len(self._current_session.messages) != self._journaled_messages:
+                self._needs_compaction = True
+
+            if self._needs_compaction or self._journal_size >= self.compact_threshold:
+                if not self._compact():
+                    return False
+            elif not self._append_journal():
+                return False
+
+            # Update index
+            summary = self._generate_summary()
+            info = SessionInfo(
+                session_id=self._current_session.session_id,
+                state=self._current_session.state,
+                created_at=self._current_session.created_at,
+                updated_at=self._current_session.updated_at,
+                message_count=len(self._current_session.messages),
+                working_directory=self._current_session.working_directory,
+                summary=summary,
+            )
+            try:
+                self._update_index(info)
+            except OSError as e:
+                logger.error(f"Failed to update session index: {e}")
 
-        # Update current session marker
-        current_path = self.session_dir / self.CURRENT_SESSION_FILE
-        current_data = {
-            "session_id": self._current_session.session_id,
-            "updated_at": self._current_session.updated_at,
-        }
-        current_path.write_text(json.dumps(current_data))
-
-        # Update index
-        summary = self._generate_summary()
-        info = SessionInfo(
-            session_id=self._current_session.session_id,
-            state=self._current_session.state,
-            created_at=self._current_session.created_at,
-            updated_at=self._current_session.updated_at,
-            message_count=len(self._current_session.messages),
-            working_directory=self._current_session.working_directory,
-            summary=summary,
-        )
-        self._update_index(info)
+            # After the session index, so a concurrent search never sees
+            # indexed messages of a session it does not know yet
+            self._index_new_messages()
 
-        self._dirty = False
-        self._last_save = time.time()
+            self._dirty = False
+            self._last_save = time.time()
 
-        return True
+            return True
 
     def _generate_summary(self) -> str:
         """Generate brief summary of session."""
@@ -564,11 +865,13 @@ class SessionManager:
         return f"{len(messages)} messages"
 
     def end_session(self) -> None:
-        """End the current session gracefully."""
+        """End the current session gracefully (compacting its journal)."""
         if self._current_session:
-            self._current_session.state = SessionState.COMPLETED
-            self._current_session.updated_at = time.time()
-            self.save()
+            with self._lock:
+                self._current_session.state = SessionState.COMPLETED
+                self._current_session.updated_at = time.time()
+                self._needs_compaction = True
+                self.save()
 
             # Remove current session marker
             current_path = self.session_dir / self.CURRENT_SESSION_FILE
@@ -588,26 +891,8 @@ class SessionManager:
         Returns:
             List of session info, newest first
         """
-        index_path = self.session_dir / self.INDEX_FILE
-
-        if not index_path.exists():
-            return []
-
         try:
-            index = json.loads(index_path.read_text())
-
-            sessions = [
-                SessionInfo(
-                    session_id=sid,
-                    state=SessionState(data["state"]),
-                    created_at=data["created_at"],
-                    updated_at=data["updated_at"],
-                    message_count=data["message_count"],
-                    working_directory=data["working_directory"],
-                    summary=data["summary"],
-                )
-                for sid, data in index.items()
-            ]
+            sessions = [self._session_info(sid, data) for sid, data in self._read_index().items()]
 
             # Sort by updated_at, newest first
             sessions.sort(key=lambda s: s.updated_at, reverse=True)
@@ -622,40 +907,118 @@ class SessionManager:
         self,
         query: str,
         limit: int = 10,
+        role: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
     ) -> List[SessionInfo]:
         """
         Search sessions by content.
 
         Args:
-            query: Search query
+            query: Search query (words match as prefixes, "quoted" as phrases;
+                all terms must appear in one message)
             limit: Maximum results
+            role: Only match messages with this role
+            since/until: Only match messages timestamped within this range
 
         Returns:
-            Matching sessions
+            Matching sessions, most relevant first
         """
-        query_lower = query.lower()
-        results = []
+        if self._search_index:
+            try:
+                index = self._sync_search_index()
+                ranked = self._search_index.search_sessions(
+                    query, limit=limit, role=role, since=since, until=until
+                )
+                return [self._session_info(sid, index[sid]) for sid, _, _ in ranked if sid in index]
+            except (sqlite3.Error, OSError, ValueError) as e:
+                logger.warning(f"Session search index failed, scanning instead: {e}")
 
-        for session_info in self.list_sessions(limit=100):
-            # Check summary
-            if query_lower in session_info.summary.lower():
+        results: List[SessionInfo] = []
+        for session_info, _ in self._scan_messages(query, role, since, until):
+            if not results or results[-1].session_id != session_info.session_id:
                 results.append(session_info)
-                continue
+                if len(results) >= limit:
+                    break
+        return results
 
-            # Load full session and search messages
-            path = self._get_session_path(session_info.session_id)
-            session = self._load_session(path)
+    def search_messages(
+        self,
+        query: str,
+        limit: int = 20,
+        role: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        session_id: Optional[str] = None,
+    ) -> List[SearchHit]:
+        """
+        Search individual messages across sessions.
 
-            if session:
-                for msg in session.messages:
-                    if query_lower in msg.content.lower():
-                        results.append(session_info)
-                        break
+        Args:
+            query: Search query (as for search_sessions)
+            limit: Maximum hits
+            role: Only messages with this role
+            since/until: Only messages timestamped within this range
+            session_id: Only messages of this session
 
-            if len(results) >= limit:
-                break
+        Returns:
+            Hits with highlighted snippets, most relevant first
+        """
+        if self._search_index:
+            try:
+                self._sync_search_index()
+                return self._search_index.search(
+                    query, limit=limit, role=role, since=since, until=until, session_id=session_id
+                )
+            except (sqlite3.Error, OSError, ValueError) as e:
+                logger.warning(f"Session search index failed, scanning instead: {e}")
+
+        hits: List[SearchHit] = []
+        for session_info, hit in self._scan_messages(query, role, since, until):
+            if session_id is None or session_info.session_id == session_id:
+                hits.append(hit)
+                if len(hits) >= limit:
+                    break
+        return hits
+
+    def _scan_messages(
+        self,
+        query: str,
+        role: Optional[str],
+        since: Optional[float],
+        until: Optional[float],
+    ):
+        """Fallback search: substring scan of the 100 most recent sessions."""
+        query_lower = query.lower()
 
-        return results
+        for session_info in self.list_sessions(limit=100):
+            session = self._load_session(session_info.session_id)
+            if not session:
+                continue
+
+            for position, msg in enumerate(session.messages):
+                if role and msg.role != role:
+                    continue
+                if (since is not None and msg.timestamp < since) or (until is not None and msg.timestamp > until):
+                    continue
+                at = msg.content.lower().find(query_lower)
+                if at < 0:
+                    continue
+                start, end = max(0, at - 40), at + len(query) + 40
+                snippet = (
+                    ("…" if start else "")
+                    + msg.content[start:at] + "**" + msg.content[at:at + len(query)] + "**"
+                    + msg.content[at + len(query):end]
+                    + ("…" if end < len(msg.content) else "")
+                )
+                yield session_info, SearchHit(
+                    session_id=session_info.session_id,
+                    position=position,
+                    role=msg.role,
+                    timestamp=msg.timestamp,
+                    snippet=snippet,
+                    score=0.0,
+                )
 
     def get_messages(
         self,
@@ -741,6 +1104,7 @@ __all__ = [
     'ConversationMessage',
     'SessionSnapshot',
     'SessionInfo',
+    'SearchHit',
     'SessionManager',
     'get_session_manager',
     'start_session',
@@ -0,0 +1,303 @@
+"""
+SessionSearchIndex - Full-text index over session messages.
+
+Backs SessionManager.search_sessions/search_messages. Messages are indexed
+incrementally as sessions are saved (appended by position, never rewritten),
+so a search is one FTS5 query instead of loading and gunzipping every
+session file.
+
+Storage (`search_index.db` in the session directory):
+- `messages`: one row per message (session, position, role, timestamp, text)
+- `messages_fts`: external-content FTS5 table over `messages.content`,
+  kept in sync by triggers
+- `indexed_sessions`: how many messages of each session are indexed
+
+Queries are ranked with bm25; plain words match as prefixes ("pars" finds
+"parser"), double-quoted text matches as a phrase.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import sqlite3
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY,
+    session_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    role TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    content TEXT NOT NULL,
+    UNIQUE (session_id, position)
+);
+CREATE INDEX IF NOT EXISTS messages_by_time ON messages (timestamp);
+CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
+    content, content='messages', content_rowid='id',
+    tokenize='porter unicode61 remove_diacritics 1'
+);
+CREATE TRIGGER IF NOT EXISTS messages_fts_insert AFTER INSERT ON messages BEGIN
+    INSERT INTO messages_fts (rowid, content) VALUES (NEW.id, NEW.content);
+END;
+CREATE TRIGGER IF NOT EXISTS messages_fts_delete AFTER DELETE ON messages BEGIN
+    INSERT INTO messages_fts (messages_fts, rowid, content) VALUES ('delete', OLD.id, OLD.content);
+END;
+CREATE TABLE IF NOT EXISTS indexed_sessions (
+    session_id TEXT PRIMARY KEY,
+    message_count INTEGER NOT NULL
+);
+"""
+
+_QUERY_TOKEN = re.compile(r'"([^"]*)"|(\S+)')
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def _fts5_available() -> bool:
+    try:
+        conn = sqlite3.connect(":memory:")
+        try:
+            conn.execute("CREATE VIRTUAL TABLE probe USING fts5(content)")
+        finally:
+            conn.close()
+        return True
+    except sqlite3.Error:
+        return False
+
+
+FTS5_AVAILABLE = _fts5_available()
+
+# (role, content, timestamp)
+IndexedMessage = Tuple[str, str, float]
+
+
+@dataclass
+class SearchHit:
+    """A message matching a search query."""
+    session_id: str
+    position: int  # Index of the message within its session
+    role: str
+    timestamp: float
+    snippet: str  # Matched terms wrapped in the highlight markers
+    score: float  # Higher is more relevant (negated bm25)
+
+
+def build_match_query(query: str, match_all: bool = True) -> str:
+    """
+    Translate a user query into an FTS5 MATCH expression.
+
+    Words become quoted prefix terms and "quoted text" becomes a phrase, so
+    FTS5 operators and punctuation in the query are never interpreted.
+    Returns "" when the query has no searchable words.
+    """
+    terms = []
+    for phrase, word in _QUERY_TOKEN.findall(query):
+        if phrase:
+            words = _WORD.findall(phrase)
+            if words:
+                terms.append('"%s"' % " ".join(words))
+        else:
+            terms.extend('"%s"*' % w for w in _WORD.findall(word))
+    return (" AND " if match_all else " OR ").join(terms)
+
+
+class SessionSearchIndex:
+    """
+    Incrementally maintained FTS5 index of session messages.
+
+    Thread-safe: one connection shared under a lock (writes come from the
+    session's save path, which may run on the auto-save thread).
+
+    Usage:
+        index = SessionSearchIndex(".qwen_sessions/search_index.db")
+        index.add_messages("abc", 0, [("user", "fix the parser", 1700000000.0)])
+        hits = index.search("parser", role="user")
+    """
+
+    def __init__(self, db_path: Union[str, Path]):
+        if not FTS5_AVAILABLE:
+            raise RuntimeError("SQLite was built without FTS5")
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.db_path), timeout=30.0, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    # === Writes ===
+
+    def add_messages(self, session_id: str, start: int, messages: Sequence[IndexedMessage]) -> int:
+        """
+        Index messages `start..start+len(messages)` of a session.
+
+        Positions already indexed are skipped, so re-adding is harmless.
+
+        Returns:
+            Number of indexed messages for the session afterwards
+        """
+        rows = [
+            (session_id, start + i, role, timestamp, content)
+            for i, (role, content, timestamp) in enumerate(messages)
+        ]
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO messages (session_id, position, role, timestamp, content) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+            count = start + len(rows)
+            self._conn.execute(
+                "INSERT INTO indexed_sessions (session_id, message_count) VALUES (?, ?) "
+                "ON CONFLICT (session_id) DO UPDATE SET "
+                "message_count = MAX(message_count, excluded.message_count)",
+                (session_id, count)
+            )
+            row = self._conn.execute(
+                "SELECT message_count FROM indexed_sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+        return row[0]
+
+    def delete_sessions(self, session_ids: Iterable[str]) -> None:
+        """Drop all messages of the given sessions."""
+        ids = [(sid,) for sid in session_ids]
+        if not ids:
+            return
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._conn.executemany("DELETE FROM messages WHERE session_id = ?", ids)
+            self._conn.executemany("DELETE FROM indexed_sessions WHERE session_id = ?", ids)
+
+    # === Reads ===
+
+    def indexed_count(self, session_id: str) -> int:
+        """Number of leading messages of a session that are indexed."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT message_count FROM indexed_sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+        return row[0] if row else 0
+
+    def indexed_counts(self) -> Dict[str, int]:
+        """Indexed message count of every session."""
+        with self._lock:
+            return dict(self._conn.execute("SELECT session_id, message_count FROM indexed_sessions"))
+
+    def _filters(
+        self,
+        role: Optional[Union[str, Sequence[str]]],
+        since: Optional[float],
+        until: Optional[float],
+        session_id: Optional[str],
+    ) -> Tuple[str, List]:
+        clauses, params = [], []
+        if role:
+            roles = [role] if isinstance(role, str) else list(role)
+            clauses.append(f"m.role IN ({','.join('?' * len(roles))})")
+            params.extend(roles)
+        if since is not None:
+            clauses.append("m.timestamp >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("m.timestamp <= ?")
+            params.append(until)
+        if session_id is not None:
+            clauses.append("m.session_id = ?")
+            params.append(session_id)
+        return "".join(f" AND {c}" for c in clauses), params
+
+    def search(
+        self,
+        query: str,
+        limit: int = 20,
+        role: Optional[Union[str, Sequence[str]]] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        session_id: Optional[str] = None,
+        match_all: bool = True,
+        highlight: Tuple[str, str] = ("**", "**"),
+        snippet_tokens: int = 16,
+    ) -> List[SearchHit]:
+        """
+        Find the best matching messages.
+
+        Args:
+            query: Words (prefix match) and "quoted phrases"
+            limit: Maximum hits
+            role: Only messages with this role (or any of these roles)
+            since/until: Only messages timestamped within this range
+            session_id: Only messages of this session
+            match_all: Require every term (AND) instead of any (OR)
+            highlight: Markers wrapped around matched terms in snippets
+            snippet_tokens: Approximate snippet length in tokens
+
+        Returns:
+            Hits, most relevant first
+        """
+        match = build_match_query(query, match_all)
+        if not match:
+            return []
+        where, params = self._filters(role, since, until, session_id)
+        sql = (
+            "SELECT m.session_id, m.position, m.role, m.timestamp, "
+            "snippet(messages_fts, 0, ?, ?, '…', ?), messages_fts.rank "
+            "FROM messages_fts JOIN messages m ON m.id = messages_fts.rowid "
+            f"WHERE messages_fts MATCH ?{where} "
+            "ORDER BY messages_fts.rank LIMIT ?"
+        )
+        with self._lock:
+            rows = self._conn.execute(
+                sql, [highlight[0], highlight[1], snippet_tokens, match, *params, limit]
+            ).fetchall()
+        return [SearchHit(sid, pos, r, ts, snip, -rank) for sid, pos, r, ts, snip, rank in rows]
+
+    def search_sessions(
+        self,
+        query: str,
+        limit: int = 10,
+        role: Optional[Union[str, Sequence[str]]] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        match_all: bool = True,
+    ) -> List[Tuple[str, float, int]]:
+        """
+        Rank sessions by their best matching message.
+
+        Returns:
+            (session_id, score, matching message count), most relevant first
+        """
+        match = build_match_query(query, match_all)
+        if not match:
+            return []
+        where, params = self._filters(role, since, until, None)
+        sql = (
+            "SELECT m.session_id, MIN(messages_fts.rank) AS best, COUNT(*) "
+            "FROM messages_fts JOIN messages m ON m.id = messages_fts.rowid "
+            f"WHERE messages_fts MATCH ?{where} "
+            "GROUP BY m.session_id ORDER BY best LIMIT ?"
+        )
+        with self._lock:
+            rows = self._conn.execute(sql, [match, *params, limit]).fetchall()
+        return [(sid, -best, count) for sid, best, count in rows]
+
+    def close(self) -> None:
+        """Close the connection."""
+        with self._lock:
+            self._conn.close()
+
+
+__all__ = [
+    'FTS5_AVAILABLE',
+    'SearchHit',
+    'SessionSearchIndex',
+    'build_match_query',
+]
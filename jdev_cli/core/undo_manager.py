@@ -7,7 +7,8 @@ Addresses: ISSUE-030 (Undo support)
 Implements comprehensive undo/redo:
 - Stack-based operation history
 - Branching support (redo cleared on new action)
-- Memory-efficient snapshots
+- Content-addressed, reverse-delta snapshots (see BlobStore)
+- Incremental (journaled) state persistence
 - Operation descriptions for timeline view
 - Automatic compaction of old operations
 
@@ -24,8 +25,8 @@ import os
 import json
 import time
 import shutil
-import hashlib
-from typing import Any, Callable, Dict, List, Optional, TypeVar
+import zlib
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, TypeVar
 from pathlib import Path
 from dataclasses import dataclass, field
 from enum import Enum
@@ -33,6 +34,7 @@ from contextlib import contextmanager
 import logging
 
 from .atomic_ops import AtomicFileOps
+from .blob_store import BlobStore
 
 logger = logging.getLogger(__name__)
 
@@ -66,7 +68,11 @@ class UndoableOperation:
     target_path: Optional[str] = None
     original_content: Optional[str] = None
     new_content: Optional[str] = None
-    backup_path: Optional[str] = None
+    backup_path: Optional[str] = None  # Legacy per-operation snapshot file
+
+    # BlobStore hashes of the content before/after (content is not kept in memory)
+    original_blob: Optional[str] = None
+    new_blob: Optional[str] = None
 
     # For move/rename
     source_path: Optional[str] = None
@@ -91,6 +97,8 @@ class UndoableOperation:
             "timestamp": self.timestamp,
             "target_path": self.target_path,
             "backup_path": self.backup_path,
+            "original_blob": self.original_blob,
+            "new_blob": self.new_blob,
             "source_path": self.source_path,
             "dest_path": self.dest_path,
             "sub_operations": [op.to_dict() for op in self.sub_operations],
@@ -107,6 +115,8 @@ class UndoableOperation:
             timestamp=data["timestamp"],
             target_path=data.get("target_path"),
             backup_path=data.get("backup_path"),
+            original_blob=data.get("original_blob"),
+            new_blob=data.get("new_blob"),
             source_path=data.get("source_path"),
             dest_path=data.get("dest_path"),
             sub_operations=[cls.from_dict(op) for op in data.get("sub_operations", [])],
@@ -144,6 +154,18 @@ class UndoManager:
     - Persistent state for crash recovery
     - Memory-efficient snapshot storage
 
+    File contents go to a BlobStore under `snapshot_dir/objects`: each
+    version once, keyed by hash, successive versions of a file as deltas
+    against each other. Blobs of operations that fall off the history (or
+    are dropped from the redo stack) are garbage-collected. GC only looks at
+    blobs this manager stored or its history references, so managers that
+    share a snapshot_dir never sweep each other's snapshots (clear_history()
+    still removes the whole directory).
+
+    State changes are appended to `.qwen_undo_state.journal` (one CRC'd
+    JSON line each) and folded into `.qwen_undo_state.json` every
+    COMPACT_EVERY records, so a push costs O(1) bytes, not O(history).
+
     Usage:
         manager = UndoManager()
 
@@ -164,6 +186,8 @@ class UndoManager:
     DEFAULT_MAX_SIZE = 100
     SNAPSHOT_DIR = ".qwen_undo_snapshots"
     STATE_FILE = ".qwen_undo_state.json"
+    JOURNAL_FILE = ".qwen_undo_state.journal"
+    COMPACT_EVERY = 256  # Journal records before the state file is rewritten
 
     def __init__(
         self,
@@ -192,6 +216,12 @@ class UndoManager:
 
         self._atomic_ops = AtomicFileOps()
 
+        self._store = BlobStore(self.snapshot_dir / "objects")
+        self._heads: Dict[str, str] = {}  # path -> latest stored version
+        self._owned: Set[str] = set()  # Blobs this manager stored or loaded, GC candidates
+        self._state_seq = 0
+        self._journal_records = 0
+
         # Load persisted state
         if persist_state:
             self._load_state()
@@ -206,26 +236,71 @@ class UndoManager:
         self.snapshot_dir.mkdir(parents=True, exist_ok=True)
         return self.snapshot_dir
 
-    def _save_snapshot(self, content: str, op_id: str) -> str:
-        """Save content snapshot to disk."""
-        snapshot_dir = self._ensure_snapshot_dir()
-
-        # Use hash for deduplication
-        content_hash = hashlib.sha256(content.encode()).hexdigest()[:16]
-        snapshot_path = snapshot_dir / f"{op_id}_{content_hash}.snapshot"
-
-        snapshot_path.write_text(content)
-        return str(snapshot_path)
+    def _store_version(self, path: str, content: str) -> Optional[str]:
+        """Store a version of a file, delta-compressing the one it replaces."""
+        try:
+            blob = self._store.put(content, previous=self._heads.get(path))
+        except OSError as e:
+            logger.warning(f"Could not store undo snapshot: {e}")
+            return None
+        self._heads[path] = blob
+        self._owned.add(blob)
+        return blob
 
     def _load_snapshot(self, path: str) -> Optional[str]:
-        """Load content from snapshot."""
+        """Load content from a legacy snapshot file."""
         try:
             return Path(path).read_text()
         except Exception:
             return None
 
+    def _content(self, blob: Optional[str], backup_path: Optional[str], inline: Optional[str]) -> Optional[str]:
+        """Resolve content from the blob store, a legacy snapshot, or memory."""
+        if blob:
+            content = self._store.get_text(blob)
+            if content is not None:
+                return content
+        if backup_path:
+            content = self._load_snapshot(backup_path)
+            if content is not None:
+                return content
+        return inline
+
+    @staticmethod
+    def _blobs(operations: Iterable[UndoableOperation]) -> Iterable[str]:
+        """Blob hashes referenced by operations (including batch members)."""
+        for op in operations:
+            if op.original_blob:
+                yield op.original_blob
+            if op.new_blob:
+                yield op.new_blob
+            yield from UndoManager._blobs(op.sub_operations)
+
+    def _live_blobs(self) -> List[str]:
+        return list(self._blobs(self._undo_stack + self._redo_stack))
+
+    def _release(self, dropped: List[UndoableOperation]) -> None:
+        """Delete the snapshots of operations that left the history."""
+        for op in dropped:
+            if op.backup_path and os.path.exists(op.backup_path):
+                try:
+                    os.unlink(op.backup_path)
+                except Exception:
+                    pass
+        candidates = list(self._blobs(dropped))
+        if candidates:
+            self._store.discard(candidates, self._live_blobs())
+
+    def gc(self) -> int:
+        """Delete the blobs this manager stored that its history no longer references."""
+        removed = self._store.discard(self._owned, self._live_blobs())
+        self._owned = {blob for blob in self._owned if blob in self._store}
+        return removed
+
+    # === State persistence ===
+
     def _save_state(self) -> None:
-        """Save manager state to disk."""
+        """Write the full state and start an empty journal."""
         if not self.persist_state:
             return
 
@@ -233,39 +308,128 @@ class UndoManager:
             "undo_stack": [op.to_dict() for op in self._undo_stack],
             "redo_stack": [op.to_dict() for op in self._redo_stack],
             "counter": self._operation_counter,
+            "seq": self._state_seq,
             "timestamp": time.time(),
         }
 
         state_path = self.working_dir / self.STATE_FILE
+        tmp_path = state_path.with_name(state_path.name + ".tmp")
         try:
-            state_path.write_text(json.dumps(state, indent=2))
+            tmp_path.write_text(json.dumps(state))
+            os.replace(tmp_path, state_path)
+            # Records up to seq are in the state file; replay skips them even if this fails
+            journal_path = self.working_dir / self.JOURNAL_FILE
+            if journal_path.exists():
+                journal_path.unlink()
+            self._journal_records = 0
         except Exception as e:
             logger.warning(f"Could not save undo state: {e}")
+            return
 
-    def _load_state(self) -> None:
-        """Load manager state from disk."""
-        state_path = self.working_dir / self.STATE_FILE
+        self.gc()
 
-        if not state_path.exists():
+    def _log(self, op: str, **fields: Any) -> None:
+        """Append a state change to the journal."""
+        if not self.persist_state:
             return
 
+        self._state_seq += 1
+        payload = json.dumps({"seq": self._state_seq, "op": op, **fields}, default=str).encode("utf-8")
         try:
-            state = json.loads(state_path.read_text())
-            self._undo_stack = [
-                UndoableOperation.from_dict(op)
-                for op in state.get("undo_stack", [])
-            ]
-            self._redo_stack = [
-                UndoableOperation.from_dict(op)
-                for op in state.get("redo_stack", [])
-            ]
-            self._operation_counter = state.get("counter", 0)
+            with open(self.working_dir / self.JOURNAL_FILE, "ab") as f:
+                f.write(b"%08x %s\n" % (zlib.crc32(payload), payload))
         except Exception as e:
-            logger.warning(f"Could not load undo state: {e}")
+            logger.warning(f"Could not save undo state: {e}")
+            return
 
-    def _push_operation(self, operation: UndoableOperation) -> None:
-        """Push operation to undo stack."""
+        self._journal_records += 1
+        if self._journal_records >= self.COMPACT_EVERY:
+            self._save_state()
+
+    def _load_state(self) -> None:
+        """Load manager state from disk: the state file, then the journal."""
+        state_path = self.working_dir / self.STATE_FILE
+
+        if state_path.exists():
+            try:
+                state = json.loads(state_path.read_text())
+                self._undo_stack = [
+                    UndoableOperation.from_dict(op)
+                    for op in state.get("undo_stack", [])
+                ]
+                self._redo_stack = [
+                    UndoableOperation.from_dict(op)
+                    for op in state.get("redo_stack", [])
+                ]
+                self._operation_counter = state.get("counter", 0)
+                self._state_seq = state.get("seq", 0)
+            except Exception as e:
+                logger.warning(f"Could not load undo state: {e}")
+        self._owned.update(self._live_blobs())
+
+        self._replay_journal()
+
+        for op in self._undo_stack:
+            for sub_op in op.sub_operations or [op]:
+                if sub_op.target_path and sub_op.new_blob:
+                    self._heads[sub_op.target_path] = sub_op.new_blob
+
+    def _replay_journal(self) -> None:
+        """Apply journal records newer than the state file; drop a torn tail."""
+        journal_path = self.working_dir / self.JOURNAL_FILE
+        try:
+            data = journal_path.read_bytes()
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            logger.warning(f"Could not load undo journal: {e}")
+            return
+
+        offset = 0
+        while offset < len(data):
+            end = data.find(b"\n", offset)
+            if end < 0:
+                break
+            line = data[offset:end]
+            try:
+                crc, payload = line.split(b" ", 1)
+                if int(crc, 16) != zlib.crc32(payload):
+                    break
+                record = json.loads(payload)
+            except ValueError:
+                break
+            offset = end + 1
+
+            if record["seq"] <= self._state_seq:
+                continue
+            self._state_seq = record["seq"]
+            self._journal_records += 1
+            op = record["op"]
+            if op == "push":
+                operation = UndoableOperation.from_dict(record["operation"])
+                self._owned.update(self._blobs([operation]))
+                self._apply_push(operation)
+                self._operation_counter = record.get("counter", self._operation_counter)
+            elif op == "undo" and self._undo_stack:
+                moved = self._undo_stack.pop()
+                if record["ok"]:
+                    self._redo_stack.append(moved)
+            elif op == "redo" and self._redo_stack:
+                moved = self._redo_stack.pop()
+                if record["ok"]:
+                    self._undo_stack.append(moved)
+            elif op == "clear":
+                self._undo_stack.clear()
+                self._redo_stack.clear()
+
+        if offset < len(data):
+            with open(journal_path, "r+b") as f:
+                f.truncate(offset)
+
+    def _apply_push(self, operation: UndoableOperation) -> List[UndoableOperation]:
+        """Push onto the undo stack; returns the operations that fell out."""
         # Clear redo stack (branching: new action clears redo)
+        dropped = list(self._redo_stack)
         self._redo_stack.clear()
 
         # Add to undo stack
@@ -273,16 +437,19 @@ class UndoManager:
 
         # Enforce max size
         while len(self._undo_stack) > self.max_size:
-            removed = self._undo_stack.pop(0)
-            # Clean up snapshot if exists
-            if removed.backup_path and os.path.exists(removed.backup_path):
-                try:
-                    os.unlink(removed.backup_path)
-                except Exception:
-                    pass
+            dropped.append(self._undo_stack.pop(0))
+
+        return dropped
+
+    def _push_operation(self, operation: UndoableOperation) -> None:
+        """Push operation to undo stack."""
+        dropped = self._apply_push(operation)
 
         # Persist state
-        self._save_state()
+        self._log("push", operation=operation.to_dict(), counter=self._operation_counter)
+
+        # Clean up snapshots nothing references any more
+        self._release(dropped)
 
     def record_file_create(
         self,
@@ -291,13 +458,15 @@ class UndoManager:
         description: Optional[str] = None,
     ) -> UndoableOperation:
         """Record file creation operation."""
+        new_blob = self._store_version(path, content)
         op = UndoableOperation(
             id=self._generate_op_id(),
             op_type=OperationType.FILE_CREATE,
             description=description or f"Create {Path(path).name}",
             timestamp=time.time(),
             target_path=path,
-            new_content=content,
+            new_content=None if new_blob else content,
+            new_blob=new_blob,
         )
 
         self._push_operation(op)
@@ -311,19 +480,21 @@ class UndoManager:
         description: Optional[str] = None,
     ) -> UndoableOperation:
         """Record file edit operation."""
-        # Save original content as snapshot
-        op_id = self._generate_op_id()
-        backup_path = self._save_snapshot(original_content, op_id)
+        # Both versions go to the blob store; the original usually is
+        # already there as the previous edit's new version
+        original_blob = self._store_version(path, original_content)
+        new_blob = self._store_version(path, new_content)
 
         op = UndoableOperation(
-            id=op_id,
+            id=self._generate_op_id(),
             op_type=OperationType.FILE_EDIT,
             description=description or f"Edit {Path(path).name}",
             timestamp=time.time(),
             target_path=path,
-            original_content=original_content,
-            new_content=new_content,
-            backup_path=backup_path,
+            original_content=None if original_blob else original_content,
+            new_content=None if new_blob else new_content,
+            original_blob=original_blob,
+            new_blob=new_blob,
         )
 
         self._push_operation(op)
@@ -336,17 +507,17 @@ class UndoManager:
         description: Optional[str] = None,
     ) -> UndoableOperation:
         """Record file deletion operation."""
-        op_id = self._generate_op_id()
-        backup_path = self._save_snapshot(original_content, op_id)
+        original_blob = self._store_version(path, original_content)
+        self._heads.pop(path, None)
 
         op = UndoableOperation(
-            id=op_id,
+            id=self._generate_op_id(),
             op_type=OperationType.FILE_DELETE,
             description=description or f"Delete {Path(path).name}",
             timestamp=time.time(),
             target_path=path,
-            original_content=original_content,
-            backup_path=backup_path,
+            original_content=None if original_blob else original_content,
+            original_blob=original_blob,
         )
 
         self._push_operation(op)
@@ -359,6 +530,9 @@ class UndoManager:
         description: Optional[str] = None,
     ) -> UndoableOperation:
         """Record file move/rename operation."""
+        if source in self._heads:
+            self._heads[dest] = self._heads.pop(source)
+
         op = UndoableOperation(
             id=self._generate_op_id(),
             op_type=OperationType.FILE_MOVE,
@@ -429,7 +603,7 @@ class UndoManager:
 
             elif op.op_type == OperationType.FILE_EDIT:
                 # Undo edit = restore original
-                original = self._load_snapshot(op.backup_path) or op.original_content
+                original = self._content(op.original_blob, op.backup_path, op.original_content)
                 if original is not None:
                     result = self._atomic_ops.write_atomic(
                         op.target_path, original, create_backup=False
@@ -442,7 +616,7 @@ class UndoManager:
 
             elif op.op_type == OperationType.FILE_DELETE:
                 # Undo delete = restore file
-                original = self._load_snapshot(op.backup_path) or op.original_content
+                original = self._content(op.original_blob, op.backup_path, op.original_content)
                 if original is not None:
                     result = self._atomic_ops.write_atomic(
                         op.target_path, original, create_backup=False
@@ -493,8 +667,11 @@ class UndoManager:
 
             if op.op_type == OperationType.FILE_CREATE:
                 # Redo create = create again
+                content = self._content(op.new_blob, None, op.new_content)
+                if content is None:
+                    return UndoResult.failure_result(op, "No content available")
                 result = self._atomic_ops.write_atomic(
-                    op.target_path, op.new_content, create_backup=False
+                    op.target_path, content, create_backup=False
                 )
                 if result.success:
                     return UndoResult.success_result(op, f"Redid: {op.description}")
@@ -503,8 +680,11 @@ class UndoManager:
 
             elif op.op_type == OperationType.FILE_EDIT:
                 # Redo edit = apply new content
+                content = self._content(op.new_blob, None, op.new_content)
+                if content is None:
+                    return UndoResult.failure_result(op, "No new content available")
                 result = self._atomic_ops.write_atomic(
-                    op.target_path, op.new_content, create_backup=False
+                    op.target_path, content, create_backup=False
                 )
                 if result.success:
                     return UndoResult.success_result(op, f"Redid: {op.description}")
@@ -561,7 +741,7 @@ class UndoManager:
         if result.success:
             self._redo_stack.append(op)
 
-        self._save_state()
+        self._log("undo", ok=result.success)
         return result
 
     def redo(self) -> Optional[UndoResult]:
@@ -580,7 +760,7 @@ class UndoManager:
         if result.success:
             self._undo_stack.append(op)
 
-        self._save_state()
+        self._log("redo", ok=result.success)
         return result
 
     def can_undo(self) -> bool:
@@ -611,11 +791,14 @@ class UndoManager:
         """Clear all undo/redo history."""
         self._undo_stack.clear()
         self._redo_stack.clear()
+        self._log("clear")
         self._save_state()
 
         # Clean up snapshots
         if self.snapshot_dir.exists():
             shutil.rmtree(str(self.snapshot_dir))
+        self._store = BlobStore(self.snapshot_dir / "objects")
+        self._heads.clear()
 
     @contextmanager
     def batch_operations(self, description: str):
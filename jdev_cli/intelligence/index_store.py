@@ -0,0 +1,299 @@
+"""
+Binary on-disk format for the semantic index.
+
+Layout (native byte order, every section 8-byte aligned):
+
+    header   magic, version, byte-order marker, section counts
+    strings  u64 offsets + UTF-8 blob (every string stored once)
+    files    one column per field (path, hash, stat fingerprint, ranges)
+    symbols  one u32 column per field, grouped by file
+    imports  u32 string ids, grouped by file
+    names    unique symbol names sorted lexicographically + postings
+
+The file is memory-mapped and decoded on demand: opening costs a header
+read regardless of index size, and lookups binary-search the sorted name
+table instead of materializing every symbol.
+"""
+
+import mmap
+import os
+import struct
+import tempfile
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+
+MAGIC = b"QIDX"
+FORMAT_VERSION = 1
+BYTE_ORDER_MARK = 0x01020304
+NONE_ID = 0xFFFFFFFF
+
+# magic, version, byte-order mark, strings, files, symbols, imports, names, blob bytes
+_HEADER = struct.Struct("=4sIIIIIIIQ")
+
+# (column, typecode, count) in file order, after the string table
+_COLUMNS = [
+    ("file_last_modified", "d", "files"),
+    ("file_mtime_ns", "q", "files"),
+    ("file_size", "q", "files"),
+    ("file_inode", "Q", "files"),
+    ("file_path", "I", "files"),
+    ("file_hash", "I", "files"),
+    ("file_sym_start", "I", "files"),
+    ("file_sym_count", "I", "files"),
+    ("file_imp_start", "I", "files"),
+    ("file_imp_count", "I", "files"),
+    ("sym_name", "I", "symbols"),
+    ("sym_type", "I", "symbols"),
+    ("sym_file", "I", "symbols"),
+    ("sym_line", "I", "symbols"),
+    ("sym_doc", "I", "symbols"),
+    ("sym_sig", "I", "symbols"),
+    ("sym_parent", "I", "symbols"),
+    ("imports", "I", "imports"),
+    ("name_id", "I", "names"),
+    ("name_start", "I", "names"),
+    ("name_count", "I", "names"),
+    ("postings", "I", "symbols"),
+]
+
+
+# (name, type, file_path, line_number, docstring, signature, parent) - Symbol field order
+SymbolRow = Tuple[str, str, str, int, Optional[str], Optional[str], Optional[str]]
+
+
+class FileRecord(NamedTuple):
+    """One file's worth of index data, as written to disk."""
+    path: str
+    hash: str
+    last_modified: float
+    mtime_ns: int
+    size: int
+    inode: int
+    symbols: Iterable[SymbolRow]
+    imports: Iterable[str]
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def _column_size(typecode: str, count: int) -> int:
+    return array(typecode).itemsize * count
+
+
+def write_index(path: Path, files: Iterable[FileRecord]) -> None:
+    """
+    Write an index atomically (temp file + fsync + rename).
+
+    Readers holding a mapping of the previous file keep a consistent view.
+    """
+    strings: Dict[str, int] = {}
+    offsets = array("Q", [0])
+    blob = bytearray()
+
+    def intern(value: Optional[str]) -> int:
+        if value is None:
+            return NONE_ID
+        sid = strings.get(value)
+        if sid is None:
+            sid = len(strings)
+            strings[value] = sid
+            blob.extend(value.encode("utf-8", "surrogatepass"))
+            offsets.append(len(blob))
+        return sid
+
+    cols = {name: array(code) for name, code, _ in _COLUMNS}
+    postings_by_name: Dict[int, List[int]] = {}
+
+    for file_id, record in enumerate(files):
+        cols["file_path"].append(intern(record.path))
+        cols["file_hash"].append(intern(record.hash))
+        cols["file_last_modified"].append(record.last_modified)
+        cols["file_mtime_ns"].append(record.mtime_ns)
+        cols["file_size"].append(record.size)
+        cols["file_inode"].append(record.inode)
+
+        cols["file_sym_start"].append(len(cols["sym_name"]))
+        for name, type_, _, line, doc, sig, parent in record.symbols:
+            name_id = intern(name)
+            postings_by_name.setdefault(name_id, []).append(len(cols["sym_name"]))
+            cols["sym_name"].append(name_id)
+            cols["sym_type"].append(intern(type_))
+            cols["sym_file"].append(file_id)
+            cols["sym_line"].append(line)
+            cols["sym_doc"].append(intern(doc))
+            cols["sym_sig"].append(intern(sig))
+            cols["sym_parent"].append(intern(parent))
+        cols["file_sym_count"].append(len(cols["sym_name"]) - cols["file_sym_start"][-1])
+
+        cols["file_imp_start"].append(len(cols["imports"]))
+        cols["imports"].extend(intern(imp) for imp in record.imports)
+        cols["file_imp_count"].append(len(cols["imports"]) - cols["file_imp_start"][-1])
+
+    # Sorted name table so lookups can binary-search without decoding everything
+    by_text = {sid: text for text, sid in strings.items()}
+    for name_id in sorted(postings_by_name, key=by_text.__getitem__):
+        ids = postings_by_name[name_id]
+        cols["name_id"].append(name_id)
+        cols["name_start"].append(len(cols["postings"]))
+        cols["name_count"].append(len(ids))
+        cols["postings"].extend(ids)
+
+    header = _HEADER.pack(
+        MAGIC, FORMAT_VERSION, BYTE_ORDER_MARK,
+        len(strings), len(cols["file_path"]), len(cols["sym_name"]),
+        len(cols["imports"]), len(cols["name_id"]), len(blob),
+    )
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            def write_padded(data: bytes) -> None:
+                f.write(data)
+                f.write(b"\0" * (_align(len(data)) - len(data)))
+
+            write_padded(header)
+            write_padded(offsets.tobytes())
+            write_padded(bytes(blob))
+            for name, _, _ in _COLUMNS:
+                write_padded(cols[name].tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+class IndexStore:
+    """Read-only, memory-mapped view of an index written by `write_index`."""
+
+    def __init__(self, mapped: mmap.mmap):
+        self._mmap = mapped
+        self._view = view = memoryview(mapped)
+
+        (magic, version, bom, n_strings, n_files, n_symbols,
+         n_imports, n_names, blob_len) = _HEADER.unpack_from(view, 0)
+        if magic != MAGIC or version != FORMAT_VERSION or bom != BYTE_ORDER_MARK:
+            raise ValueError("Incompatible index format")
+
+        counts = {"files": n_files, "symbols": n_symbols, "imports": n_imports, "names": n_names}
+
+        def take(offset: int, typecode: str, count: int) -> Tuple[memoryview, int]:
+            size = _column_size(typecode, count)
+            if offset + size > len(view):
+                raise ValueError("Truncated index file")
+            return view[offset:offset + size].cast(typecode), _align(offset + size)
+
+        offset = _align(_HEADER.size)
+        self._offsets, offset = take(offset, "Q", n_strings + 1)
+        self._blob, offset = take(offset, "B", blob_len)
+
+        self._cols: Dict[str, memoryview] = {}
+        for name, code, count_key in _COLUMNS:
+            self._cols[name], offset = take(offset, code, counts[count_key])
+
+        self.file_count = n_files
+        self.symbol_count = n_symbols
+        self.name_count = n_names
+
+    @classmethod
+    def open(cls, path: Path) -> Optional["IndexStore"]:
+        """Map an index file; None if missing, truncated or another version."""
+        try:
+            with open(path, "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+
+        try:
+            return cls(mapped)
+        except (ValueError, struct.error, TypeError):
+            return None  # Mapping is released with its views on collection
+
+    def string(self, sid: int) -> Optional[str]:
+        """Decode one string-table entry."""
+        if sid == NONE_ID:
+            return None
+        return bytes(self._blob[self._offsets[sid]:self._offsets[sid + 1]]).decode(
+            "utf-8", "surrogatepass"
+        )
+
+    def files(self) -> Iterator[Tuple[int, FileRecord]]:
+        """Iterate file fingerprints; symbols/imports are (start, count) ranges."""
+        c = self._cols
+        for fid in range(self.file_count):
+            yield fid, FileRecord(
+                path=self.string(c["file_path"][fid]),
+                hash=self.string(c["file_hash"][fid]),
+                last_modified=c["file_last_modified"][fid],
+                mtime_ns=c["file_mtime_ns"][fid],
+                size=c["file_size"][fid],
+                inode=c["file_inode"][fid],
+                symbols=range(c["file_sym_start"][fid],
+                              c["file_sym_start"][fid] + c["file_sym_count"][fid]),
+                imports=range(c["file_imp_start"][fid],
+                              c["file_imp_start"][fid] + c["file_imp_count"][fid]),
+            )
+
+    def symbol_row(self, symbol_id: int) -> SymbolRow:
+        """Decode one symbol record in Symbol field order."""
+        c = self._cols
+        return (
+            self.string(c["sym_name"][symbol_id]),
+            self.string(c["sym_type"][symbol_id]),
+            self.string(c["file_path"][c["sym_file"][symbol_id]]),
+            c["sym_line"][symbol_id],
+            self.string(c["sym_doc"][symbol_id]),
+            self.string(c["sym_sig"][symbol_id]),
+            self.string(c["sym_parent"][symbol_id]),
+        )
+
+    def symbol_file(self, symbol_id: int) -> int:
+        """File id owning a symbol."""
+        return self._cols["sym_file"][symbol_id]
+
+    def symbol_type(self, symbol_id: int) -> str:
+        """Decode only the type column of a symbol."""
+        return self.string(self._cols["sym_type"][symbol_id])
+
+    def import_name(self, import_id: int) -> str:
+        """Decode one import entry."""
+        return self.string(self._cols["imports"][import_id])
+
+    def name(self, index: int) -> str:
+        """Name at a position of the sorted name table."""
+        return self.string(self._cols["name_id"][index])
+
+    def postings(self, index: int) -> Sequence[int]:
+        """Symbol ids sharing the name at a position of the name table."""
+        start = self._cols["name_start"][index]
+        return self._cols["postings"][start:start + self._cols["name_count"][index]]
+
+    def lookup(self, name: str) -> Sequence[int]:
+        """Symbol ids with exactly this name (binary search, O(log n) decodes)."""
+        lo, hi = 0, self.name_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.name(mid) < name:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.name_count and self.name(lo) == name:
+            return self.postings(lo)
+        return ()
+
+    def close(self) -> None:
+        """Release the mapping (views must no longer be used)."""
+        for col in self._cols.values():
+            col.release()
+        self._offsets.release()
+        self._blob.release()
+        self._view.release()
+        self._mmap.close()
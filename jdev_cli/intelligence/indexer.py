@@ -5,14 +5,25 @@ Provides blazing-fast semantic search and context awareness.
 """
 
 import ast
-import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
-from typing import Dict, List, Set, Optional, Tuple
+from typing import Dict, Iterator, List, Sequence, Set, Optional, Tuple
 from dataclasses import dataclass, field
-from collections import defaultdict
+from collections import Counter, defaultdict
 import hashlib
 import re
 
+from .index_store import FileRecord, IndexStore, SymbolRow, write_index
+from .symbol_search import SymbolNameIndex
+
+# Below this many changed files, a process pool costs more than it saves
+PARALLEL_PARSE_THRESHOLD = 64
+
+INDEX_FILE = "index.bin"
+LEGACY_INDEX_FILE = "index.json"
+
 
 @dataclass
 class Symbol:
@@ -36,6 +47,227 @@ class FileIndex:
     imports: List[str]
     dependencies: Set[str] = field(default_factory=set)
     last_modified: float = 0.0
+    # Stat fingerprint used to skip unchanged files without hashing
+    mtime_ns: int = 0
+    size: int = 0
+    inode: int = 0
+
+    def matches_stat(self, st: os.stat_result) -> bool:
+        """Check whether a stat result matches the indexed fingerprint."""
+        return (
+            self.mtime_ns == st.st_mtime_ns
+            and self.size == st.st_size
+            and self.inode == st.st_ino
+        )
+
+    def update_stat(self, st: os.stat_result) -> None:
+        """Record a new stat fingerprint for unchanged content."""
+        self.last_modified = st.st_mtime
+        self.mtime_ns = st.st_mtime_ns
+        self.size = st.st_size
+        self.inode = st.st_ino
+
+
+# Nodes whose subtrees may contain definitions or imports; expressions never do
+_STATEMENT_NODES = (ast.stmt, ast.excepthandler, ast.match_case)
+
+
+def _format_arg(arg: ast.arg, default: Optional[ast.expr] = None) -> str:
+    """Render one parameter with its annotation and default."""
+    text = arg.arg
+    if arg.annotation is not None:
+        text += f": {ast.unparse(arg.annotation)}"
+    if default is not None:
+        text += f" = {ast.unparse(default)}" if arg.annotation is not None else f"={ast.unparse(default)}"
+    return text
+
+
+def _format_signature(node: ast.AST) -> str:
+    """Render a full function signature (defaults, annotations, markers)."""
+    args = node.args
+    params = []
+
+    positional = args.posonlyargs + args.args
+    defaults = [None] * (len(positional) - len(args.defaults)) + list(args.defaults)
+    for i, (arg, default) in enumerate(zip(positional, defaults)):
+        params.append(_format_arg(arg, default))
+        if i == len(args.posonlyargs) - 1:
+            params.append('/')
+
+    if args.vararg:
+        params.append('*' + _format_arg(args.vararg))
+    elif args.kwonlyargs:
+        params.append('*')
+
+    for arg, default in zip(args.kwonlyargs, args.kw_defaults):
+        params.append(_format_arg(arg, default))
+
+    if args.kwarg:
+        params.append('**' + _format_arg(args.kwarg))
+
+    signature = f"{node.name}({', '.join(params)})"
+    if node.returns is not None:
+        signature += f" -> {ast.unparse(node.returns)}"
+    if isinstance(node, ast.AsyncFunctionDef):
+        signature = f"async {signature}"
+    return signature
+
+
+class _SymbolVisitor(ast.NodeVisitor):
+    """
+    Single-pass symbol extractor.
+
+    Tracks the enclosing class/function scope on a stack, so methods and
+    nested functions get their parent without re-walking the tree, and only
+    descends into statements (definitions and imports never live in
+    expressions).
+    """
+
+    def __init__(self, rel_path: str):
+        self.rel_path = rel_path
+        self.symbols: List[Symbol] = []
+        self.imports: List[str] = []
+        self._scopes: List[Tuple[str, str]] = []  # (kind, name)
+
+        # Package used to resolve relative imports
+        package_parts = Path(rel_path).parts[:-1]
+        self._package = list(package_parts)
+
+    def _parent(self) -> Optional[str]:
+        return '.'.join(name for _, name in self._scopes) or None
+
+    def generic_visit(self, node: ast.AST) -> None:
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, _STATEMENT_NODES):
+                self.visit(child)
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        bases = [ast.unparse(b) for b in node.bases]
+        bases += [ast.unparse(k) for k in node.keywords]
+        self.symbols.append(Symbol(
+            name=node.name,
+            type='class',
+            file_path=self.rel_path,
+            line_number=node.lineno,
+            docstring=ast.get_docstring(node),
+            signature=f"{node.name}({', '.join(bases)})" if bases else node.name,
+            parent=self._parent()
+        ))
+
+        self._scopes.append(('class', node.name))
+        self.generic_visit(node)
+        self._scopes.pop()
+
+    def _visit_function(self, node: ast.AST) -> None:
+        is_method = bool(self._scopes) and self._scopes[-1][0] == 'class'
+        self.symbols.append(Symbol(
+            name=node.name,
+            type='method' if is_method else 'function',
+            file_path=self.rel_path,
+            line_number=node.lineno,
+            docstring=ast.get_docstring(node),
+            signature=_format_signature(node),
+            parent=self._parent()
+        ))
+
+        self._scopes.append(('function', node.name))
+        self.generic_visit(node)
+        self._scopes.pop()
+
+    visit_FunctionDef = _visit_function
+    visit_AsyncFunctionDef = _visit_function
+
+    def visit_Import(self, node: ast.Import) -> None:
+        for alias in node.names:
+            self.imports.append(alias.name)
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        if not node.level:
+            if node.module:
+                self.imports.append(node.module)
+            return
+
+        # Relative import: anchor on this file's package
+        if node.level - 1 > len(self._package):
+            return  # Escapes the indexed root
+        base = self._package[:len(self._package) - (node.level - 1)]
+
+        if node.module:
+            self.imports.append('.'.join(base + [node.module]))
+        else:
+            # `from . import a, b` usually names sibling modules
+            for alias in node.names:
+                self.imports.append('.'.join(base + [alias.name]))
+
+
+class _StoredSymbols(Sequence):
+    """A file's symbols inside a mapped IndexStore, decoded on access."""
+
+    def __init__(self, store: IndexStore, ids: range):
+        self.store = store
+        self.ids = ids
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [Symbol(*self.store.symbol_row(i)) for i in self.ids[index]]
+        return Symbol(*self.store.symbol_row(self.ids[index]))
+
+    def rows(self) -> Iterator[SymbolRow]:
+        """Raw rows, for rewriting the index without building Symbols."""
+        return (self.store.symbol_row(i) for i in self.ids)
+
+
+class _StoredImports(Sequence):
+    """A file's imports inside a mapped IndexStore, decoded on access."""
+
+    def __init__(self, store: IndexStore, ids: range):
+        self.store = store
+        self.ids = ids
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.store.import_name(i) for i in self.ids[index]]
+        return self.store.import_name(self.ids[index])
+
+
+def _parse_python_file(root_path: Path, path: Path) -> Optional[FileIndex]:
+    """
+    Parse Python file and extract symbols.
+
+    Module-level so it can run inside a process pool worker.
+    """
+    try:
+        st = path.stat()
+        with open(path, 'rb') as f:
+            raw = f.read()
+
+        content = raw.decode('utf-8')
+        tree = ast.parse(content, filename=str(path))
+        rel_path = str(path.relative_to(root_path))
+
+        visitor = _SymbolVisitor(rel_path)
+        visitor.visit(tree)
+
+        return FileIndex(
+            path=rel_path,
+            hash=hashlib.sha256(raw).hexdigest()[:16],
+            symbols=visitor.symbols,
+            imports=visitor.imports,
+            last_modified=st.st_mtime,
+            mtime_ns=st.st_mtime_ns,
+            size=st.st_size,
+            inode=st.st_ino
+        )
+
+    except Exception:
+        # Silently skip files that can't be parsed
+        return None
 
 
 class SemanticIndexer:
@@ -54,11 +286,20 @@ class SemanticIndexer:
         self.cache_dir = Path(cache_dir or self.root_path / ".qwen" / "index")
         self.cache_dir.mkdir(parents=True, exist_ok=True)
 
-        # In-memory indexes
+        # In-memory indexes (files parsed this session)
         self.file_index: Dict[str, FileIndex] = {}
         self.symbol_index: Dict[str, List[Symbol]] = defaultdict(list)
         self.import_graph: Dict[str, Set[str]] = defaultdict(set)
 
+        # Memory-mapped index from load_cache(); files re-parsed or deleted
+        # since then are shadowed so their stored symbols are ignored
+        self._store: Optional[IndexStore] = None
+        self._store_files: Dict[str, int] = {}
+        self._shadowed: Set[int] = set()
+
+        # Name index for search_symbols(), built on first search
+        self._name_index: Optional[SymbolNameIndex] = None
+
         # Exclude patterns
         self.exclude_patterns = {
             '__pycache__', '.git', '.venv', 'venv', 'node_modules',
@@ -91,118 +332,152 @@ class SemanticIndexer:
 
     def parse_file(self, path: Path) -> Optional[FileIndex]:
         """Parse Python file and extract symbols."""
+        return _parse_python_file(self.root_path, path)
+
+    def _iter_source_files(self) -> Iterator[Path]:
+        """Walk the tree, pruning excluded directories before descending."""
+        excluded_dirs = {p for p in self.exclude_patterns if not p.startswith('*.')}
+        excluded_suffixes = tuple(p[1:] for p in self.exclude_patterns if p.startswith('*.'))
+
+        for dirpath, dirnames, filenames in os.walk(self.root_path):
+            dirnames[:] = [
+                d for d in dirnames
+                if d not in excluded_dirs and not d.endswith(excluded_suffixes)
+            ]
+            for filename in filenames:
+                if filename.endswith('.py'):
+                    path = Path(dirpath) / filename
+                    if self.should_index(path):
+                        yield path
+
+    def _parse_many(self, paths: List[Path], workers: Optional[int]) -> Iterator[Optional[FileIndex]]:
+        """Parse files, fanning out to a process pool for large batches."""
+        if workers == 1 or len(paths) < PARALLEL_PARSE_THRESHOLD:
+            for path in paths:
+                yield self.parse_file(path)
+            return
+
+        max_workers = workers or os.cpu_count() or 1
+        chunksize = max(1, len(paths) // (max_workers * 4))
         try:
-            with open(path, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            tree = ast.parse(content, filename=str(path))
-
-            symbols = []
-            imports = []
-
-            for node in ast.walk(tree):
-                # Classes
-                if isinstance(node, ast.ClassDef):
-                    symbols.append(Symbol(
-                        name=node.name,
-                        type='class',
-                        file_path=str(path.relative_to(self.root_path)),
-                        line_number=node.lineno,
-                        docstring=ast.get_docstring(node)
-                    ))
-
-                # Functions
-                elif isinstance(node, ast.FunctionDef):
-                    parent = None
-                    # Check if it's a method
-                    for parent_node in ast.walk(tree):
-                        if isinstance(parent_node, ast.ClassDef):
-                            if node in ast.walk(parent_node):
-                                parent = parent_node.name
-                                break
-
-                    # Build signature
-                    args = [arg.arg for arg in node.args.args]
-                    signature = f"{node.name}({', '.join(args)})"
-
-                    symbols.append(Symbol(
-                        name=node.name,
-                        type='method' if parent else 'function',
-                        file_path=str(path.relative_to(self.root_path)),
-                        line_number=node.lineno,
-                        docstring=ast.get_docstring(node),
-                        signature=signature,
-                        parent=parent
-                    ))
-
-                # Imports
-                elif isinstance(node, ast.Import):
-                    for alias in node.names:
-                        imports.append(alias.name)
-
-                elif isinstance(node, ast.ImportFrom):
-                    if node.module:
-                        imports.append(node.module)
-
-            file_hash = self.compute_file_hash(path)
-
-            return FileIndex(
-                path=str(path.relative_to(self.root_path)),
-                hash=file_hash,
-                symbols=symbols,
-                imports=imports,
-                last_modified=path.stat().st_mtime
-            )
-
-        except Exception as e:
-            # Silently skip files that can't be parsed
-            return None
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                results = list(pool.map(
+                    _parse_python_file, repeat(self.root_path), paths, chunksize=chunksize
+                ))
+        except (OSError, RuntimeError):
+            # No process support (sandbox, frozen app): parse serially
+            results = [self.parse_file(path) for path in paths]
+
+        yield from results
+
+    def _add_file(self, file_idx: FileIndex) -> None:
+        """Register a parsed file in the in-memory indexes."""
+        rel_path = file_idx.path
+        self.file_index[rel_path] = file_idx
+
+        # Update symbol index
+        for symbol in file_idx.symbols:
+            self.symbol_index[symbol.name].append(symbol)
+            if self._name_index is not None:
+                self._name_index.add(symbol.name)
+
+        # Update import graph
+        for imp in file_idx.imports:
+            self.import_graph[rel_path].add(imp)
+
+    def _remove_file(self, rel_path: str) -> None:
+        """Drop a file's symbols and import edges from the indexes."""
+        old = self.file_index.pop(rel_path, None)
+        self.import_graph.pop(rel_path, None)
+        if old is None:
+            return
+
+        if self._name_index is not None:
+            for name, count in Counter(s.name for s in old.symbols).items():
+                self._name_index.discard(name, count)
+
+        if isinstance(old.symbols, _StoredSymbols):
+            self._shadowed.add(self._store_files[rel_path])
+            return
+
+        for name in {s.name for s in old.symbols}:
+            remaining = [s for s in self.symbol_index.get(name, []) if s.file_path != rel_path]
+            if remaining:
+                self.symbol_index[name] = remaining
+            else:
+                self.symbol_index.pop(name, None)
 
-    def index_codebase(self, force: bool = False) -> int:
+    def index_codebase(self, force: bool = False, workers: Optional[int] = None) -> int:
         """
-        Index entire codebase.
-        
+        Index entire codebase incrementally.
+
+        Unchanged files are skipped by (mtime, size, inode) before hashing;
+        changed files are re-parsed (in a process pool for large batches) and
+        their stale symbols replaced; deleted files are dropped.
+
+        Args:
+            force: Re-parse every file regardless of fingerprints
+            workers: Parser processes (None = CPU count, 1 = serial)
+
         Returns number of files indexed.
         """
-        indexed_count = 0
-
-        for path in self.root_path.rglob('*.py'):
-            if not self.should_index(path):
-                continue
+        seen: Set[str] = set()
+        changed: List[Path] = []
+        dirty = False
 
-            # Check if file needs reindexing
+        for path in self._iter_source_files():
             rel_path = str(path.relative_to(self.root_path))
+            seen.add(rel_path)
 
-            if not force and rel_path in self.file_index:
-                existing = self.file_index[rel_path]
-                current_hash = self.compute_file_hash(path)
+            existing = self.file_index.get(rel_path)
+            if not force and existing is not None:
+                try:
+                    st = path.stat()
+                except OSError:
+                    continue
 
-                if existing.hash == current_hash:
-                    continue  # Skip unchanged files
+                if existing.matches_stat(st):
+                    continue  # Fast path: untouched since last index
 
-            # Parse and index
-            file_idx = self.parse_file(path)
-            if file_idx:
-                self.file_index[rel_path] = file_idx
+                if existing.hash and existing.hash == self.compute_file_hash(path):
+                    existing.update_stat(st)  # Touched but content identical
+                    dirty = True
+                    continue
 
-                # Update symbol index
-                for symbol in file_idx.symbols:
-                    self.symbol_index[symbol.name].append(symbol)
+            changed.append(path)
 
-                # Update import graph
-                for imp in file_idx.imports:
-                    self.import_graph[rel_path].add(imp)
+        # Drop files that disappeared since the last run
+        for rel_path in [p for p in self.file_index if p not in seen]:
+            self._remove_file(rel_path)
+            dirty = True
 
+        indexed_count = 0
+        for path, file_idx in zip(changed, self._parse_many(changed, workers)):
+            self._remove_file(str(path.relative_to(self.root_path)))
+            dirty = True
+            if file_idx:
+                self._add_file(file_idx)
                 indexed_count += 1
 
         # Save to cache
-        self._save_cache()
+        if dirty or force:
+            self._save_cache()
 
         return indexed_count
 
+    def _stored_symbols(self, name: str) -> List[Symbol]:
+        """Symbols with this exact name from the mapped index, minus shadowed files."""
+        if self._store is None:
+            return []
+        return [
+            Symbol(*self._store.symbol_row(i))
+            for i in self._store.lookup(name)
+            if self._store.symbol_file(i) not in self._shadowed
+        ]
+
     def find_symbol(self, name: str, type: Optional[str] = None) -> List[Symbol]:
         """Find symbols by name and optional type."""
-        symbols = self.symbol_index.get(name, [])
+        symbols = self.symbol_index.get(name, []) + self._stored_symbols(name)
 
         if type:
             symbols = [s for s in symbols if s.type == type]
@@ -276,12 +551,18 @@ class SemanticIndexer:
             processed.add(current)
 
             if current in self.import_graph:
-                for imp in self.import_graph[current]:
-                    # Try to resolve import to file
-                    resolved = self._resolve_import(imp)
-                    if resolved and resolved not in processed:
-                        deps.add(resolved)
-                        to_process.append(resolved)
+                imports = self.import_graph[current]
+            elif current in self.file_index:
+                imports = self.file_index[current].imports
+            else:
+                continue
+
+            for imp in imports:
+                # Try to resolve import to file
+                resolved = self._resolve_import(imp)
+                if resolved and resolved not in processed:
+                    deps.add(resolved)
+                    to_process.append(resolved)
 
         return deps
 
@@ -302,26 +583,41 @@ class SemanticIndexer:
 
         return None
 
+    def _stored_names(self) -> Iterator[Tuple[str, Sequence[int]]]:
+        """(name, live symbol ids) pairs from the mapped index."""
+        store = self._store
+        if store is None:
+            return
+
+        for i in range(store.name_count):
+            ids = store.postings(i)
+            if self._shadowed:
+                ids = [sid for sid in ids if store.symbol_file(sid) not in self._shadowed]
+                if not ids:
+                    continue
+            yield store.name(i), ids
+
+    def _names(self) -> SymbolNameIndex:
+        """Name index over overlay and stored symbols, built on first use."""
+        if self._name_index is None:
+            counts = [(name, len(symbols)) for name, symbols in self.symbol_index.items()]
+            counts += [(name, len(ids)) for name, ids in self._stored_names()]
+            self._name_index = SymbolNameIndex.from_counts(counts)
+        return self._name_index
+
     def search_symbols(self, query: str, limit: int = 10) -> List[Symbol]:
-        """Fuzzy search symbols."""
-        query_lower = query.lower()
-        results = []
+        """
+        Fuzzy search symbols.
 
-        for name, symbols in self.symbol_index.items():
-            if query_lower in name.lower():
-                results.extend(symbols)
-
-        # Sort by relevance (exact match first, then prefix, then contains)
-        def sort_key(symbol: Symbol) -> Tuple[int, str]:
-            name_lower = symbol.name.lower()
-            if name_lower == query_lower:
-                return (0, symbol.name)
-            elif name_lower.startswith(query_lower):
-                return (1, symbol.name)
-            else:
-                return (2, symbol.name)
+        Ranked exact > prefix > word-boundary substring > substring >
+        camel-hump abbreviation (see symbol_search).
+        """
+        results = []
 
-        results.sort(key=sort_key)
+        for name in self._names().search(query, limit):
+            results.extend(self.find_symbol(name))
+            if len(results) >= limit:
+                break
 
         return results[:limit]
 
@@ -334,84 +630,86 @@ class SemanticIndexer:
             for symbol in symbols:
                 symbol_types[symbol.type] += 1
 
+        unique_names = {name for name, symbols in self.symbol_index.items() if symbols}
+
+        if self._store is not None:
+            type_counts = Counter()
+            for idx in self.file_index.values():
+                if isinstance(idx.symbols, _StoredSymbols):
+                    total_symbols += len(idx.symbols)
+                    type_counts.update(self._store.symbol_type(i) for i in idx.symbols.ids)
+            for type_name, count in type_counts.items():
+                symbol_types[type_name] += count
+            unique_names.update(name for name, _ in self._stored_names())
+
         return {
             'files_indexed': len(self.file_index),
             'total_symbols': total_symbols,
             'symbol_types': dict(symbol_types),
-            'unique_symbols': len(self.symbol_index)
+            'unique_symbols': len(unique_names)
         }
 
     def _save_cache(self):
-        """Save index to cache."""
-        cache_file = self.cache_dir / "index.json"
+        """Save index to cache (binary, atomic)."""
+        def records() -> Iterator[FileRecord]:
+            for idx in self.file_index.values():
+                if isinstance(idx.symbols, _StoredSymbols):
+                    rows = idx.symbols.rows()
+                else:
+                    rows = (
+                        (s.name, s.type, s.file_path, s.line_number,
+                         s.docstring, s.signature, s.parent)
+                        for s in idx.symbols
+                    )
+                yield FileRecord(
+                    path=idx.path,
+                    hash=idx.hash,
+                    last_modified=idx.last_modified,
+                    mtime_ns=idx.mtime_ns,
+                    size=idx.size,
+                    inode=idx.inode,
+                    symbols=rows,
+                    imports=idx.imports
+                )
 
         try:
-            data = {
-                'file_index': {
-                    path: {
-                        'path': idx.path,
-                        'hash': idx.hash,
-                        'symbols': [
-                            {
-                                'name': s.name,
-                                'type': s.type,
-                                'file_path': s.file_path,
-                                'line_number': s.line_number,
-                                'docstring': s.docstring,
-                                'signature': s.signature,
-                                'parent': s.parent
-                            }
-                            for s in idx.symbols
-                        ],
-                        'imports': idx.imports,
-                        'last_modified': idx.last_modified
-                    }
-                    for path, idx in self.file_index.items()
-                }
-            }
-
-            with open(cache_file, 'w') as f:
-                json.dump(data, f, indent=2)
+            write_index(self.cache_dir / INDEX_FILE, records())
+            # Superseded by the binary format
+            (self.cache_dir / LEGACY_INDEX_FILE).unlink(missing_ok=True)
 
         except Exception:
             pass  # Silently fail cache save
 
     def load_cache(self) -> bool:
-        """Load index from cache."""
-        cache_file = self.cache_dir / "index.json"
+        """
+        Load index from cache.
 
-        if not cache_file.exists():
+        The index file is memory-mapped; only per-file fingerprints are read
+        up front and symbols are decoded when looked up.
+        """
+        store = IndexStore.open(self.cache_dir / INDEX_FILE)
+        if store is None:
             return False
 
-        try:
-            with open(cache_file, 'r') as f:
-                data = json.load(f)
-
-            # Reconstruct indexes
-            for path, idx_data in data['file_index'].items():
-                symbols = [
-                    Symbol(**s) for s in idx_data['symbols']
-                ]
-
-                file_idx = FileIndex(
-                    path=idx_data['path'],
-                    hash=idx_data['hash'],
-                    symbols=symbols,
-                    imports=idx_data['imports'],
-                    last_modified=idx_data['last_modified']
-                )
-
-                self.file_index[path] = file_idx
-
-                # Rebuild symbol index
-                for symbol in symbols:
-                    self.symbol_index[symbol.name].append(symbol)
-
-                # Rebuild import graph
-                for imp in file_idx.imports:
-                    self.import_graph[path].add(imp)
-
-            return True
+        self.file_index.clear()
+        self.symbol_index.clear()
+        self.import_graph.clear()
+        self._store = store
+        self._store_files = {}
+        self._shadowed = set()
+        self._name_index = None
+
+        for file_id, record in store.files():
+            self._store_files[record.path] = file_id
+            self.file_index[record.path] = FileIndex(
+                path=record.path,
+                hash=record.hash,
+                symbols=_StoredSymbols(store, record.symbols),
+                imports=_StoredImports(store, record.imports),
+                last_modified=record.last_modified,
+                mtime_ns=record.mtime_ns,
+                size=record.size,
+                inode=record.inode
+            )
 
-        except Exception:
-            return False
+        return True
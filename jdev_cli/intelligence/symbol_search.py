@@ -0,0 +1,299 @@
+"""
+Symbol name index for fuzzy lookup.
+
+Ranks unique symbol names against a query in tiers:
+
+    0  exact (case-insensitive)
+    1  prefix
+    2  substring at a camelCase/snake_case word boundary
+    3  substring anywhere else
+    4  camel-hump abbreviation ("gfc" -> get_file_context, "semInd" -> SemanticIndexer)
+
+Exact and prefix matches come from a sorted key list (bisect); word-start
+substrings from trigrams taken at inner word starts; other substrings from
+the query's rarest trigram; abbreviations from postings keyed by the name's
+leading word initials. Candidates are verified against the lowercased name.
+Lower tiers are only consulted while the top-k is not yet full, each tier
+stops scanning once it cannot improve the top-k, and hits are ranked with a
+heap instead of sorting.
+
+Queries shorter than a trigram have no postings to narrow the substring
+tiers, so those scan every name linearly.
+"""
+
+import heapq
+import re
+from collections import defaultdict
+from array import array
+from bisect import bisect_left, insort
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+
+_WORD_RE = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|\d+")
+_SEPARATOR = "\0"
+
+# Rebuild once tombstoned names outnumber live ones (and there are enough to matter)
+_COMPACT_MIN_DEAD = 1024
+
+
+def split_words(name: str) -> List[str]:
+    """Split a camelCase / snake_case / ALLCAPS identifier into lowercase words."""
+    return [w.lower() for w in _WORD_RE.findall(name)]
+
+
+def _trigrams(text: str) -> Iterator[str]:
+    return (text[i:i + 3] for i in range(len(text) - 2))
+
+
+def _initial_keys(initial_chars: List[str]) -> List[str]:
+    initials = "".join(initial_chars[:3])
+    return [initials[:n] for n in (2, 3) if len(initials) >= n]
+
+
+def _query_initials(query: str) -> str:
+    """Word initials implied by a query: explicit humps/underscores, else each char."""
+    words = split_words(query)
+    if len(words) > 1:
+        return "".join(w[0] for w in words[:3])
+    return query.lower()[:3]
+
+
+def _hump_pattern(query: str) -> "re.Pattern[str]":
+    """Match query chars in order, each continuing the current word or starting a later one."""
+    words = split_words(query) or [query.lower() or " "]
+    chars = "".join(words)
+    skip = "(?:[^ ]* )*?"
+    # An explicit query hump must land on a word start
+    parts = [re.escape(chars[0])]
+    pos = len(words[0])
+    boundaries = set()
+    for w in words[1:]:
+        boundaries.add(pos)
+        pos += len(w)
+    for i, char in enumerate(chars[1:], start=1):
+        parts.append(("(?:[^ ]* )+?" if i in boundaries else skip) + re.escape(char))
+    return re.compile("".join(parts))
+
+
+def _word_starts(name: str) -> List[int]:
+    """Offsets where camelCase / snake_case words begin."""
+    return [m.start() for m in _WORD_RE.finditer(name)]
+
+
+class SymbolNameIndex:
+    """
+    Incrementally maintained index over unique symbol names.
+
+    Names are reference counted (many symbols share a name); a name leaves
+    the index when its count drops to zero.
+    """
+
+    def __init__(self) -> None:
+        self._ids: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._lower: List[str] = []
+        self._refs: List[int] = []
+        self._dead = 0
+
+        self._sorted: List[str] = []  # "<lower>\0<name>", kept sorted
+        self._ordered_until = 0  # ids below this were assigned in name order
+        self._trigrams: Dict[str, array] = {}
+        self._word_trigrams: Dict[str, array] = {}  # trigrams at inner word starts
+        self._initials: Dict[str, array] = {}
+
+    @classmethod
+    def from_counts(cls, counts: Iterable[Tuple[str, int]]) -> "SymbolNameIndex":
+        """Bulk-build from (name, symbol count) pairs."""
+        index = cls()
+        trigrams: Dict[str, List[int]] = defaultdict(list)
+        word_trigrams: Dict[str, List[int]] = defaultdict(list)
+        initials: Dict[str, List[int]] = defaultdict(list)
+
+        # Assign ids in name order so every postings list is name-ordered too
+        live = sorted((name.lower(), name, count) for name, count in counts if count > 0)
+        for name_id, (lower, name, count) in enumerate(live):
+            index._ids[name] = name_id
+            index._names.append(name)
+            index._lower.append(lower)
+            index._refs.append(count)
+            index._sorted.append(lower + _SEPARATOR + name)
+
+            for gram in {lower[i:i + 3] for i in range(len(lower) - 2)}:
+                trigrams[gram].append(name_id)
+            starts = _word_starts(name)
+            for gram in {lower[pos:pos + 3] for pos in starts if 0 < pos <= len(lower) - 3}:
+                word_trigrams[gram].append(name_id)
+            for key in _initial_keys([lower[pos] for pos in starts]):
+                initials[key].append(name_id)
+
+        index._trigrams = {g: array("I", ids) for g, ids in trigrams.items()}
+        index._word_trigrams = {g: array("I", ids) for g, ids in word_trigrams.items()}
+        index._initials = {k: array("I", ids) for k, ids in initials.items()}
+        index._ordered_until = len(live)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._names) - self._dead
+
+    def __contains__(self, name: str) -> bool:
+        name_id = self._ids.get(name)
+        return name_id is not None and self._refs[name_id] > 0
+
+    def add(self, name: str, count: int = 1) -> None:
+        """Register `count` more symbols called `name`."""
+        self._insert(name, count)
+
+    def discard(self, name: str, count: int = 1) -> None:
+        """Forget `count` symbols called `name`."""
+        name_id = self._ids.get(name)
+        if name_id is None or self._refs[name_id] <= 0:
+            return
+
+        self._refs[name_id] = max(0, self._refs[name_id] - count)
+        if self._refs[name_id] == 0:
+            key = self._lower[name_id] + _SEPARATOR + name
+            pos = bisect_left(self._sorted, key)
+            if pos < len(self._sorted) and self._sorted[pos] == key:
+                del self._sorted[pos]
+            self._dead += 1
+            if self._dead > _COMPACT_MIN_DEAD and self._dead > len(self):
+                self._compact()
+
+    def _insert(self, name: str, count: int) -> None:
+        name_id = self._ids.get(name)
+        if name_id is not None:
+            revived = self._refs[name_id] == 0
+            self._refs[name_id] += count
+            if revived:
+                # Postings were kept as tombstones; only the sorted key went away
+                self._dead -= 1
+                insort(self._sorted, self._lower[name_id] + _SEPARATOR + name)
+            return
+
+        name_id = len(self._names)
+        lower = name.lower()
+        self._ids[name] = name_id
+        self._names.append(name)
+        self._lower.append(lower)
+        self._refs.append(count)
+
+        insort(self._sorted, lower + _SEPARATOR + name)
+
+        for gram in set(_trigrams(lower)):
+            postings = self._trigrams.get(gram)
+            if postings is None:
+                postings = self._trigrams[gram] = array("I")
+            postings.append(name_id)
+
+        starts = _word_starts(name)
+        for gram in {lower[pos:pos + 3] for pos in starts if 0 < pos <= len(lower) - 3}:
+            postings = self._word_trigrams.get(gram)
+            if postings is None:
+                postings = self._word_trigrams[gram] = array("I")
+            postings.append(name_id)
+
+        for initials in _initial_keys([lower[pos] for pos in starts]):
+            postings = self._initials.get(initials)
+            if postings is None:
+                postings = self._initials[initials] = array("I")
+            postings.append(name_id)
+
+    def _compact(self) -> None:
+        live = [(n, r) for n, r in zip(self._names, self._refs) if r > 0]
+        self.__dict__.update(SymbolNameIndex.from_counts(live).__dict__)
+
+    def search(self, query: str, limit: int = 10) -> List[str]:
+        """Return up to `limit` names ranked by tier, then case-insensitively by name."""
+        if limit <= 0:
+            return []
+
+        q = query.lower()
+        results: List[str] = []
+        seen = set()
+
+        # Tiers 0-1: exact and prefix matches are one contiguous sorted range,
+        # exact ones first since the separator sorts below every character
+        for pos in range(bisect_left(self._sorted, q), len(self._sorted)):
+            key = self._sorted[pos]
+            if len(results) >= limit or not key.startswith(q):
+                break
+            name = key.partition(_SEPARATOR)[2]
+            results.append(name)
+            seen.add(name)
+        if len(results) >= limit:
+            return results
+
+        # Tiers 2-3: substrings; every candidate list is a superset of the
+        # matches, so scan the shortest and verify with a C-level `in` first
+        if len(q) >= 3:
+            grams = [self._trigrams.get(g) for g in set(_trigrams(q))]
+            rarest = min(grams, key=len) if all(grams) else None
+            word_grams = self._word_trigrams.get(q[:3], ())
+        else:
+            # Shorter than a trigram: fall back to a linear scan over every name
+            rarest = word_grams = range(len(self._names)) if q else None
+        if rarest is not None:
+            # Tier 2: substring starting an inner word
+            need = limit - len(results)
+            hits = []
+            candidates = word_grams if len(word_grams) < len(rarest) else rarest
+            for name_id in self._scan(candidates, lambda: len(hits) >= need):
+                lower = self._lower[name_id]
+                if q in lower and self._refs[name_id] and not lower.startswith(q):
+                    name = self._names[name_id]
+                    if any(lower.startswith(q, pos) for pos in _word_starts(name) if pos):
+                        hits.append((lower, name))
+            for _, name in heapq.nsmallest(need, hits):
+                results.append(name)
+                seen.add(name)
+            if len(results) >= limit:
+                return results
+
+            # Tier 3: any other substring
+            need = limit - len(results)
+            hits = []
+            for name_id in self._scan(rarest, lambda: len(hits) >= need):
+                lower = self._lower[name_id]
+                if q in lower and self._refs[name_id] and not lower.startswith(q):
+                    name = self._names[name_id]
+                    if name not in seen:
+                        hits.append((lower, name))
+            for _, name in heapq.nsmallest(need, hits):
+                results.append(name)
+                seen.add(name)
+            if len(results) >= limit:
+                return results
+
+        # Tier 4: camel-hump abbreviations anchored at the first word
+        initials = _query_initials(query)
+        postings: Optional[array] = self._initials.get(initials) if len(initials) >= 2 else None
+        if postings:
+            pattern = _hump_pattern(query)
+            # Necessary condition checked in C before splitting the name into words
+            in_order = re.compile(".*?".join(map(re.escape, "".join(split_words(query)) or q)))
+            need = limit - len(results)
+            hits = []
+            for name_id in self._scan(postings, lambda: len(hits) >= need):
+                name = self._names[name_id]
+                if in_order.search(self._lower[name_id]) and self._refs[name_id] and name not in seen:
+                    if pattern.match(" ".join(split_words(name))):
+                        hits.append((self._lower[name_id], name))
+            results.extend(name for _, name in heapq.nsmallest(need, hits))
+
+        return results
+
+    def _scan(self, postings: Sequence[int], full: Callable[[], bool]) -> Iterator[int]:
+        """
+        Walk postings, skipping the rest of the name-ordered head once `full()`.
+
+        Ids below the bulk-build watermark are in name order, so once enough
+        hits are found there no later head entry can rank higher; ids added
+        incrementally since are unordered and always scanned.
+        """
+        tail = bisect_left(postings, self._ordered_until)
+        for pos in range(tail):
+            if full():
+                break
+            yield postings[pos]
+        for pos in range(tail, len(postings)):
+            yield postings[pos]
@@ -277,7 +277,10 @@ class InteractiveShell:
         self.async_executor = AsyncExecutor(max_parallel=5)
 
         # Phase 4.4: File watcher for context tracking
-        self.file_watcher = FileWatcher(root_path=".", watch_extensions={'.py', '.js', '.ts', '.go', '.rs'})
+        # Editor saves fire bursts of events; hold a path until it is quiet briefly
+        self.file_watcher = FileWatcher(
+            root_path=".", watch_extensions={'.py', '.js', '.ts', '.go', '.rs'}, debounce=0.3
+        )
         self.recent_files = RecentFilesTracker(maxsize=50)
 
         # Setup file watcher callback
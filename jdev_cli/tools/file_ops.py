@@ -9,6 +9,7 @@ import logging
 from .base import ToolResult, ToolCategory
 from .validated import ValidatedTool
 from ..core.validation import Required, TypeCheck
+from ..core.edit_engine import EditError, Replacement, apply_edits, backup_file, write_text_atomic
 
 logger = logging.getLogger(__name__)
 
@@ -291,38 +292,25 @@ class EditFileTool(ValidatedTool):
 
             # Read current content
             original_content = file_path.read_text()
-            modified_content = original_content
 
-            # Create backup
-            backup_path = None
-            if create_backup:
-                backup_dir = Path(".qwen_backups")
-                backup_dir.mkdir(exist_ok=True)
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                backup_path = backup_dir / f"{file_path.name}.{timestamp}.bak"
-                backup_path.write_text(original_content)
-
-            # Apply edits
-            changes = 0
-            for edit in edits:
-                search = edit.get('search', '')
-                replace = edit.get('replace', '')
-
-                if search in modified_content:
-                    if replace_all:
-                        # Claude Code parity: Replace ALL occurrences
-                        occurrence_count = modified_content.count(search)
-                        modified_content = modified_content.replace(search, replace)
-                        changes += occurrence_count
-                    else:
-                        # Default: Replace only first occurrence
-                        modified_content = modified_content.replace(search, replace, 1)
-                        changes += 1
-                else:
-                    return ToolResult(
-                        success=False,
-                        error=f"Search string not found: {search[:50]}..."
-                    )
+            # Apply edits in one pass over the original; apply_edits runs
+            # them sequentially when an edit could match text produced by an
+            # earlier one, so chained edits give the same result as before
+            replacements = [
+                Replacement(edit.get('search', ''), edit.get('replace', ''), replace_all)
+                for edit in edits
+            ]
+            try:
+                result = apply_edits(original_content, replacements)
+            except EditError as e:
+                if e.kind == "empty":
+                    return ToolResult(success=False, error=f"Edit {e.index + 1}: search string is empty")
+                return ToolResult(
+                    success=False,
+                    error=f"Search string not found: {e.search[:50]}..."
+                )
+            modified_content = result.content
+            changes = result.changes
 
             # Show preview if enabled (Integration Sprint Week 1: Task 1.3)
             if preview and console and original_content != modified_content:
@@ -343,8 +331,12 @@ class EditFileTool(ValidatedTool):
                         error="Edit cancelled by user"
                     )
 
-            # Write modified content
-            file_path.write_text(modified_content)
+            # Back up (hard link to the current inode) and replace atomically
+            backup_path = None
+            if create_backup:
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                backup_path = backup_file(file_path, Path(".qwen_backups") / f"{file_path.name}.{timestamp}.bak")
+            write_text_atomic(file_path, modified_content)
 
             result = ToolResult(
                 success=True,
@@ -20,6 +20,7 @@ import logging
 from pathlib import Path
 from typing import List
 
+from jdev_cli.core.edit_engine import EditError, EditTransaction, Replacement, backup_file
 from jdev_cli.tools.base import Tool, ToolCategory, ToolResult
 
 logger = logging.getLogger(__name__)
@@ -242,10 +243,12 @@ class LSTool(Tool):
 
 class MultiEditTool(Tool):
     """
-    Apply multiple edits to a single file atomically.
+    Apply multiple edits to a file (or several files) atomically.
 
     All edits must succeed or none are applied - atomic operation.
-    Edits are applied in order, with line numbers adjusted automatically.
+    Every old_string is located in the original content and must be
+    unique; edits may not overlap. The result is written via a temp file
+    and rename, so readers never see a partial file.
 
     Security: Validates edits before applying to prevent data loss.
 
@@ -257,6 +260,12 @@ class MultiEditTool(Tool):
                 {"old_string": "baz", "new_string": "qux"}
             ]
         )
+
+        # Several files, all or none
+        result = await multi_edit.execute(files=[
+            {"file_path": "a.py", "edits": [{"old_string": "foo", "new_string": "bar"}]},
+            {"file_path": "b.py", "edits": [{"old_string": "foo", "new_string": "bar"}]},
+        ])
     """
 
     # Maximum file size to process (10MB)
@@ -271,7 +280,7 @@ class MultiEditTool(Tool):
             "file_path": {
                 "type": "string",
                 "description": "Absolute path to the file to edit",
-                "required": True
+                "required": False
             },
             "edits": {
                 "type": "array",
@@ -283,12 +292,24 @@ class MultiEditTool(Tool):
                     }
                 },
                 "description": "List of {old_string, new_string} edits to apply",
-                "required": True
+                "required": False
             },
             "create_backup": {
                 "type": "boolean",
                 "description": "Create backup before editing (default: true)",
                 "required": False
+            },
+            "files": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "file_path": {"type": "string"},
+                        "edits": {"type": "array"}
+                    }
+                },
+                "description": "Edit several files at once, all or none (instead of file_path/edits)",
+                "required": False
             }
         }
 
@@ -296,8 +317,12 @@ class MultiEditTool(Tool):
         """Execute multiple edits atomically."""
         file_path = kwargs.get("file_path", "")
         edits = kwargs.get("edits", [])
+        files = kwargs.get("files")
         create_backup = kwargs.get("create_backup", True)
 
+        if files is not None:
+            return self._execute_batch(files, create_backup)
+
         # Validate required parameters
         if not file_path:
             return ToolResult(success=False, error="file_path is required")
@@ -309,82 +334,17 @@ class MultiEditTool(Tool):
             return ToolResult(success=False, error="edits must be an array")
 
         try:
-            path = Path(file_path)
+            tx = EditTransaction()
+            planned = self._plan_file(tx, file_path, edits)
+            if isinstance(planned, ToolResult):
+                return planned
+            path, original_size, new_size, applied = planned
 
-            if not path.exists():
-                return ToolResult(success=False, error=f"File does not exist: {file_path}")
+            # Create backup if requested (hard link: the write below replaces the inode)
+            backup_path = self._backup(path) if create_backup else None
 
-            if not path.is_file():
-                return ToolResult(success=False, error=f"Path is not a file: {file_path}")
-
-            # Check file size
-            file_size = path.stat().st_size
-            if file_size > self.MAX_FILE_SIZE:
-                return ToolResult(
-                    success=False,
-                    error=f"File too large ({file_size} bytes). Max: {self.MAX_FILE_SIZE}"
-                )
-
-            # Read original content
-            try:
-                original_content = path.read_text(encoding='utf-8')
-            except UnicodeDecodeError:
-                return ToolResult(success=False, error="File is not valid UTF-8 text")
-
-            content = original_content
-
-            # Phase 1: Validate all edits first (dry run)
-            validation_errors = []
-            for i, edit in enumerate(edits):
-                if not isinstance(edit, dict):
-                    validation_errors.append(f"Edit {i+1}: must be an object")
-                    continue
-
-                old_string = edit.get("old_string", "")
-                if old_string and old_string not in content:
-                    validation_errors.append(f"Edit {i+1}: old_string not found in file")
-
-            if validation_errors:
-                return ToolResult(
-                    success=False,
-                    error="; ".join(validation_errors)
-                )
-
-            # Phase 2: Apply all edits
-            applied = []
-            for i, edit in enumerate(edits):
-                old_string = edit.get("old_string", "")
-                new_string = edit.get("new_string", "")
-
-                if old_string:
-                    # Check for ambiguous matches
-                    count = content.count(old_string)
-                    if count > 1:
-                        return ToolResult(
-                            success=False,
-                            error=f"Edit {i+1}: old_string appears {count} times (ambiguous)"
-                        )
-
-                    content = content.replace(old_string, new_string, 1)
-                    applied.append({
-                        "index": i,
-                        "type": "replace",
-                        "old_len": len(old_string),
-                        "new_len": len(new_string)
-                    })
-
-            # Create backup if requested
-            backup_path = None
-            if create_backup:
-                backup_path = path.with_suffix(path.suffix + '.bak')
-                try:
-                    backup_path.write_text(original_content, encoding='utf-8')
-                except OSError as e:
-                    logger.warning(f"Could not create backup: {e}")
-                    backup_path = None
-
-            # Write new content
-            path.write_text(content, encoding='utf-8')
+            # Write new content (temp file + rename)
+            tx.commit()
 
             return ToolResult(
                 success=True,
@@ -394,10 +354,10 @@ class MultiEditTool(Tool):
                     "backup": str(backup_path) if backup_path else None
                 },
                 metadata={
-                    "original_size": len(original_content),
-                    "new_size": len(content),
+                    "original_size": original_size,
+                    "new_size": new_size,
                     "edits": applied,
-                    "size_delta": len(content) - len(original_content)
+                    "size_delta": new_size - original_size
                 }
             )
 
@@ -407,6 +367,118 @@ class MultiEditTool(Tool):
             logger.error(f"MultiEdit error: {e}")
             return ToolResult(success=False, error=str(e))
 
+    def _execute_batch(self, files: list, create_backup: bool) -> ToolResult:
+        """Edit several files: every file is validated before any is written."""
+        if not isinstance(files, list) or not files:
+            return ToolResult(success=False, error="files must be a non-empty array")
+
+        try:
+            tx = EditTransaction()
+            results = []
+            for entry in files:
+                if not isinstance(entry, dict) or not entry.get("file_path") or not entry.get("edits"):
+                    return ToolResult(success=False, error="each file needs file_path and edits")
+                planned = self._plan_file(tx, entry["file_path"], entry["edits"])
+                if isinstance(planned, ToolResult):
+                    planned.error = f"{entry['file_path']}: {planned.error}"
+                    return planned
+                results.append(planned)
+
+            backups = {str(path): self._backup(path) for path, *_ in results} if create_backup else {}
+            tx.commit()
+
+            return ToolResult(
+                success=True,
+                data={
+                    "files": [
+                        {
+                            "file": str(path),
+                            "edits_applied": len(applied),
+                            "backup": str(backups[str(path)]) if backups.get(str(path)) else None
+                        }
+                        for path, _, _, applied in results
+                    ],
+                    "edits_applied": sum(len(applied) for *_, applied in results)
+                },
+                metadata={
+                    "size_delta": sum(new - old for _, old, new, _ in results)
+                }
+            )
+
+        except PermissionError as e:
+            return ToolResult(success=False, error=f"Permission denied: {e.filename}")
+        except Exception as e:
+            logger.error(f"MultiEdit error: {e}")
+            return ToolResult(success=False, error=str(e))
+
+    def _plan_file(self, tx: EditTransaction, file_path: str, edits: list):
+        """Validate a file's edits and add them to tx; a ToolResult on failure."""
+        path = Path(file_path)
+
+        if not path.exists():
+            return ToolResult(success=False, error=f"File does not exist: {file_path}")
+
+        if not path.is_file():
+            return ToolResult(success=False, error=f"Path is not a file: {file_path}")
+
+        # Check file size
+        file_size = path.stat().st_size
+        if file_size > self.MAX_FILE_SIZE:
+            return ToolResult(
+                success=False,
+                error=f"File too large ({file_size} bytes). Max: {self.MAX_FILE_SIZE}"
+            )
+
+        # Validate all edits first (dry run); empty old_string is a no-op
+        validation_errors = []
+        indexes, replacements = [], []
+        for i, edit in enumerate(edits):
+            if not isinstance(edit, dict):
+                validation_errors.append(f"Edit {i+1}: must be an object")
+            elif edit.get("old_string", ""):
+                indexes.append(i)
+                replacements.append(Replacement(edit["old_string"], edit.get("new_string", "")))
+
+        if validation_errors:
+            return ToolResult(success=False, error="; ".join(validation_errors))
+
+        # Splice once when the edits are independent; chained edits (an
+        # old_string produced by an earlier edit) still apply in order
+        try:
+            result = tx.edit(path, replacements, unique=True)
+        except UnicodeDecodeError:
+            return ToolResult(success=False, error="File is not valid UTF-8 text")
+        except EditError as e:
+            edit_number = indexes[e.index] + 1
+            if e.kind == "not_found":
+                error = f"Edit {edit_number}: old_string not found in file"
+            elif e.kind == "ambiguous":
+                error = f"Edit {edit_number}: old_string appears {e.count} times (ambiguous)"
+            else:
+                error = str(e)
+            return ToolResult(success=False, error=error)
+
+        applied = [
+            {
+                "index": i,
+                "type": "replace",
+                "old_len": len(r.search),
+                "new_len": len(r.replace)
+            }
+            for i, r in zip(indexes, replacements)
+        ]
+        original_size = len(result.content) - sum(a["new_len"] - a["old_len"] for a in applied)
+        return path, original_size, len(result.content), applied
+
+    @staticmethod
+    def _backup(path: Path):
+        """Keep the current version at <file>.bak; None if that fails."""
+        try:
+            return backup_file(path, path.with_suffix(path.suffix + '.bak'))
+        except OSError as e:
+            logger.warning(f"Could not create backup: {e}")
+            return None
+
 
 # =============================================================================
 # REGISTRY HELPER
@@ -2,14 +2,180 @@
 import logging
 logger = logging.getLogger(__name__)
 
-import subprocess
+import asyncio
+import base64
+import json
+import re
+import threading
+from collections import deque
+from itertools import islice
 from pathlib import Path
-from typing import Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 
+from . import text_search
 from .base import ToolResult, ToolCategory
 from .validated import ValidatedTool
 
 
+# Hard wall-clock limit for one text search
+SEARCH_TIMEOUT = 10.0
+
+# Files larger than this are skipped by ripgrep (rg size syntax)
+DEFAULT_MAX_FILESIZE = "10M"
+
+# rg --json emits one object per line; long source lines make long objects
+_RG_LINE_LIMIT = 8 * 1024 * 1024
+
+
+def _parse_size(size: str) -> int:
+    """Convert an rg size ("10M", "512K", "100") to bytes."""
+    units = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+    if size and size[-1].upper() in units:
+        return int(size[:-1]) * units[size[-1].upper()]
+    return int(size)
+
+
+def _rg_text(data: Optional[Dict[str, Any]]) -> str:
+    """Decode an rg JSON text field (non-UTF-8 data arrives base64 encoded)."""
+    if not data:
+        return ""
+    if "text" in data:
+        return data["text"]
+    return base64.b64decode(data.get("bytes", "")).decode("utf-8", "replace")
+
+
+async def _discard_line(stream: asyncio.StreamReader) -> None:
+    """Drop the rest of an oversized line, up to and including its newline."""
+    while True:
+        try:
+            await stream.readuntil(b"\n")
+            return
+        except asyncio.LimitOverrunError as e:
+            await stream.read(e.consumed)  # Still no newline within the limit
+        except asyncio.IncompleteReadError:
+            return
+
+
+async def ripgrep_stream(
+    pattern: str,
+    path: str = ".",
+    file_pattern: Optional[str] = None,
+    ignore_case: bool = False,
+    context_lines: int = 0,
+    max_count: Optional[int] = None,
+    max_filesize: Optional[str] = DEFAULT_MAX_FILESIZE,
+    stats: Optional[Dict[str, Any]] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Stream structured matches from `rg --json` as they are produced.
+
+    Each match carries the byte offset of its line, submatch spans and,
+    when `context_lines` > 0, the surrounding lines. Closing the generator
+    early (or cancelling the consumer) terminates rg, so callers only pay
+    for the output they read. Raises FileNotFoundError without rg.
+
+    If given, `stats` receives rg's exit code and stderr tail.
+    """
+    cmd = ["rg", "--json"]
+    if ignore_case:
+        cmd.append("-i")
+    if file_pattern:
+        cmd.extend(["--glob", file_pattern])
+    if context_lines > 0:
+        cmd.extend(["--context", str(context_lines)])
+    if max_count:
+        cmd.extend(["--max-count", str(max_count)])  # Per-file cap, pushed down
+    if max_filesize:
+        cmd.extend(["--max-filesize", max_filesize])
+    cmd.extend(["-e", pattern, "--", path])
+
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        limit=_RG_LINE_LIMIT,
+    )
+
+    # Drain stderr concurrently so a chatty rg can never block on a full pipe
+    stderr_tail: deque = deque(maxlen=20)
+
+    async def drain_stderr() -> None:
+        async for line in proc.stderr:
+            stderr_tail.append(line.decode("utf-8", "replace").rstrip())
+
+    stderr_task = asyncio.create_task(drain_stderr())
+
+    last: Optional[Dict[str, Any]] = None  # Match still collecting trailing context
+    before: deque = deque(maxlen=max(context_lines, 1))
+    try:
+        while True:
+            try:
+                raw = await proc.stdout.readline()
+            except ValueError:
+                # Line over the stream limit: skip the oversized event
+                logger.debug("Skipping oversized rg output line")
+                await _discard_line(proc.stdout)
+                continue
+            if not raw:
+                break
+
+            event = json.loads(raw)
+            kind = event.get("type")
+            data = event.get("data", {})
+
+            if kind == "context":
+                text = _rg_text(data.get("lines")).rstrip("\r\n")
+                if last is not None and data.get("line_number", 0) - last["line"] <= context_lines:
+                    last["context_after"].append(text)
+                before.append((data.get("line_number", 0), text))
+                continue
+
+            if last is not None:
+                yield last
+                last = None
+
+            if kind == "begin":
+                before.clear()
+            elif kind == "match":
+                line_number = data.get("line_number") or 0
+                match = {
+                    "file": _rg_text(data.get("path")),
+                    "line": line_number,
+                    "text": _rg_text(data.get("lines")).strip(),
+                    "byte_offset": data.get("absolute_offset", 0),
+                    "submatches": [
+                        {"start": sub["start"], "end": sub["end"], "text": _rg_text(sub.get("match"))}
+                        for sub in data.get("submatches", [])
+                    ],
+                }
+                if context_lines > 0:
+                    match["context_before"] = [
+                        text for number, text in before if line_number - number <= context_lines
+                    ]
+                    match["context_after"] = []
+                    before.clear()
+                    last = match
+                else:
+                    yield match
+
+        if last is not None:
+            yield last
+    finally:
+        if proc.returncode is None:
+            try:
+                proc.kill()
+            except ProcessLookupError:
+                pass
+        await proc.wait()
+        try:
+            await asyncio.wait_for(stderr_task, timeout=1.0)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            stderr_task.cancel()
+        if stats is not None:
+            stats["returncode"] = proc.returncode
+            stats["stderr"] = "\n".join(stderr_tail)
+
+
 class SearchFilesTool(ValidatedTool):
     """Search for text pattern in files using ripgrep."""
 
@@ -47,6 +213,11 @@ class SearchFilesTool(ValidatedTool):
                 "type": "boolean",
                 "description": "Case insensitive search",
                 "required": False
+            },
+            "context_lines": {
+                "type": "integer",
+                "description": "Lines of context to include before and after each match",
+                "required": False
             }
         }
     def get_validators(self):
@@ -56,12 +227,15 @@ class SearchFilesTool(ValidatedTool):
 
     async def _execute_validated(self, pattern: str, path: str = ".", file_pattern: Optional[str] = None,
                                  max_results: int = 50, semantic: bool = False, indexer=None,
-                                 ignore_case: bool = False) -> ToolResult:
+                                 ignore_case: bool = False, context_lines: int = 0) -> ToolResult:
         """
         Search for pattern in files.
         
         Week 3 Day 1: Added semantic search mode using indexer.
         When semantic=True, searches code symbols instead of text.
+
+        Text search streams `rg --json` and stops rg once `max_results`
+        matches are in, instead of buffering its whole output.
         """
         try:
             # Week 3 Day 1: Semantic search mode
@@ -70,91 +244,95 @@ class SearchFilesTool(ValidatedTool):
 
             # Original text-based search
             # Try ripgrep first
-            cmd = ["rg", "--line-number", "--with-filename", "--no-heading"]
-
-            if ignore_case:
-                cmd.append("-i")
-
-            if file_pattern:
-                cmd.extend(["--glob", file_pattern])
-
-            cmd.extend([pattern, path])
-
             try:
-                result = subprocess.run(
-                    cmd,
-                    capture_output=True,
-                    text=True,
-                    timeout=10
+                return await asyncio.wait_for(
+                    self._ripgrep_search(pattern, path, file_pattern, max_results,
+                                         ignore_case, context_lines),
+                    timeout=SEARCH_TIMEOUT
                 )
-
-                if result.returncode == 0:
-                    lines = result.stdout.strip().split('\n')[:max_results]
-
-                    results = []
-                    for line in lines:
-                        if ':' in line:
-                            parts = line.split(':', 2)
-                            if len(parts) >= 3:
-                                results.append({
-                                    "file": parts[0],
-                                    "line": int(parts[1]),
-                                    "text": parts[2].strip()
-                                })
-
-                    return ToolResult(
-                        success=True,
-                        data={"matches": results, "count": len(results)},
-                        metadata={
-                            "pattern": pattern,
-                            "count": len(results),
-                            "tool": "ripgrep"
-                        }
-                    )
             except FileNotFoundError:
-                # Ripgrep not installed, fall back to grep
-                logger.debug("ripgrep not available, falling back to grep")
-
-            # Fallback to grep
-            cmd = ["grep", "-rn"]
-            if ignore_case:
-                cmd.append("-i")
-            cmd.extend([pattern, path])
-            if file_pattern:
-                cmd.extend(["--include", file_pattern])
-
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
+                # Ripgrep not installed, fall back to the built-in engine
+                logger.debug("ripgrep not available, using built-in search")
 
-            lines = result.stdout.strip().split('\n')[:max_results]
+            # Fallback: built-in engine (honors .gitignore, skips binaries)
+            return await self._builtin_search(pattern, path, file_pattern, max_results,
+                                              ignore_case, context_lines)
 
-            results = []
-            for line in lines:
-                if ':' in line:
-                    parts = line.split(':', 2)
-                    if len(parts) >= 3:
-                        results.append({
-                            "file": parts[0],
-                            "line": int(parts[1]),
-                            "text": parts[2].strip()
-                        })
+        except asyncio.TimeoutError:
+            return ToolResult(success=False, error=f"Search timed out after {SEARCH_TIMEOUT:.0f}s")
+        except Exception as e:
+            return ToolResult(success=False, error=str(e))
 
-            return ToolResult(
-                success=True,
-                data={"matches": results, "count": len(results)},
-                metadata={
-                    "pattern": pattern,
-                    "count": len(results),
-                    "tool": "grep"
-                }
+    async def _ripgrep_search(self, pattern: str, path: str, file_pattern: Optional[str],
+                              max_results: int, ignore_case: bool, context_lines: int) -> ToolResult:
+        """Collect up to max_results matches from ripgrep, then stop it."""
+        results: List[Dict[str, Any]] = []
+        stats: Dict[str, Any] = {}
+        truncated = False
+
+        stream = ripgrep_stream(
+            pattern, path, file_pattern=file_pattern, ignore_case=ignore_case,
+            context_lines=context_lines, max_count=max_results, stats=stats
+        )
+        try:
+            async for match in stream:
+                if len(results) >= max_results:
+                    truncated = True
+                    break
+                results.append(match)
+        finally:
+            await stream.aclose()
+
+        # rg exits 1 for "no matches" and 2 for errors (possibly after partial output)
+        if stats.get("returncode") == 2 and not results:
+            return ToolResult(success=False, error=stats.get("stderr") or "ripgrep failed")
+
+        return ToolResult(
+            success=True,
+            data={"matches": results, "count": len(results)},
+            metadata={
+                "pattern": pattern,
+                "count": len(results),
+                "truncated": truncated,
+                "tool": "ripgrep"
+            }
+        )
+
+    async def _builtin_search(self, pattern: str, path: str, file_pattern: Optional[str],
+                              max_results: int, ignore_case: bool, context_lines: int) -> ToolResult:
+        """Search with the pure-Python engine in a worker thread."""
+        stop = threading.Event()
+
+        def collect() -> List[Dict[str, Any]]:
+            matches = text_search.iter_matches(
+                pattern, path, globs=[file_pattern] if file_pattern else (),
+                ignore_case=ignore_case, context_lines=context_lines, max_count=max_results,
+                max_filesize=_parse_size(DEFAULT_MAX_FILESIZE), stop=stop
             )
+            try:
+                return list(islice(matches, max_results + 1))
+            finally:
+                matches.close()
 
-        except Exception as e:
-            return ToolResult(success=False, error=str(e))
+        try:
+            results = await asyncio.wait_for(asyncio.to_thread(collect), timeout=SEARCH_TIMEOUT)
+        except re.error as e:
+            return ToolResult(success=False, error=f"Invalid pattern: {e}")
+        finally:
+            stop.set()  # Lets the walk wind down if we timed out or were cancelled
+
+        truncated = len(results) > max_results
+        results = results[:max_results]
+        return ToolResult(
+            success=True,
+            data={"matches": results, "count": len(results)},
+            metadata={
+                "pattern": pattern,
+                "count": len(results),
+                "truncated": truncated,
+                "tool": "builtin"
+            }
+        )
 
     async def _semantic_search(self, query: str, indexer, max_results: int) -> ToolResult:
         """
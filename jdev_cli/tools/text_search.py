@@ -0,0 +1,379 @@
+"""Built-in text search engine (ripgrep-compatible fallback).
+
+Used by SearchFilesTool when `rg` is not installed. Mirrors ripgrep's
+defaults closely enough that results agree on ordinary trees:
+
+- hidden files and directories are skipped, `.git` always
+- `.gitignore` files are honored hierarchically (negation, anchoring,
+  directory-only patterns, `**`); ignored directories are never entered
+- files whose first block contains a NUL byte are treated as binary
+- `--glob` semantics: a glob without `/` matches the file name at any
+  depth, with `/` the path relative to the search root, `!glob` excludes
+
+Files are scanned by a thread pool (large ones through mmap, small ones
+with a single read) using one compiled bytes regex over the whole buffer;
+like rg, a match never spans lines (one that would is retried within the
+line it starts on). Matches are yielded in walk order as soon as each file is done. The
+walk only stays a bounded window ahead of the consumer, so stopping early
+stops the work.
+"""
+
+import logging
+import mmap
+import os
+import re
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Bytes sniffed for NUL to classify a file as binary (same window as grep)
+BINARY_SNIFF_BYTES = 8192
+
+# Below this size one read() beats setting up a mapping
+MMAP_THRESHOLD = 64 * 1024
+
+# Files submitted ahead of the consumer, per worker
+_WINDOW_PER_WORKER = 4
+
+
+def _translate_glob(pattern: str) -> str:
+    """Translate a gitignore-style glob (no anchoring logic) into a regex body."""
+    out = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == "*":
+            if pattern.startswith("**/", i):
+                out.append("(?:.*/)?")
+                i += 3
+                continue
+            if pattern.startswith("**", i):
+                out.append(".*")
+                i += 2
+                continue
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            end = pattern.find("]", i + 2 if pattern.startswith("[!", i) or pattern.startswith("[^", i) else i + 1)
+            if end == -1:
+                out.append(re.escape(c))
+            else:
+                body = pattern[i + 1:end]
+                if body[:1] in ("!", "^"):
+                    body = "^" + body[1:]
+                out.append("[" + body.replace("\\", "\\\\") + "]")
+                i = end
+        elif c == "\\" and i + 1 < n:
+            i += 1
+            out.append(re.escape(pattern[i]))
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+
+@dataclass(frozen=True)
+class _Rule:
+    regex: "re.Pattern[str]"
+    negate: bool
+    dir_only: bool
+
+
+def _compile_rule(line: str) -> Optional[_Rule]:
+    """Compile one .gitignore line (None for blanks and comments)."""
+    line = line.rstrip("\n\r")
+    # Trailing spaces are ignored unless escaped
+    stripped = line.rstrip(" ")
+    if stripped.endswith("\\") and len(stripped) < len(line):
+        stripped += " "
+    line = stripped
+    if not line or line.startswith("#"):
+        return None
+
+    negate = line.startswith("!")
+    if negate or line.startswith("\\!") or line.startswith("\\#"):
+        line = line[1:]
+    dir_only = line.endswith("/")
+    line = line.rstrip("/")
+    if not line:
+        return None
+
+    anchored = "/" in line
+    body = _translate_glob(line.lstrip("/"))
+    if not anchored:
+        body = "(?:.*/)?" + body
+    return _Rule(re.compile(body + r"\Z", re.DOTALL), negate, dir_only)
+
+
+class IgnoreFile:
+    """Rules of one .gitignore, matched against paths relative to its directory."""
+
+    def __init__(self, base: str, lines: Sequence[str]):
+        self.base = base  # Directory relative to the search root ("" for the root)
+        self.rules = [r for r in map(_compile_rule, lines) if r is not None]
+
+    @classmethod
+    def load(cls, directory: str, base: str) -> Optional["IgnoreFile"]:
+        try:
+            with open(os.path.join(directory, ".gitignore"), encoding="utf-8", errors="replace") as f:
+                rules = cls(base, f.readlines())
+        except OSError:
+            return None
+        return rules if rules.rules else None
+
+    def match(self, rel_path: str, is_dir: bool) -> Optional[bool]:
+        """True if ignored, False if re-included, None if no rule applies."""
+        path = rel_path[len(self.base) + 1:] if self.base else rel_path
+        for rule in reversed(self.rules):  # Last matching rule wins
+            if rule.dir_only and not is_dir:
+                continue
+            if rule.regex.match(path):
+                return not rule.negate
+        return None
+
+
+def is_ignored(ignores: Sequence[IgnoreFile], rel_path: str, is_dir: bool) -> bool:
+    """Apply .gitignore files from the deepest directory up; the first verdict wins."""
+    for ignore in reversed(ignores):
+        verdict = ignore.match(rel_path, is_dir)
+        if verdict is not None:
+            return verdict
+    return False
+
+
+class GlobFilter:
+    """ripgrep --glob semantics for file selection."""
+
+    def __init__(self, globs: Sequence[str]):
+        self._include: List["re.Pattern[str]"] = []
+        self._exclude: List["re.Pattern[str]"] = []
+        for glob in globs:
+            target = self._exclude if glob.startswith("!") else self._include
+            glob = glob[1:] if glob.startswith("!") else glob
+            body = _translate_glob(glob.lstrip("/"))
+            if "/" not in glob:
+                body = "(?:.*/)?" + body
+            target.append(re.compile(body + r"\Z", re.DOTALL))
+
+    def __call__(self, rel_path: str) -> bool:
+        if any(r.match(rel_path) for r in self._exclude):
+            return False
+        return not self._include or any(r.match(rel_path) for r in self._include)
+
+
+def iter_files(
+    root: str,
+    globs: Sequence[str] = (),
+    hidden: bool = False,
+    max_filesize: Optional[int] = None,
+    stop: Optional[threading.Event] = None,
+) -> Iterator[Tuple[str, str]]:
+    """Yield (path, path relative to root) for searchable files, in sorted walk order."""
+    if os.path.isfile(root):
+        yield root, os.path.basename(root)
+        return
+
+    selected = GlobFilter(globs)
+    # (directory, relative dir, active .gitignore files)
+    stack: List[Tuple[str, str, Tuple[IgnoreFile, ...]]] = [(root, "", ())]
+    while stack:
+        if stop is not None and stop.is_set():
+            return
+        directory, rel_dir, ignores = stack.pop()
+
+        own = IgnoreFile.load(directory, rel_dir)
+        if own is not None:
+            ignores = ignores + (own,)
+
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError as e:
+            logger.debug(f"Cannot list {directory}: {e}")
+            continue
+
+        subdirs = []
+        for entry in entries:
+            name = entry.name
+            if name == ".git" or (not hidden and name.startswith(".")):
+                continue
+            rel = f"{rel_dir}/{name}" if rel_dir else name
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+                if not is_dir and not entry.is_file():
+                    continue
+            except OSError:
+                continue
+            if is_ignored(ignores, rel, is_dir):
+                continue
+
+            if is_dir:
+                subdirs.append((entry.path, rel, ignores))
+            elif selected(rel):
+                if max_filesize is not None:
+                    try:
+                        if entry.stat().st_size > max_filesize:
+                            continue
+                    except OSError:
+                        continue
+                yield entry.path, rel
+
+        # Depth-first, preserving name order
+        stack.extend(reversed(subdirs))
+
+
+def _line_bounds(buf, pos: int) -> Tuple[int, int]:
+    """(start, end) of the line containing pos; end excludes the newline."""
+    start = buf.rfind(b"\n", 0, pos) + 1
+    end = buf.find(b"\n", pos)
+    return start, len(buf) if end == -1 else end
+
+
+def _decode(line) -> str:
+    return bytes(line).rstrip(b"\r").decode("utf-8", "replace")
+
+
+def _iter_line_matches(buf, regex: "re.Pattern[bytes]") -> Iterator["re.Match[bytes]"]:
+    """regex.finditer over buf, keeping every match inside a single line."""
+    pos = 0
+    while True:
+        for m in regex.finditer(buf, pos):
+            if buf.find(b"\n", m.start(), m.end()) == -1:
+                yield m
+                continue
+            # e.g. \s or [^x] ran over a newline: rescan that line on its own
+            _, end = _line_bounds(buf, m.start())
+            yield from regex.finditer(buf, m.start(), end)
+            pos = end + 1
+            break
+        else:
+            return
+
+
+def search_buffer(
+    buf, regex: "re.Pattern[bytes]", path: str, max_count: Optional[int] = None, context_lines: int = 0
+) -> List[Dict[str, Any]]:
+    """Find matching lines in a bytes-like buffer (one result per line, like rg)."""
+    matches: List[Dict[str, Any]] = []
+    line_number = 1
+    counted_until = 0
+    current: Optional[Dict[str, Any]] = None
+    current_end = -1
+
+    for m in _iter_line_matches(buf, regex):
+        pos = m.start()
+        if current is not None and pos <= current_end:
+            if m.end() > m.start() or pos < current_end:
+                current["submatches"].append(
+                    {"start": pos - current["byte_offset"], "end": m.end() - current["byte_offset"],
+                     "text": _decode(m.group())}
+                )
+            continue
+        if max_count is not None and len(matches) >= max_count:
+            break
+
+        start, end = _line_bounds(buf, pos)
+        line_number += buf[counted_until:start].count(b"\n")  # mmap has no count()
+        counted_until = start
+
+        current = {
+            "file": path,
+            "line": line_number,
+            "text": _decode(buf[start:end]).strip(),
+            "byte_offset": start,
+            "submatches": [{"start": pos - start, "end": m.end() - start, "text": _decode(m.group())}],
+        }
+        if context_lines > 0:
+            before = []
+            cursor = start
+            for _ in range(context_lines):
+                if cursor == 0:
+                    break
+                prev_start, prev_end = _line_bounds(buf, cursor - 1)
+                before.append(_decode(buf[prev_start:prev_end]))
+                cursor = prev_start
+            after = []
+            cursor = end
+            for _ in range(context_lines):
+                if cursor >= len(buf) - 1:
+                    break
+                next_start, next_end = _line_bounds(buf, cursor + 1)
+                after.append(_decode(buf[next_start:next_end]))
+                cursor = next_end
+            current["context_before"] = before[::-1]
+            current["context_after"] = after
+        matches.append(current)
+        current_end = end
+
+    return matches
+
+
+def search_file(
+    path: str, display_path: str, regex: "re.Pattern[bytes]",
+    max_count: Optional[int] = None, context_lines: int = 0
+) -> List[Dict[str, Any]]:
+    """Search one file; binary and unreadable files yield nothing."""
+    try:
+        with open(path, "rb") as f:
+            head = f.read(MMAP_THRESHOLD)
+            if b"\0" in head[:BINARY_SNIFF_BYTES]:
+                return []
+            if len(head) < MMAP_THRESHOLD:
+                return search_buffer(head, regex, display_path, max_count, context_lines)
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return search_buffer(mapped, regex, display_path, max_count, context_lines)
+    except (OSError, ValueError) as e:
+        logger.debug(f"Skipping {path}: {e}")
+        return []
+
+
+def compile_pattern(pattern: str, ignore_case: bool = False) -> "re.Pattern[bytes]":
+    """Compile a search pattern for bytes buffers (raises re.error if invalid)."""
+    flags = re.MULTILINE | (re.IGNORECASE if ignore_case else 0)
+    return re.compile(pattern.encode("utf-8", "surrogateescape"), flags)
+
+
+def iter_matches(
+    pattern: str,
+    path: str = ".",
+    globs: Sequence[str] = (),
+    ignore_case: bool = False,
+    context_lines: int = 0,
+    max_count: Optional[int] = None,
+    max_filesize: Optional[int] = None,
+    hidden: bool = False,
+    workers: Optional[int] = None,
+    stop: Optional[threading.Event] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Search a tree, yielding structured matches (rg --json shape) incrementally.
+
+    Results come in walk order. Closing the generator, or setting `stop`,
+    cancels files that have not started yet.
+    """
+    regex = compile_pattern(pattern, ignore_case)
+    workers = workers or min(32, (os.cpu_count() or 1) + 4)
+    prefix = "" if os.path.isfile(path) else path
+
+    files = iter_files(path, globs, hidden=hidden, max_filesize=max_filesize, stop=stop)
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="text-search")
+    pending: deque = deque()
+    try:
+        for file_path, rel in files:
+            display = os.path.join(prefix, rel) if prefix else file_path
+            pending.append(pool.submit(search_file, file_path, display, regex, max_count, context_lines))
+            if len(pending) >= workers * _WINDOW_PER_WORKER:
+                yield from pending.popleft().result()
+            if stop is not None and stop.is_set():
+                return
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+        pool.shutdown(wait=False, cancel_futures=True)
@@ -528,6 +528,7 @@ def create_code_block_panel(
     language: str = "python",
     show_line_numbers: bool = True,
     title: Optional[str] = None,
+    highlighter: Optional[IncrementalSyntaxHighlighter] = None,
 ) -> Panel:
     """
     Cria um Panel com código highlightado (não streaming).
@@ -537,12 +538,14 @@ def create_code_block_panel(
         language: Linguagem
         show_line_numbers: Mostrar números de linha
         title: Título opcional
+        highlighter: Highlighter que já processou code (evita re-tokenizar)
 
     Returns:
         Rich Panel
     """
-    highlighter = IncrementalSyntaxHighlighter(language)
-    highlighter.process_chunk(code)
+    if highlighter is None:
+        highlighter = IncrementalSyntaxHighlighter(language)
+        highlighter.process_chunk(code)
 
     highlighted = highlighter.get_highlighted_text(
         show_line_numbers=show_line_numbers,
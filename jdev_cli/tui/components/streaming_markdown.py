@@ -39,7 +39,9 @@ from rich.text import Text
 from rich.markdown import Markdown as RichMarkdown
 from rich.syntax import Syntax
 from rich.panel import Panel
-from rich.console import RenderableType, Group
+from rich.console import Console, ConsoleOptions, RenderableType, RenderResult, Group
+from rich.measure import Measurement
+from rich.segment import Segment
 
 from .block_detector import BlockDetector, BlockInfo, BlockType
 from .streaming_code_block import IncrementalSyntaxHighlighter, create_code_block_panel
@@ -63,7 +65,41 @@ class BlockWidgetFactory:
     def __init__(self):
         # Cache de highlighters por linguagem (reutiliza para performance)
         self._highlighters: dict[str, IncrementalSyntaxHighlighter] = {}
+        # Código já processado por cada highlighter (para alimentar só o delta)
+        self._highlighted: dict[str, str] = {}
         self._table_renderer = StreamingTableRenderer()
+        # Blocos finalizados já renderizados, na ordem do documento
+        self._finalized: List[tuple[BlockInfo, RenderableType]] = []
+
+    def render_blocks(self, blocks: List[BlockInfo]) -> List[RenderableType]:
+        """
+        Renderiza os blocos de um documento em streaming.
+
+        Blocos finalizados não mudam mais: são renderizados uma vez e
+        reaproveitados (inclusive os segmentos, via CachedRenderable).
+        Só o bloco aberto é re-renderizado a cada frame.
+
+        Args:
+            blocks: Blocos em ordem (BlockDetector.get_all_blocks())
+
+        Returns:
+            Renderables na mesma ordem
+        """
+        renderables: List[RenderableType] = []
+        for i, block in enumerate(blocks):
+            if i < len(self._finalized):
+                cached_block, rendered = self._finalized[i]
+                if cached_block is block:
+                    renderables.append(rendered)
+                    continue
+                del self._finalized[i:]  # Documento diferente: descarta o resto
+
+            rendered = self.render_block(block)
+            if block.is_complete:
+                rendered = CachedRenderable(rendered)
+                self._finalized.append((block, rendered))
+            renderables.append(rendered)
+        return renderables
 
     def render_block(self, block: BlockInfo) -> RenderableType:
         """
@@ -103,22 +139,29 @@ class BlockWidgetFactory:
 
         highlighter = self._highlighters[language]
 
-        # Reseta e processa conteúdo
-        highlighter.reset()
-        highlighter.process_chunk(block.content)
+        # Bloco crescendo: processa só o delta (linhas completas ficam em cache)
+        done = self._highlighted.get(language, "")
+        if block.content.startswith(done):
+            highlighter.process_chunk(block.content[len(done):])
+        else:
+            highlighter.reset()
+            highlighter.process_chunk(block.content)
+        self._highlighted[language] = block.content
 
         # Retorna como Panel estilizado
-        # Nota: create_code_block_panel recebe código como string, não Text
         return create_code_block_panel(
             code=block.content,
             language=language,
-            title=f"{language.upper()}" + ("" if block.is_complete else " ⏳")
+            title=f"{language.upper()}" + ("" if block.is_complete else " ⏳"),
+            highlighter=highlighter,
         )
 
     def _render_table(self, block: BlockInfo) -> RenderableType:
         """Renderiza tabela progressivamente."""
         self._table_renderer.reset()
-        return self._table_renderer.process_chunk(block.content)
+        rendered = self._table_renderer.process_chunk(block.content)
+        # Sem header + separador ainda: mostra como markdown até a tabela formar
+        return rendered if rendered is not None else self._render_default(block)
 
     def _render_checklist(self, block: BlockInfo) -> RenderableType:
         """Renderiza checklist com items."""
@@ -419,7 +462,37 @@ class BlockWidgetFactory:
     def reset(self) -> None:
         """Reseta estado dos renderers."""
         self._highlighters.clear()
+        self._highlighted.clear()
         self._table_renderer.reset()
+        self._finalized.clear()
+
+
+class CachedRenderable:
+    """
+    Renderable cujos segmentos são reaproveitados enquanto a largura não muda.
+
+    Usado para blocos finalizados: o Textual re-renderiza o Group inteiro a
+    cada frame, mas markdown/syntax de blocos prontos só são processados uma
+    vez por largura.
+    """
+
+    def __init__(self, renderable: RenderableType):
+        self.renderable = renderable
+        self._key: Optional[tuple] = None
+        self._segments: List[Segment] = []
+
+    def __rich_console__(self, console: Console, options: ConsoleOptions) -> RenderResult:
+        key = (
+            options.max_width, options.min_width, options.justify, options.overflow,
+            options.no_wrap, options.ascii_only, console.color_system,
+        )
+        if key != self._key:
+            self._segments = list(console.render(self.renderable, options))
+            self._key = key
+        return self._segments
+
+    def __rich_measure__(self, console: Console, options: ConsoleOptions) -> Measurement:
+        return Measurement.get(console, options, self.renderable)
 
 
 @dataclass
@@ -630,9 +703,6 @@ class StreamingMarkdownWidget(Widget):
         # Markdown widget interno
         self._markdown_static: Optional[Static] = None
 
-        # Cache de blocos finalizados (não re-renderiza)
-        self._finalized_blocks_count: int = 0
-
         # Cursor animation task
         self._cursor_task: Optional[asyncio.Task] = None
 
@@ -654,7 +724,6 @@ class StreamingMarkdownWidget(Widget):
         self._fps_controller.reset()
         self._widget_factory.reset()  # NOVO: Reset widget factory
         self._metrics = PerformanceMetrics()
-        self._finalized_blocks_count = 0
         self._last_render = time.perf_counter()
 
         self.add_class("streaming")
@@ -785,13 +854,9 @@ class StreamingMarkdownWidget(Widget):
                 content += self.CURSOR_FRAMES[self._cursor_index]
             return RichMarkdown(content) if content else Text("")
 
-        # Renderiza cada bloco com widget especializado
-        renderables: List[RenderableType] = []
-
-        for block in blocks:
-            # Usa Widget Factory para renderizar bloco especializado
-            rendered = self._widget_factory.render_block(block)
-            renderables.append(rendered)
+        # Blocos finalizados vêm do cache da Widget Factory; só o bloco
+        # aberto é re-renderizado
+        renderables = self._widget_factory.render_blocks(blocks)
 
         # Adiciona cursor no final se streaming
         if self.is_streaming and self.show_cursor:
@@ -5,14 +5,23 @@ SCALE & SUSTAIN Phase 3.2 - Connection Pooling.
 
 A generic, reusable connection pool implementation.
 
+Acquire never holds a lock across I/O: capacity is tracked synchronously
+(idle + in use + reserved slots), and the slow parts - creating,
+validating and closing connections - run after a slot has been reserved.
+Waiters are served strictly FIFO: a released connection (or a freed slot)
+is handed to the oldest waiter instead of whoever asks next.
+
 Author: JuanCS Dev
 Date: 2025-11-26
 """
 
 import asyncio
+import bisect
+import math
 import time
+from collections import deque
 from dataclasses import dataclass, field
-from typing import Callable, Generic, Optional, TypeVar
+from typing import Callable, Deque, Generic, List, Optional, Set, Tuple, TypeVar
 
 T = TypeVar('T')
 
@@ -34,6 +43,49 @@ class PoolConfig:
     validate_on_release: bool = False
 
 
+# Histogram bucket upper bounds: 1 microsecond growing by 2^(1/4) (~19%), up to ~7 hours
+_LATENCY_BOUNDS_MS: List[float] = [0.001 * 2 ** (i / 4) for i in range(128)]
+
+
+class LatencyHistogram:
+    """
+    Log-bucketed latency histogram (milliseconds).
+
+    Percentiles are accurate to within one bucket (~19%) at any scale, in
+    constant memory.
+    """
+
+    _BOUNDS = _LATENCY_BOUNDS_MS
+
+    def __init__(self):
+        self.counts = [0] * (len(self._BOUNDS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, elapsed_ms: float) -> None:
+        self.counts[bisect.bisect_left(self._BOUNDS, elapsed_ms)] += 1
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+
+    def percentile(self, pct: float) -> float:
+        """Upper bound of the bucket holding the pct-th percentile (0 when empty)."""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(self.count * pct / 100))
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return min(self._BOUNDS[i] if i < len(self._BOUNDS) else self.max_ms, self.max_ms)
+        return self.max_ms
+
+    @property
+    def mean(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+
 @dataclass
 class PoolStats:
     """Connection pool statistics."""
@@ -41,17 +93,31 @@ class PoolStats:
     total_connections: int = 0
     available_connections: int = 0
     in_use_connections: int = 0
+    pending_connections: int = 0  # Slots reserved for connections being created/validated
+    waiting_acquirers: int = 0
     total_acquires: int = 0
     total_releases: int = 0
     total_timeouts: int = 0
     total_errors: int = 0
-    avg_acquire_time_ms: float = 0.0
+    acquire_latency: LatencyHistogram = field(default_factory=LatencyHistogram)
     created_at: float = field(default_factory=time.time)
 
     @property
     def uptime_seconds(self) -> float:
         return time.time() - self.created_at
 
+    @property
+    def acquire_p50_ms(self) -> float:
+        return self.acquire_latency.percentile(50)
+
+    @property
+    def acquire_p99_ms(self) -> float:
+        return self.acquire_latency.percentile(99)
+
+    @property
+    def avg_acquire_time_ms(self) -> float:
+        return self.acquire_latency.mean
+
 
 class ConnectionPool(Generic[T]):
     """
@@ -94,29 +160,38 @@ class ConnectionPool(Generic[T]):
         self._closer = closer or (lambda c: None)
         self._config = config or PoolConfig()
 
-        self._available: asyncio.Queue[tuple[T, float]] = asyncio.Queue()
-        self._in_use: set[T] = set()
-        self._lock = asyncio.Lock()
+        self._available: Deque[Tuple[T, float]] = deque()  # (conn, idle since), newest on the right
+        self._in_use: Set[T] = set()
+        self._reserved = 0  # Slots held while a connection is created or validated
+        self._waiters: Deque[asyncio.Future] = deque()
         self._stats = PoolStats()
         self._closed = False
+        self._initialized = False
         self._cleanup_task: Optional[asyncio.Task] = None
+        self._warmup_task: Optional[asyncio.Task] = None
+        self._background: Set[asyncio.Task] = set()
 
     @property
     def stats(self) -> PoolStats:
         """Get pool statistics."""
-        self._stats.available_connections = self._available.qsize()
+        self._stats.available_connections = len(self._available)
         self._stats.in_use_connections = len(self._in_use)
+        self._stats.pending_connections = self._reserved
+        self._stats.waiting_acquirers = sum(1 for w in self._waiters if not w.done())
         self._stats.total_connections = (
             self._stats.available_connections + self._stats.in_use_connections
         )
         return self._stats
 
+    @property
+    def _size(self) -> int:
+        """Connections that exist or are being created."""
+        return len(self._available) + len(self._in_use) + self._reserved
+
     async def initialize(self) -> None:
-        """Initialize pool with minimum connections."""
-        for _ in range(self._config.min_size):
-            conn = await self._create_connection()
-            if conn:
-                await self._available.put((conn, time.time()))
+        """Initialize pool with minimum connections (created concurrently)."""
+        self._initialized = True
+        await self._warm_up()
 
         # Start cleanup task
         self._cleanup_task = asyncio.create_task(self._cleanup_loop())
@@ -127,7 +202,7 @@ class ConnectionPool(Generic[T]):
             if asyncio.iscoroutinefunction(self._factory):
                 conn = await self._factory()
             else:
-                loop = asyncio.get_event_loop()
+                loop = asyncio.get_running_loop()
                 conn = await loop.run_in_executor(None, self._factory)
             return conn
         except Exception:
@@ -140,7 +215,7 @@ class ConnectionPool(Generic[T]):
             if asyncio.iscoroutinefunction(self._validator):
                 return await self._validator(conn)
             else:
-                loop = asyncio.get_event_loop()
+                loop = asyncio.get_running_loop()
                 return await loop.run_in_executor(None, self._validator, conn)
         except Exception:
             return False
@@ -151,11 +226,67 @@ class ConnectionPool(Generic[T]):
             if asyncio.iscoroutinefunction(self._closer):
                 await self._closer(conn)
             else:
-                loop = asyncio.get_event_loop()
+                loop = asyncio.get_running_loop()
                 await loop.run_in_executor(None, self._closer, conn)
         except Exception:
             pass
 
+    def _close_in_background(self, conn: T) -> None:
+        """Close without making anyone wait for a slow closer."""
+        task = asyncio.create_task(self._close_connection(conn))
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    # === Capacity bookkeeping (synchronous between awaits, so lock-free) ===
+
+    def _has_waiters(self) -> bool:
+        while self._waiters and self._waiters[0].done():
+            self._waiters.popleft()  # Timed out or cancelled
+        return bool(self._waiters)
+
+    def _checkout(self) -> Optional[Tuple[Optional[T], float]]:
+        """
+        Take an idle connection, or reserve a slot to create one.
+
+        Returns (conn, idle_since) or (None, 0.0) for an empty slot; None at capacity.
+        Either way a slot is reserved until the caller uses or frees it.
+        """
+        if self._available:
+            self._reserved += 1
+            return self._available.pop()  # Most recently used: warmest, least likely stale
+        if self._size < self._config.max_size:
+            self._reserved += 1
+            return (None, 0.0)
+        return None
+
+    def _free_slot(self, rewarm: bool = True) -> None:
+        """Give up a reserved slot; the oldest waiter inherits it."""
+        if self._has_waiters():
+            self._waiters.popleft().set_result((None, 0.0))  # Still reserved, by the waiter now
+            return
+        self._reserved -= 1
+        if rewarm:
+            self._schedule_warm_up()
+
+    def _hand_back(self, conn: T) -> None:
+        """Make a connection available: to the oldest waiter first, else the idle set."""
+        if self._has_waiters():
+            self._reserved += 1
+            self._waiters.popleft().set_result((conn, time.time()))
+        else:
+            self._available.append((conn, time.time()))
+
+    def _return_grant(self, grant: Tuple[Optional[T], float]) -> None:
+        """Undo a grant the caller can no longer use."""
+        conn, _ = grant
+        if conn is None:
+            self._free_slot()
+        else:
+            self._reserved -= 1
+            self._hand_back(conn)
+
+    # === Acquire / release ===
+
     async def acquire(self) -> 'PooledConnection[T]':
         """
         Acquire a connection from the pool.
@@ -169,128 +300,172 @@ class ConnectionPool(Generic[T]):
         if self._closed:
             raise PoolExhaustedError("Pool is closed")
 
-        start_time = time.time()
-
-        async with self._lock:
-            # Try to get from available pool
-            while not self._available.empty():
-                conn, created_at = await self._available.get()
-
-                # Check if connection is stale
-                if time.time() - created_at > self._config.max_idle_time:
-                    await self._close_connection(conn)
-                    continue
-
-                # Validate if required
-                if self._config.validate_on_acquire:
-                    if not await self._validate_connection(conn):
-                        await self._close_connection(conn)
-                        continue
-
-                self._in_use.add(conn)
-                self._stats.total_acquires += 1
-                elapsed = (time.time() - start_time) * 1000
-                self._update_avg_acquire_time(elapsed)
-                return PooledConnection(self, conn)
-
-            # Create new if under max
-            total = self._available.qsize() + len(self._in_use)
-            if total < self._config.max_size:
-                conn = await self._create_connection()
-                if conn:
-                    self._in_use.add(conn)
-                    self._stats.total_acquires += 1
-                    elapsed = (time.time() - start_time) * 1000
-                    self._update_avg_acquire_time(elapsed)
-                    return PooledConnection(self, conn)
-
-        # Wait for available connection
-        try:
-            conn, _ = await asyncio.wait_for(
-                self._available.get(),
-                timeout=self._config.acquire_timeout
-            )
-            async with self._lock:
-                self._in_use.add(conn)
-            self._stats.total_acquires += 1
-            elapsed = (time.time() - start_time) * 1000
-            self._update_avg_acquire_time(elapsed)
-            return PooledConnection(self, conn)
-        except asyncio.TimeoutError:
-            self._stats.total_timeouts += 1
-            raise PoolExhaustedError(
-                f"No connection available within {self._config.acquire_timeout}s"
-            )
-
-    def _update_avg_acquire_time(self, elapsed_ms: float) -> None:
-        """Update average acquire time."""
-        count = self._stats.total_acquires
-        current_avg = self._stats.avg_acquire_time_ms
-        self._stats.avg_acquire_time_ms = (
-            (current_avg * (count - 1) + elapsed_ms) / count
+        start_time = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._config.acquire_timeout
+        wait_first = False
+
+        while True:
+            # Nobody jumps the queue while others are already waiting
+            grant = None if wait_first or self._has_waiters() else self._checkout()
+            if grant is None:
+                grant = await self._wait_for_grant(deadline - loop.time())
+
+            try:
+                conn = await self._prepare(*grant)
+            except BaseException:
+                if grant[0] is not None:
+                    self._close_in_background(grant[0])
+                self._free_slot()
+                raise
+
+            if conn is not None:
+                break
+
+            self._free_slot()
+            # Creation failed: wait for a connection instead of hammering the factory
+            wait_first = grant[0] is None
+
+        self._reserved -= 1
+        self._in_use.add(conn)
+        self._stats.total_acquires += 1
+        self._stats.acquire_latency.record((time.perf_counter() - start_time) * 1000)
+        return PooledConnection(self, conn)
+
+    async def _wait_for_grant(self, timeout: float) -> Tuple[Optional[T], float]:
+        """Queue up (FIFO) for the next released connection or freed slot."""
+        if timeout > 0:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await asyncio.wait((waiter,), timeout=timeout)
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled() and waiter.exception() is None:
+                    self._return_grant(waiter.result())
+                waiter.cancel()
+                raise
+            if waiter.done():
+                return waiter.result()
+            waiter.cancel()  # Dropped from the queue lazily
+
+        self._stats.total_timeouts += 1
+        raise PoolExhaustedError(
+            f"No connection available within {self._config.acquire_timeout}s"
         )
 
+    async def _prepare(self, conn: Optional[T], idle_since: float) -> Optional[T]:
+        """Create (empty slot) or check (idle connection); None if unusable."""
+        if conn is None:
+            return await self._create_connection()
+
+        # Check if connection is stale
+        if time.time() - idle_since > self._config.max_idle_time:
+            self._close_in_background(conn)
+            return None
+
+        # Validate if required
+        if self._config.validate_on_acquire:
+            if not await self._validate_connection(conn):
+                self._close_in_background(conn)
+                return None
+
+        return conn
+
     async def release(self, conn: T) -> None:
         """Release a connection back to the pool."""
-        async with self._lock:
-            if conn in self._in_use:
-                self._in_use.remove(conn)
-
-                # Validate before returning to pool
-                if self._config.validate_on_release:
-                    if not await self._validate_connection(conn):
-                        await self._close_connection(conn)
-                        self._stats.total_releases += 1
-                        return
+        if conn not in self._in_use:
+            return
+        self._in_use.remove(conn)
+        self._stats.total_releases += 1
 
-                await self._available.put((conn, time.time()))
-                self._stats.total_releases += 1
+        if self._closed:
+            await self._close_connection(conn)
+            return
+
+        # Validate before returning to pool (slot stays reserved meanwhile)
+        if self._config.validate_on_release:
+            self._reserved += 1
+            valid = await self._validate_connection(conn)
+            if not valid:
+                self._close_in_background(conn)
+                self._free_slot()
+                return
+            self._reserved -= 1
+
+        self._hand_back(conn)
+
+    # === Warm-up and cleanup ===
+
+    def _schedule_warm_up(self) -> None:
+        """Top the pool back up to min_size in the background."""
+        if (
+            self._initialized and not self._closed
+            and self._size < self._config.min_size
+            and (self._warmup_task is None or self._warmup_task.done())
+        ):
+            self._warmup_task = asyncio.create_task(self._warm_up())
+
+    async def _warm_up(self) -> None:
+        """Create connections up to min_size, concurrently, ahead of demand."""
+        needed = self._config.min_size - self._size
+        if needed <= 0:
+            return
+        self._reserved += needed
+        results = await asyncio.gather(*(self._create_connection() for _ in range(needed)))
+        for conn in results:
+            if conn is None:
+                self._free_slot(rewarm=False)  # Retried by the next cleanup pass
+            elif self._closed:
+                self._reserved -= 1
+                await self._close_connection(conn)
+            else:
+                self._reserved -= 1
+                self._hand_back(conn)
 
     async def _cleanup_loop(self) -> None:
         """Periodically clean up idle connections."""
         while not self._closed:
             await asyncio.sleep(60)  # Check every minute
 
-            async with self._lock:
-                # Remove stale connections
-                temp_connections = []
-                while not self._available.empty():
-                    conn, created_at = await self._available.get()
-                    if time.time() - created_at > self._config.max_idle_time:
-                        await self._close_connection(conn)
-                    else:
-                        temp_connections.append((conn, created_at))
-
-                # Keep at least min_size connections
-                while len(temp_connections) < self._config.min_size:
-                    conn = await self._create_connection()
-                    if conn:
-                        temp_connections.append((conn, time.time()))
-
-                # Return to queue
-                for item in temp_connections:
-                    await self._available.put(item)
+            # Remove stale connections (oldest idle are on the left)
+            now = time.time()
+            while self._available and now - self._available[0][1] > self._config.max_idle_time:
+                conn, _ = self._available.popleft()
+                self._close_in_background(conn)
+
+            # Keep at least min_size connections
+            self._schedule_warm_up()
 
     async def close(self) -> None:
         """Close all connections and the pool."""
         self._closed = True
 
-        if self._cleanup_task:
-            self._cleanup_task.cancel()
-            try:
-                await self._cleanup_task
-            except asyncio.CancelledError:
-                pass
+        for task in (self._cleanup_task, self._warmup_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+
+        # Wake everyone still waiting
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_exception(PoolExhaustedError("Pool is closed"))
 
         # Close all connections
-        while not self._available.empty():
-            conn, _ = await self._available.get()
+        while self._available:
+            conn, _ = self._available.popleft()
             await self._close_connection(conn)
 
         for conn in list(self._in_use):
             await self._close_connection(conn)
             self._in_use.remove(conn)
 
+        if self._background:
+            await asyncio.gather(*self._background, return_exceptions=True)
+
 
 class PooledConnection(Generic[T]):
     """Context manager for pooled connections."""
@@ -317,4 +492,5 @@ __all__ = [
     'PoolStats',
     'PoolExhaustedError',
     'PooledConnection',
+    'LatencyHistogram',
 ]
@@ -140,6 +140,26 @@ class IMessageQueue(ABC):
         """
         pass
 
+    async def publish_batch(
+        self,
+        messages: List[Message],
+        delay: float = 0.0
+    ) -> List[str]:
+        """
+        Publish many messages.
+
+        Implementations should override this to move the whole batch in one
+        round-trip; the default publishes one by one.
+
+        Args:
+            messages: Messages to publish, in order
+            delay: Optional delay before the messages become visible
+
+        Returns:
+            Message IDs
+        """
+        return [await self.publish(message, delay) for message in messages]
+
     @abstractmethod
     async def consume(
         self,
@@ -171,6 +191,21 @@ class IMessageQueue(ABC):
         """
         pass
 
+    async def ack_batch(self, message_ids: List[str]) -> int:
+        """
+        Acknowledge many messages.
+
+        Implementations should override this to ack the whole batch in one
+        round-trip; the default acks one by one.
+
+        Args:
+            message_ids: IDs of messages to acknowledge
+
+        Returns:
+            Number of messages acknowledged
+        """
+        return sum([await self.ack(message_id) for message_id in message_ids])
+
     @abstractmethod
     async def nack(
         self,
@@ -11,9 +11,13 @@ Date: 2025-11-26
 
 import asyncio
 import fnmatch
+import heapq
+import itertools
+import math
 import time
 import uuid
-from typing import Any, Callable, Dict, List, Optional
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
 
 from .interface import (
     IMessageQueue,
@@ -29,15 +33,68 @@ class InMemoryQueue(IMessageQueue):
     In-memory message queue implementation.
 
     Suitable for development, testing, and single-process applications.
+
+    Visible messages sit in a deque; delayed and nacked messages sit in a
+    heap keyed by visibility time. A single timer, always armed for the
+    earliest due message, promotes them without waiting for a consumer.
+    Batch publish and consume move many messages per lock acquisition.
     """
 
     def __init__(self, config: QueueConfig):
         self._config = config
-        self._messages: asyncio.Queue[Message] = asyncio.Queue(maxsize=config.max_size)
+        self._messages: Deque[Message] = deque()
         self._processing: Dict[str, Message] = {}
-        self._delayed: List[tuple[float, Message]] = []
+        self._delayed: List[Tuple[float, int, Message]] = []  # heap of (visible_at, seq, message)
+        self._seq = itertools.count()  # FIFO among messages due at the same time
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._timer_at = math.inf
+        self._available = asyncio.Event()
         self._lock = asyncio.Lock()
 
+    def _has_room(self, count: int) -> bool:
+        return self._config.max_size <= 0 or len(self._messages) + count <= self._config.max_size
+
+    def _push_ready(self, messages) -> None:
+        self._messages.extend(messages)
+        if self._messages:
+            self._available.set()
+
+    def _push_delayed(self, messages, visible_at: float) -> None:
+        for message in messages:
+            heapq.heappush(self._delayed, (visible_at, next(self._seq), message))
+        self._arm_timer()
+
+    def _arm_timer(self) -> None:
+        """Make sure a timer fires when the earliest delayed message is due."""
+        if not self._delayed:
+            return
+        due = self._delayed[0][0]
+        if self._timer is not None and self._timer_at <= due:
+            return  # Already armed early enough
+        if self._timer is not None:
+            self._timer.cancel()
+        loop = asyncio.get_running_loop()
+        self._timer = loop.call_later(max(0.0, due - time.time()), self._on_timer)
+        self._timer_at = due
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        self._timer_at = math.inf
+        self._promote_due()
+
+    def _promote_due(self) -> None:
+        """Move every due delayed message that fits into the visible queue."""
+        now = time.time()
+        moved = False
+        while self._delayed and self._delayed[0][0] <= now and self._has_room(1):
+            self._messages.append(heapq.heappop(self._delayed)[2])
+            moved = True
+        if moved:
+            self._available.set()
+        if self._delayed and self._delayed[0][0] > now:
+            self._arm_timer()
+        # Due but blocked by max_size: consumers promote again as they make room
+
     async def publish(
         self,
         message: Message,
@@ -47,17 +104,37 @@ class InMemoryQueue(IMessageQueue):
         message.max_retries = self._config.max_retries
 
         if delay > 0:
-            async with self._lock:
-                visible_at = time.time() + delay
-                self._delayed.append((visible_at, message))
-                self._delayed.sort(key=lambda x: x[0])
+            self._push_delayed((message,), time.time() + delay)
             return message.id
 
-        try:
-            self._messages.put_nowait(message)
-            return message.id
-        except asyncio.QueueFull:
+        if not self._has_room(1):
             raise Exception(f"Queue {self._config.name} is full")
+        self._push_ready((message,))
+        return message.id
+
+    async def publish_batch(
+        self,
+        messages: List[Message],
+        delay: float = 0.0
+    ) -> List[str]:
+        """
+        Publish many messages in one lock acquisition.
+
+        All-or-nothing: raises without publishing anything if the batch
+        does not fit.
+        """
+        async with self._lock:
+            for message in messages:
+                message.max_retries = self._config.max_retries
+
+            if delay > 0:
+                self._push_delayed(messages, time.time() + delay)
+            elif not self._has_room(len(messages)):
+                raise Exception(f"Queue {self._config.name} is full")
+            else:
+                self._push_ready(messages)
+
+        return [message.id for message in messages]
 
     async def consume(
         self,
@@ -65,56 +142,49 @@ class InMemoryQueue(IMessageQueue):
         timeout: float = 0.0
     ) -> List[Message]:
         """Consume messages from the queue."""
-        # First, move any delayed messages that are now visible
-        await self._process_delayed()
-
-        messages = []
+        messages: List[Message] = []
         deadline = time.time() + timeout if timeout > 0 else 0
 
-        for _ in range(count):
+        while True:
+            async with self._lock:
+                self._take(count - len(messages), messages)
+
+            if len(messages) >= count or timeout <= 0:
+                return messages
+
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return messages
             try:
-                if timeout > 0:
-                    remaining = deadline - time.time()
-                    if remaining <= 0:
-                        break
-                    message = await asyncio.wait_for(
-                        self._messages.get(),
-                        timeout=remaining
-                    )
-                else:
-                    message = self._messages.get_nowait()
-
-                message.mark_processing()
-                async with self._lock:
-                    self._processing[message.id] = message
-                messages.append(message)
-
-            except (asyncio.QueueEmpty, asyncio.TimeoutError):
-                break
-
-        return messages
-
-    async def _process_delayed(self) -> None:
-        """Move delayed messages to main queue if visible."""
-        async with self._lock:
-            now = time.time()
-            while self._delayed and self._delayed[0][0] <= now:
-                _, message = self._delayed.pop(0)
-                try:
-                    self._messages.put_nowait(message)
-                except asyncio.QueueFull:
-                    # Put back in delayed queue
-                    self._delayed.insert(0, (now, message))
+                await asyncio.wait_for(self._available.wait(), timeout=remaining)
+            except asyncio.TimeoutError:
+                return messages
+
+    def _take(self, limit: int, into: List[Message]) -> None:
+        """Move up to `limit` visible messages into processing."""
+        self._promote_due()
+        while limit > 0:
+            if not self._messages:
+                self._promote_due()  # Due messages that were blocked by max_size
+                if not self._messages:
                     break
+            message = self._messages.popleft()
+            message.mark_processing()
+            self._processing[message.id] = message
+            into.append(message)
+            limit -= 1
+        if self._delayed:
+            self._promote_due()  # Room may have opened up for due messages
+        if not self._messages:
+            self._available.clear()
 
     async def ack(self, message_id: str) -> bool:
         """Acknowledge message processing."""
-        async with self._lock:
-            if message_id in self._processing:
-                message = self._processing.pop(message_id)
-                message.mark_completed()
-                return True
+        message = self._processing.pop(message_id, None)
+        if message is None:
             return False
+        message.mark_completed()
+        return True
 
     async def nack(
         self,
@@ -122,42 +192,37 @@ class InMemoryQueue(IMessageQueue):
         requeue: bool = True
     ) -> bool:
         """Negative acknowledge message."""
-        async with self._lock:
-            if message_id not in self._processing:
-                return False
-
-            message = self._processing.pop(message_id)
-            message.mark_failed("Negative acknowledgement")
-
-            if requeue and message.status != MessageStatus.DEAD_LETTER:
-                # Requeue with delay
-                visible_at = time.time() + self._config.retry_delay
-                self._delayed.append((visible_at, message))
-                self._delayed.sort(key=lambda x: x[0])
-            elif self._config.dead_letter_queue:
-                # Would send to dead letter queue in production
-                pass
+        message = self._processing.pop(message_id, None)
+        if message is None:
+            return False
 
-            return True
+        message.mark_failed("Negative acknowledgement")
+
+        if requeue and message.status != MessageStatus.DEAD_LETTER:
+            # Requeue with delay
+            self._push_delayed((message,), time.time() + self._config.retry_delay)
+        elif self._config.dead_letter_queue:
+            # Would send to dead letter queue in production
+            pass
+
+        return True
 
     async def size(self) -> int:
         """Get current queue size."""
-        return self._messages.qsize() + len(self._delayed)
+        return len(self._messages) + len(self._delayed)
 
     async def purge(self) -> int:
         """Purge all messages."""
         async with self._lock:
-            count = self._messages.qsize() + len(self._delayed)
-
-            # Clear main queue
-            while not self._messages.empty():
-                try:
-                    self._messages.get_nowait()
-                except asyncio.QueueEmpty:
-                    break
+            count = len(self._messages) + len(self._delayed)
 
-            # Clear delayed
+            self._messages.clear()
             self._delayed.clear()
+            self._available.clear()
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+                self._timer_at = math.inf
 
             return count
 
@@ -6,12 +6,18 @@ SCALE & SUSTAIN Phase 3.3 - Message Queue.
 Redis-based message queue for production distributed systems.
 Falls back to in-memory if Redis is not available.
 
+Batch operations are pipelined, delayed promotion runs server-side in Lua,
+and an optional Streams mode gives consumer groups with at-least-once
+delivery.
+
 Author: JuanCS Dev
 Date: 2025-11-26
 """
 
 import asyncio
 import json
+import os
+import socket
 import time
 import uuid
 from dataclasses import dataclass
@@ -47,6 +53,8 @@ class RedisConfig:
     socket_connect_timeout: float = 5.0
     max_connections: int = 10
     key_prefix: str = "jdev:mq:"
+    stream_mode: bool = False  # Redis Streams consumer groups instead of lists
+    consumer_group: str = "jdev-workers"
 
     @property
     def url(self) -> str:
@@ -56,165 +64,411 @@ class RedisConfig:
         return f"{protocol}://{auth}{self.host}:{self.port}/{self.db}"
 
 
+# Server-side scripts. Message bodies live in a hash (id -> JSON); the ready
+# list, delayed zset and processing zset only hold ids, so ack/nack are
+# O(log n) lookups by id instead of scans over serialized messages.
+
+# Before the hash layout, list and zset members were the JSON bodies
+# themselves. Such a member is recognised by its leading '{' and stands for
+# the message id inside it.
+_LEGACY_ID_LUA = """
+local function legacy_id(member)
+    if string.sub(member, 1, 1) ~= '{' then
+        return nil
+    end
+    local ok, body = pcall(cjson.decode, member)
+    if ok and type(body) == 'table' and type(body.id) == 'string' then
+        return body.id
+    end
+    return nil
+end
+"""
+
+# Move due delayed ids to the ready list, or into the stream (ARGV[3] == "1")
+_PROMOTE_LUA = _LEGACY_ID_LUA + """
+local ids = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, tonumber(ARGV[2]))
+for _, id in ipairs(ids) do
+    if ARGV[3] == '1' then
+        local message_id = id
+        local data = redis.call('HGET', KEYS[3], id)
+        if not data then
+            message_id = legacy_id(id)
+            if message_id then
+                data = id
+            end
+        end
+        if data then
+            redis.call('XADD', KEYS[2], '*', 'id', message_id, 'data', data)
+            redis.call('HDEL', KEYS[3], message_id)
+        end
+    else
+        redis.call('RPUSH', KEYS[2], id)
+    end
+    redis.call('ZREM', KEYS[1], id)
+end
+return #ids
+"""
+
+# Promote due delayed ids, then pop up to ARGV[3] ids (after any already
+# popped by BLPOP in ARGV[5..]) into the processing zset; returns bodies.
+# Legacy inline bodies are moved into the hash under their message id.
+_CONSUME_LUA = _LEGACY_ID_LUA + """
+local ids = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, tonumber(ARGV[2]))
+for _, id in ipairs(ids) do
+    redis.call('RPUSH', KEYS[2], id)
+    redis.call('ZREM', KEYS[1], id)
+end
+local popped = {}
+for i = 5, #ARGV do
+    popped[#popped + 1] = ARGV[i]
+end
+for i = 1, tonumber(ARGV[3]) do
+    local id = redis.call('LPOP', KEYS[2])
+    if not id then
+        break
+    end
+    popped[#popped + 1] = id
+end
+local out = {}
+for _, id in ipairs(popped) do
+    local data = redis.call('HGET', KEYS[3], id)
+    if not data then
+        local message_id = legacy_id(id)
+        if message_id then
+            data = id
+            id = message_id
+            redis.call('HSET', KEYS[3], id, data)
+        end
+    end
+    if data then
+        redis.call('ZADD', KEYS[4], ARGV[4], id)
+        out[#out + 1] = data
+    end
+end
+return out
+"""
+
+# Return ids whose visibility timeout expired to the front of the ready list
+_REQUEUE_STALE_LUA = """
+local ids = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, tonumber(ARGV[2]))
+for _, id in ipairs(ids) do
+    redis.call('LPUSH', KEYS[2], id)
+    redis.call('ZREM', KEYS[1], id)
+end
+return #ids
+"""
+
+_SCRIPT_BATCH = 1000  # ids moved per script call (keeps each call short)
+
+
 class RedisQueue(IMessageQueue):
     """
     Redis-based message queue implementation.
 
-    Uses Redis lists for queue operations and sorted sets for delayed messages.
+    List mode (default) keeps ids in a list, delayed ids in a sorted set and
+    in-flight ids in a sorted set scored by visibility deadline; bodies live
+    in a hash. Stream mode (RedisConfig.stream_mode) uses a Redis Stream
+    with a consumer group for at-least-once delivery: entries stay pending
+    until acked, and entries idle past the visibility timeout on a stale
+    consumer are claimed by the next consume() (dead-lettered after
+    max_retries deliveries).
 
     Features:
     - Persistent messages
-    - Delayed message delivery
+    - Pipelined batch publish/ack, batch (blocking) consume
+    - Delayed message delivery, promoted server-side by a Lua script
     - Dead letter queue support
     - Message acknowledgment with visibility timeout
     """
 
-    def __init__(self, config: QueueConfig, redis_config: RedisConfig):
+    def __init__(
+        self,
+        config: QueueConfig,
+        redis_config: RedisConfig,
+        consumer_name: Optional[str] = None,
+        client: Optional[Any] = None,
+    ):
+        """
+        Args:
+            config: Queue configuration
+            redis_config: Redis connection configuration
+            consumer_name: Stream consumer name (default: unique per instance)
+            client: Existing redis.asyncio client to use instead of connecting
+        """
         self._config = config
         self._redis_config = redis_config
-        self._redis: Optional[Any] = None
+        self._redis: Optional[Any] = client
         self._processing: Dict[str, Message] = {}
+        self._entry_ids: Dict[str, str] = {}  # message id -> stream entry id
+        self._scripts: Dict[str, Any] = {}
+        self._stream_mode = redis_config.stream_mode
+        self._group = redis_config.consumer_group
+        self._consumer = consumer_name or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._group_ready = False
 
         # Key names
         self._prefix = redis_config.key_prefix
         self._queue_key = f"{self._prefix}queue:{config.name}"
         self._delayed_key = f"{self._prefix}delayed:{config.name}"
         self._processing_key = f"{self._prefix}processing:{config.name}"
+        self._data_key = f"{self._prefix}data:{config.name}"
+        self._stream_key = f"{self._prefix}stream:{config.name}"
         self._dlq_key = f"{self._prefix}dlq:{config.name}"
 
     async def connect(self) -> None:
         """Connect to Redis."""
-        if not REDIS_AVAILABLE:
-            raise RuntimeError("redis package not installed. Install with: pip install redis")
-
-        self._redis = aioredis.from_url(
-            self._redis_config.url,
-            socket_timeout=self._redis_config.socket_timeout,
-            socket_connect_timeout=self._redis_config.socket_connect_timeout,
-            max_connections=self._redis_config.max_connections,
-            decode_responses=True
-        )
+        if self._redis is None:
+            if not REDIS_AVAILABLE:
+                raise RuntimeError("redis package not installed. Install with: pip install redis")
+
+            self._redis = aioredis.from_url(
+                self._redis_config.url,
+                socket_timeout=self._redis_config.socket_timeout,
+                socket_connect_timeout=self._redis_config.socket_connect_timeout,
+                max_connections=self._redis_config.max_connections,
+                decode_responses=True
+            )
+
+        self._scripts = {
+            "promote": self._redis.register_script(_PROMOTE_LUA),
+            "consume": self._redis.register_script(_CONSUME_LUA),
+            "requeue_stale": self._redis.register_script(_REQUEUE_STALE_LUA),
+        }
+        if self._stream_mode:
+            await self._ensure_group()
 
     async def disconnect(self) -> None:
         """Disconnect from Redis."""
         if self._redis:
-            await self._redis.close()
+            close = getattr(self._redis, "aclose", None) or self._redis.close
+            await close()
             self._redis = None
+            self._scripts = {}
 
     async def _ensure_connected(self) -> None:
         """Ensure Redis connection is established."""
-        if self._redis is None:
+        if self._redis is None or not self._scripts:
             await self.connect()
 
+    async def _ensure_group(self) -> None:
+        """Create the consumer group (and stream) if missing."""
+        try:
+            await self._redis.xgroup_create(self._stream_key, self._group, id="0", mkstream=True)
+        except Exception as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+        self._group_ready = True
+
+    # === Publish ===
+
     async def publish(
         self,
         message: Message,
         delay: float = 0.0
     ) -> str:
         """Publish a message to the queue."""
+        return (await self.publish_batch([message], delay))[0]
+
+    async def publish_batch(
+        self,
+        messages: List[Message],
+        delay: float = 0.0
+    ) -> List[str]:
+        """Publish many messages in one pipelined round-trip."""
+        if not messages:
+            return []
         await self._ensure_connected()
 
-        message.max_retries = self._config.max_retries
-        message_data = json.dumps(message.to_dict())
+        bodies = {}
+        for message in messages:
+            message.max_retries = self._config.max_retries
+            bodies[message.id] = json.dumps(message.to_dict())
 
+        pipe = self._redis.pipeline(transaction=False)
         if delay > 0:
             # Add to delayed sorted set with score = delivery time
             delivery_time = time.time() + delay
-            await self._redis.zadd(self._delayed_key, {message_data: delivery_time})
+            pipe.hset(self._data_key, mapping=bodies)
+            pipe.zadd(self._delayed_key, {message_id: delivery_time for message_id in bodies})
+        elif self._stream_mode:
+            for message_id, body in bodies.items():
+                pipe.xadd(self._stream_key, {"id": message_id, "data": body})
         else:
-            # Add to main queue
-            await self._redis.rpush(self._queue_key, message_data)
+            # Body first, so a consumer never pops an id without one
+            pipe.hset(self._data_key, mapping=bodies)
+            pipe.rpush(self._queue_key, *bodies)
+        await pipe.execute()
 
-        return message.id
+        return [message.id for message in messages]
+
+    # === Consume ===
 
     async def consume(
         self,
         count: int = 1,
         timeout: float = 0.0
     ) -> List[Message]:
-        """Consume messages from the queue."""
+        """
+        Consume up to `count` messages.
+
+        With a timeout, blocks until at least one message is available and
+        then returns every ready message up to `count` in one batch.
+        """
         await self._ensure_connected()
+        if self._stream_mode:
+            return await self._consume_stream(count, timeout)
+
+        bodies = await self._pop_batch(count)
+        deadline = time.time() + timeout
+        while not bodies and timeout > 0:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            # Block server-side, waking in time to promote the next delayed message
+            result = await self._redis.blpop(
+                self._queue_key, timeout=await self._block_time(remaining)
+            )
+            bodies = await self._pop_batch(count - 1 if result else count, [result[1]] if result else [])
 
-        # First, move any delayed messages that are now ready
-        await self._process_delayed()
+        return self._track(bodies)
 
-        messages = []
+    async def _pop_batch(self, count: int, popped: Optional[List[str]] = None) -> List[str]:
+        """Promote due delayed messages and move up to `count` ids into processing (one script call)."""
+        now = time.time()
+        return await self._scripts["consume"](
+            keys=[self._delayed_key, self._queue_key, self._data_key, self._processing_key],
+            args=[now, _SCRIPT_BATCH, count, now + self._config.visibility_timeout, *(popped or [])],
+        )
+
+    async def _block_time(self, remaining: float) -> float:
+        """How long a blocking read may wait before a delayed message comes due."""
+        head = await self._redis.zrange(self._delayed_key, 0, 0, withscores=True)
+        if head:
+            remaining = min(remaining, head[0][1] - time.time())
+        return max(remaining, 0.01)
 
-        for _ in range(count):
+    def _track(self, bodies: List[str], entry_ids: Optional[List[str]] = None) -> List[Message]:
+        """Turn bodies into processing messages."""
+        messages = []
+        for i, body in enumerate(bodies):
             try:
-                if timeout > 0:
-                    # Blocking pop with timeout
-                    result = await self._redis.blpop(
-                        self._queue_key,
-                        timeout=timeout
-                    )
-                    if result:
-                        _, message_data = result
-                    else:
-                        break
-                else:
-                    # Non-blocking pop
-                    message_data = await self._redis.lpop(self._queue_key)
-                    if not message_data:
-                        break
-
-                message = Message.from_dict(json.loads(message_data))
-                message.mark_processing()
-
-                # Store in processing set with visibility timeout
-                visibility_timeout = time.time() + self._config.visibility_timeout
-                await self._redis.zadd(
-                    self._processing_key,
-                    {json.dumps(message.to_dict()): visibility_timeout}
-                )
+                message = Message.from_dict(json.loads(body))
+            except (json.JSONDecodeError, KeyError, ValueError):
+                continue
+            message.mark_processing()
+            self._processing[message.id] = message
+            if entry_ids is not None:
+                self._entry_ids[message.id] = entry_ids[i]
+            messages.append(message)
+        return messages
 
-                self._processing[message.id] = message
-                messages.append(message)
+    async def _consume_stream(self, count: int, timeout: float) -> List[Message]:
+        if not self._group_ready:
+            await self._ensure_group()
 
-            except Exception:
+        # At-least-once: pick up entries a stale consumer never acked
+        messages = await self._claim_stale(count)
+        if len(messages) >= count:
+            return messages
+
+        await self._process_delayed()
+        deadline = time.time() + timeout
+        while True:
+            block = None
+            if timeout > 0 and not messages:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                block = max(1, int(await self._block_time(remaining) * 1000))
+
+            response = await self._redis.xreadgroup(
+                self._group, self._consumer, {self._stream_key: ">"},
+                count=count - len(messages), block=block,
+            )
+            entries = response[0][1] if response else []
+            messages.extend(self._track(
+                [fields["data"] for _, fields in entries], [entry_id for entry_id, _ in entries]
+            ))
+            if messages or block is None:
                 break
+            await self._process_delayed()
 
         return messages
 
-    async def _process_delayed(self) -> None:
-        """Move delayed messages that are ready to main queue."""
-        now = time.time()
-
-        # Get all messages with score <= now
-        ready_messages = await self._redis.zrangebyscore(
-            self._delayed_key,
-            '-inf',
-            now
+    async def _claim_stale(self, count: int) -> List[Message]:
+        """Claim entries pending longer than the visibility timeout on any consumer."""
+        idle_ms = int(self._config.visibility_timeout * 1000)
+        pending = await self._redis.xpending_range(
+            self._stream_key, self._group, "-", "+", count, idle=idle_ms
         )
+        if not pending:
+            return []
 
-        if ready_messages:
-            # Move to main queue
-            pipe = self._redis.pipeline()
-            for msg in ready_messages:
-                pipe.rpush(self._queue_key, msg)
-            pipe.zremrangebyscore(self._delayed_key, '-inf', now)
+        claimed = await self._redis.xclaim(
+            self._stream_key, self._group, self._consumer, idle_ms,
+            [p["message_id"] for p in pending],
+        )
+        deliveries = {p["message_id"]: p["times_delivered"] for p in pending}
+        live, dead = [], []
+        for entry_id, fields in claimed:
+            if not fields:
+                continue  # Entry was deleted meanwhile
+            (dead if deliveries.get(entry_id, 0) > self._config.max_retries else live).append((entry_id, fields))
+
+        if dead:
+            # Poison messages: stop redelivering
+            pipe = self._redis.pipeline(transaction=False)
+            if self._config.dead_letter_queue:
+                pipe.rpush(self._dlq_key, *(fields["data"] for _, fields in dead))
+            pipe.xack(self._stream_key, self._group, *(entry_id for entry_id, _ in dead))
+            pipe.xdel(self._stream_key, *(entry_id for entry_id, _ in dead))
             await pipe.execute()
 
+        return self._track([fields["data"] for _, fields in live], [entry_id for entry_id, _ in live])
+
+    async def _process_delayed(self) -> None:
+        """Move delayed messages that are ready to main queue (server-side)."""
+        target = self._stream_key if self._stream_mode else self._queue_key
+        while True:
+            moved = await self._scripts["promote"](
+                keys=[self._delayed_key, target, self._data_key],
+                args=[time.time(), _SCRIPT_BATCH, "1" if self._stream_mode else "0"],
+            )
+            if moved < _SCRIPT_BATCH:
+                return
+
+    # === Ack / nack ===
+
     async def ack(self, message_id: str) -> bool:
         """Acknowledge message processing."""
-        await self._ensure_connected()
+        return await self.ack_batch([message_id]) == 1
 
-        if message_id not in self._processing:
-            return False
+    async def ack_batch(self, message_ids: List[str]) -> int:
+        """Acknowledge many messages in one pipelined round-trip."""
+        await self._ensure_connected()
 
-        message = self._processing.pop(message_id)
-        message.mark_completed()
-
-        # Remove from processing set
-        # Need to find and remove the message
-        processing_messages = await self._redis.zrange(self._processing_key, 0, -1)
-        for msg_data in processing_messages:
-            msg = Message.from_dict(json.loads(msg_data))
-            if msg.id == message_id:
-                await self._redis.zrem(self._processing_key, msg_data)
-                break
+        acked = [message_id for message_id in message_ids if message_id in self._processing]
+        if not acked:
+            return 0
+        for message_id in acked:
+            self._processing.pop(message_id).mark_completed()
 
-        return True
+        pipe = self._redis.pipeline(transaction=False)
+        self._release(pipe, acked)
+        if not self._stream_mode:
+            pipe.hdel(self._data_key, *acked)
+        await pipe.execute()
+        return len(acked)
+
+    def _release(self, pipe: Any, message_ids: List[str]) -> None:
+        """Queue the commands that end in-flight tracking for these messages."""
+        if self._stream_mode:
+            entry_ids = [self._entry_ids.pop(m) for m in message_ids if m in self._entry_ids]
+            if entry_ids:
+                pipe.xack(self._stream_key, self._group, *entry_ids)
+                pipe.xdel(self._stream_key, *entry_ids)
+        else:
+            pipe.zrem(self._processing_key, *message_ids)
 
     async def nack(
         self,
@@ -229,32 +483,43 @@ class RedisQueue(IMessageQueue):
 
         message = self._processing.pop(message_id)
         message.mark_failed("Negative acknowledgement")
+        body = json.dumps(message.to_dict())
 
-        # Remove from processing set
-        processing_messages = await self._redis.zrange(self._processing_key, 0, -1)
-        for msg_data in processing_messages:
-            msg = Message.from_dict(json.loads(msg_data))
-            if msg.id == message_id:
-                await self._redis.zrem(self._processing_key, msg_data)
-                break
+        pipe = self._redis.pipeline(transaction=False)
+        self._release(pipe, [message_id])
 
         if message.status == MessageStatus.DEAD_LETTER:
             # Send to dead letter queue
             if self._config.dead_letter_queue:
-                await self._redis.rpush(self._dlq_key, json.dumps(message.to_dict()))
+                pipe.rpush(self._dlq_key, body)
+            pipe.hdel(self._data_key, message_id)
         elif requeue:
             # Requeue with delay
-            await self.publish(message, delay=self._config.retry_delay)
+            pipe.hset(self._data_key, message_id, body)
+            pipe.zadd(self._delayed_key, {message_id: time.time() + self._config.retry_delay})
+        else:
+            pipe.hdel(self._data_key, message_id)
 
+        await pipe.execute()
         return True
 
+    # === Maintenance ===
+
     async def size(self) -> int:
-        """Get current queue size."""
+        """Get current queue size (ready + delayed, excluding in-flight)."""
         await self._ensure_connected()
 
-        queue_size = await self._redis.llen(self._queue_key)
-        delayed_size = await self._redis.zcard(self._delayed_key)
-        return queue_size + delayed_size
+        pipe = self._redis.pipeline(transaction=False)
+        pipe.zcard(self._delayed_key)
+        if self._stream_mode:
+            pipe.xlen(self._stream_key)
+            pipe.xpending(self._stream_key, self._group)
+            delayed, length, pending = await pipe.execute()
+            return delayed + length - pending["pending"]
+
+        pipe.llen(self._queue_key)
+        delayed, queued = await pipe.execute()
+        return queued + delayed
 
     async def purge(self) -> int:
         """Purge all messages."""
@@ -262,41 +527,37 @@ class RedisQueue(IMessageQueue):
 
         count = await self.size()
 
-        pipe = self._redis.pipeline()
-        pipe.delete(self._queue_key)
-        pipe.delete(self._delayed_key)
-        pipe.delete(self._processing_key)
-        await pipe.execute()
+        await self._redis.delete(
+            self._queue_key, self._delayed_key, self._processing_key,
+            self._data_key, self._stream_key,
+        )
+        if self._stream_mode:
+            await self._ensure_group()  # Deleting the stream dropped the group
 
         self._processing.clear()
+        self._entry_ids.clear()
         return count
 
     async def requeue_stale(self) -> int:
-        """Requeue messages that exceeded visibility timeout."""
-        await self._ensure_connected()
-
-        now = time.time()
-
-        # Get stale messages
-        stale = await self._redis.zrangebyscore(
-            self._processing_key,
-            '-inf',
-            now
-        )
+        """
+        Requeue messages that exceeded visibility timeout.
 
-        if not stale:
+        List mode only: in stream mode consume() claims stale pending
+        entries itself, so this returns 0.
+        """
+        await self._ensure_connected()
+        if self._stream_mode:
             return 0
 
-        # Requeue them
-        pipe = self._redis.pipeline()
-        for msg_data in stale:
-            msg = Message.from_dict(json.loads(msg_data))
-            msg.status = MessageStatus.PENDING
-            pipe.rpush(self._queue_key, json.dumps(msg.to_dict()))
-        pipe.zremrangebyscore(self._processing_key, '-inf', now)
-        await pipe.execute()
-
-        return len(stale)
+        total = 0
+        while True:
+            moved = await self._scripts["requeue_stale"](
+                keys=[self._processing_key, self._queue_key],
+                args=[time.time(), _SCRIPT_BATCH],
+            )
+            total += moved
+            if moved < _SCRIPT_BATCH:
+                return total
 
 
 class RedisBroker(IMessageBroker):
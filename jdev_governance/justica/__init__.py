@@ -103,6 +103,7 @@ from .audit import (
     InMemoryBackend,
     AuditLogger
 )
+from .audit_store import IndexedFileBackend
 
 # Main Agent
 from .agent import (
@@ -164,6 +165,7 @@ __all__ = [
     "ConsoleBackend",
     "FileBackend",
     "InMemoryBackend",
+    "IndexedFileBackend",
     "AuditLogger",
 
     # Agent
@@ -29,7 +29,7 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional, TextIO
 from uuid import UUID, uuid4
 import threading
-from queue import Queue
+from queue import Empty, Full, Queue
 import atexit
 
 
@@ -182,6 +182,22 @@ class AuditBackend(ABC):
         """Escreve uma entrada. Retorna True se bem-sucedido."""
         pass
 
+    def write_batch(self, entries: List[AuditEntry]) -> int:
+        """
+        Escreve um lote de entradas. Retorna quantas foram escritas.
+
+        Backends que conseguem agrupar a escrita (group commit) sobrescrevem;
+        o padrão escreve uma a uma.
+        """
+        written = 0
+        for entry in entries:
+            try:
+                if self.write(entry):
+                    written += 1
+            except Exception:
+                pass
+        return written
+
     @abstractmethod
     def flush(self) -> None:
         """Força flush de buffers."""
@@ -379,12 +395,17 @@ class AuditLogger:
     Suporta múltiplos backends e fornece API conveniente
     para logging de diferentes tipos de eventos.
     
-    Thread-safe com queue assíncrona para não bloquear.
+    Thread-safe com queue assíncrona para não bloquear. O worker drena a
+    queue em lotes de até `batch_size` (group commit nos backends) e, quando
+    ocioso, faz flush a cada `flush_interval` segundos - assim nenhuma
+    entrada fica em buffer por mais que isso.
     
     Attributes:
         backends: Lista de backends para escrita
         default_trace_id: Trace ID padrão para correlação
         async_mode: Se deve usar queue assíncrona
+        backpressure_threshold: Fração da queue a partir da qual o logger
+            está sob backpressure (ver get_metrics)
     """
 
     def __init__(
@@ -392,16 +413,15 @@ class AuditLogger:
         backends: Optional[List[AuditBackend]] = None,
         async_mode: bool = True,
         queue_size: int = 10000,
+        batch_size: int = 512,
+        flush_interval: float = 1.0,
+        backpressure_threshold: float = 0.8,
     ):
         self.backends = backends or [ConsoleBackend()]
         self.async_mode = async_mode
-
-        # Queue para modo assíncrono
-        if async_mode:
-            self._queue: Queue[Optional[AuditEntry]] = Queue(maxsize=queue_size)
-            self._worker_thread = threading.Thread(target=self._worker, daemon=True)
-            self._worker_thread.start()
-            atexit.register(self.close)
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.backpressure_threshold = backpressure_threshold
 
         # Trace ID atual (para correlacionar eventos)
         self._current_trace_id: Optional[UUID] = None
@@ -409,15 +429,46 @@ class AuditLogger:
         # Métricas
         self.total_entries = 0
         self.failed_writes = 0
+        self.batches_written = 0
+        self.batched_entries = 0
+        self.max_batch_size = 0
+        self.queue_high_water = 0
+        self.backpressure_events = 0
+        self.sync_fallbacks = 0
+        self._under_pressure = False
+
+        # Queue para modo assíncrono
+        if async_mode:
+            self._queue: Queue[Optional[AuditEntry]] = Queue(maxsize=queue_size)
+            self._backpressure_at = max(1, int(queue_size * backpressure_threshold)) if queue_size > 0 else 0
+            self._worker_thread = threading.Thread(target=self._worker, daemon=True)
+            self._worker_thread.start()
+            atexit.register(self.close)
 
     def _worker(self) -> None:
-        """Worker thread para escrita assíncrona."""
+        """Worker thread: drena a queue em lotes; flush periódico quando ociosa."""
         while True:
-            entry = self._queue.get()
-            if entry is None:  # Sinal de shutdown
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except Empty:
+                self._flush_backends()
+                continue
+
+            batch = [first]
+            while len(batch) < self.batch_size and batch[-1] is not None:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except Empty:
+                    break
+
+            shutdown = batch[-1] is None  # Sinal de shutdown
+            entries = batch[:-1] if shutdown else batch
+            if entries:
+                self._write_batch_to_backends(entries)
+            for _ in batch:
+                self._queue.task_done()
+            if shutdown:
                 break
-            self._write_to_backends(entry)
-            self._queue.task_done()
 
     def _write_to_backends(self, entry: AuditEntry) -> None:
         """Escreve para todos os backends."""
@@ -428,6 +479,38 @@ class AuditLogger:
             except Exception:
                 self.failed_writes += 1
 
+    def _write_batch_to_backends(self, entries: List[AuditEntry]) -> None:
+        """Escreve um lote para todos os backends."""
+        self.batches_written += 1
+        self.batched_entries += len(entries)
+        self.max_batch_size = max(self.max_batch_size, len(entries))
+        for backend in self.backends:
+            try:
+                self.failed_writes += len(entries) - backend.write_batch(entries)
+            except Exception:
+                self.failed_writes += len(entries)
+
+    def _flush_backends(self) -> None:
+        for backend in self.backends:
+            try:
+                backend.flush()
+            except Exception:
+                pass
+
+    def _track_queue_depth(self) -> None:
+        """Atualiza high-water mark e eventos de backpressure (com histerese)."""
+        depth = self._queue.qsize()
+        if depth > self.queue_high_water:
+            self.queue_high_water = depth
+        if not self._backpressure_at:
+            return
+        if depth >= self._backpressure_at:
+            if not self._under_pressure:
+                self._under_pressure = True
+                self.backpressure_events += 1
+        elif depth < self._backpressure_at // 2:
+            self._under_pressure = False
+
     def add_backend(self, backend: AuditBackend) -> None:
         """Adiciona um backend."""
         self.backends.append(backend)
@@ -483,8 +566,10 @@ class AuditLogger:
         if self.async_mode:
             try:
                 self._queue.put_nowait(entry)
-            except (asyncio.QueueFull, AttributeError):
+            except Full:
+                self.sync_fallbacks += 1
                 self._write_to_backends(entry)  # Fallback síncrono
+            self._track_queue_depth()
         else:
             self._write_to_backends(entry)
 
@@ -660,12 +745,25 @@ class AuditLogger:
 
     def get_metrics(self) -> Dict[str, Any]:
         """Retorna métricas do logger."""
+        queue_size = self._queue.qsize() if self.async_mode else 0
+        capacity = self._queue.maxsize if self.async_mode else 0
         return {
             "total_entries": self.total_entries,
             "failed_writes": self.failed_writes,
             "backends_count": len(self.backends),
             "async_mode": self.async_mode,
-            "queue_size": self._queue.qsize() if self.async_mode else 0,
+            "queue_size": queue_size,
+            # Backpressure
+            "queue_capacity": capacity,
+            "queue_utilization": queue_size / capacity if capacity else 0.0,
+            "queue_high_water": self.queue_high_water,
+            "backpressure": self._under_pressure,
+            "backpressure_events": self.backpressure_events,
+            "sync_fallbacks": self.sync_fallbacks,
+            # Group commit
+            "batches_written": self.batches_written,
+            "max_batch_size": self.max_batch_size,
+            "avg_batch_size": self.batched_entries / self.batches_written if self.batches_written else 0.0,
         }
 
     def __repr__(self) -> str:
@@ -0,0 +1,485 @@
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║                          INDEXED AUDIT STORE                                 ║
+║                                                                              ║
+║  "Rastreável: possível reconstruir cadeia de decisão"                        ║
+║  ...sem varrer gigabytes de JSONL para isso.                                 ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+
+Backend de auditoria em segmentos, pensado para o worker em lote do
+AuditLogger:
+
+- Group commit: write_batch serializa o lote inteiro e faz uma única escrita;
+  fsync no máximo a cada `fsync_interval` segundos (e sempre em flush/close),
+  então a latência até o disco é limitada sem um fsync por entrada.
+- O tamanho do segmento é contado em memória (nada de stat() por entrada).
+- Segmentos são divididos em blocos de ~`block_bytes`. Na rotação cada bloco
+  é comprimido com zlib de forma independente (audit-000001.seg) e um índice
+  lateral (audit-000001.idx) guarda, por bloco, offset, faixa de timestamps
+  e em quais blocos aparece cada trace_id, agent_id e category.
+- Consultas usam os índices para escolher blocos e só descomprimem esses.
+
+Layout do diretório:
+    audit-000007.jsonl   segmento ativo (JSON Lines puro, append-only)
+    audit-000006.seg     blocos zlib concatenados
+    audit-000006.idx     índice lateral (JSON)
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from .audit import AuditBackend, AuditCategory, AuditEntry, AuditLevel
+
+# Campos indexados por bloco
+INDEXED_FIELDS = ("trace_id", "agent_id", "category")
+
+_SEGMENT_RE = re.compile(r"^audit-(\d{6})\.(jsonl|seg|idx)$")
+
+# Mesmo formato de json.dumps(record, ensure_ascii=False), sem recriar o encoder
+_encode = json.JSONEncoder(ensure_ascii=False).encode
+
+
+class _BlockIndex:
+    """
+    Índice de um segmento: tabela de blocos + postings por bloco.
+
+    blocks[i] = [offset, length, first_entry, count, min_ts, max_ts]
+    No segmento ativo offset/length são bytes do JSONL; num segmento
+    comprimido, do bloco zlib.
+    """
+
+    def __init__(self) -> None:
+        self.blocks: List[List[Any]] = []
+        self.postings: Dict[str, Dict[str, List[int]]] = {name: {} for name in INDEXED_FIELDS}
+        self.entries = 0
+
+    def add_block(self, offset: int, length: int, records: Sequence[Dict[str, Any]], timestamps: Sequence[float]) -> None:
+        block_id = len(self.blocks)
+        self.blocks.append([offset, length, self.entries, len(records), min(timestamps), max(timestamps)])
+        self.entries += len(records)
+        for name in INDEXED_FIELDS:
+            seen: Set[str] = set()
+            for record in records:
+                value = record.get(name)
+                if value is not None and value not in seen:
+                    seen.add(value)
+                    self.postings[name].setdefault(value, []).append(block_id)
+
+    @property
+    def min_ts(self) -> float:
+        return min(b[4] for b in self.blocks) if self.blocks else float("inf")
+
+    @property
+    def max_ts(self) -> float:
+        return max(b[5] for b in self.blocks) if self.blocks else float("-inf")
+
+    def candidate_blocks(self, filters: Dict[str, str], since: Optional[float], until: Optional[float]) -> List[int]:
+        """Blocos que podem conter entradas que passam nos filtros."""
+        candidates: Optional[Set[int]] = None
+        for name, value in filters.items():
+            blocks = set(self.postings[name].get(value, ()))
+            candidates = blocks if candidates is None else candidates & blocks
+            if not candidates:
+                return []
+        ids = sorted(candidates) if candidates is not None else range(len(self.blocks))
+        return [
+            i for i in ids
+            if (since is None or self.blocks[i][5] >= since) and (until is None or self.blocks[i][4] <= until)
+        ]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"version": 1, "entries": self.entries, "blocks": self.blocks, "postings": self.postings}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> _BlockIndex:
+        index = cls()
+        index.blocks = data["blocks"]
+        index.postings = data["postings"]
+        index.entries = data["entries"]
+        return index
+
+
+def _needle(name: str, value: str) -> bytes:
+    """
+    Trecho exato que `"name": value` produz na linha serializada por
+    write_batch (_encode: separadores padrão, ensure_ascii=False).
+    """
+    return f'"{name}": {json.dumps(value, ensure_ascii=False)}'.encode("utf-8")
+
+
+def _decode_block(data: bytes, needles: Sequence[bytes]) -> List[Dict[str, Any]]:
+    """
+    Linhas do bloco que contêm todos os needles, já parseadas.
+
+    O teste de substring nos bytes crus descarta a maioria das linhas sem
+    json.loads. Pode deixar passar falsos positivos (o mesmo trecho dentro de
+    context, por exemplo), nunca descartar uma linha que casa: o filtro exato
+    continua em get_entries.
+    """
+    if not needles:
+        return [json.loads(line) for line in data.splitlines()]
+    if not all(needle in data for needle in needles):
+        return []
+    return [json.loads(line) for line in data.splitlines() if all(needle in line for needle in needles)]
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as fh:
+        fh.write(data)
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(tmp, path)
+
+
+class IndexedFileBackend(AuditBackend):
+    """
+    Backend em segmentos comprimidos com índice lateral.
+
+    Attributes:
+        directory: Diretório dos segmentos
+        max_segment_bytes: Tamanho (não comprimido) que dispara rotação
+        block_bytes: Tamanho alvo de cada bloco comprimido
+        fsync_interval: Atraso máximo, em segundos, até o fsync de um lote
+            (0 = fsync a cada lote, None = nunca, só flush/close)
+        max_segments: Segmentos comprimidos mantidos (None = todos)
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        max_segment_bytes: int = 64 * 1024 * 1024,
+        block_bytes: int = 64 * 1024,
+        fsync_interval: Optional[float] = 1.0,
+        max_segments: Optional[int] = None,
+        compression_level: int = 6,
+        index_cache_size: int = 64,
+    ):
+        self.directory = Path(directory)
+        self.max_segment_bytes = max_segment_bytes
+        self.block_bytes = block_bytes
+        self.fsync_interval = fsync_interval
+        self.max_segments = max_segments
+        self.compression_level = compression_level
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._index_cache: OrderedDict[int, _BlockIndex] = OrderedDict()
+        self._index_cache_size = index_cache_size
+        # (seq, min_ts, max_ts) dos segmentos comprimidos, em ordem
+        self._segments: List[Tuple[int, float, float]] = []
+
+        self._file = None
+        self._seq = 0
+        self._size = 0
+        self._active = _BlockIndex()
+        # Bloco aberto do segmento ativo: ainda não entrou no índice
+        self._block_start = 0
+        self._block_records: List[Dict[str, Any]] = []
+        self._block_timestamps: List[float] = []
+        self._last_fsync = time.monotonic()
+        self._unsynced = False
+
+        # Métricas
+        self.batches_written = 0
+        self.entries_written = 0
+        self.fsyncs = 0
+        self.rotations = 0
+
+        self._recover()
+
+    # ════════════════════════════════════════════════════════════════════════
+    # ABERTURA / RECUPERAÇÃO
+    # ════════════════════════════════════════════════════════════════════════
+
+    def _path(self, seq: int, suffix: str) -> Path:
+        return self.directory / f"audit-{seq:06d}.{suffix}"
+
+    def _recover(self) -> None:
+        """Carrega segmentos existentes e retoma (ou termina de rotacionar) os abertos."""
+        found: Dict[int, Set[str]] = {}
+        for path in self.directory.iterdir():
+            match = _SEGMENT_RE.match(path.name)
+            if match:
+                found.setdefault(int(match.group(1)), set()).add(match.group(2))
+            elif path.name.endswith(".tmp"):
+                path.unlink()  # Escrita atômica interrompida
+
+        plain = []
+        for seq in sorted(seq for seq, kinds in found.items() if "jsonl" in kinds):
+            if "idx" in found[seq]:
+                self._path(seq, "jsonl").unlink()  # Rotação concluída antes do crash
+            else:
+                plain.append(seq)
+
+        for seq in sorted(seq for seq, kinds in found.items() if "idx" in kinds):
+            index = self._load_index(seq)
+            self._segments.append((seq, index.min_ts, index.max_ts))
+        self._index_cache.clear()  # Carregados só pela faixa de tempo
+
+        # Segmentos puros antigos: rotação interrompida, comprimir agora
+        for seq in plain[:-1]:
+            self._seq = seq
+            self._load_active(seq)
+            self._compress_active()
+
+        self._seq = plain[-1] if plain else max(found, default=0) + 1
+        self._load_active(self._seq)
+
+    def _load_active(self, seq: int) -> None:
+        """Reconstrói o índice de um segmento JSONL, descartando linha parcial."""
+        self._active = _BlockIndex()
+        self._block_start = 0
+        self._block_records, self._block_timestamps = [], []
+        path = self._path(seq, "jsonl")
+        valid = 0
+        if path.exists():
+            with open(path, "rb") as fh:
+                for line in fh:
+                    if not line.endswith(b"\n"):
+                        break
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        break
+                    self._block_records.append(record)
+                    self._block_timestamps.append(datetime.fromisoformat(record["timestamp"]).timestamp())
+                    valid += len(line)
+                    if valid - self._block_start >= self.block_bytes:
+                        self._close_block(valid)
+            if valid < path.stat().st_size:
+                os.truncate(path, valid)
+        self._file = open(path, "ab")
+        self._size = valid
+
+    # ════════════════════════════════════════════════════════════════════════
+    # ESCRITA
+    # ════════════════════════════════════════════════════════════════════════
+
+    def write(self, entry: AuditEntry) -> bool:
+        return self.write_batch([entry]) == 1
+
+    def write_batch(self, entries: Sequence[AuditEntry]) -> int:
+        """Group commit: uma escrita para o lote inteiro."""
+        if not entries:
+            return 0
+        with self._lock:
+            if self._file is None:
+                return 0
+            records = [entry.to_dict() for entry in entries]
+            data = ("\n".join(map(_encode, records)) + "\n").encode("utf-8")
+            self._block_records.extend(records)
+            self._block_timestamps.extend(entry.timestamp.timestamp() for entry in entries)
+            try:
+                self._file.write(data)
+                self._file.flush()
+            except OSError:
+                del self._block_records[-len(entries):]
+                del self._block_timestamps[-len(entries):]
+                return 0
+            self._size += len(data)
+            self._unsynced = True
+            self.batches_written += 1
+            self.entries_written += len(entries)
+
+            if self._size - self._block_start >= self.block_bytes:
+                self._close_block(self._size)
+            if self.fsync_interval is not None and time.monotonic() - self._last_fsync >= self.fsync_interval:
+                self._fsync()
+            if self._size >= self.max_segment_bytes:
+                self._rotate()
+            return len(entries)
+
+    def _close_block(self, end: int) -> None:
+        if self._block_records:
+            self._active.add_block(self._block_start, end - self._block_start, self._block_records, self._block_timestamps)
+        self._block_start = end
+        self._block_records, self._block_timestamps = [], []
+
+    def _fsync(self) -> None:
+        if self._file is not None and self._unsynced:
+            os.fsync(self._file.fileno())
+            self.fsyncs += 1
+            self._unsynced = False
+        self._last_fsync = time.monotonic()
+
+    def _rotate(self) -> None:
+        self._compress_active()
+        self.rotations += 1
+        self._seq += 1
+        self._load_active(self._seq)
+        if self.max_segments is not None:
+            while len(self._segments) > self.max_segments:
+                seq = self._segments.pop(0)[0]
+                self._index_cache.pop(seq, None)
+                for suffix in ("idx", "seg"):
+                    self._path(seq, suffix).unlink(missing_ok=True)
+
+    def _compress_active(self) -> None:
+        """Comprime o segmento ativo bloco a bloco e grava o índice lateral."""
+        self._close_block(self._size)
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        plain = self._path(self._seq, "jsonl")
+        if self._active.entries == 0:
+            plain.unlink(missing_ok=True)
+            return
+
+        compressed = []
+        offset = 0
+        with open(plain, "rb") as fh:
+            for block in self._active.blocks:
+                fh.seek(block[0])
+                data = zlib.compress(fh.read(block[1]), self.compression_level)
+                compressed.append(data)
+                block[0], block[1] = offset, len(data)
+                offset += len(data)
+
+        _write_atomic(self._path(self._seq, "seg"), b"".join(compressed))
+        _write_atomic(self._path(self._seq, "idx"), json.dumps(self._active.to_dict()).encode("utf-8"))
+        plain.unlink()
+        self._segments.append((self._seq, self._active.min_ts, self._active.max_ts))
+        self._cache_index(self._seq, self._active)
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+                self._fsync()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self.flush()
+                self._file.close()
+                self._file = None
+
+    # ════════════════════════════════════════════════════════════════════════
+    # CONSULTA
+    # ════════════════════════════════════════════════════════════════════════
+
+    def _cache_index(self, seq: int, index: _BlockIndex) -> None:
+        self._index_cache[seq] = index
+        self._index_cache.move_to_end(seq)
+        while len(self._index_cache) > self._index_cache_size:
+            self._index_cache.popitem(last=False)
+
+    def _load_index(self, seq: int) -> _BlockIndex:
+        index = self._index_cache.get(seq)
+        if index is None:
+            index = _BlockIndex.from_dict(json.loads(self._path(seq, "idx").read_bytes()))
+            self._cache_index(seq, index)
+        else:
+            self._index_cache.move_to_end(seq)
+        return index
+
+    def _candidate_blocks_newest_first(
+        self, filters: Dict[str, str], since: Optional[float], until: Optional[float], needles: Sequence[bytes]
+    ) -> Iterator[Tuple[List[Dict[str, Any]], bool]]:
+        """
+        (registros, precisa_checar_tempo) de cada bloco candidato, do mais
+        recente ao mais antigo. Blocos inteiros dentro do intervalo dispensam
+        o parse do timestamp de cada registro.
+        """
+        # Bloco aberto: ainda só em memória, filtrado direto
+        if self._block_records:
+            yield self._block_records, True
+
+        def inside(block: List[Any]) -> bool:
+            return (since is None or block[4] >= since) and (until is None or block[5] <= until)
+
+        if self._active.blocks:
+            with open(self._path(self._seq, "jsonl"), "rb") as fh:
+                for block_id in reversed(self._active.candidate_blocks(filters, since, until)):
+                    block = self._active.blocks[block_id]
+                    fh.seek(block[0])
+                    yield _decode_block(fh.read(block[1]), needles), not inside(block)
+
+        for seq, min_ts, max_ts in reversed(self._segments):
+            if (since is not None and max_ts < since) or (until is not None and min_ts > until):
+                continue
+            index = self._load_index(seq)
+            block_ids = index.candidate_blocks(filters, since, until)
+            if not block_ids:
+                continue
+            with open(self._path(seq, "seg"), "rb") as fh:
+                for block_id in reversed(block_ids):
+                    block = index.blocks[block_id]
+                    fh.seek(block[0])
+                    yield _decode_block(zlib.decompress(fh.read(block[1])), needles), not inside(block)
+
+    def get_entries(
+        self,
+        level: Optional[AuditLevel] = None,
+        category: Optional[AuditCategory] = None,
+        agent_id: Optional[str] = None,
+        limit: int = 100,
+        trace_id: Optional[Any] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> List[AuditEntry]:
+        """
+        Retorna as `limit` entradas mais recentes que passam nos filtros,
+        em ordem cronológica (mesma semântica de InMemoryBackend.get_entries).
+
+        trace_id, agent_id, category e o intervalo de tempo usam o índice;
+        level é filtrado nas entradas dos blocos candidatos.
+        """
+        filters: Dict[str, str] = {}
+        if trace_id is not None:
+            filters["trace_id"] = str(trace_id)
+        if agent_id is not None:
+            filters["agent_id"] = agent_id
+        if category is not None:
+            filters["category"] = category.value
+        since_ts = since.timestamp() if since else None
+        until_ts = until.timestamp() if until else None
+        needles = [_needle(name, value) for name, value in filters.items()]
+        if level is not None:
+            needles.append(_needle("level", level.name))
+
+        results: List[AuditEntry] = []
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+            for records, check_time in self._candidate_blocks_newest_first(filters, since_ts, until_ts, needles):
+                for record in reversed(records):
+                    if any(record.get(name) != value for name, value in filters.items()):
+                        continue
+                    if level is not None and record["level"] != level.name:
+                        continue
+                    if check_time and (since_ts is not None or until_ts is not None):
+                        ts = datetime.fromisoformat(record["timestamp"]).timestamp()
+                        if (since_ts is not None and ts < since_ts) or (until_ts is not None and ts > until_ts):
+                            continue
+                    results.append(AuditEntry.from_dict(record))
+                    if len(results) >= limit:
+                        return results[::-1]
+        return results[::-1]
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Métricas de escrita e armazenamento."""
+        with self._lock:
+            return {
+                "segments": len(self._segments) + 1,
+                "active_segment_bytes": self._size,
+                "batches_written": self.batches_written,
+                "entries_written": self.entries_written,
+                "avg_batch_size": self.entries_written / max(1, self.batches_written),
+                "fsyncs": self.fsyncs,
+                "rotations": self.rotations,
+            }
+
+
+__all__ = ["IndexedFileBackend", "INDEXED_FIELDS"]
@@ -22,10 +22,11 @@ from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import Enum, auto
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Pattern, Tuple
 from uuid import UUID, uuid4
 
 from .constitution import Constitution, Severity, ViolationType
+from .matcher import PatternMatcher, TextScan
 
 
 class ClassificationResult(Enum):
@@ -106,6 +107,7 @@ class BaseClassifier(ABC):
         self.classification_count = 0
         self.violation_count = 0
         self._custom_rules: List[Callable[[str], Optional[Tuple[ViolationType, Severity]]]] = []
+        self._matcher: Optional[PatternMatcher] = None
 
     @abstractmethod
     def classify(self, text: str, context: Optional[Dict[str, Any]] = None) -> ClassificationReport:
@@ -133,6 +135,22 @@ class BaseClassifier(ABC):
         """
         self._custom_rules.append(rule)
 
+    def _regex_families(self) -> Dict[str, List[Pattern]]:
+        """Famílias de regex do classifier, na ordem em que são reportadas."""
+        return {}
+
+    def _scan(self, text: str) -> TextScan:
+        """
+        Varre o texto com o matcher pré-compilado.
+
+        O matcher só é recompilado quando a Constituição muda
+        (princípios ou red flags), não a cada classificação.
+        """
+        key = self.constitution.pattern_fingerprint()
+        if self._matcher is None or self._matcher.key != key:
+            self._matcher = PatternMatcher(self.constitution, self._regex_families(), key)
+        return self._matcher.scan(text)
+
     def _apply_custom_rules(self, text: str) -> List[Tuple[ViolationType, Severity]]:
         """Aplica todas as regras customizadas."""
         results = []
@@ -206,6 +224,13 @@ class InputClassifier(BaseClassifier):
         self._code_injection_re = [re.compile(p, re.IGNORECASE) for p in self.CODE_INJECTION_PATTERNS]
         self._exfiltration_re = [re.compile(p, re.IGNORECASE) for p in self.EXFILTRATION_PATTERNS]
 
+    def _regex_families(self) -> Dict[str, List[Pattern]]:
+        return {
+            "JAILBREAK": self._jailbreak_re,
+            "CODE_INJECTION": self._code_injection_re,
+            "EXFILTRATION": self._exfiltration_re,
+        }
+
     def classify(self, text: str, context: Optional[Dict[str, Any]] = None) -> ClassificationReport:
         """
         Classifica um input quanto a violações de segurança.
@@ -219,44 +244,39 @@ class InputClassifier(BaseClassifier):
         violation_types = []
         reasoning_parts = []
         principles_violated = []
+        scan = self._scan(text)
 
         # ════════════════════════════════════════════════════════════════════
         # FASE 1: Detecção de Jailbreak
         # ════════════════════════════════════════════════════════════════════
-        for pattern in self._jailbreak_re:
-            match = pattern.search(text)
-            if match:
-                detected_patterns.append(f"JAILBREAK: {match.group()}")
-                violation_types.append(ViolationType.JAILBREAK_ATTEMPT)
-                reasoning_parts.append(f"Padrão de jailbreak detectado: '{match.group()}'")
-                principles_violated.append("Proteção da Integridade do Sistema")
+        for match in scan.search("JAILBREAK"):
+            detected_patterns.append(f"JAILBREAK: {match.group()}")
+            violation_types.append(ViolationType.JAILBREAK_ATTEMPT)
+            reasoning_parts.append(f"Padrão de jailbreak detectado: '{match.group()}'")
+            principles_violated.append("Proteção da Integridade do Sistema")
 
         # ════════════════════════════════════════════════════════════════════
         # FASE 2: Detecção de Injeção de Código
         # ════════════════════════════════════════════════════════════════════
-        for pattern in self._code_injection_re:
-            match = pattern.search(text)
-            if match:
-                detected_patterns.append(f"CODE_INJECTION: {match.group()}")
-                violation_types.append(ViolationType.CODE_INJECTION)
-                reasoning_parts.append(f"Padrão de injeção de código detectado: '{match.group()}'")
-                principles_violated.append("Proteção da Integridade do Sistema")
+        for match in scan.search("CODE_INJECTION"):
+            detected_patterns.append(f"CODE_INJECTION: {match.group()}")
+            violation_types.append(ViolationType.CODE_INJECTION)
+            reasoning_parts.append(f"Padrão de injeção de código detectado: '{match.group()}'")
+            principles_violated.append("Proteção da Integridade do Sistema")
 
         # ════════════════════════════════════════════════════════════════════
         # FASE 3: Detecção de Exfiltração
         # ════════════════════════════════════════════════════════════════════
-        for pattern in self._exfiltration_re:
-            match = pattern.search(text)
-            if match:
-                detected_patterns.append(f"EXFILTRATION: {match.group()}")
-                violation_types.append(ViolationType.DATA_EXFILTRATION)
-                reasoning_parts.append(f"Padrão de exfiltração detectado: '{match.group()}'")
-                principles_violated.append("Proteção da Integridade do Sistema")
+        for match in scan.search("EXFILTRATION"):
+            detected_patterns.append(f"EXFILTRATION: {match.group()}")
+            violation_types.append(ViolationType.DATA_EXFILTRATION)
+            reasoning_parts.append(f"Padrão de exfiltração detectado: '{match.group()}'")
+            principles_violated.append("Proteção da Integridade do Sistema")
 
         # ════════════════════════════════════════════════════════════════════
         # FASE 4: Detecção de Red Flags Constitucionais
         # ════════════════════════════════════════════════════════════════════
-        red_flags = self.constitution.check_red_flags(text)
+        red_flags = scan.red_flags
         if red_flags:
             detected_keywords.extend(red_flags)
             reasoning_parts.append(f"Red flags constitucionais: {red_flags}")
@@ -264,16 +284,13 @@ class InputClassifier(BaseClassifier):
         # ════════════════════════════════════════════════════════════════════
         # FASE 5: Verificação contra Princípios
         # ════════════════════════════════════════════════════════════════════
-        for principle in self.constitution.get_principles_by_category("DISALLOW"):
-            matched_patterns = principle.matches_pattern(text)
-            matched_keywords = principle.contains_keywords(text)
-
-            if matched_patterns or matched_keywords:
-                detected_patterns.extend([f"PRINCIPLE({principle.name}): {p}" for p in matched_patterns])
-                detected_keywords.extend(matched_keywords)
-                reasoning_parts.append(f"Princípio '{principle.name}' possivelmente violado")
-                if principle.name not in principles_violated:
-                    principles_violated.append(principle.name)
+        for matched in scan.principles:
+            principle = matched.principle
+            detected_patterns.extend([f"PRINCIPLE({principle.name}): {p}" for p in matched.patterns])
+            detected_keywords.extend(matched.keywords)
+            reasoning_parts.append(f"Princípio '{principle.name}' possivelmente violado")
+            if principle.name not in principles_violated:
+                principles_violated.append(principle.name)
 
         # ════════════════════════════════════════════════════════════════════
         # FASE 6: Regras Customizadas
@@ -428,6 +445,13 @@ class OutputClassifier(BaseClassifier):
         self._dangerous_code_re = [re.compile(p, re.IGNORECASE) for p in self.DANGEROUS_CODE_PATTERNS]
         self._dangerous_instruction_re = [re.compile(p, re.IGNORECASE) for p in self.DANGEROUS_INSTRUCTION_PATTERNS]
 
+    def _regex_families(self) -> Dict[str, List[Pattern]]:
+        return {
+            "SENSITIVE_DATA": self._sensitive_re,
+            "DANGEROUS_CODE": self._dangerous_code_re,
+            "DANGEROUS_INSTRUCTION": self._dangerous_instruction_re,
+        }
+
     def classify(self, text: str, context: Optional[Dict[str, Any]] = None) -> ClassificationReport:
         """
         Classifica um output quanto a violações de segurança.
@@ -441,46 +465,41 @@ class OutputClassifier(BaseClassifier):
         violation_types = []
         reasoning_parts = []
         principles_violated = []
+        scan = self._scan(text)
 
         # ════════════════════════════════════════════════════════════════════
         # FASE 1: Detecção de Informação Sensível
         # ════════════════════════════════════════════════════════════════════
-        for pattern in self._sensitive_re:
-            match = pattern.search(text)
-            if match:
-                # Mascarar a informação sensível no log
-                masked = match.group()[:4] + "****" + match.group()[-4:] if len(match.group()) > 8 else "****"
-                detected_patterns.append(f"SENSITIVE_DATA: {masked}")
-                violation_types.append(ViolationType.DATA_EXFILTRATION)
-                reasoning_parts.append("Possível vazamento de informação sensível detectado")
-                principles_violated.append("Proteção da Integridade do Sistema")
+        for match in scan.search("SENSITIVE_DATA"):
+            # Mascarar a informação sensível no log
+            masked = match.group()[:4] + "****" + match.group()[-4:] if len(match.group()) > 8 else "****"
+            detected_patterns.append(f"SENSITIVE_DATA: {masked}")
+            violation_types.append(ViolationType.DATA_EXFILTRATION)
+            reasoning_parts.append("Possível vazamento de informação sensível detectado")
+            principles_violated.append("Proteção da Integridade do Sistema")
 
         # ════════════════════════════════════════════════════════════════════
         # FASE 2: Detecção de Código Perigoso
         # ════════════════════════════════════════════════════════════════════
-        for pattern in self._dangerous_code_re:
-            match = pattern.search(text)
-            if match:
-                detected_patterns.append(f"DANGEROUS_CODE: {match.group()}")
-                violation_types.append(ViolationType.MALICIOUS_CODE)
-                reasoning_parts.append(f"Código potencialmente destrutivo: '{match.group()}'")
-                principles_violated.append("Proteção da Integridade do Sistema")
+        for match in scan.search("DANGEROUS_CODE"):
+            detected_patterns.append(f"DANGEROUS_CODE: {match.group()}")
+            violation_types.append(ViolationType.MALICIOUS_CODE)
+            reasoning_parts.append(f"Código potencialmente destrutivo: '{match.group()}'")
+            principles_violated.append("Proteção da Integridade do Sistema")
 
         # ════════════════════════════════════════════════════════════════════
         # FASE 3: Detecção de Instruções Perigosas
         # ════════════════════════════════════════════════════════════════════
-        for pattern in self._dangerous_instruction_re:
-            match = pattern.search(text)
-            if match:
-                detected_patterns.append(f"DANGEROUS_INSTRUCTION: {match.group()}")
-                violation_types.append(ViolationType.SECURITY_BYPASS)
-                reasoning_parts.append(f"Instrução potencialmente perigosa: '{match.group()}'")
-                principles_violated.append("Proteção da Integridade do Sistema")
+        for match in scan.search("DANGEROUS_INSTRUCTION"):
+            detected_patterns.append(f"DANGEROUS_INSTRUCTION: {match.group()}")
+            violation_types.append(ViolationType.SECURITY_BYPASS)
+            reasoning_parts.append(f"Instrução potencialmente perigosa: '{match.group()}'")
+            principles_violated.append("Proteção da Integridade do Sistema")
 
         # ════════════════════════════════════════════════════════════════════
         # FASE 4: Red Flags Constitucionais
         # ════════════════════════════════════════════════════════════════════
-        red_flags = self.constitution.check_red_flags(text)
+        red_flags = scan.red_flags
         if red_flags:
             detected_keywords.extend(red_flags)
             reasoning_parts.append(f"Red flags no output: {red_flags}")
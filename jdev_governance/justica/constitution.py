@@ -15,7 +15,7 @@ import json
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import Enum, auto
-from typing import Any, Dict, FrozenSet, List, Optional, Set
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
 from uuid import UUID, uuid4
 
 
@@ -440,6 +440,16 @@ class Constitution:
         text_lower = text.lower()
         return [flag for flag in self._red_flags if flag.lower() in text_lower]
 
+    def pattern_fingerprint(self) -> Tuple[Any, ...]:
+        """
+        Chave barata que muda sempre que princípios ou red flags mudam.
+
+        Usada pelos classifiers para decidir quando recompilar o matcher.
+        Ao contrário de integrity_hash, não serializa nada - os princípios
+        são imutáveis, então compará-los por identidade basta.
+        """
+        return tuple(self._principles.values()), tuple(self._red_flags)
+
     def check_escalation_needed(self, context: Dict[str, Any]) -> List[str]:
         """Verifica se o contexto requer escalação humana."""
         triggered = []
@@ -0,0 +1,288 @@
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║                          JUSTIÇA PATTERN MATCHER                             ║
+║                                                                              ║
+║  "Uma passada por texto, não uma por padrão"                                ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+
+Matcher pré-compilado usado pelos classifiers. Todo prompt e todo output passa
+por aqui, então o custo é pago uma vez por Constituição e não por texto:
+
+- O texto é convertido para minúsculas uma única vez.
+- Literais (red flags, keywords e patterns dos princípios) são deduplicados
+  num único índice. Um literal só é procurado se os literais contidos nele
+  foram encontrados ("bypass segurança" só é testado se "bypass" apareceu).
+- Cada regex ganha um filtro: os literais que todo match dela contém,
+  extraídos da árvore de parse. Se algum não aparece no texto, a regex nem
+  roda. Texto benigno quase nunca contém "jailbreak" ou "override", então a
+  maioria das regexes é pulada.
+- Em texto ASCII as regexes que rodam usam uma variante compilada com
+  re.ASCII, que casa exatamente o mesmo e é bem mais rápida com IGNORECASE.
+
+As regexes continuam sendo aplicadas ao texto original, então match.group()
+e a ordem dos resultados são idênticos à varredura sequencial.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Hashable, Iterable, List, Optional, Pattern, Sequence, Set, Tuple
+
+try:
+    from re import _constants as sre_constants
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_constants
+    import sre_parse
+
+from .constitution import Constitution, ConstitutionalPrinciple
+
+
+# Letras não-ASCII que re.IGNORECASE iguala a letras ASCII mas que lower() não
+# converte ("ſubprocess." casa subprocess\. com IGNORECASE). K vira k, mas İ vira
+# "i" + U+0307, e o ponto combinante quebraria o literal: é removido. Remover
+# caracteres só pode criar ocorrências a mais, e aí a regex apenas roda.
+_IGNORECASE_FOLD = str.maketrans({"ı": "i", "ſ": "s", "\u0307": None})
+
+_REPEATS = {sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT}
+if hasattr(sre_constants, "POSSESSIVE_REPEAT"):
+    _REPEATS.add(sre_constants.POSSESSIVE_REPEAT)
+
+# Um filtro: todos os conjuntos precisam ter pelo menos um literal no texto
+Gate = Tuple[FrozenSet[str], ...]
+
+
+def _selectivity(alternatives: FrozenSet[str]) -> int:
+    return min(len(s) for s in alternatives)
+
+
+def _required_literals(parsed) -> List[FrozenSet[str]]:
+    """
+    Conjuntos de literais (minúsculos) presentes em todo match: de cada
+    conjunto, pelo menos um literal aparece.
+
+    Conservador: qualquer construção não reconhecida interrompe a sequência
+    de literais e não contribui com nada.
+    """
+    required: List[FrozenSet[str]] = []
+    run: List[str] = []
+
+    def close_run() -> None:
+        if run:
+            required.append(frozenset(["".join(run)]))
+            run.clear()
+
+    for op, av in parsed:
+        if op is sre_constants.LITERAL:
+            run.append(chr(av).lower())
+            continue
+        if op is sre_constants.AT:
+            continue  # \b, ^, $ têm largura zero: não quebram a sequência
+        close_run()
+        if op is sre_constants.SUBPATTERN:
+            required.extend(_required_literals(av[-1]))
+        elif op is sre_constants.BRANCH:
+            # Cada ramo contribui com o seu conjunto mais seletivo
+            branches = [_required_literals(branch) for branch in av[1]]
+            if all(branches):
+                required.append(frozenset().union(*(max(b, key=_selectivity) for b in branches)))
+        elif op in _REPEATS:
+            if av[0] >= 1:
+                required.extend(_required_literals(av[2]))
+        elif op is getattr(sre_constants, "ATOMIC_GROUP", None):
+            required.extend(_required_literals(av))
+    close_run()
+    return required
+
+
+def regex_gate(pattern: Pattern) -> Gate:
+    """
+    Filtro de uma regex compilada, do conjunto mais seletivo para o menos.
+
+    Vazio significa que a regex precisa rodar sempre.
+    """
+    try:
+        required = _required_literals(sre_parse.parse(pattern.pattern, pattern.flags))
+    except Exception:
+        return ()
+    # Equivalências de caixa fora do ASCII não cabem em lower()
+    required = {alternatives for alternatives in required if all(a.isascii() for a in alternatives)}
+    return tuple(sorted(required, key=lambda alternatives: (-_selectivity(alternatives), sorted(alternatives))))
+
+
+def _ascii_variant(pattern: Pattern) -> Pattern:
+    """
+    A mesma regex com re.ASCII, para texto só ASCII.
+
+    Com IGNORECASE o sre testa equivalências Unicode a cada caractere; em
+    texto ASCII o resultado é idêntico e a variante é ~2x mais rápida.
+    """
+    if not isinstance(pattern.pattern, str) or not pattern.pattern.isascii():
+        return pattern
+    try:
+        return re.compile(pattern.pattern, (pattern.flags & ~re.UNICODE) | re.ASCII)
+    except (re.error, ValueError):
+        return pattern
+
+
+class LiteralIndex:
+    """
+    Busca de substrings para um conjunto fixo de literais.
+
+    Cada literal aponta para o maior outro literal contido nele; se esse
+    não está no texto, o literal maior também não pode estar e nem é testado.
+    As buscas em si são `in` do CPython (fastsearch em C), que para algumas
+    dezenas de literais vence qualquer autômato percorrido em Python.
+    """
+
+    def __init__(self, literals: Iterable[str]):
+        ordered = sorted(set(literals), key=lambda lit: (len(lit), lit))
+        self._order: List[Tuple[str, Optional[str]]] = []
+        for i, literal in enumerate(ordered):
+            parent = None
+            for shorter in reversed(ordered[:i]):
+                if shorter in literal:
+                    parent = shorter
+                    break
+            self._order.append((literal, parent))
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def find(self, haystack: str) -> Set[str]:
+        """Literais presentes em haystack (que já deve estar em minúsculas)."""
+        found: Set[str] = set()
+        for literal, parent in self._order:
+            if parent is not None and parent not in found:
+                continue
+            if literal in haystack:
+                found.add(literal)
+        return found
+
+
+@dataclass
+class PrincipleMatch:
+    """Patterns e keywords de um princípio encontrados no texto."""
+
+    principle: ConstitutionalPrinciple
+    patterns: List[str]
+    keywords: List[str]
+
+
+class TextScan:
+    """Resultado de PatternMatcher.scan para um texto."""
+
+    __slots__ = ("text", "lowered", "red_flags", "principles", "_matcher", "_is_ascii", "_haystack", "_known")
+
+    def __init__(
+        self,
+        text: str,
+        lowered: str,
+        red_flags: List[str],
+        principles: List[PrincipleMatch],
+        matcher: PatternMatcher,
+        found: Set[str],
+    ):
+        self.text = text
+        self.lowered = lowered
+        self.red_flags = red_flags
+        self.principles = principles
+        self._matcher = matcher
+        self._is_ascii = text.isascii()
+        if self._is_ascii or not ("ı" in lowered or "ſ" in lowered or "\u0307" in lowered):
+            self._haystack = lowered
+            self._known = dict.fromkeys(found, True)
+        else:
+            self._haystack = lowered.translate(_IGNORECASE_FOLD)
+            self._known = {}
+
+    def _present(self, literal: str) -> bool:
+        present = self._known.get(literal)
+        if present is None:
+            present = self._known[literal] = literal in self._haystack
+        return present
+
+    def _passes(self, gate: Gate) -> bool:
+        return all(any(self._present(a) for a in alternatives) for alternatives in gate)
+
+    def search(self, family: str) -> List:
+        """
+        Primeiro match de cada regex da família, na ordem das regexes.
+
+        Equivale a [p.search(text) for p in family] sem os None, mas regexes
+        cujo filtro falha nem são executadas.
+        """
+        matches = []
+        for pattern, ascii_pattern, gate in self._matcher.families[family]:
+            if gate and not self._passes(gate):
+                continue
+            match = (ascii_pattern if self._is_ascii else pattern).search(self.text)
+            if match:
+                matches.append(match)
+        return matches
+
+
+class PatternMatcher:
+    """
+    Matcher pré-compilado para uma Constituição e um conjunto de famílias de
+    regex ({"JAILBREAK": [re.compile(...), ...], ...}).
+
+    Construído uma vez e reutilizado enquanto `key` for igual a
+    Constitution.pattern_fingerprint(); os classifiers reconstroem ao mudar.
+    """
+
+    def __init__(
+        self,
+        constitution: Constitution,
+        families: Dict[str, Sequence[Pattern]],
+        key: Optional[Hashable] = None,
+    ):
+        self.key = key if key is not None else constitution.pattern_fingerprint()
+
+        # A ordem de iteração dos sets é fixada aqui para que os resultados
+        # saiam na mesma ordem de Constitution.check_red_flags e Principle.*
+        self._red_flags = [(flag, flag.lower()) for flag in constitution._red_flags]
+        self._principles = [
+            (
+                principle,
+                [(p, p.lower()) for p in principle.patterns],
+                [(kw, kw.lower()) for kw in principle.keywords],
+            )
+            for principle in constitution.get_principles_by_category("DISALLOW")
+        ]
+
+        self.families: Dict[str, List[Tuple[Pattern, Pattern, Gate]]] = {
+            name: [(pattern, _ascii_variant(pattern), regex_gate(pattern)) for pattern in patterns]
+            for name, patterns in families.items()
+        }
+
+        literals = {lowered for _, lowered in self._red_flags}
+        for _, patterns, keywords in self._principles:
+            literals.update(lowered for _, lowered in patterns)
+            literals.update(lowered for _, lowered in keywords)
+        self._literals = LiteralIndex(literals)
+
+    def scan(self, text: str) -> TextScan:
+        """Uma passada de lower() e uma busca de literais para o texto inteiro."""
+        lowered = text.lower()
+        found = self._literals.find(lowered)
+
+        red_flags = [flag for flag, lowered_flag in self._red_flags if lowered_flag in found]
+        principles = []
+        for principle, patterns, keywords in self._principles:
+            matched_patterns = [p for p, lowered_p in patterns if lowered_p in found]
+            matched_keywords = [kw for kw, lowered_kw in keywords if lowered_kw in found]
+            if matched_patterns or matched_keywords:
+                principles.append(PrincipleMatch(principle, matched_patterns, matched_keywords))
+
+        return TextScan(text, lowered, red_flags, principles, self, found)
+
+
+__all__ = [
+    "LiteralIndex",
+    "PatternMatcher",
+    "PrincipleMatch",
+    "TextScan",
+    "regex_gate",
+]
@@ -28,7 +28,7 @@ from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from enum import Enum, auto
 from typing import Any, Deque, Dict, List, Optional, Tuple
-from collections import deque
+from collections import OrderedDict, deque
 from uuid import UUID, uuid4
 
 from .constitution import Constitution
@@ -117,6 +117,67 @@ class MonitoringEvent:
     flags: List[str] = field(default_factory=list)
 
 
+class SlidingWindow:
+    """
+    Agregados de uma janela deslizante, em buckets de tempo.
+
+    Cada bucket cobre `resolution` segundos e guarda soma das contribuições,
+    número de eventos e número de eventos com flags. Os totais da janela são
+    mantidos a cada add/expire, então consultar custa O(1) e não depende de
+    quantos eventos o agente gerou.
+
+    Só buckets com eventos são guardados e buckets fora da janela são
+    descartados: no máximo window / resolution + 1 buckets, qualquer que seja
+    a taxa de eventos. Um bucket sai quando todo o seu intervalo ficou fora da
+    janela, então a borda é resolvida com precisão de `resolution`.
+    """
+
+    __slots__ = ("window", "resolution", "_buckets", "total", "count", "flagged")
+
+    def __init__(self, window: timedelta, resolution: float = 1.0):
+        self.window = window.total_seconds()
+        self.resolution = resolution
+        # [índice do bucket, soma, eventos, eventos com flags], do mais antigo
+        self._buckets: Deque[List[Any]] = deque()
+        self.total = 0.0
+        self.count = 0
+        self.flagged = 0
+
+    def add(self, timestamp: datetime, value: float, flagged: bool) -> None:
+        # Expira aqui também: o limite de buckets não pode depender de alguém
+        # chamar calculate_suspicion
+        self.expire(timestamp)
+        index = int(timestamp.timestamp() // self.resolution)
+        buckets = self._buckets
+        if buckets and buckets[-1][0] >= index:
+            bucket = buckets[-1]  # Relógio voltou: conta no bucket mais novo
+        else:
+            bucket = [index, 0.0, 0, 0]
+            buckets.append(bucket)
+        bucket[1] += value
+        bucket[2] += 1
+        self.total += value
+        self.count += 1
+        if flagged:
+            bucket[3] += 1
+            self.flagged += 1
+
+    def expire(self, now: datetime) -> None:
+        """Descarta buckets inteiramente fora da janela terminada em `now`."""
+        cutoff = (now.timestamp() - self.window) / self.resolution
+        buckets = self._buckets
+        while buckets and buckets[0][0] + 1 <= cutoff:
+            _, value, count, flagged = buckets.popleft()
+            self.total -= value
+            self.count -= count
+            self.flagged -= flagged
+        if not buckets:
+            self.total, self.count, self.flagged = 0.0, 0, 0  # Sem resíduo de float
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
 @dataclass
 class AgentSession:
     """
@@ -136,6 +197,9 @@ class AgentSession:
     # Histórico de scores
     suspicion_history: Deque[SuspicionScore] = field(default_factory=lambda: deque(maxlen=100))
 
+    # Agregados da janela de análise (criados pelo JusticaMonitor)
+    recent: Optional[SlidingWindow] = None
+
     # Contadores
     total_events: int = 0
     flagged_events: int = 0
@@ -180,6 +244,7 @@ class JusticaMonitor:
         constitution: Constituição para verificação de regras
         sessions: Sessões ativas de agentes
         violation_threshold: Threshold para considerar violação (default: 80)
+        window_resolution_seconds: Largura dos buckets da janela de análise
     """
 
     # Padrões de comportamento suspeito
@@ -241,15 +306,21 @@ class JusticaMonitor:
         violation_threshold: float = 80.0,
         analysis_window_minutes: int = 30,
         cross_agent_correlation_window_minutes: int = 5,
+        window_resolution_seconds: float = 1.0,
     ):
         self.constitution = constitution
         self.violation_threshold = violation_threshold
         self.analysis_window = timedelta(minutes=analysis_window_minutes)
         self.correlation_window = timedelta(minutes=cross_agent_correlation_window_minutes)
+        self.window_resolution = window_resolution_seconds
 
         # Sessões por agente
         self._sessions: Dict[str, AgentSession] = {}
 
+        # Último evento com flags por agente, do mais antigo ao mais recente.
+        # Entradas fora da janela de correlação saem pela frente.
+        self._recently_flagged: OrderedDict[str, datetime] = OrderedDict()
+
         # Compilar padrões para performance
         self._compiled_patterns: Dict[str, List[re.Pattern]] = {
             category: [re.compile(p, re.IGNORECASE) for p in patterns]
@@ -264,7 +335,10 @@ class JusticaMonitor:
     def get_or_create_session(self, agent_id: str) -> AgentSession:
         """Obtém ou cria uma sessão para um agente."""
         if agent_id not in self._sessions:
-            self._sessions[agent_id] = AgentSession(agent_id=agent_id)
+            self._sessions[agent_id] = AgentSession(
+                agent_id=agent_id,
+                recent=SlidingWindow(self.analysis_window, self.window_resolution),
+            )
         return self._sessions[agent_id]
 
     def record_event(
@@ -303,11 +377,14 @@ class JusticaMonitor:
 
         # Registrar
         session.events.append(event)
+        session.recent.add(event.timestamp, contribution, bool(flags))
         session.total_events += 1
         session.last_activity = datetime.now(timezone.utc)
 
         if flags:
             session.flagged_events += 1
+            self._recently_flagged.pop(agent_id, None)
+            self._recently_flagged[agent_id] = event.timestamp
 
         # Atualizar contadores específicos
         if event_type == "tool_call":
@@ -382,12 +459,10 @@ class JusticaMonitor:
         # ════════════════════════════════════════════════════════════════════
         # FATOR 1: Eventos Recentes
         # ════════════════════════════════════════════════════════════════════
-        recent_events = [
-            e for e in session.events
-            if now - e.timestamp < self.analysis_window
-        ]
+        recent = session.recent
+        recent.expire(now)
 
-        event_contribution = sum(e.suspicion_contribution for e in recent_events)
+        event_contribution = recent.total
         if event_contribution > 0:
             factors.append(("recent_events", event_contribution))
             total_score += event_contribution
@@ -437,7 +512,8 @@ class JusticaMonitor:
             agent_id=agent_id,
             factors=factors,
             context={
-                "recent_events": len(recent_events),
+                "recent_events": recent.count,
+                "recent_flagged_events": recent.flagged,
                 "total_events": session.total_events,
                 "flagged_events": session.flagged_events,
             },
@@ -468,30 +544,19 @@ class JusticaMonitor:
         now = datetime.now(timezone.utc)
         correlation_score = 0.0
 
-        # Agentes com atividade recente suspeita
-        suspicious_agents = []
-
-        for other_id, session in self._sessions.items():
-            if other_id == agent_id:
-                continue
-
-            # Verificar atividade na janela de correlação
-            recent = [
-                e for e in session.events
-                if now - e.timestamp < self.correlation_window
-            ]
-
-            if not recent:
-                continue
-
-            # Verificar se tem flags
-            flagged = [e for e in recent if e.flags]
-            if flagged:
-                suspicious_agents.append(other_id)
+        # Agentes com evento flagged na janela de correlação: o índice está
+        # em ordem de último flag, então basta descartar pela frente
+        flagged = self._recently_flagged
+        while flagged:
+            oldest_id, last_flag = next(iter(flagged.items()))
+            if now - last_flag < self.correlation_window:
+                break
+            del flagged[oldest_id]
+        suspicious_agents = len(flagged) - (agent_id in flagged)
 
         # Múltiplos agentes suspeitos = possível coordenação
-        if len(suspicious_agents) >= 2:
-            correlation_score = min(len(suspicious_agents) * 10, 30)
+        if suspicious_agents >= 2:
+            correlation_score = min(suspicious_agents * 10, 30)
             self.total_cross_agent_alerts += 1
 
         return correlation_score
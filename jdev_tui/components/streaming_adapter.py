@@ -16,7 +16,10 @@ Data: 2025-11-25
 
 from typing import Optional, Callable, List
 import asyncio
+import json
+import re
 import threading
+import time
 
 from textual.widgets import Static
 from textual.containers import Container
@@ -39,6 +42,108 @@ from jdev_cli.tui.components.streaming_markdown import (
 from jdev_tui.core.output_formatter import Colors
 
 
+# =============================================================================
+# BLINDAGEM: sanitização fundida (Rich markup + JSON tool calls) em um só regex
+# =============================================================================
+
+# Rich markup que o LLM gerou erroneamente: [bold], [/red], [#ff79c6], [on blue]...
+_RICH_MARKUP = (
+    r'\[/?(?:bold|italic|dim|underline|strike|blink|reverse|#[0-9a-fA-F]{6}|'
+    r'red|green|blue|yellow|magenta|cyan|white|black|'
+    r'bright_\w+|rgb\([^)]+\)|on\s+\w+)[^\]]*\]'
+)
+_RICH_MARKUP_RE = re.compile(_RICH_MARKUP)
+
+# Tool calls JSON (ordem importa - mais específico primeiro)
+_SANITIZE_RE = re.compile(
+    rf'(?P<markup>{_RICH_MARKUP})'
+    # Nested PRIMEIRO: {"tool":{"tool":"bash_command","args":{...}}}
+    r'|\{"tool"\s*:\s*\{\s*"tool"\s*:\s*"(?P<nested_name>\w+)"\s*,\s*"args"\s*:\s*(?P<nested_args>\{[^{}]*\})\s*\}\s*\}'
+    # {"tool": "bash_command", "args": {"command": "..."}}
+    r'|\{\s*"tool"\s*:\s*"(?P<tool_name>\w+)"\s*,\s*"args"\s*:\s*(?P<tool_args>\{[^{}]*\})\s*\}'
+    # {"name": "bash_command", "arguments": {"command": "..."}}
+    r'|\{\s*"name"\s*:\s*"(?P<named_name>\w+)"\s*,\s*"(?:arguments|params)"\s*:\s*(?P<named_args>\{[^{}]*\})\s*\}',
+    re.DOTALL,
+)
+
+# Possível início de tool call no fim do texto (chave completa ou ainda parcial)
+_TOOL_CALL_START = re.compile(r'\{\s*(?:"(?:tool|name)"|"[a-z]{0,4}\Z|\Z)')
+
+# Quanto texto pode ficar retido esperando um tool call / markup fechar
+_MAX_PENDING_JSON = 4096
+_MAX_PENDING_MARKUP = 48
+
+
+def _format_tool_call(tool_name: str, args: dict) -> str:
+    """Converte um tool call em exibição amigável."""
+    if tool_name in ('bash_command', 'bash'):
+        cmd = args.get('command', args.get('cmd', ''))
+        if cmd:
+            return f"```bash\n{cmd}\n```"
+    elif tool_name == 'write_file':
+        path = args.get('path', args.get('file_path', ''))
+        return f"📝 **Escrevendo arquivo:** `{path}`"
+    elif tool_name == 'read_file':
+        path = args.get('path', args.get('file_path', ''))
+        return f"📖 **Lendo arquivo:** `{path}`"
+    elif tool_name == 'edit_file':
+        path = args.get('path', args.get('file_path', ''))
+        return f"✏️ **Editando arquivo:** `{path}`"
+    elif tool_name in ('web_search', 'search'):
+        query = args.get('query', args.get('q', ''))
+        return f"🔍 **Pesquisando:** `{query}`"
+    elif tool_name in ('web_fetch', 'fetch_url'):
+        url = args.get('url', '')
+        return f"🌐 **Acessando:** `{url}`"
+
+    # Fallback: mostra tool call de forma limpa
+    args_str = ', '.join(f"{k}={repr(v)}" for k, v in args.items())
+    return f"🔧 **{tool_name}**({args_str})"
+
+
+def _replace_sanitized(match: re.Match) -> str:
+    """Callback do _SANITIZE_RE: remove markup, converte tool calls."""
+    if match.group('markup'):
+        return ''
+
+    tool_name = match.group('nested_name') or match.group('tool_name') or match.group('named_name')
+    args_json = match.group('nested_args') or match.group('tool_args') or match.group('named_args')
+    try:
+        args = json.loads(_RICH_MARKUP_RE.sub('', args_json))
+    except json.JSONDecodeError:
+        return _RICH_MARKUP_RE.sub('', match.group(0))  # Original se não conseguir parsear
+    return _format_tool_call(tool_name, args)
+
+
+def _pending_start(text: str) -> Optional[int]:
+    """
+    Posição a partir da qual o fim de text pode ser um tool call JSON ou
+    Rich markup ainda incompleto (retido até o próximo chunk), ou None.
+    """
+    window = max(0, len(text) - _MAX_PENDING_JSON)
+    for match in _TOOL_CALL_START.finditer(text, window):
+        tail = text[match.start():]
+        if tail.count('{') > tail.count('}'):
+            return match.start()
+
+    bracket = text.rfind('[', max(0, len(text) - _MAX_PENDING_MARKUP))
+    if bracket >= 0 and ']' not in text[bracket:] and '\n' not in text[bracket:]:
+        return bracket
+    return None
+
+
+def sanitize_stream_text(text: str) -> str:
+    """
+    Remove Rich markup e converte JSON tool calls em uma única passada.
+
+    Exemplo: '{"tool": "bash_command", "args": {"command": "ls"}}'
+    vira um bloco ```bash com o comando.
+    """
+    if '[' not in text and '{' not in text:
+        return text
+    return _SANITIZE_RE.sub(_replace_sanitized, text)
+
+
 class StreamingResponseWidget(Static):
     """
     Drop-in replacement for SelectableStatic with streaming markdown.
@@ -106,7 +211,8 @@ class StreamingResponseWidget(Static):
         """
         super().__init__(*args, **kwargs)
 
-        self._content = ""
+        # Conteúdo em partes (evita copiar tudo a cada chunk); ver _content
+        self._content_parts: List[str] = []
         self._enable_markdown = enable_markdown
 
         # Streaming components
@@ -132,71 +238,35 @@ class StreamingResponseWidget(Static):
         # Tool call JSON buffer for multi-chunk JSON parsing
         self._json_buffer = ""
 
-    def _sanitize_tool_call_json(self, chunk: str) -> str:
-        """
-        BLINDAGEM: Converte JSON tool calls em exibição amigável.
+    @property
+    def _content(self) -> str:
+        """Conteúdo acumulado (chunks juntados sob demanda)."""
+        if len(self._content_parts) > 1:
+            self._content_parts[:] = ["".join(self._content_parts)]
+        return self._content_parts[0] if self._content_parts else ""
 
-        Detecta padrões como:
-        - {"tool": "bash_command", "args": {"command": "..."}}
-        - {"name": "bash_command", "arguments": {"command": "..."}}
-        - {"functionCall": {"name": "...", "args": {...}}}
+    @_content.setter
+    def _content(self, value: str) -> None:
+        self._content_parts = [value]
 
-        E converte para formato legível:
-        ```bash
-        sudo apt install ...
-        ```
+    def _sanitize_chunk(self, chunk: str, final: bool = False) -> str:
+        """
+        Sanitização incremental: um tool call JSON ou markup que ainda não
+        fechou fica retido em _json_buffer e é processado junto com o
+        próximo chunk (ou no finalize).
         """
-        import re
-        import json
-
-        # Patterns para detectar tool calls JSON (ordem importa - mais específico primeiro)
-        TOOL_PATTERNS = [
-            # Nested PRIMEIRO: {"tool":{"tool":"bash_command","args":{...}}}
-            (re.compile(r'\{"tool"\s*:\s*\{\s*"tool"\s*:\s*"(\w+)"\s*,\s*"args"\s*:\s*(\{[^{}]*\})\s*\}\s*\}', re.DOTALL), True),
-            # {"tool": "bash_command", "args": {"command": "..."}}
-            (re.compile(r'\{\s*"tool"\s*:\s*"(\w+)"\s*,\s*"args"\s*:\s*(\{[^{}]*\})\s*\}', re.DOTALL), False),
-            # {"name": "bash_command", "arguments": {"command": "..."}}
-            (re.compile(r'\{\s*"name"\s*:\s*"(\w+)"\s*,\s*"(?:arguments|params)"\s*:\s*(\{[^{}]*\})\s*\}', re.DOTALL), False),
-        ]
-
-        result = chunk
-
-        for pattern, _ in TOOL_PATTERNS:
-            def replace_tool_call(match):
-                tool_name = match.group(1)
-                try:
-                    args = json.loads(match.group(2))
-                except json.JSONDecodeError:
-                    return match.group(0)  # Retorna original se não conseguir parsear
-
-                # Converte para formato amigável baseado no tool
-                if tool_name in ('bash_command', 'bash'):
-                    cmd = args.get('command', args.get('cmd', ''))
-                    if cmd:
-                        return f"```bash\n{cmd}\n```"
-                elif tool_name == 'write_file':
-                    path = args.get('path', args.get('file_path', ''))
-                    return f"📝 **Escrevendo arquivo:** `{path}`"
-                elif tool_name == 'read_file':
-                    path = args.get('path', args.get('file_path', ''))
-                    return f"📖 **Lendo arquivo:** `{path}`"
-                elif tool_name == 'edit_file':
-                    path = args.get('path', args.get('file_path', ''))
-                    return f"✏️ **Editando arquivo:** `{path}`"
-                elif tool_name in ('web_search', 'search'):
-                    query = args.get('query', args.get('q', ''))
-                    return f"🔍 **Pesquisando:** `{query}`"
-                elif tool_name in ('web_fetch', 'fetch_url'):
-                    url = args.get('url', '')
-                    return f"🌐 **Acessando:** `{url}`"
-
-                # Fallback: mostra tool call de forma limpa
-                args_str = ', '.join(f"{k}={repr(v)}" for k, v in args.items())
-                return f"🔧 **{tool_name}**({args_str})"
-
-            result = pattern.sub(replace_tool_call, result)
-
-        return result
+        text = self._json_buffer + chunk
+        self._json_buffer = ""
+        if not final:
+            hold = _pending_start(text)
+            if hold is not None:
+                text, self._json_buffer = text[:hold], text[hold:]
+        return sanitize_stream_text(text)
+
+    def _flush_pending(self) -> None:
+        """Processa o texto ainda retido pela sanitização incremental."""
+        if self._json_buffer:
+            self._append_sanitized(self._sanitize_chunk("", final=True))
 
     def on_mount(self) -> None:
         """Chamado quando widget é montado."""
@@ -218,25 +288,18 @@ class StreamingResponseWidget(Static):
         Args:
             chunk: Texto a adicionar ao stream
         """
-        import time
-        import re
-
         # =================================================================
-        # BLINDAGEM 1: Sanitizar Rich markup que o LLM gerou erroneamente
+        # BLINDAGEM: Sanitizar Rich markup que o LLM gerou erroneamente e
+        # converter JSON tool calls em exibição amigável - uma passada só,
+        # incremental (tool calls divididos entre chunks são detectados)
         # =================================================================
-        chunk = re.sub(
-            r'\[/?(?:bold|italic|dim|underline|strike|blink|reverse|#[0-9a-fA-F]{6}|'
-            r'red|green|blue|yellow|magenta|cyan|white|black|'
-            r'bright_\w+|rgb\([^)]+\)|on\s+\w+)[^\]]*\]',
-            '',
-            chunk
-        )
+        chunk = self._sanitize_chunk(chunk)
+        self._append_sanitized(chunk)
 
-        # =================================================================
-        # BLINDAGEM 2: Converter JSON tool calls em exibição amigável
-        # Detecta {"tool": "bash_command", "args": {...}} e converte
-        # =================================================================
-        chunk = self._sanitize_tool_call_json(chunk)
+    def _append_sanitized(self, chunk: str) -> None:
+        """Dedup, acumula e agenda render de um chunk já sanitizado."""
+        if not chunk:
+            return
 
         # DEDUPLICATION: Remove LLM-generated duplicate lines
         # Split chunk into lines and filter duplicates
@@ -269,7 +332,7 @@ class StreamingResponseWidget(Static):
 
             chunk = '\n'.join(filtered_lines)
 
-        self._content += chunk
+        self._content_parts.append(chunk)
 
         # Processa com block detector (incremental)
         self._block_detector.process_chunk(chunk)
@@ -346,11 +409,8 @@ class StreamingResponseWidget(Static):
                 logging.warning(f"RichMarkdown error: {e}")
                 return Text(content)
 
-        # Renderiza cada bloco com widget especializado
-        renderables = []
-        for block in blocks:
-            rendered = self._widget_factory.render_block(block)
-            renderables.append(rendered)
+        # Blocos finalizados vêm do cache; só o bloco aberto é re-renderizado
+        renderables = self._widget_factory.render_blocks(blocks)
 
         # Cursor no final (thread-safe) - Orange brand color
         if self.is_streaming and not self._is_finalizing:
@@ -382,6 +442,8 @@ class StreamingResponseWidget(Static):
 
         Deve ser chamado quando o streaming terminar.
         """
+        self._flush_pending()
+
         # Seta flag ANTES para evitar race conditions
         self._is_finalizing = True
         self.is_streaming = False
@@ -413,6 +475,8 @@ class StreamingResponseWidget(Static):
 
         Usa call_later para executar a versão async.
         """
+        self._flush_pending()
+
         # Seta flags imediatamente para evitar race conditions
         self._is_finalizing = True
         self.is_streaming = False
@@ -8,10 +8,12 @@ Contains:
 - ToolCallWithDeps: Tool call with dependency tracking
 - ParallelExecutionResult: Result with timing metrics
 - detect_tool_dependencies: Dependency detection
-- ParallelToolExecutor: Wave-based parallel execution
+- ParallelToolExecutor: Ready-queue (DAG) parallel execution
 
 Claude Code Parity: Independent tools execute in parallel,
 dependent tools execute sequentially respecting dependencies.
+Each call starts as soon as its own dependencies finish; per-resource
+limits (file path, git repo, shell, network host) bound concurrency.
 
 Author: JuanCS Dev
 Date: 2025-11-27
@@ -21,9 +23,15 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import os
+import re
+import shlex
 import time
 from dataclasses import dataclass, field
-from typing import Any, Callable, Coroutine, Dict, List, Set, Tuple
+from enum import Enum
+from functools import lru_cache
+from typing import Any, Callable, Coroutine, Dict, List, NamedTuple, Optional, Set, Tuple
+from urllib.parse import urlparse
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +40,20 @@ logger = logging.getLogger(__name__)
 # DATA CLASSES
 # =============================================================================
 
+class ResourceClass(Enum):
+    """Shared resources with their own concurrency limit."""
+    PATH = "path"  # Keyed per normalized file path
+    GIT = "git"  # Keyed per repository root
+    SHELL = "shell"  # Subprocesses (builds, test runs)
+    NETWORK = "net"  # Keyed per host
+
+
+class Resource(NamedTuple):
+    """One resource instance a tool call holds while it runs."""
+    kind: ResourceClass
+    key: str
+
+
 @dataclass
 class ToolCallWithDeps:
     """
@@ -42,11 +64,13 @@ class ToolCallWithDeps:
         tool_name: Name of the tool to execute
         args: Arguments for the tool
         depends_on: Set of call IDs this call depends on
+        resources: Resources held while running (concurrency limits)
     """
     id: str
     tool_name: str
     args: Dict[str, Any]
     depends_on: Set[str] = field(default_factory=set)
+    resources: Tuple[Resource, ...] = ()
 
 
 @dataclass
@@ -57,19 +81,151 @@ class ParallelExecutionResult:
     Attributes:
         results: Dict mapping call_id to execution result
         execution_time_ms: Total execution time in milliseconds
-        parallelism_factor: >1.0 means parallel speedup achieved
-        wave_count: Number of execution waves
+        parallelism_factor: Summed call time over the wall time from the first
+            call's start to the last call's end; >1.0 means parallel speedup
+        wave_count: Depth of the dependency graph (longest chain of calls)
+        critical_path: Call IDs of the chain that determined total time
+        critical_path_ms: Execution time summed along critical_path
     """
     results: Dict[str, Dict[str, Any]]
     execution_time_ms: float
     parallelism_factor: float
     wave_count: int
+    critical_path: List[str] = field(default_factory=list)
+    critical_path_ms: float = 0.0
 
 
 # =============================================================================
 # DEPENDENCY DETECTION
 # =============================================================================
 
+# Tools that write to files
+WRITE_TOOLS = frozenset({
+    "write_file",
+    "edit_file",
+    "delete_file",
+    "insert_lines",
+    "multi_edit",
+    "notebook_edit",
+    "create_directory",
+    "move_file",
+    "copy_file",
+})
+
+# Tools that read files
+READ_TOOLS = frozenset({
+    "read_file",
+    "read_multiple_files",
+    "cat",
+    "notebook_read",
+})
+
+# Tools that hit the network (limited per host)
+NETWORK_TOOLS = frozenset({
+    "web_fetch",
+    "web_search",
+    "fetch_url",
+    "http_request",
+})
+
+# Argument names that carry the file a tool operates on
+_PATH_ARGS = ("file_path", "path", "filepath", "notebook_path")
+
+# Argument names that carry the second file of move/copy tools
+_DESTINATION_ARGS = ("destination", "dest", "target_path", "new_path")
+
+# Shell operators that precede a file written by the command
+_REDIRECTS = frozenset({">", ">>", "1>", "2>", "&>", "tee"})
+
+
+def normalize_path(path: str, cwd: Optional[str] = None) -> str:
+    """
+    Canonical form of a path for dependency matching.
+
+    "./src/a.py", "src//a.py" and "/abs/cwd/src/a.py" all map to the same key.
+    """
+    return _normalize(str(path), cwd or os.getcwd())
+
+
+@lru_cache(maxsize=1024)
+def _normalize(path: str, cwd: str) -> str:
+    path = os.path.expanduser(path)
+    if not os.path.isabs(path):
+        path = os.path.join(cwd, path)
+    return os.path.normcase(os.path.normpath(path))
+
+
+@lru_cache(maxsize=256)
+def _git_repo(path: str) -> str:
+    """Root of the git repository containing path (path itself if none)."""
+    current = path if os.path.isdir(path) else os.path.dirname(path)
+    while True:
+        if os.path.exists(os.path.join(current, ".git")):
+            return current
+        parent = os.path.dirname(current)
+        if parent == current:
+            return path
+        current = parent
+
+
+# Separators inside a shell token around a path: pytest node ids
+# (tests/x.py::test_y), --opt=path, code passed to -c ("open('a.py')")
+_TOKEN_PIECES = re.compile(r"::|[=\"'`(),;\[\]{}]")
+
+
+def _command_paths(command: str, cwd: str) -> Tuple[Set[str], Set[str]]:
+    """
+    Paths a shell command mentions, as (referenced, written).
+
+    Tokens are also split on "::", "=", quotes and brackets, so
+    "tests/x.py::test_y", "--config=conf.yaml" and "open('conf.yaml')"
+    reference the file. Tokens after a redirect (> file, >> file,
+    tee file) count as written.
+    """
+    try:
+        tokens = shlex.split(command, posix=True)
+    except ValueError:
+        tokens = command.split()
+
+    referenced: Set[str] = set()
+    written: Set[str] = set()
+    previous = ""
+    for token in tokens:
+        target = token
+        for redirect in (">>", ">"):
+            if token.startswith(redirect) and len(token) > len(redirect):
+                target, previous = token[len(redirect):], redirect
+                break
+        if target and not target.startswith("-") and target not in _REDIRECTS:
+            normalized = normalize_path(target, cwd)
+            referenced.add(normalized)
+            if previous in _REDIRECTS:
+                written.add(normalized)
+        for piece in _TOKEN_PIECES.split(target):
+            if piece and piece != target and not piece.startswith("-"):
+                referenced.add(normalize_path(piece, cwd))
+        previous = token
+    return referenced, written
+
+
+@lru_cache(maxsize=1024)
+def _spelling_pattern(spelling: str) -> "re.Pattern[str]":
+    """spelling as a whole path: not part of a longer name on either side."""
+    return re.compile(r"(?<![\w.-])" + re.escape(spelling) + r"(?![\w-]|\.\w)")
+
+
+def _spelled_in(command: str, spellings: Set[str]) -> bool:
+    """True if the raw command contains one of the spellings of a path."""
+    return any(spelling in command and _spelling_pattern(spelling).search(command) for spelling in spellings)
+
+
+def _mentions(referenced: Set[str], path: str) -> bool:
+    """True if path or one of its parent directories is referenced."""
+    if path in referenced:
+        return True
+    return any(path.startswith(ref.rstrip(os.sep) + os.sep) for ref in referenced)
+
+
 def detect_tool_dependencies(tool_calls: List[Tuple[str, Dict]]) -> List[ToolCallWithDeps]:
     """
     Detect dependencies between tool calls using file-based heuristics.
@@ -79,8 +235,12 @@ def detect_tool_dependencies(tool_calls: List[Tuple[str, Dict]]) -> List[ToolCal
     - write_file(path) depends on read_file(path) for same file
     - edit_file(path) depends on read_file(path) for same file
     - bash_command() depends on write_file() if command references the file
+      (or a directory containing it); "> file" in a command is a write
     - All tools that modify same file must be sequential
-    - Git operations should be sequential
+    - Git operations on the same repository are sequential
+
+    Paths are normalized first, so "a.py", "./a.py" and its absolute path
+    are the same file.
 
     Args:
         tool_calls: List of (tool_name, args) tuples
@@ -97,97 +257,153 @@ def detect_tool_dependencies(tool_calls: List[Tuple[str, Dict]]) -> List[ToolCal
         deps = detect_tool_dependencies(calls)
         # deps[2].depends_on == {"tool_0"}
     """
+    if all(tool_name in READ_TOOLS for tool_name, _ in tool_calls):
+        # Read-only batch: nothing to order
+        return [
+            ToolCallWithDeps(id=f"tool_{i}", tool_name=tool_name, args=args)
+            for i, (tool_name, args) in enumerate(tool_calls)
+        ]
+
     calls = []
-    file_read_ops: Dict[str, str] = {}   # file_path -> call_id that read it
+    cwd = os.getcwd()
+    file_read_ops: Dict[str, Set[str]] = {}  # file_path -> reads since its last write
     file_write_ops: Dict[str, str] = {}  # file_path -> call_id that last wrote it
+    last_git_op: Dict[str, str] = {}  # repo root -> call_id of its last git call
+    spellings: Dict[str, Set[str]] = {}  # file_path -> how the calls wrote it
 
-    # Tools that write to files
-    WRITE_TOOLS = frozenset({
-        "write_file",
-        "edit_file",
-        "delete_file",
-        "insert_lines",
-        "multi_edit",
-        "create_directory",
-        "move_file",
-        "copy_file",
-    })
-
-    # Tools that read files
-    READ_TOOLS = frozenset({
-        "read_file",
-        "read_multiple_files",
-        "cat",
-    })
-
-    # Git tools (should be sequential)
-    GIT_TOOLS = frozenset({
-        "git_status",
-        "git_diff",
-        "git_commit",
-        "git_log",
-        "git_add",
-        "git_push",
-        "git_pull",
-        "git_checkout",
-        "git_branch",
-    })
+    def record_write(path: str, call_id: str, depends_on: Set[str], spelling: str) -> None:
+        depends_on.update(file_read_ops.pop(path, set()))
+        if path in file_write_ops:
+            depends_on.add(file_write_ops[path])
+        file_write_ops[path] = call_id
+        spellings.setdefault(path, {path}).add(spelling)
 
     for i, (tool_name, args) in enumerate(tool_calls):
         call_id = f"tool_{i}"
         depends_on: Set[str] = set()
+        resources: List[Resource] = []
 
         # Extract file path from various argument names
-        file_path = (
-            args.get("file_path")
-            or args.get("path")
-            or args.get("filepath")
-            or args.get("notebook_path")
-        )
+        path_arg = next((args[key] for key in _PATH_ARGS if args.get(key)), None)
+        file_path = normalize_path(path_arg, cwd) if isinstance(path_arg, str) and path_arg else None
 
         # Write operations depend on previous reads/writes to same file
         if tool_name in WRITE_TOOLS:
-            if file_path:
-                # Depend on any previous read of this file
-                if file_path in file_read_ops:
-                    depends_on.add(file_read_ops[file_path])
-                # Depend on any previous write to this file
-                if file_path in file_write_ops:
-                    depends_on.add(file_write_ops[file_path])
-                # Track this write
-                file_write_ops[file_path] = call_id
+            targets = [(file_path, path_arg)] if file_path else []
+            for key in _DESTINATION_ARGS:
+                if isinstance(args.get(key), str) and args[key]:
+                    targets.append((normalize_path(args[key], cwd), args[key]))
+            for target, spelling in targets:
+                record_write(target, call_id, depends_on, spelling)
+                resources.append(Resource(ResourceClass.PATH, target))
 
         # Read operations depend on previous writes to same file
         elif tool_name in READ_TOOLS:
-            if file_path and file_path in file_write_ops:
-                depends_on.add(file_write_ops[file_path])
-            # Track this read
             if file_path:
-                file_read_ops[file_path] = call_id
+                if file_path in file_write_ops:
+                    depends_on.add(file_write_ops[file_path])
+                file_read_ops.setdefault(file_path, set()).add(call_id)
 
-        # Bash commands - check if they reference any written files
+        # Bash commands - depend on writes to files they mention
         elif tool_name == "bash_command":
             command = args.get("command", "")
+            command_cwd = normalize_path(args.get("cwd") or cwd, cwd)
+            referenced, written = _command_paths(command, command_cwd)
+            resources.append(Resource(ResourceClass.SHELL, "bash"))
             for written_file, dep_id in file_write_ops.items():
-                if written_file in command:
+                # Tokens first; the raw command catches forms they miss
+                if _mentions(referenced, written_file) or _spelled_in(command, spellings[written_file]):
                     depends_on.add(dep_id)
-
-        # Git operations should be sequential
-        elif tool_name in GIT_TOOLS:
-            for prev_call in calls:
-                if prev_call.tool_name in GIT_TOOLS:
-                    depends_on.add(prev_call.id)
-
+            for target in written:
+                record_write(target, call_id, depends_on, target)
+
+        # Git operations are sequential per repository
+        elif tool_name.startswith("git_"):
+            repo = _git_repo(file_path or normalize_path(args.get("repo_path") or args.get("cwd") or cwd, cwd))
+            if repo in last_git_op:
+                depends_on.add(last_git_op[repo])
+            last_git_op[repo] = call_id
+            resources.append(Resource(ResourceClass.GIT, repo))
+
+        elif tool_name in NETWORK_TOOLS:
+            url = args.get("url") or ""
+            resources.append(Resource(ResourceClass.NETWORK, urlparse(url).netloc or tool_name))
+
+        depends_on.discard(call_id)
         calls.append(ToolCallWithDeps(
             id=call_id,
             tool_name=tool_name,
             args=args,
-            depends_on=depends_on
+            depends_on=depends_on,
+            resources=tuple(resources),
         ))
 
     return calls
 
 
+# =============================================================================
+# READY QUEUE
+# =============================================================================
+
+class ReadyQueue:
+    """
+    Dependency counts for one batch of calls.
+
+    pop_ready() hands out calls whose dependencies have all completed;
+    complete(call_id) releases the calls waiting on it.
+    """
+
+    def __init__(self, calls: List[ToolCallWithDeps]):
+        self._calls = {call.id: call for call in calls}
+        self._dependents: Dict[str, List[str]] = {call.id: [] for call in calls}
+        self._waiting: Dict[str, int] = {}
+        self._ready: List[str] = []
+        for call in calls:
+            deps = call.depends_on & self._calls.keys()
+            self._waiting[call.id] = len(deps)
+            for dep in deps:
+                self._dependents[dep].append(call.id)
+            if not deps:
+                self._ready.append(call.id)
+
+    def pop_ready(self) -> List[ToolCallWithDeps]:
+        ready, self._ready = self._ready, []
+        return [self._calls[call_id] for call_id in ready]
+
+    def complete(self, call_id: str) -> None:
+        for dependent in self._dependents[call_id]:
+            self._waiting[dependent] -= 1
+            if self._waiting[dependent] == 0:
+                self._ready.append(dependent)
+
+
+class ResourceLimiter:
+    """Per-resource semaphores, created on first use."""
+
+    def __init__(self, limits: Dict[ResourceClass, int], default: int):
+        self._limits = limits
+        self._default = default
+        self._semaphores: Dict[Resource, asyncio.Semaphore] = {}
+
+    async def acquire(self, resources: Tuple[Resource, ...]) -> List[asyncio.Semaphore]:
+        """Acquire every resource of a call; release the returned semaphores when done."""
+        acquired = []
+        try:
+            # Sorted acquisition order keeps multi-resource calls deadlock-free
+            for resource in sorted(set(resources), key=lambda r: (r.kind.value, r.key)):
+                semaphore = self._semaphores.get(resource)
+                if semaphore is None:
+                    semaphore = asyncio.Semaphore(self._limits.get(resource.kind, self._default))
+                    self._semaphores[resource] = semaphore
+                await semaphore.acquire()
+                acquired.append(semaphore)
+        except BaseException:
+            for semaphore in acquired:
+                semaphore.release()
+            raise
+        return acquired
+
+
 # =============================================================================
 # PARALLEL EXECUTOR
 # =============================================================================
@@ -201,9 +417,12 @@ class ParallelToolExecutor:
     Execute tool calls with intelligent parallelization.
 
     Claude Code Pattern:
-    - Independent tools execute in parallel (asyncio.gather)
+    - Independent tools execute in parallel
     - Dependent tools execute sequentially (respecting dependencies)
-    - Wave-based execution for optimal throughput
+    - Ready-queue scheduling: a call starts the moment its own dependencies
+      finish, not when a whole wave does
+    - Concurrency bounded globally (max_parallel) and per resource
+      (RESOURCE_LIMITS: file path, git repo, shell, network host)
 
     Example:
         executor = ParallelToolExecutor(tools.execute_tool)
@@ -212,12 +431,20 @@ class ParallelToolExecutor:
             ("read_file", {"path": "b.py"}),
             ("write_file", {"path": "c.py", "content": "..."})
         ])
-        print(f"Executed in {result.wave_count} waves")
+        print(f"Critical path: {result.critical_path} ({result.critical_path_ms:.0f}ms)")
     """
 
     # Configuration
     MAX_PARALLEL_TOOLS = 5  # Max concurrent tool executions
 
+    # Max concurrent calls per resource key, by resource class
+    RESOURCE_LIMITS = {
+        ResourceClass.PATH: 1,  # One writer per file
+        ResourceClass.GIT: 1,  # One git call per repository (index.lock)
+        ResourceClass.SHELL: 2,  # Builds and test runs compete for CPU
+        ResourceClass.NETWORK: 2,  # Per host
+    }
+
     def __init__(self, execute_fn: ToolExecutorFn, max_parallel: int = None):
         """
         Initialize executor.
@@ -249,116 +476,184 @@ class ParallelToolExecutor:
             tool_name, args = tool_calls[0]
             result = await self._execute_fn(tool_name, **args)
             result["tool_name"] = tool_name
+            elapsed_ms = (time.time() - start_time) * 1000
             return ParallelExecutionResult(
                 results={"tool_0": result},
-                execution_time_ms=(time.time() - start_time) * 1000,
+                execution_time_ms=elapsed_ms,
                 parallelism_factor=1.0,
-                wave_count=1
+                wave_count=1,
+                critical_path=["tool_0"],
+                critical_path_ms=elapsed_ms,
             )
 
         # Detect dependencies
         calls_with_deps = detect_tool_dependencies(tool_calls)
-
-        # Execute in waves
         results: Dict[str, Dict[str, Any]] = {}
-        completed: Set[str] = set()
-        wave_count = 0
         semaphore = asyncio.Semaphore(self._max_parallel)
+        limiter = ResourceLimiter(self.RESOURCE_LIMITS, default=self._max_parallel)
+        spans: List[Tuple[float, float]] = []  # (start, end) of each call
+
+        if any(call.depends_on for call in calls_with_deps):
+            await self._run_ready_queue(calls_with_deps, results, semaphore, limiter, spans)
+        else:
+            # Flat batch: everything is ready at once
+            outcomes = await asyncio.gather(
+                *(self._execute_single(call, semaphore, limiter, spans) for call in calls_with_deps),
+                return_exceptions=True
+            )
+            for call, outcome in zip(calls_with_deps, outcomes):
+                results[call.id] = self._as_result(call, outcome)
 
-        while len(completed) < len(calls_with_deps):
-            # Find tools ready to execute (all dependencies completed)
-            ready = [
-                call for call in calls_with_deps
-                if call.id not in completed
-                and call.depends_on.issubset(completed)
-            ]
-
-            if not ready:
-                # Circular dependency or error - break to avoid infinite loop
-                logger.warning("Possible circular dependency detected")
-                break
-
-            wave_count += 1
-            logger.debug(f"Wave {wave_count}: executing {len(ready)} tools")
-
-            # Execute ready tools in parallel
-            if len(ready) == 1:
-                # Single tool in wave - direct execution
-                call = ready[0]
-                result = await self._execute_single(call, semaphore)
-                results[call.id] = result
-                completed.add(call.id)
-            else:
-                # Multiple tools - parallel execution
-                tasks = [self._execute_single(call, semaphore) for call in ready]
-                wave_results = await asyncio.gather(*tasks, return_exceptions=True)
-
-                for call, item in zip(ready, wave_results):
-                    if isinstance(item, Exception):
-                        # Handle exception - create error result
-                        logger.error(f"Tool {call.tool_name} failed: {item}")
-                        results[call.id] = {
-                            "success": False,
-                            "error": str(item),
-                            "tool_name": call.tool_name,
-                            "execution_time_ms": 0
-                        }
-                    else:
-                        results[call.id] = item
-                    completed.add(call.id)
+        if len(results) < len(calls_with_deps):
+            # Circular dependency or error - remaining calls never became ready
+            logger.warning("Possible circular dependency detected")
 
-        # Calculate timing metrics
+        # Calculate timing metrics. Parallelism is measured over the span in
+        # which calls ran, so dependency detection and scheduling overhead
+        # (comparable to sub-millisecond calls) do not count as serial time
         total_time_ms = (time.time() - start_time) * 1000
         sequential_time = sum(
             r.get("execution_time_ms", 0)
             for r in results.values()
             if isinstance(r, dict)
         )
-        parallelism_factor = sequential_time / total_time_ms if total_time_ms > 0 else 1.0
+        span_ms = (max(end for _, end in spans) - min(start for start, _ in spans)) * 1000 if spans else 0.0
+        parallelism_factor = sequential_time / span_ms if span_ms > 0 else 1.0
+        critical_path = self._critical_path(calls_with_deps, results)
 
         return ParallelExecutionResult(
             results=results,
             execution_time_ms=total_time_ms,
             parallelism_factor=parallelism_factor,
-            wave_count=wave_count
+            wave_count=self._depth(calls_with_deps, results),
+            critical_path=critical_path,
+            critical_path_ms=sum(results[c].get("execution_time_ms", 0) for c in critical_path),
         )
 
+    @staticmethod
+    def _depth(calls: List[ToolCallWithDeps], results: Dict[str, Any]) -> int:
+        """Longest dependency chain among executed calls (calls are in topological order)."""
+        level: Dict[str, int] = {}
+        for call in calls:
+            if call.id in results:
+                level[call.id] = 1 + max((level.get(d, 0) for d in call.depends_on), default=0)
+        return max(level.values(), default=0)
+
+    @staticmethod
+    def _critical_path(calls: List[ToolCallWithDeps], results: Dict[str, Dict[str, Any]]) -> List[str]:
+        """
+        Dependency chain with the largest summed execution time - the part of
+        the batch no amount of parallelism can shorten.
+        """
+        total: Dict[str, float] = {}
+        previous: Dict[str, Optional[str]] = {}
+        for call in calls:  # calls are in topological order
+            if call.id not in results:
+                continue
+            deps = [d for d in call.depends_on if d in total]
+            best = max(deps, key=total.get, default=None)
+            previous[call.id] = best
+            total[call.id] = results[call.id].get("execution_time_ms", 0) + (total[best] if best else 0.0)
+
+        if not total:
+            return []
+        path = [max(total, key=total.get)]
+        while previous[path[-1]] is not None:
+            path.append(previous[path[-1]])
+        return path[::-1]
+
+    @staticmethod
+    def _as_result(call: ToolCallWithDeps, outcome: Any) -> Dict[str, Any]:
+        """Result dict for a finished call; exceptions become error results."""
+        if not isinstance(outcome, BaseException):
+            return outcome
+        # Handle exception - create error result
+        logger.error(f"Tool {call.tool_name} failed: {outcome}")
+        return {
+            "success": False,
+            "error": str(outcome) or type(outcome).__name__,
+            "tool_name": call.tool_name,
+            "execution_time_ms": 0
+        }
+
+    async def _run_ready_queue(
+        self,
+        calls_with_deps: List[ToolCallWithDeps],
+        results: Dict[str, Dict[str, Any]],
+        semaphore: asyncio.Semaphore,
+        limiter: ResourceLimiter,
+        spans: Optional[List[Tuple[float, float]]] = None,
+    ) -> None:
+        """Launch each call as soon as its last dependency finishes."""
+        queue = ReadyQueue(calls_with_deps)
+        running: Dict[asyncio.Task, ToolCallWithDeps] = {}
+
+        try:
+            while True:
+                for call in queue.pop_ready():
+                    running[asyncio.ensure_future(self._execute_single(call, semaphore, limiter, spans))] = call
+                if not running:
+                    break
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    call = running.pop(task)
+                    outcome = task.exception() or task.result()
+                    results[call.id] = self._as_result(call, outcome)
+                    queue.complete(call.id)
+        finally:
+            for task in running:
+                task.cancel()
+
     async def _execute_single(
         self,
         call: ToolCallWithDeps,
-        semaphore: asyncio.Semaphore
+        semaphore: asyncio.Semaphore,
+        limiter: Optional[ResourceLimiter] = None,
+        spans: Optional[List[Tuple[float, float]]] = None,
     ) -> Dict[str, Any]:
-        """Execute a single tool with semaphore control."""
-        async with semaphore:
-            tool_start = time.time()
-            try:
-                result = await self._execute_fn(call.tool_name, **call.args)
-
-                # Convert ToolResult to dict if needed
-                if hasattr(result, 'success') and hasattr(result, 'data'):
-                    # It's a ToolResult object
-                    result_dict = {
-                        "success": result.success,
-                        "data": result.data,
-                        "error": getattr(result, 'error', None),
-                        "metadata": getattr(result, 'metadata', {})
+        """
+        Execute a single tool under its resource limits and the global semaphore.
+
+        The call's (start, end) wall times are appended to spans if given.
+        """
+        locks = await limiter.acquire(call.resources) if limiter and call.resources else []
+        try:
+            async with semaphore:
+                tool_start = time.time()
+                try:
+                    result = await self._execute_fn(call.tool_name, **call.args)
+
+                    # Convert ToolResult to dict if needed
+                    if hasattr(result, 'success') and hasattr(result, 'data'):
+                        # It's a ToolResult object
+                        result_dict = {
+                            "success": result.success,
+                            "data": result.data,
+                            "error": getattr(result, 'error', None),
+                            "metadata": getattr(result, 'metadata', {})
+                        }
+                    elif isinstance(result, dict):
+                        result_dict = result
+                    else:
+                        result_dict = {"success": True, "data": result}
+
+                    result_dict["tool_name"] = call.tool_name
+                    result_dict["execution_time_ms"] = (time.time() - tool_start) * 1000
+                    return result_dict
+                except Exception as e:
+                    logger.error(f"Tool {call.tool_name} execution error: {e}")
+                    return {
+                        "success": False,
+                        "error": str(e),
+                        "tool_name": call.tool_name,
+                        "execution_time_ms": (time.time() - tool_start) * 1000
                     }
-                elif isinstance(result, dict):
-                    result_dict = result
-                else:
-                    result_dict = {"success": True, "data": result}
-
-                result_dict["tool_name"] = call.tool_name
-                result_dict["execution_time_ms"] = (time.time() - tool_start) * 1000
-                return result_dict
-            except Exception as e:
-                logger.error(f"Tool {call.tool_name} execution error: {e}")
-                return {
-                    "success": False,
-                    "error": str(e),
-                    "tool_name": call.tool_name,
-                    "execution_time_ms": (time.time() - tool_start) * 1000
-                }
+                finally:
+                    if spans is not None:
+                        spans.append((tool_start, time.time()))
+        finally:
+            for lock in reversed(locks):
+                lock.release()
 
 
 # =============================================================================
@@ -366,8 +661,13 @@ class ParallelToolExecutor:
 # =============================================================================
 
 __all__ = [
+    "Resource",
+    "ResourceClass",
     "ToolCallWithDeps",
     "ParallelExecutionResult",
     "detect_tool_dependencies",
+    "normalize_path",
+    "ReadyQueue",
+    "ResourceLimiter",
     "ParallelToolExecutor",
 ]
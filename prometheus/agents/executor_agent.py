@@ -280,6 +280,7 @@ Evaluate each criterion and provide scores in JSON:
         passed = 0
         errors = []
 
+        test_codes = []
         for i, test in enumerate(task.test_cases):
             test_input = test.get("input", "")
             expected = test.get("expected_output", test.get("expected", ""))
@@ -310,9 +311,11 @@ except Exception as e:
     print(f"ERROR: {{e}}")
     print("PASSED: False")
 """
+            test_codes.append(test_code)
 
-            result = await self.sandbox.execute(test_code, timeout=10)
+        results = await self.sandbox.execute_batch(test_codes, timeout=10)
 
+        for i, result in enumerate(results):
             if result.success and "PASSED: True" in result.stdout:
                 passed += 1
             else:
@@ -15,10 +15,17 @@ Memory Types:
 
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, List, Optional, Any, Tuple
+from typing import TYPE_CHECKING, Dict, List, Optional, Any, Tuple
 from enum import Enum
 import hashlib
+import heapq
 import math
+import time
+
+from .recall import RecallIndex
+
+if TYPE_CHECKING:
+    from .storage import MemoryStore
 
 
 class MemoryType(Enum):
@@ -84,10 +91,35 @@ class EpisodicMemory:
     Reference: +47% adaptation to new situations (arXiv:2502.06975)
     """
 
-    def __init__(self, max_entries: int = 1000):
-        self.entries: List[MemoryEntry] = []
+    # Eviction keys are re-computed at least this often (recency decays daily)
+    EVICTION_REKEY_SECONDS = 3600.0
+
+    def __init__(self, max_entries: int = 1000, store: Optional["MemoryStore"] = None):
+        self._entries: List[MemoryEntry] = []
         self.max_entries = max_entries
         self._index: Dict[str, int] = {}  # id -> index
+        self._recall = RecallIndex()
+        # Min-heap of (relevance when keyed, seq, id) for pruning
+        self._eviction_heap: List[Tuple[float, int, str]] = []
+        self._eviction_seq = 0
+        self._eviction_keyed_at = time.time()
+        # Persisted entries are loaded on first read
+        self._store = store
+        self._loaded = store is None
+
+    @property
+    def entries(self) -> List[MemoryEntry]:
+        """All entries (persisted ones are loaded on first access)."""
+        self._ensure_loaded()
+        return self._entries
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        for _, entry in self._store.load_entries(MemoryType.EPISODIC):
+            self._add_entry(entry)
+        self._prune_if_needed()
 
     def store(
         self,
@@ -126,9 +158,11 @@ class EpisodicMemory:
             tags=tags or [],
         )
 
-        self.entries.append(entry)
-        self._index[entry_id] = len(self.entries) - 1
-        self._prune_if_needed()
+        if self._store is not None:
+            self._store.put_entry(entry)
+        if self._loaded:
+            self._add_entry(entry)
+            self._prune_if_needed()
 
         return entry
 
@@ -141,27 +175,21 @@ class EpisodicMemory:
         """
         Retrieve similar experiences.
 
-        Uses keyword matching (can be upgraded to embeddings).
+        Ranks by hashed TF-IDF cosine similarity combined with relevance;
+        only entries sharing a term with the query are considered. Returned
+        entries are marked as accessed.
         """
-        query_words = set(self._tokenize(query))
-        scored_entries = []
-
-        for entry in self.entries:
-            entry_words = set(self._tokenize(entry.content))
-            overlap = len(query_words & entry_words)
-
-            if overlap > 0:
-                # Jaccard similarity + relevance
-                similarity = overlap / len(query_words | entry_words)
-                relevance = entry.compute_relevance()
-                combined_score = 0.6 * similarity + 0.4 * relevance
-
-                if combined_score >= min_relevance:
-                    scored_entries.append((combined_score, entry))
-                    entry.update_access()
-
-        scored_entries.sort(key=lambda x: x[0], reverse=True)
-        return [entry for _, entry in scored_entries[:top_k]]
+        self._ensure_loaded()
+        results = []
+        for _, entry_id in self._recall.search(query, top_k, min_score=min_relevance):
+            entry = self.get_by_id(entry_id)
+            if entry is not None:
+                entry.update_access()
+                self._recall.touch(entry_id, entry.accessed_at.timestamp())
+                results.append(entry)
+        if results and self._store is not None:
+            self._store.touch_entries(MemoryType.EPISODIC, results)
+        return results
 
     def recall_by_outcome(self, outcome_type: str) -> List[MemoryEntry]:
         """Retrieve experiences by outcome type (success/failure)."""
@@ -181,9 +209,10 @@ class EpisodicMemory:
 
     def get_by_id(self, entry_id: str) -> Optional[MemoryEntry]:
         """Get entry by ID."""
+        self._ensure_loaded()
         idx = self._index.get(entry_id)
-        if idx is not None and idx < len(self.entries):
-            return self.entries[idx]
+        if idx is not None and idx < len(self._entries):
+            return self._entries[idx]
         return None
 
     def _generate_id(self, content: str) -> str:
@@ -203,19 +232,58 @@ class EpisodicMemory:
             return "failure"
         return "neutral"
 
-    def _tokenize(self, text: str) -> List[str]:
-        """Simple tokenization."""
-        import re
-        return re.findall(r'\b\w+\b', text.lower())
+    def _add_entry(self, entry: MemoryEntry):
+        """Append an entry and register it with the recall and eviction indexes."""
+        if entry.id in self._index:
+            self._remove_entry(entry.id)
+        self._entries.append(entry)
+        self._index[entry.id] = len(self._entries) - 1
+        self._recall.add(entry.id, entry.content, entry.importance, entry.accessed_at.timestamp())
+        self._push_eviction(entry)
+
+    def _remove_entry(self, entry_id: str):
+        """Remove an entry in O(1) by moving the last entry into its slot."""
+        idx = self._index.pop(entry_id)
+        last = self._entries.pop()
+        if idx < len(self._entries):
+            self._entries[idx] = last
+            self._index[last.id] = idx
+        self._recall.remove(entry_id)
+
+    def _push_eviction(self, entry: MemoryEntry):
+        self._eviction_seq += 1
+        heapq.heappush(
+            self._eviction_heap, (entry.compute_relevance(), self._eviction_seq, entry.id)
+        )
 
     def _prune_if_needed(self):
-        """Remove low-relevance entries if exceeding limit."""
-        if len(self.entries) > self.max_entries:
-            # Sort by relevance, keep top entries
-            self.entries.sort(key=lambda e: e.compute_relevance(), reverse=True)
-            self.entries = self.entries[:self.max_entries]
-            # Rebuild index
-            self._index = {e.id: i for i, e in enumerate(self.entries)}
+        """Remove lowest-relevance entries if exceeding limit."""
+        if len(self._entries) <= self.max_entries:
+            return
+
+        # Relevance decays over time, so periodically re-key everything in O(n)
+        if time.time() - self._eviction_keyed_at > self.EVICTION_REKEY_SECONDS:
+            self._eviction_heap = []
+            for entry in self._entries:
+                self._eviction_seq += 1
+                self._eviction_heap.append((entry.compute_relevance(), self._eviction_seq, entry.id))
+            heapq.heapify(self._eviction_heap)
+            self._eviction_keyed_at = time.time()
+
+        evicted = []
+        while len(self._entries) > self.max_entries and self._eviction_heap:
+            keyed, _, entry_id = heapq.heappop(self._eviction_heap)
+            entry = self.get_by_id(entry_id)
+            if entry is None:
+                continue  # Stale heap item
+            if entry.compute_relevance() > keyed:
+                self._push_eviction(entry)  # Accessed since it was keyed
+                continue
+            self._remove_entry(entry_id)
+            evicted.append(entry_id)
+
+        if evicted and self._store is not None:
+            self._store.delete_entries(MemoryType.EPISODIC, evicted)
 
     def export(self) -> List[dict]:
         """Export all entries."""
@@ -223,8 +291,8 @@ class EpisodicMemory:
 
     def import_entries(self, data: List[dict]):
         """Import entries from export."""
-        for item in data:
-            entry = MemoryEntry(
+        entries = [
+            MemoryEntry(
                 id=item["id"],
                 type=MemoryType(item["type"]),
                 content=item["content"],
@@ -233,8 +301,13 @@ class EpisodicMemory:
                 importance=item.get("importance", 0.5),
                 tags=item.get("tags", []),
             )
-            self.entries.append(entry)
-            self._index[entry.id] = len(self.entries) - 1
+            for item in data
+        ]
+        if self._store is not None:
+            self._store.put_entries((entry, None) for entry in entries)
+        if self._loaded:
+            for entry in entries:
+                self._add_entry(entry)
 
 
 class SemanticMemory:
@@ -245,10 +318,52 @@ class SemanticMemory:
     Organized by topics and relations.
     """
 
-    def __init__(self):
-        self.facts: Dict[str, MemoryEntry] = {}  # topic -> entry
-        self.relations: Dict[str, List[str]] = {}  # concept -> related concepts
+    def __init__(self, store: Optional["MemoryStore"] = None):
+        self._facts: Dict[str, MemoryEntry] = {}  # topic -> entry
+        self._relations: Dict[str, List[str]] = {}  # concept -> related concepts
         self._topic_index: Dict[str, List[str]] = {}  # keyword -> topics
+        # Persisted facts are fetched per topic, or all at once for searches
+        self._store = store
+        self._loaded = store is None
+
+    @property
+    def facts(self) -> Dict[str, MemoryEntry]:
+        """All facts by topic (loads persisted ones on first access)."""
+        self._ensure_loaded()
+        return self._facts
+
+    @property
+    def relations(self) -> Dict[str, List[str]]:
+        """Concept relations (loads persisted ones on first access)."""
+        self._ensure_loaded()
+        return self._relations
+
+    @relations.setter
+    def relations(self, value: Dict[str, List[str]]):
+        self._ensure_loaded()
+        self._relations = value
+        if self._store is not None:
+            self._store.replace_values("relations", value)
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        for topic, entry in self._store.load_entries(MemoryType.SEMANTIC):
+            if topic not in self._facts:  # Newer in-memory versions win
+                self._facts[topic] = entry
+                self._update_topic_index(topic, entry.content)
+        self._relations = self._store.get_values("relations")
+
+    def _get(self, topic: str) -> Optional[MemoryEntry]:
+        """Fact by topic, fetching just that row if not loaded yet."""
+        entry = self._facts.get(topic)
+        if entry is None and not self._loaded:
+            entry = self._store.get_entry(MemoryType.SEMANTIC, topic)
+            if entry is not None:
+                self._facts[topic] = entry
+                self._update_topic_index(topic, entry.content)
+        return entry
 
     def store_fact(
         self,
@@ -284,16 +399,20 @@ class SemanticMemory:
             tags=tags or [],
         )
 
-        self.facts[topic] = entry
+        self._facts[topic] = entry
         self._update_topic_index(topic, fact)
+        if self._store is not None:
+            self._store.put_entry(entry, key=topic)
 
         return entry
 
     def query(self, topic: str) -> Optional[MemoryEntry]:
         """Query knowledge by exact topic."""
-        entry = self.facts.get(topic)
+        entry = self._get(topic)
         if entry:
             entry.update_access()
+            if self._store is not None:
+                self._store.touch_entries(MemoryType.SEMANTIC, [entry])
         return entry
 
     def search(self, query: str, top_k: int = 5) -> List[Tuple[str, MemoryEntry]]:
@@ -302,14 +421,15 @@ class SemanticMemory:
 
         Returns list of (topic, entry) tuples.
         """
+        self._ensure_loaded()
         query_words = set(query.lower().split())
         results = []
 
         for keyword in query_words:
             if keyword in self._topic_index:
                 for topic in self._topic_index[keyword]:
-                    if topic in self.facts:
-                        entry = self.facts[topic]
+                    if topic in self._facts:
+                        entry = self._facts[topic]
                         results.append((topic, entry))
                         entry.update_access()
 
@@ -321,6 +441,8 @@ class SemanticMemory:
                 seen.add(topic)
                 unique_results.append((topic, entry))
 
+        if unique_results and self._store is not None:
+            self._store.touch_entries(MemoryType.SEMANTIC, [e for _, e in unique_results])
         return unique_results[:top_k]
 
     def add_relation(self, concept_a: str, concept_b: str, relation_type: str = "related"):
@@ -340,6 +462,11 @@ class SemanticMemory:
             if reverse_entry not in self.relations[concept_b]:
                 self.relations[concept_b].append(reverse_entry)
 
+        if self._store is not None:
+            self._store.set_value("relations", concept_a, self._relations[concept_a])
+            if relation_type == "related":
+                self._store.set_value("relations", concept_b, self._relations[concept_b])
+
     def get_related(self, concept: str) -> List[str]:
         """Get concepts related to a given concept."""
         if concept not in self.relations:
@@ -348,11 +475,13 @@ class SemanticMemory:
 
     def update_confidence(self, topic: str, delta: float):
         """Update confidence for a fact."""
-        if topic in self.facts:
-            entry = self.facts[topic]
+        entry = self._get(topic)
+        if entry is not None:
             new_confidence = max(0, min(1, entry.metadata["confidence"] + delta))
             entry.metadata["confidence"] = new_confidence
             entry.importance = new_confidence
+            if self._store is not None:
+                self._store.put_entry(entry, key=topic)
 
     def _update_topic_index(self, topic: str, content: str):
         """Update keyword index."""
@@ -380,9 +509,41 @@ class ProceduralMemory:
     Enables reuse of successful solutions.
     """
 
-    def __init__(self):
-        self.procedures: Dict[str, MemoryEntry] = {}  # skill_name -> procedure
+    def __init__(self, store: Optional["MemoryStore"] = None):
+        self._procedures: Dict[str, MemoryEntry] = {}  # skill_name -> procedure
         self._skill_index: Dict[str, List[str]] = {}  # keyword -> skill_names
+        # Persisted procedures are fetched per skill, or all at once for searches
+        self._store = store
+        self._loaded = store is None
+
+    @property
+    def procedures(self) -> Dict[str, MemoryEntry]:
+        """All procedures by skill (loads persisted ones on first access)."""
+        self._ensure_loaded()
+        return self._procedures
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        for skill_name, entry in self._store.load_entries(MemoryType.PROCEDURAL):
+            if skill_name not in self._procedures:  # Newer in-memory versions win
+                self._procedures[skill_name] = entry
+                self._update_skill_index(skill_name, entry.metadata.get("steps", []))
+
+    def _get(self, skill_name: str) -> Optional[MemoryEntry]:
+        """Procedure by skill, fetching just that row if not loaded yet."""
+        entry = self._procedures.get(skill_name)
+        if entry is None and not self._loaded:
+            entry = self._store.get_entry(MemoryType.PROCEDURAL, skill_name)
+            if entry is not None:
+                self._procedures[skill_name] = entry
+                self._update_skill_index(skill_name, entry.metadata.get("steps", []))
+        return entry
+
+    def _persist(self, skill_name: str, entry: MemoryEntry):
+        if self._store is not None:
+            self._store.put_entry(entry, key=skill_name)
 
     def store_procedure(
         self,
@@ -421,16 +582,19 @@ class ProceduralMemory:
             tags=tags or [],
         )
 
-        self.procedures[skill_name] = entry
+        self._procedures[skill_name] = entry
         self._update_skill_index(skill_name, steps)
+        self._persist(skill_name, entry)
 
         return entry
 
     def get_procedure(self, skill_name: str) -> Optional[MemoryEntry]:
         """Get procedure by skill name."""
-        entry = self.procedures.get(skill_name)
+        entry = self._get(skill_name)
         if entry:
             entry.update_access()
+            if self._store is not None:
+                self._store.touch_entries(MemoryType.PROCEDURAL, [entry])
         return entry
 
     def get_steps(self, skill_name: str) -> Optional[List[str]]:
@@ -442,14 +606,15 @@ class ProceduralMemory:
 
     def search_procedures(self, query: str, top_k: int = 5) -> List[MemoryEntry]:
         """Search procedures by keywords."""
+        self._ensure_loaded()
         query_words = set(query.lower().split())
         results = []
 
         for keyword in query_words:
             if keyword in self._skill_index:
                 for skill_name in self._skill_index[keyword]:
-                    if skill_name in self.procedures:
-                        entry = self.procedures[skill_name]
+                    if skill_name in self._procedures:
+                        entry = self._procedures[skill_name]
                         results.append(entry)
 
         # Deduplicate and sort by success rate
@@ -468,8 +633,8 @@ class ProceduralMemory:
 
     def update_success_rate(self, skill_name: str, success: bool):
         """Update success rate after execution."""
-        if skill_name in self.procedures:
-            entry = self.procedures[skill_name]
+        entry = self._get(skill_name)
+        if entry is not None:
             current_rate = entry.metadata.get("success_rate", 0.5)
             exec_count = entry.metadata.get("execution_count", 0)
 
@@ -480,11 +645,12 @@ class ProceduralMemory:
             entry.metadata["success_rate"] = new_rate
             entry.metadata["execution_count"] = exec_count + 1
             entry.importance = new_rate
+            self._persist(skill_name, entry)
 
     def add_step(self, skill_name: str, step: str, position: Optional[int] = None):
         """Add a step to an existing procedure."""
-        if skill_name in self.procedures:
-            entry = self.procedures[skill_name]
+        entry = self._get(skill_name)
+        if entry is not None:
             steps = entry.metadata.get("steps", [])
 
             if position is not None and 0 <= position <= len(steps):
@@ -495,6 +661,7 @@ class ProceduralMemory:
             entry.metadata["steps"] = steps
             entry.metadata["steps_count"] = len(steps)
             entry.content = "\n".join([f"{i+1}. {s}" for i, s in enumerate(steps)])
+            self._persist(skill_name, entry)
 
     def _update_skill_index(self, skill_name: str, steps: List[str]):
         """Update keyword index."""
@@ -532,11 +699,24 @@ class MemorySystem:
         self,
         agent_name: str = "Prometheus",
         max_episodic: int = 1000,
+        storage_path: Optional[str] = None,
     ):
+        """
+        Args:
+            agent_name: Name stored in core memory
+            max_episodic: Episodic capacity before pruning
+            storage_path: SQLite file for incremental persistence; memories
+                stored there are reloaded lazily on first recall
+        """
+        from .storage import MemoryStore  # storage imports this module
+
+        self.max_episodic = max_episodic
+        self.store: Optional[MemoryStore] = MemoryStore(storage_path) if storage_path else None
+
         # Initialize all memory subsystems
-        self.episodic = EpisodicMemory(max_entries=max_episodic)
-        self.semantic = SemanticMemory()
-        self.procedural = ProceduralMemory()
+        self.episodic = EpisodicMemory(max_entries=max_episodic, store=self.store)
+        self.semantic = SemanticMemory(store=self.store)
+        self.procedural = ProceduralMemory(store=self.store)
 
         # Core memory - persistent identity
         self.core: Dict[str, Any] = {
@@ -551,7 +731,7 @@ class MemorySystem:
         self.resource_cache: Dict[str, Any] = {}
 
         # Knowledge vault - consolidated long-term knowledge
-        self.knowledge_vault: List[MemoryEntry] = []
+        self._knowledge_vault: Optional[List[MemoryEntry]] = None if self.store else []
 
         # Stats
         self._stats = {
@@ -561,6 +741,37 @@ class MemorySystem:
             "consolidations": 0,
         }
 
+        if self.store is not None:
+            persisted_core = self.store.get_values("core")
+            if persisted_core:
+                self.core.update(persisted_core)
+            else:
+                self.store.replace_values("core", self.core)
+            self._stats.update(self.store.get_values("stats"))
+
+    @property
+    def knowledge_vault(self) -> List[MemoryEntry]:
+        """Consolidated entries (persisted ones are loaded on first access)."""
+        if self._knowledge_vault is None:
+            self._knowledge_vault = [
+                entry for _, entry in self.store.load_entries(MemoryType.KNOWLEDGE_VAULT)
+            ]
+        return self._knowledge_vault
+
+    @knowledge_vault.setter
+    def knowledge_vault(self, value: List[MemoryEntry]):
+        self._knowledge_vault = value
+
+    def _bump_stat(self, name: str):
+        self._stats[name] += 1
+        if self.store is not None:
+            self.store.set_value("stats", name, self._stats[name])
+
+    def close(self):
+        """Close the persistent store, if any."""
+        if self.store is not None:
+            self.store.close()
+
     # === Core Memory ===
 
     def get_identity(self) -> Dict[str, Any]:
@@ -570,6 +781,8 @@ class MemorySystem:
     def update_core(self, key: str, value: Any):
         """Update core memory value."""
         self.core[key] = value
+        if self.store is not None:
+            self.store.set_value("core", key, value)
 
     # === Episodic Memory Interface ===
 
@@ -591,7 +804,7 @@ class MemorySystem:
             context=context or {},
             importance=importance,
         )
-        self._stats["total_experiences"] += 1
+        self._bump_stat("total_experiences")
         return entry.id
 
     def recall_experiences(
@@ -626,7 +839,7 @@ class MemorySystem:
     ):
         """Learn a new fact."""
         self.semantic.store_fact(topic, fact, source, confidence)
-        self._stats["total_facts"] += 1
+        self._bump_stat("total_facts")
 
     def query_knowledge(self, topic: str) -> Optional[str]:
         """Query knowledge about a topic."""
@@ -652,7 +865,7 @@ class MemorySystem:
             steps=steps,
             preconditions=preconditions,
         )
-        self._stats["total_procedures"] += 1
+        self._bump_stat("total_procedures")
 
     def get_procedure(self, skill_name: str) -> Optional[List[str]]:
         """Get steps for a procedure."""
@@ -703,7 +916,7 @@ class MemorySystem:
         Moves high-value procedural knowledge and
         frequent patterns to long-term storage.
         """
-        consolidated = 0
+        consolidated = []
 
         # Consolidate high-success procedures
         for name, entry in self.procedural.procedures.items():
@@ -722,7 +935,7 @@ class MemorySystem:
                 # Avoid duplicates
                 if not any(v.id == vault_entry.id for v in self.knowledge_vault):
                     self.knowledge_vault.append(vault_entry)
-                    consolidated += 1
+                    consolidated.append(vault_entry)
 
         # Consolidate high-confidence facts
         for topic, entry in self.semantic.facts.items():
@@ -740,10 +953,12 @@ class MemorySystem:
 
                 if not any(v.id == vault_entry.id for v in self.knowledge_vault):
                     self.knowledge_vault.append(vault_entry)
-                    consolidated += 1
+                    consolidated.append(vault_entry)
 
-        self._stats["consolidations"] += 1
-        return consolidated
+        if consolidated and self.store is not None:
+            self.store.put_entries((entry, None) for entry in consolidated)
+        self._bump_stat("consolidations")
+        return len(consolidated)
 
     def query_vault(self, query: str, top_k: int = 5) -> List[dict]:
         """Query the knowledge vault."""
@@ -807,6 +1022,8 @@ class MemorySystem:
         """Import memory state from export."""
         if "core" in state:
             self.core.update(state["core"])
+            if self.store is not None:
+                self.store.replace_values("core", self.core)
 
         if "episodic" in state:
             self.episodic.import_entries(state["episodic"])
@@ -830,6 +1047,8 @@ class MemorySystem:
 
         if "stats" in state:
             self._stats.update(state["stats"])
+            if self.store is not None:
+                self.store.replace_values("stats", self._stats)
 
     def get_stats(self) -> dict:
         """Get memory system statistics."""
@@ -844,9 +1063,12 @@ class MemorySystem:
 
     def clear_all(self):
         """Clear all memories (use with caution)."""
-        self.episodic = EpisodicMemory()
-        self.semantic = SemanticMemory()
-        self.procedural = ProceduralMemory()
+        if self.store is not None:
+            self.store.clear()
+            self.store.replace_values("core", self.core)
+        self.episodic = EpisodicMemory(max_entries=self.max_episodic, store=self.store)
+        self.semantic = SemanticMemory(store=self.store)
+        self.procedural = ProceduralMemory(store=self.store)
         self.resource_cache = {}
         self.knowledge_vault = []
         self._stats = {
@@ -0,0 +1,238 @@
+"""
+Vectorized recall index for episodic memory.
+
+Entries are tokenized once, at store time, into sublinear-TF vectors over
+hashed features (stable CRC32 buckets, so memory stays bounded whatever
+the vocabulary). Each feature keeps a posting list of (row, weight) pairs:
+the columns of a sparse document-term matrix. A query is one sparse
+matrix-vector product - gather the postings of its features, scale by
+IDF, accumulate with numpy.bincount - followed by argpartition top-k over
+the combined similarity/relevance score.
+
+IDF is applied on the query side (df = posting length), so stored vectors
+never need reweighting as the corpus grows. Removed rows are tombstoned
+and postings are compacted once tombstones dominate.
+
+Falls back to pure-Python accumulation when numpy is unavailable.
+"""
+
+import heapq
+import math
+import re
+import time
+import zlib
+from array import array
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+
+HASH_BITS = 20
+_HASH_MASK = (1 << HASH_BITS) - 1
+_TOKEN_RE = re.compile(r"\b\w+\b")
+_DAY = 86400.0
+
+# Compact once tombstoned rows outnumber live ones (and there are enough to matter)
+_COMPACT_MIN_DEAD = 1024
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def hashed_features(tokens: List[str]) -> Dict[int, float]:
+    """Sublinear term frequency per hashed feature, L2-normalized."""
+    counts = Counter(zlib.crc32(t.encode("utf-8")) & _HASH_MASK for t in tokens)
+    weights = {f: 1.0 + math.log(c) for f, c in counts.items()}
+    norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+    return {f: w / norm for f, w in weights.items()}
+
+
+class _Postings:
+    """Rows containing one feature, with their weights (growable C arrays)."""
+
+    __slots__ = ("rows", "weights")
+
+    def __init__(self):
+        self.rows = array("i")
+        self.weights = array("f")
+
+
+class RecallIndex:
+    """
+    Similarity + relevance ranking over keyed texts.
+
+    Scores match EpisodicMemory's ranking: 0.6 * similarity + 0.4 * relevance,
+    where relevance mirrors MemoryEntry.compute_relevance (importance and
+    exponential decay on whole days since last access). Only rows sharing at
+    least one feature with the query are candidates.
+    """
+
+    def __init__(self, similarity_weight: float = 0.6, recency_weight: float = 0.3):
+        self.similarity_weight = similarity_weight
+        self.recency_weight = recency_weight
+
+        self._postings: Dict[int, _Postings] = {}
+        self._keys: List[Optional[str]] = []  # row -> key (None once removed)
+        self._rows: Dict[str, int] = {}  # key -> row
+        self._importance = array("d")
+        self._accessed = array("d")  # POSIX timestamps
+        self._alive = array("b")
+        self._dead = 0
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._rows
+
+    def add(self, key: str, text: str, importance: float, accessed_at: float) -> None:
+        """Index a text under `key` (replaces an existing key)."""
+        if key in self._rows:
+            self.remove(key)
+
+        row = len(self._keys)
+        self._keys.append(key)
+        self._rows[key] = row
+        self._importance.append(importance)
+        self._accessed.append(accessed_at)
+        self._alive.append(1)
+
+        for feature, weight in hashed_features(tokenize(text)).items():
+            postings = self._postings.get(feature)
+            if postings is None:
+                postings = self._postings[feature] = _Postings()
+            postings.rows.append(row)
+            postings.weights.append(weight)
+
+    def remove(self, key: str) -> None:
+        """Drop a key (tombstoned until the next compaction)."""
+        row = self._rows.pop(key, None)
+        if row is None:
+            return
+        self._keys[row] = None
+        self._alive[row] = 0
+        self._dead += 1
+        if self._dead > _COMPACT_MIN_DEAD and self._dead > len(self._rows):
+            self._compact()
+
+    def touch(self, key: str, accessed_at: float) -> None:
+        """Record an access (feeds the recency term)."""
+        row = self._rows.get(key)
+        if row is not None:
+            self._accessed[row] = accessed_at
+
+    def search(
+        self, query: str, top_k: int = 5, min_score: float = 0.0, now: Optional[float] = None
+    ) -> List[Tuple[float, str]]:
+        """Return up to top_k (score, key) pairs, best first."""
+        if top_k <= 0 or not self._rows:
+            return []
+        query_vector = self._query_vector(query)
+        if not query_vector:
+            return []
+        now = time.time() if now is None else now
+        if NUMPY_AVAILABLE:
+            return self._search_numpy(query_vector, top_k, min_score, now)
+        return self._search_python(query_vector, top_k, min_score, now)
+
+    def _query_vector(self, query: str) -> Dict[int, float]:
+        """Query features weighted by smoothed IDF, L2-normalized; unknown features dropped."""
+        n_rows = len(self._keys)
+        weights = {}
+        for feature, tf in hashed_features(tokenize(query)).items():
+            postings = self._postings.get(feature)
+            if postings is not None and len(postings.rows):
+                idf = math.log((1 + n_rows) / (1 + len(postings.rows))) + 1.0
+                weights[feature] = tf * idf
+        norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+        return {f: w / norm for f, w in weights.items()}
+
+    def _search_numpy(self, query_vector, top_k, min_score, now):
+        rows, weights = [], []
+        for feature, query_weight in query_vector.items():
+            postings = self._postings[feature]
+            rows.append(np.frombuffer(postings.rows, dtype=np.int32))
+            weights.append(np.multiply(
+                np.frombuffer(postings.weights, dtype=np.float32), query_weight, dtype=np.float64
+            ))
+
+        similarity = np.bincount(
+            np.concatenate(rows), weights=np.concatenate(weights), minlength=len(self._keys)
+        )
+        alive = np.frombuffer(self._alive, dtype=np.int8).astype(bool)
+        candidates = np.flatnonzero((similarity > 0) & alive)
+        if not len(candidates):
+            return []
+
+        importance = np.frombuffer(self._importance, dtype=np.float64)[candidates]
+        days = np.floor((now - np.frombuffer(self._accessed, dtype=np.float64)[candidates]) / _DAY)
+        relevance = (1 - self.recency_weight) * importance + self.recency_weight * np.exp(-0.1 * days)
+        scores = self.similarity_weight * similarity[candidates] + (1 - self.similarity_weight) * relevance
+
+        keep = scores >= min_score
+        candidates, scores = candidates[keep], scores[keep]
+        if len(scores) > top_k:
+            kth = -np.partition(-scores, top_k - 1)[top_k - 1]
+            above = np.flatnonzero(scores > kth)
+            # Candidates are in row order, so boundary ties keep insertion order
+            tied = np.flatnonzero(scores == kth)[:top_k - len(above)]
+            best = np.concatenate((above, tied))
+            candidates, scores = candidates[best], scores[best]
+        order = np.lexsort((candidates, -scores))  # Score desc, then insertion order
+        return [(float(scores[i]), self._keys[candidates[i]]) for i in order]
+
+    def _search_python(self, query_vector, top_k, min_score, now):
+        similarity: Dict[int, float] = {}
+        for feature, query_weight in query_vector.items():
+            postings = self._postings[feature]
+            for row, weight in zip(postings.rows, postings.weights):
+                if self._alive[row]:
+                    similarity[row] = similarity.get(row, 0.0) + weight * query_weight
+
+        scored = []
+        for row, sim in similarity.items():
+            days = math.floor((now - self._accessed[row]) / _DAY)
+            relevance = ((1 - self.recency_weight) * self._importance[row]
+                         + self.recency_weight * math.exp(-0.1 * days))
+            score = self.similarity_weight * sim + (1 - self.similarity_weight) * relevance
+            if score >= min_score:
+                scored.append((score, -row))
+        return [(score, self._keys[-neg_row]) for score, neg_row in heapq.nlargest(top_k, scored)]
+
+    def _compact(self) -> None:
+        """Renumber live rows densely and drop tombstoned postings."""
+        remap = array("i", [-1]) * len(self._keys)
+        keys: List[Optional[str]] = []
+        importance, accessed = array("d"), array("d")
+        for row, key in enumerate(self._keys):
+            if key is not None:
+                remap[row] = len(keys)
+                keys.append(key)
+                importance.append(self._importance[row])
+                accessed.append(self._accessed[row])
+
+        postings_by_feature: Dict[int, _Postings] = {}
+        for feature, postings in self._postings.items():
+            compacted = _Postings()
+            for row, weight in zip(postings.rows, postings.weights):
+                if remap[row] >= 0:
+                    compacted.rows.append(remap[row])
+                    compacted.weights.append(weight)
+            if len(compacted.rows):
+                postings_by_feature[feature] = compacted
+
+        self._postings = postings_by_feature
+        self._keys = keys
+        self._rows = {key: row for row, key in enumerate(keys)}
+        self._importance = importance
+        self._accessed = accessed
+        self._alive = array("b", [1]) * len(keys)
+        self._dead = 0
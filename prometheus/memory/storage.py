@@ -0,0 +1,219 @@
+"""
+Persistent storage for the memory system (SQLite, WAL mode).
+
+Every store/update is written through as its own small transaction, so a
+crash loses at most the write in flight and never corrupts earlier ones.
+WAL lets any number of readers (threads or other processes) query the
+database while one writer appends. Each thread gets its own connection.
+
+Layout:
+    entries  one row per memory entry, keyed by (type, id); `key` holds the
+             topic / skill name for semantic and procedural memories
+    kv       small namespaced JSON values (core identity, relations, stats)
+"""
+
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .memory_system import MemoryEntry, MemoryType
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    type TEXT NOT NULL,
+    id TEXT NOT NULL,
+    key TEXT,
+    content TEXT NOT NULL,
+    metadata TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    access_count INTEGER NOT NULL,
+    importance REAL NOT NULL,
+    tags TEXT NOT NULL,
+    PRIMARY KEY (type, id)
+);
+CREATE INDEX IF NOT EXISTS entries_by_key ON entries (type, key);
+CREATE TABLE IF NOT EXISTS kv (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (namespace, key)
+);
+"""
+
+_COLUMNS = "type, id, key, content, metadata, created_at, accessed_at, access_count, importance, tags"
+
+
+def _to_row(entry: MemoryEntry, key: Optional[str]) -> Tuple:
+    return (
+        entry.type.value, entry.id, key, entry.content,
+        json.dumps(entry.metadata, default=str),
+        entry.created_at.timestamp(), entry.accessed_at.timestamp(),
+        entry.access_count, entry.importance, json.dumps(entry.tags),
+    )
+
+
+def _from_row(row: Tuple) -> MemoryEntry:
+    type_, id_, _, content, metadata, created, accessed, count, importance, tags = row
+    return MemoryEntry(
+        id=id_,
+        type=MemoryType(type_),
+        content=content,
+        metadata=json.loads(metadata),
+        created_at=datetime.fromtimestamp(created),
+        accessed_at=datetime.fromtimestamp(accessed),
+        access_count=count,
+        importance=importance,
+        tags=json.loads(tags),
+    )
+
+
+class MemoryStore:
+    """SQLite-backed persistence used by MemorySystem and its subsystems."""
+
+    def __init__(self, path: str, synchronous: str = "NORMAL"):
+        """
+        Args:
+            path: Database file (created if missing)
+            synchronous: SQLite synchronous level; NORMAL survives process
+                crashes, FULL also survives power loss at a per-write fsync
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._synchronous = synchronous
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+
+        conn = self._conn()
+        conn.executescript(_SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        """Connection for the calling thread."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Used only by its own thread; check_same_thread=False just lets close() run anywhere
+            conn = sqlite3.connect(
+                self.path, timeout=30.0, isolation_level=None, check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(f"PRAGMA synchronous={self._synchronous}")
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    # === Entries ===
+
+    def put_entry(self, entry: MemoryEntry, key: Optional[str] = None) -> None:
+        """Insert or replace one entry."""
+        self._conn().execute(
+            f"INSERT OR REPLACE INTO entries ({_COLUMNS}) VALUES (?,?,?,?,?,?,?,?,?,?)",
+            _to_row(entry, key),
+        )
+
+    def put_entries(self, entries: Iterable[Tuple[MemoryEntry, Optional[str]]]) -> None:
+        """Insert or replace many entries in one transaction."""
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN")
+            conn.executemany(
+                f"INSERT OR REPLACE INTO entries ({_COLUMNS}) VALUES (?,?,?,?,?,?,?,?,?,?)",
+                (_to_row(entry, key) for entry, key in entries),
+            )
+
+    def touch_entries(self, type_: MemoryType, entries: Iterable[MemoryEntry]) -> None:
+        """Persist access time/count updates."""
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN")
+            conn.executemany(
+                "UPDATE entries SET accessed_at = ?, access_count = ? WHERE type = ? AND id = ?",
+                ((e.accessed_at.timestamp(), e.access_count, type_.value, e.id) for e in entries),
+            )
+
+    def delete_entries(self, type_: MemoryType, ids: Iterable[str]) -> None:
+        """Delete entries by id."""
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN")
+            conn.executemany(
+                "DELETE FROM entries WHERE type = ? AND id = ?",
+                ((type_.value, entry_id) for entry_id in ids),
+            )
+
+    def load_entries(self, type_: MemoryType) -> List[Tuple[Optional[str], MemoryEntry]]:
+        """All (key, entry) pairs of one memory type, oldest first."""
+        rows = self._conn().execute(
+            f"SELECT {_COLUMNS} FROM entries WHERE type = ? ORDER BY created_at, rowid",
+            (type_.value,),
+        )
+        return [(row[2], _from_row(row)) for row in rows]
+
+    def get_entry(self, type_: MemoryType, key: str) -> Optional[MemoryEntry]:
+        """The most recent entry of a type stored under `key`."""
+        row = self._conn().execute(
+            f"SELECT {_COLUMNS} FROM entries WHERE type = ? AND key = ? ORDER BY rowid DESC LIMIT 1",
+            (type_.value, key),
+        ).fetchone()
+        return _from_row(row) if row else None
+
+    def count_entries(self, type_: MemoryType) -> int:
+        """Number of stored entries of a type."""
+        return self._conn().execute(
+            "SELECT COUNT(*) FROM entries WHERE type = ?", (type_.value,)
+        ).fetchone()[0]
+
+    # === Key/value ===
+
+    def set_value(self, namespace: str, key: str, value: Any) -> None:
+        """Store a JSON value."""
+        self._conn().execute(
+            "INSERT OR REPLACE INTO kv (namespace, key, value) VALUES (?, ?, ?)",
+            (namespace, key, json.dumps(value, default=str)),
+        )
+
+    def replace_values(self, namespace: str, values: Dict[str, Any]) -> None:
+        """Replace a whole namespace in one transaction."""
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN")
+            conn.execute("DELETE FROM kv WHERE namespace = ?", (namespace,))
+            conn.executemany(
+                "INSERT INTO kv (namespace, key, value) VALUES (?, ?, ?)",
+                ((namespace, key, json.dumps(value, default=str)) for key, value in values.items()),
+            )
+
+    def get_values(self, namespace: str) -> Dict[str, Any]:
+        """All values of a namespace."""
+        rows = self._conn().execute("SELECT key, value FROM kv WHERE namespace = ?", (namespace,))
+        return {key: json.loads(value) for key, value in rows}
+
+    # === Maintenance ===
+
+    def clear(self) -> None:
+        """Delete everything."""
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN")
+            conn.execute("DELETE FROM entries")
+            conn.execute("DELETE FROM kv")
+
+    def checkpoint(self) -> None:
+        """Fold the WAL back into the main database file."""
+        self._conn().execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def close(self) -> None:
+        """Close every thread's connection."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.ProgrammingError:
+                pass  # Owned by another, already finished thread
+        self._local = threading.local()
@@ -2,15 +2,18 @@
 PROMETHEUS Sandbox Module.
 
 Secure code execution environment inspired by E2B (e2b.dev):
-- Isolated Python execution
+- Isolated Python execution (warm interpreter pool)
 - Timeout protection
 - Resource limits
 - Output capture
 """
 
-from .executor import SandboxExecutor, SandboxResult
+from .executor import SandboxExecutor, SandboxResult, SandboxConfig
+from .pool import InterpreterPool
 
 __all__ = [
     "SandboxExecutor",
     "SandboxResult",
+    "SandboxConfig",
+    "InterpreterPool",
 ]
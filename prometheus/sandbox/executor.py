@@ -2,11 +2,11 @@
 Sandbox Executor for PROMETHEUS.
 
 Secure Python code execution environment inspired by E2B (e2b.dev):
-- Isolated execution using subprocess
+- Isolated execution in warm worker processes (or one subprocess per call)
 - Timeout protection
 - Resource limits
 - Output capture (stdout, stderr)
-- Support for async execution
+- Support for async and batched execution
 """
 
 import os
@@ -18,6 +18,8 @@ from typing import Optional, Dict, Any, List
 from datetime import datetime
 import json
 
+from .pool import InterpreterPool, WorkerResult, POOL_AVAILABLE
+
 
 @dataclass
 class SandboxResult:
@@ -58,6 +60,9 @@ class SandboxConfig:
         "subprocess", "shutil", "socket", "http", "ftplib",
         "smtplib", "telnetlib", "ctypes", "multiprocessing",
     ])
+    use_pool: bool = True  # Warm interpreter pool instead of a process per call
+    pool_size: int = 2
+    max_executions_per_worker: int = 100
 
 
 class SandboxExecutor:
@@ -74,6 +79,27 @@ class SandboxExecutor:
     def __init__(self, config: Optional[SandboxConfig] = None):
         self.config = config or SandboxConfig()
         self.execution_history: List[SandboxResult] = []
+        self._pool: Optional[InterpreterPool] = None
+
+    @property
+    def pool(self) -> Optional[InterpreterPool]:
+        """Warm interpreter pool (started on first use), or None if disabled/unsupported."""
+        if self._pool is None and self.config.use_pool and POOL_AVAILABLE:
+            self._pool = InterpreterPool(
+                size=self.config.pool_size,
+                max_executions=self.config.max_executions_per_worker,
+                max_memory_mb=self.config.max_memory_mb,
+                max_output_size=self.config.max_output_size,
+                preload=self.config.allowed_imports + ["urllib.parse", "traceback"],
+            )
+            self._pool.start()
+        return self._pool
+
+    def close(self):
+        """Stop pool workers."""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
 
     async def execute(
         self,
@@ -110,7 +136,71 @@ class SandboxExecutor:
         if capture_return:
             code = self._wrap_code_for_return(code)
 
-        # Create temporary file
+        pool = self.pool
+        if pool is not None:
+            loop = asyncio.get_running_loop()
+            raw = await loop.run_in_executor(None, pool.run, code, timeout)
+        else:
+            raw = await self._run_subprocess(code, timeout)
+
+        result = self._to_result(raw, capture_return, timeout, start_time)
+        self.execution_history.append(result)
+        return result
+
+    async def execute_batch(
+        self,
+        codes: List[str],
+        timeout: Optional[float] = None,
+        capture_return: bool = True,
+    ) -> List[SandboxResult]:
+        """
+        Execute many snippets, in one worker round-trip when pooled.
+
+        Each snippet still runs in its own fresh namespace with its own
+        timeout; results are returned in input order.
+
+        Args:
+            codes: Python snippets to execute
+            timeout: Optional per-snippet timeout override
+            capture_return: Whether to capture each last expression's value
+
+        Returns:
+            One SandboxResult per snippet
+        """
+        pool = self.pool
+        if pool is None:
+            return [await self.execute(code, timeout, capture_return) for code in codes]
+
+        timeout = timeout or self.config.timeout
+        start_time = datetime.now()
+        results: List[Optional[SandboxResult]] = [None] * len(codes)
+        runnable, indexes = [], []
+
+        for i, code in enumerate(codes):
+            validation_error = self._validate_code(code)
+            if validation_error:
+                results[i] = SandboxResult(
+                    success=False,
+                    stdout="",
+                    stderr=validation_error,
+                    error_type="ValidationError",
+                    error_message=validation_error,
+                )
+            else:
+                runnable.append(self._wrap_code_for_return(code) if capture_return else code)
+                indexes.append(i)
+
+        if runnable:
+            loop = asyncio.get_running_loop()
+            raws = await loop.run_in_executor(None, pool.run_batch, runnable, timeout)
+            for i, raw in zip(indexes, raws):
+                results[i] = self._to_result(raw, capture_return, timeout, start_time)
+                self.execution_history.append(results[i])
+
+        return results
+
+    async def _run_subprocess(self, code: str, timeout: float) -> WorkerResult:
+        """Run code in a fresh interpreter process (used when the pool is off)."""
         with tempfile.NamedTemporaryFile(
             mode='w',
             suffix='.py',
@@ -120,7 +210,6 @@ class SandboxExecutor:
             temp_file = f.name
 
         try:
-            # Execute in subprocess
             process = await asyncio.create_subprocess_exec(
                 sys.executable, temp_file,
                 stdout=asyncio.subprocess.PIPE,
@@ -133,62 +222,71 @@ class SandboxExecutor:
                     process.communicate(),
                     timeout=timeout
                 )
-
-                stdout = stdout_bytes.decode('utf-8', errors='replace')
-                stderr = stderr_bytes.decode('utf-8', errors='replace')
-
-                # Truncate if too long
-                if len(stdout) > self.config.max_output_size:
-                    stdout = stdout[:self.config.max_output_size] + "\n...[truncated]"
-                if len(stderr) > self.config.max_output_size:
-                    stderr = stderr[:self.config.max_output_size] + "\n...[truncated]"
-
-                # Extract return value if present
-                return_value = None
-                if capture_return and "__SANDBOX_RETURN__:" in stdout:
-                    try:
-                        return_line = [l for l in stdout.split('\n') if "__SANDBOX_RETURN__:" in l][-1]
-                        return_json = return_line.split("__SANDBOX_RETURN__:")[1].strip()
-                        return_value = json.loads(return_json)
-                        # Remove return line from stdout
-                        stdout = stdout.replace(return_line, "").strip()
-                    except (json.JSONDecodeError, IndexError):
-                        pass
-
-                execution_time = (datetime.now() - start_time).total_seconds()
-
-                result = SandboxResult(
-                    success=process.returncode == 0,
-                    stdout=stdout,
-                    stderr=stderr,
-                    return_value=return_value,
-                    execution_time=execution_time,
-                    error_type="RuntimeError" if process.returncode != 0 else None,
-                    error_message=stderr if process.returncode != 0 else None,
-                )
-
             except asyncio.TimeoutError:
                 process.kill()
                 await process.wait()
+                return WorkerResult(stdout="", stderr="", returncode=-9, timed_out=True)
 
-                result = SandboxResult(
-                    success=False,
-                    stdout="",
-                    stderr=f"Execution timed out after {timeout} seconds",
-                    execution_time=timeout,
-                    error_type="TimeoutError",
-                    error_message=f"Code execution exceeded {timeout}s limit",
-                )
-
+            return WorkerResult(
+                stdout=stdout_bytes.decode('utf-8', errors='replace'),
+                stderr=stderr_bytes.decode('utf-8', errors='replace'),
+                returncode=process.returncode,
+            )
         finally:
-            # Clean up temp file
             try:
                 os.unlink(temp_file)
             except OSError:
                 pass
 
-        self.execution_history.append(result)
-        return result
+    def _to_result(
+        self,
+        raw: WorkerResult,
+        capture_return: bool,
+        timeout: float,
+        start_time: datetime,
+    ) -> SandboxResult:
+        """Build a SandboxResult from raw process output."""
+        if raw.timed_out:
+            return SandboxResult(
+                success=False,
+                stdout="",
+                stderr=f"Execution timed out after {timeout} seconds",
+                execution_time=timeout,
+                error_type="TimeoutError",
+                error_message=f"Code execution exceeded {timeout}s limit",
+            )
+
+        stdout, stderr = raw.stdout, raw.stderr
+
+        # Truncate if too long
+        if len(stdout) > self.config.max_output_size:
+            stdout = stdout[:self.config.max_output_size] + "\n...[truncated]"
+        if len(stderr) > self.config.max_output_size:
+            stderr = stderr[:self.config.max_output_size] + "\n...[truncated]"
+
+        # Extract return value if present
+        return_value = None
+        if capture_return and "__SANDBOX_RETURN__:" in stdout:
+            try:
+                return_line = [l for l in stdout.split('\n') if "__SANDBOX_RETURN__:" in l][-1]
+                return_json = return_line.split("__SANDBOX_RETURN__:")[1].strip()
+                return_value = json.loads(return_json)
+                # Remove return line from stdout
+                stdout = stdout.replace(return_line, "").strip()
+            except (json.JSONDecodeError, IndexError):
+                pass
+
+        execution_time = (datetime.now() - start_time).total_seconds()
+
+        return SandboxResult(
+            success=raw.returncode == 0,
+            stdout=stdout,
+            stderr=stderr,
+            return_value=return_value,
+            execution_time=execution_time,
+            error_type="RuntimeError" if raw.returncode != 0 else None,
+            error_message=stderr if raw.returncode != 0 else None,
+        )
 
     async def execute_function(
         self,
@@ -323,6 +421,7 @@ print(f"__SANDBOX_RETURN__:{{_json.dumps(__result__)}}")
         passed = 0
         failed = 0
 
+        test_codes = []
         for i, test in enumerate(test_cases):
             # Build test code
             test_code = f"""
@@ -341,9 +440,12 @@ else:
 __passed__ = __result__ == __expected__
 print(f"__SANDBOX_RETURN__:{{json.dumps({{'passed': __passed__, 'result': __result__, 'expected': __expected__}})}}")
 """
+            test_codes.append(test_code)
 
-            result = await self.execute(test_code, capture_return=True)
+        # All cases in one worker round-trip
+        batch = await self.execute_batch(test_codes, capture_return=True)
 
+        for i, result in enumerate(batch):
             if result.success and result.return_value:
                 if result.return_value.get('passed'):
                     passed += 1
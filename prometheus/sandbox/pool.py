@@ -0,0 +1,303 @@
+"""
+Warm interpreter pool for the sandbox.
+
+Starting `python` for every snippet costs 30-80 ms of interpreter startup
+and imports. The pool keeps a few long-lived worker processes (see
+worker.py) that have already imported the allowed modules and applied
+resource limits, and sends them code over a pipe:
+
+- Each snippet runs in a fresh namespace, in a process forked from a warm
+  worker that exits afterwards, so no state leaks between snippets
+- Workers are recycled after `max_executions` snippets, or when they die
+- A batch runs many snippets in one round-trip to one worker
+
+The pool is thread-safe and blocking; SandboxExecutor calls it from a
+thread so that it works from any event loop.
+"""
+
+import json
+import os
+import select
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+try:
+    import resource  # noqa: F401 - only needed by the worker, checked here
+    POOL_AVAILABLE = sys.platform != "win32"
+except ImportError:  # pragma: no cover - non-POSIX
+    POOL_AVAILABLE = False
+
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "worker.py")
+STARTUP_TIMEOUT = 30.0  # seconds for a new worker to warm up
+KILL_GRACE = 1.0  # seconds past the in-worker timeout before the parent kills it
+
+_HEADER = struct.Struct(">I")
+
+
+class WorkerError(Exception):
+    """A worker died or stopped responding."""
+
+
+@dataclass
+class WorkerResult:
+    """Raw outcome of one snippet."""
+    stdout: str
+    stderr: str
+    returncode: int
+    timed_out: bool = False
+    elapsed: float = 0.0
+
+
+class _Worker:
+    """One warm interpreter process."""
+
+    def __init__(self, config: Dict[str, Any], cwd: str):
+        self.proc = subprocess.Popen(
+            [sys.executable, WORKER_SCRIPT, json.dumps(config)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            cwd=cwd,
+        )
+        self.executions = 0
+        self.ready = False
+        self._buffer = b""
+
+    def send(self, message: Dict[str, Any]) -> None:
+        data = json.dumps(message).encode("utf-8")
+        try:
+            self.proc.stdin.write(_HEADER.pack(len(data)) + data)
+            self.proc.stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            raise WorkerError(f"Worker pipe closed: {e}") from e
+
+    def receive(self, timeout: float) -> Dict[str, Any]:
+        """Read one message, waiting at most `timeout` seconds."""
+        deadline = time.monotonic() + timeout
+        header = self._read_exact(_HEADER.size, deadline)
+        (length,) = _HEADER.unpack(header)
+        return json.loads(self._read_exact(length, deadline))
+
+    def wait_ready(self) -> None:
+        if not self.ready:
+            message = self.receive(STARTUP_TIMEOUT)
+            if not message.get("ready"):
+                raise WorkerError(f"Unexpected worker handshake: {message}")
+            self.ready = True
+
+    def _read_exact(self, size: int, deadline: float) -> bytes:
+        fd = self.proc.stdout.fileno()
+        while len(self._buffer) < size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError("Worker did not respond in time")
+            readable, _, _ = select.select([fd], [], [], remaining)
+            if not readable:
+                continue
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                try:
+                    code = self.proc.wait(timeout=1.0)
+                except subprocess.TimeoutExpired:
+                    code = None
+                raise WorkerError(f"Worker exited (code {code})")
+            self._buffer += chunk
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+    def kill(self) -> None:
+        if self.proc.poll() is None:
+            self.proc.kill()
+        self.proc.wait()
+        for stream in (self.proc.stdin, self.proc.stdout):
+            try:
+                stream.close()
+            except OSError:
+                pass
+
+
+class InterpreterPool:
+    """
+    Pool of pre-started, pre-warmed Python worker processes.
+
+    Example:
+        pool = InterpreterPool(size=2)
+        pool.start()
+        result = pool.run("print(1 + 1)", timeout=5)
+        results = pool.run_batch(["x = 1", "print(2)"], timeout=5)
+        pool.close()
+    """
+
+    def __init__(
+        self,
+        size: int = 2,
+        max_executions: int = 100,
+        max_memory_mb: Optional[int] = 512,
+        max_output_size: int = 100000,
+        preload: Sequence[str] = (),
+        cwd: Optional[str] = None,
+    ):
+        """
+        Args:
+            size: Maximum number of worker processes
+            max_executions: Snippets a worker runs before it is replaced
+            max_memory_mb: RLIMIT_AS per worker (None for no limit)
+            max_output_size: stdout/stderr characters kept per snippet
+            preload: Modules imported by each worker before it reports ready
+            cwd: Working directory of the workers (default: system temp dir)
+        """
+        if not POOL_AVAILABLE:
+            raise RuntimeError("InterpreterPool requires a POSIX platform")
+        self.size = size
+        self.max_executions = max_executions
+        self.cwd = cwd or tempfile.gettempdir()
+        self._config = {
+            "max_memory_mb": max_memory_mb,
+            "max_output": max_output_size,
+            "preload": list(preload),
+        }
+
+        self._idle: List[_Worker] = []
+        self._live = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._stats = {"executions": 0, "spawned": 0, "recycled": 0, "crashed": 0}
+
+    def start(self) -> None:
+        """Start every worker now instead of on first use."""
+        while True:
+            with self._cond:
+                if self._closed or self._live >= self.size:
+                    return
+                self._live += 1
+            worker = self._spawn()
+            with self._cond:
+                self._idle.append(worker)
+                self._cond.notify()
+
+    def run(self, code: str, timeout: float) -> WorkerResult:
+        """Execute one snippet."""
+        return self.run_batch([code], timeout)[0]
+
+    def run_batch(self, codes: Sequence[str], timeout: float) -> List[WorkerResult]:
+        """
+        Execute snippets in order, in as few worker round-trips as possible.
+
+        `timeout` applies to each snippet. If a worker dies or has to be
+        recycled mid-batch, the remaining snippets continue on another one.
+        """
+        results: List[WorkerResult] = []
+        while len(results) < len(codes):
+            worker = self._acquire()
+            reusable = False
+            try:
+                results.extend(self._run_on(worker, codes[len(results):], timeout))
+                reusable = worker.executions < self.max_executions and worker.proc.poll() is None
+            finally:
+                self._release(worker, reusable)
+        return results
+
+    def _run_on(self, worker: _Worker, codes: Sequence[str], timeout: float) -> List[WorkerResult]:
+        """Run as many snippets as this worker survives; a short list means it was retired."""
+        results = []
+        try:
+            worker.wait_ready()
+            worker.send({"items": [{"code": code, "timeout": timeout} for code in codes]})
+            for _ in codes:
+                message = worker.receive(timeout + KILL_GRACE)
+                worker.executions += 1
+                results.append(WorkerResult(
+                    stdout=message["stdout"],
+                    stderr=message["stderr"],
+                    returncode=message["returncode"],
+                    timed_out=message["timed_out"],
+                    elapsed=message["elapsed"],
+                ))
+                if message["crashed"]:
+                    # Only the snippet's process died; the worker carries on
+                    with self._cond:
+                        self._stats["crashed"] += 1
+        except TimeoutError:
+            # Worker did not even kill an overrunning snippet in time
+            worker.executions = self.max_executions
+            results.append(WorkerResult(
+                stdout="", stderr=f"Execution timed out after {timeout} seconds",
+                returncode=-9, timed_out=True, elapsed=timeout,
+            ))
+        except WorkerError as e:
+            # The worker itself died (e.g. a snippet killed its parent)
+            worker.executions = self.max_executions
+            with self._cond:
+                self._stats["crashed"] += 1
+            results.append(WorkerResult(stdout="", stderr=str(e), returncode=worker.proc.poll() or 1))
+        finally:
+            with self._cond:
+                self._stats["executions"] += len(results)
+        return results
+
+    def _spawn(self) -> _Worker:
+        try:
+            worker = _Worker(self._config, self.cwd)
+        except BaseException:
+            with self._cond:
+                self._live -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._stats["spawned"] += 1
+        return worker
+
+    def _acquire(self) -> _Worker:
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Interpreter pool is closed")
+                if self._idle:
+                    return self._idle.pop()
+                if self._live < self.size:
+                    self._live += 1
+                    break
+                self._cond.wait()
+        return self._spawn()
+
+    def _release(self, worker: _Worker, reusable: bool) -> None:
+        if reusable:
+            with self._cond:
+                if not self._closed:
+                    self._idle.append(worker)
+                    self._cond.notify()
+                    return
+        worker.kill()
+        with self._cond:
+            if self._closed:
+                self._live -= 1
+                self._cond.notify()
+                return
+            self._stats["recycled"] += 1
+        # Replace right away so the next caller finds a warm (or warming) worker
+        replacement = self._spawn()
+        with self._cond:
+            self._idle.append(replacement)
+            self._cond.notify()
+
+    def close(self) -> None:
+        """Stop all idle workers; busy ones stop when released."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._live -= len(idle)
+            self._cond.notify_all()
+        for worker in idle:
+            worker.kill()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Pool counters."""
+        with self._cond:
+            return {**self._stats, "live": self._live, "idle": len(self._idle), "size": self.size}
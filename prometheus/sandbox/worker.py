@@ -0,0 +1,248 @@
+"""
+Warm sandbox worker process.
+
+Started by InterpreterPool as `python worker.py <config-json>`; it must stay
+importable with the standard library alone, since it runs as a plain script
+outside the package.
+
+Protocol (both directions): 4-byte big-endian length + UTF-8 JSON.
+    worker -> parent  {"ready": true} once warmed up
+    parent -> worker  {"items": [{"code": str, "timeout": float}, ...]}
+    worker -> parent  one {"stdout", "stderr", "returncode", "timed_out",
+                      "crashed", "elapsed"} message per item
+
+The worker is a zygote: it warms up once and never runs snippet code
+itself. Each item runs in a child forked from it, in a fresh `__main__`
+namespace with captured stdout/stderr, and the child exits afterwards. No
+patched module, builtin, environ, cwd or thread can outlive its snippet, and
+nothing in the child can reach the zygote's state.
+
+Wall-clock timeouts are raised inside the snippet (SIGALRM); the zygote
+kills a child that overruns them anyway. The CPU and address-space rlimits
+kill only the child, which is reported as crashed.
+"""
+
+import builtins
+import io
+import json
+import os
+import select
+import signal
+import struct
+import sys
+import time
+import traceback
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - non-POSIX
+    resource = None
+
+try:
+    from _json import encode_basestring_ascii as _quote
+except ImportError:  # pragma: no cover - pure-Python json
+    from json.encoder import py_encode_basestring_ascii as _quote
+
+_HEADER = struct.Struct(">I")
+
+# Seconds past the snippet timeout before the zygote kills the child
+# (must stay below the parent's KILL_GRACE)
+_KILL_GRACE = 0.5
+
+
+class _SandboxTimeout(BaseException):
+    """Raised in the snippet when its wall-clock budget runs out (not an Exception, so bare handlers miss it)."""
+
+
+def _read_message(stream):
+    header = stream.read(_HEADER.size)
+    if len(header) < _HEADER.size:
+        return None
+    (length,) = _HEADER.unpack(header)
+    return json.loads(stream.read(length))
+
+
+def _encode(message):
+    """JSON for flat str/bool/int/float dicts, without going through the (patchable) json module."""
+    fields = []
+    for key, value in message.items():
+        if isinstance(value, str):
+            encoded = _quote(value)
+        elif isinstance(value, bool):
+            encoded = "true" if value else "false"
+        else:
+            encoded = repr(value)
+        fields.append(f"{_quote(key)}: {encoded}")
+    return "{" + ", ".join(fields) + "}"
+
+
+def _write_message(stream, message):
+    data = _encode(message).encode("utf-8")
+    stream.write(_HEADER.pack(len(data)) + data)
+    stream.flush()
+
+
+def _truncate(text, limit):
+    if len(text) > limit:
+        return text[:limit] + "\n...[truncated]"
+    return text
+
+
+def _on_alarm(signum, frame):
+    raise _SandboxTimeout()
+
+
+def _limit_cpu(seconds):
+    """Let the process use at most `seconds` more CPU before SIGXCPU kills it."""
+    if resource is None:
+        return
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    soft = int(usage.ru_utime + usage.ru_stime + seconds) + 1
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    try:
+        resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+    except (ValueError, OSError):
+        pass
+
+
+def _run(code, timeout, max_output):
+    """Execute one snippet; returns the result message."""
+    stdout, stderr = io.StringIO(), io.StringIO()
+    namespace = {"__name__": "__main__", "__builtins__": builtins}
+    returncode, timed_out = 0, False
+    start = time.perf_counter()
+
+    _limit_cpu(timeout)
+    sys.stdout, sys.stderr = stdout, stderr
+    try:
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+        try:
+            exec(compile(code, "<sandbox>", "exec"), namespace)
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+    except _SandboxTimeout:
+        returncode, timed_out = 1, True
+    except SystemExit as e:
+        if isinstance(e.code, int):
+            returncode = e.code
+        elif e.code is not None:
+            print(e.code, file=stderr)
+            returncode = 1
+    except BaseException as e:
+        # Skip this frame so the traceback starts at the snippet, like a script run
+        traceback.print_exception(type(e), e, e.__traceback__.tb_next, file=stderr)
+        returncode = 1
+    finally:
+        sys.stdout, sys.stderr = sys.__stdout__, sys.__stderr__
+
+    return {
+        "stdout": _truncate(stdout.getvalue(), max_output),
+        "stderr": _truncate(stderr.getvalue(), max_output),
+        "returncode": returncode,
+        "timed_out": timed_out,
+        "crashed": False,
+        "elapsed": time.perf_counter() - start,
+    }
+
+
+def _read_result(fd, deadline):
+    """Read one framed message from the child; None if it died or overran `deadline`."""
+    data = b""
+    size = None
+    while True:
+        if size is None and len(data) >= _HEADER.size:
+            (size,) = _HEADER.unpack(data[:_HEADER.size])
+            data = data[_HEADER.size:]
+        if size is not None and len(data) >= size:
+            return json.loads(data[:size])
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return None
+        readable, _, _ = select.select([fd], [], [], remaining)
+        if readable:
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                return None
+            data += chunk
+
+
+def _run_forked(code, timeout, max_output, private_fds):
+    """Run one snippet in a child forked from this (warm, untouched) process."""
+    start = time.perf_counter()
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        try:
+            os.close(read_fd)
+            for fd in private_fds:
+                os.close(fd)  # The snippet never sees the protocol pipes
+            result = _run(code, timeout, max_output)
+            with os.fdopen(write_fd, "wb") as out:
+                _write_message(out, result)
+        finally:
+            os._exit(0)
+
+    os.close(write_fd)
+    deadline = time.monotonic() + timeout + _KILL_GRACE
+    try:
+        result = _read_result(read_fd, deadline)
+    finally:
+        os.close(read_fd)
+    overran = result is None and time.monotonic() >= deadline
+    if overran:
+        os.kill(pid, signal.SIGKILL)
+    code = os.waitstatus_to_exitcode(os.waitpid(pid, 0)[1])
+
+    if result is not None:
+        return result
+    elapsed = time.perf_counter() - start
+    if overran:
+        # Snippet swallowed or blocked the alarm
+        return {"stdout": "", "stderr": f"Execution timed out after {timeout} seconds", "returncode": -9,
+                "timed_out": True, "crashed": False, "elapsed": elapsed}
+    # Killed by an rlimit (CPU/memory), os._exit() or a crash mid-snippet
+    return {"stdout": "", "stderr": f"Sandbox process exited (code {code})", "returncode": code or 1,
+            "timed_out": False, "crashed": True, "elapsed": elapsed}
+
+
+def main():
+    config = json.loads(sys.argv[1])
+
+    # Keep the protocol pipes private; snippets see /dev/null on fds 0 and 1
+    proto_in = os.fdopen(os.dup(0), "rb")
+    proto_out = os.fdopen(os.dup(1), "wb")
+    devnull = os.open(os.devnull, os.O_RDWR)
+    os.dup2(devnull, 0)
+    os.dup2(devnull, 1)
+    sys.path[0] = os.getcwd()  # Match running a script from the sandbox cwd
+
+    for name in config.get("preload", []):
+        try:
+            __import__(name)
+        except ImportError:
+            pass
+
+    if resource is not None and config.get("max_memory_mb"):
+        limit = config["max_memory_mb"] * 1024 * 1024
+        try:
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        except (ValueError, OSError):
+            pass
+
+    signal.signal(signal.SIGALRM, _on_alarm)
+    max_output = config.get("max_output", 100000)
+    private_fds = [proto_in.fileno(), proto_out.fileno()]
+    _write_message(proto_out, {"ready": True})
+
+    while True:
+        request = _read_message(proto_in)
+        if request is None:
+            return  # Parent closed the pipe
+        for item in request["items"]:
+            _write_message(proto_out, _run_forked(item["code"], item["timeout"], max_output, private_fds))
+
+
+if __name__ == "__main__":
+    main()
@@ -245,7 +245,9 @@ def function_name(...):
         successes = 0
         failures = []
 
-        for i, (inp, exp) in enumerate(zip(inputs, expected)):
+        cases = list(zip(inputs, expected))
+        test_codes = []
+        for inp, exp in cases:
             # Build test code
             if isinstance(inp, dict) and "input" in inp:
                 # Single input wrapped in dict
@@ -274,11 +276,26 @@ except Exception as e:
     import json
     print(json.dumps({{"passed": False, "error": str(e)}}))
 """
+            test_codes.append(test_code)
 
-            try:
-                result = await self.sandbox.execute(test_code, timeout=10)
+        # Run every case in one sandbox round-trip
+        batch_error = None
+        try:
+            batch = await self.sandbox.execute_batch(test_codes, timeout=10)
+        except Exception as e:
+            batch_error = str(e)
+            batch = [None] * len(test_codes)
 
-                if result.success:
+        for i, ((inp, exp), result) in enumerate(zip(cases, batch)):
+            try:
+                if result is None:
+                    failures.append({
+                        "test_case": i + 1,
+                        "input": inp,
+                        "expected": exp,
+                        "error": batch_error,
+                    })
+                elif result.success:
                     # Parse output
                     try:
                         output = json.loads(result.stdout.strip().split('\n')[-1])
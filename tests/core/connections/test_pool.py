@@ -234,3 +234,177 @@ class TestConnectionPool:
         await pool.close()
 
         assert len(closures) == 3
+
+
+class TestAcquirePath:
+    """Acquire without holding a lock across connection I/O."""
+
+    @pytest.mark.asyncio
+    async def test_slow_creation_runs_concurrently(self):
+        """Concurrent acquires create connections in parallel, not one by one."""
+        import asyncio
+        import time
+
+        created = []
+
+        async def slow_factory():
+            await asyncio.sleep(0.1)
+            created.append(1)
+            return MockConnection(len(created))
+
+        pool = ConnectionPool(factory=slow_factory, config=PoolConfig(min_size=0, max_size=10))
+        await pool.initialize()
+
+        start = time.perf_counter()
+        conns = await asyncio.gather(*(pool.acquire() for _ in range(10)))
+        elapsed = time.perf_counter() - start
+
+        assert len(created) == 10
+        assert elapsed < 0.5  # Serialized creation would take >= 1s
+        assert len({c.connection.id for c in conns}) == 10
+
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_waiters_are_served_fifo(self):
+        """Released connections go to the oldest waiter."""
+        import asyncio
+
+        pool = ConnectionPool(
+            factory=lambda: MockConnection(1),
+            config=PoolConfig(min_size=1, max_size=1, acquire_timeout=5.0)
+        )
+        await pool.initialize()
+        held = await pool.acquire()
+
+        order = []
+
+        async def waiter(name):
+            pooled = await pool.acquire()
+            order.append(name)
+            await pool.release(pooled.connection)
+
+        tasks = []
+        for name in range(5):
+            tasks.append(asyncio.create_task(waiter(name)))
+            await asyncio.sleep(0)  # Queue in a known order
+        assert pool.stats.waiting_acquirers == 5
+
+        await pool.release(held.connection)
+        await asyncio.gather(*tasks)
+
+        assert order == [0, 1, 2, 3, 4]
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_timed_out_waiter_does_not_leak_capacity(self):
+        """A waiter that gave up never swallows a released connection."""
+        pool = ConnectionPool(
+            factory=lambda: MockConnection(1),
+            config=PoolConfig(min_size=1, max_size=1, acquire_timeout=0.05)
+        )
+        await pool.initialize()
+        held = await pool.acquire()
+
+        with pytest.raises(PoolExhaustedError):
+            await pool.acquire()
+        await pool.release(held.connection)
+
+        async with await pool.acquire() as conn:
+            assert conn.id == 1
+        assert pool.stats.total_timeouts == 1
+        assert pool.stats.pending_connections == 0
+
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_invalid_connection_replaced_and_rewarmed(self):
+        """Invalid idle connections are closed and min_size is restored."""
+        import asyncio
+
+        counter = {"count": 0}
+        closed = []
+
+        def factory():
+            counter["count"] += 1
+            return MockConnection(counter["count"])
+
+        pool = ConnectionPool(
+            factory=factory,
+            validator=lambda conn: conn.id != 1,
+            closer=lambda conn: closed.append(conn.id),
+            config=PoolConfig(min_size=2, max_size=5)
+        )
+        await pool.initialize()
+
+        pool._available.rotate(1)  # Put connection 1 on top of the idle stack
+        async with await pool.acquire() as conn:
+            assert conn.id == 2
+        await asyncio.sleep(0.05)  # Background close and warm-up
+
+        assert closed == [1]
+        assert pool.stats.total_connections == 2
+
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_failed_creation_frees_slot(self):
+        """A factory error does not permanently consume capacity."""
+        attempts = {"count": 0}
+
+        def flaky_factory():
+            attempts["count"] += 1
+            if attempts["count"] == 1:
+                raise ConnectionError("handshake failed")
+            return MockConnection(attempts["count"])
+
+        pool = ConnectionPool(
+            factory=flaky_factory,
+            config=PoolConfig(min_size=0, max_size=1, acquire_timeout=0.5)
+        )
+        await pool.initialize()
+
+        with pytest.raises(PoolExhaustedError):
+            await pool.acquire()  # Creation failed; nothing to wait for
+
+        async with await pool.acquire() as conn:
+            assert conn.id == 2
+        assert pool.stats.total_errors == 1
+
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_acquire_latency_percentiles(self):
+        """PoolStats exposes p50/p99 acquire latency."""
+        pool = ConnectionPool(
+            factory=lambda: MockConnection(1),
+            config=PoolConfig(min_size=1, max_size=1)
+        )
+        await pool.initialize()
+
+        for _ in range(20):
+            async with await pool.acquire():
+                pass
+
+        stats = pool.stats
+        assert stats.acquire_latency.count == 20
+        assert 0 < stats.acquire_p50_ms <= stats.acquire_p99_ms
+        assert stats.avg_acquire_time_ms > 0
+
+        await pool.close()
+
+
+class TestLatencyHistogram:
+    """Test LatencyHistogram percentiles."""
+
+    def test_percentiles_within_one_bucket(self):
+        from jdev_core.connections.pool import LatencyHistogram
+
+        histogram = LatencyHistogram()
+        for ms in range(1, 101):
+            histogram.record(float(ms))
+
+        assert 50 <= histogram.percentile(50) <= 50 * 1.2
+        assert 99 <= histogram.percentile(99) <= 100
+        assert histogram.percentile(100) == 100
+        assert LatencyHistogram().percentile(50) == 0.0
@@ -268,3 +268,95 @@ class TestInMemoryBroker:
         await broker.close()
 
         assert await broker.list_queues() == []
+
+
+class TestInMemoryQueueScheduling:
+    """Delay scheduler and batch paths of InMemoryQueue."""
+
+    @pytest.fixture
+    def queue(self):
+        """Create a test queue."""
+        return InMemoryQueue(QueueConfig(name="sched-queue", max_size=100, retry_delay=0.05))
+
+    @pytest.mark.asyncio
+    async def test_delayed_messages_delivered_in_due_order(self, queue):
+        """Delayed messages come out ordered by visibility time."""
+        await queue.publish(Message(payload="late"), delay=0.08)
+        await queue.publish(Message(payload="early"), delay=0.02)
+        await queue.publish(Message(payload="now"))
+
+        await asyncio.sleep(0.12)
+        messages = await queue.consume(count=3)
+
+        assert [m.payload for m in messages] == ["now", "early", "late"]
+
+    @pytest.mark.asyncio
+    async def test_timer_promotes_without_consume(self, queue):
+        """Due messages become visible even if nobody polls."""
+        await queue.publish(Message(payload="delayed"), delay=0.02)
+        await asyncio.sleep(0.05)
+
+        assert len(queue._messages) == 1
+        assert queue._delayed == []
+
+    @pytest.mark.asyncio
+    async def test_waiting_consumer_wakes_on_due_message(self, queue):
+        """A blocked consume returns as soon as a delayed message is due."""
+        await queue.publish(Message(payload="delayed"), delay=0.05)
+
+        messages = await queue.consume(count=1, timeout=1.0)
+
+        assert [m.payload for m in messages] == ["delayed"]
+
+    @pytest.mark.asyncio
+    async def test_nack_requeues_after_retry_delay(self, queue):
+        """Nacked messages return after retry_delay."""
+        await queue.publish(Message(payload="retry me"))
+        [message] = await queue.consume(count=1)
+        await queue.nack(message.id)
+
+        assert await queue.consume(count=1) == []
+        redelivered = await queue.consume(count=1, timeout=1.0)
+        assert redelivered[0].id == message.id
+        assert redelivered[0].retry_count == 1
+
+    @pytest.mark.asyncio
+    async def test_publish_batch_and_consume_many(self, queue):
+        """Batches keep order and respect count."""
+        ids = await queue.publish_batch([Message(payload=i) for i in range(10)])
+
+        first = await queue.consume(count=4)
+        rest = await queue.consume(count=10)
+
+        assert [m.id for m in first + rest] == ids
+        assert await queue.size() == 0
+
+    @pytest.mark.asyncio
+    async def test_publish_batch_is_all_or_nothing(self):
+        """A batch that does not fit is rejected whole."""
+        queue = InMemoryQueue(QueueConfig(name="small", max_size=5))
+        await queue.publish_batch([Message(payload=i) for i in range(3)])
+
+        with pytest.raises(Exception, match="full"):
+            await queue.publish_batch([Message(payload=i) for i in range(3)])
+        assert await queue.size() == 3
+
+    @pytest.mark.asyncio
+    async def test_due_messages_wait_for_room(self):
+        """Due messages blocked by max_size are promoted once consumers make room."""
+        queue = InMemoryQueue(QueueConfig(name="small", max_size=2))
+        await queue.publish_batch([Message(payload="a"), Message(payload="b")])
+        await queue.publish(Message(payload="c"), delay=0.01)
+        await asyncio.sleep(0.03)
+
+        assert await queue.size() == 3
+        assert [m.payload for m in await queue.consume(count=3)] == ["a", "b", "c"]
+
+    @pytest.mark.asyncio
+    async def test_purge_cancels_timer(self, queue):
+        """Purge drops delayed messages and their timer."""
+        await queue.publish_batch([Message(payload=i) for i in range(5)], delay=0.02)
+
+        assert await queue.purge() == 5
+        await asyncio.sleep(0.04)
+        assert await queue.consume(count=5) == []
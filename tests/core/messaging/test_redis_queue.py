@@ -0,0 +1,198 @@
+"""
+Tests for the Redis message queue (list and streams mode), run on fakeredis.
+"""
+
+import asyncio
+import json
+import time
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("lupa")  # fakeredis needs it for EVALSHA
+
+from jdev_core.messaging import Message, MessageStatus, QueueConfig
+from jdev_core.messaging.redis import RedisConfig, RedisQueue
+
+
+def make_queue(server, stream_mode=False, consumer_name=None, **queue_kwargs):
+    config = QueueConfig(name="jobs", **queue_kwargs)
+    client = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+    return RedisQueue(
+        config,
+        RedisConfig(stream_mode=stream_mode),
+        consumer_name=consumer_name,
+        client=client,
+    )
+
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+
+class TestRedisQueue:
+    """List-mode queue."""
+
+    @pytest.fixture
+    async def queue(self, server):
+        q = make_queue(server, retry_delay=0.05, visibility_timeout=0.1)
+        await q.connect()
+        yield q
+        await q.disconnect()
+
+    @pytest.mark.asyncio
+    async def test_publish_batch_and_consume_batch(self, queue):
+        """A pipelined batch comes back in order in one consume call."""
+        ids = await queue.publish_batch([Message(payload={"n": i}) for i in range(5)])
+
+        assert await queue.size() == 5
+        messages = await queue.consume(count=10)
+        assert [m.id for m in messages] == ids
+        assert all(m.status == MessageStatus.PROCESSING for m in messages)
+        assert await queue.size() == 0
+
+    @pytest.mark.asyncio
+    async def test_ack_batch_removes_message_data(self, queue):
+        """Acked messages leave no data behind."""
+        await queue.publish_batch([Message() for _ in range(3)])
+        messages = await queue.consume(count=3)
+
+        assert await queue.ack_batch([m.id for m in messages] + ["unknown"]) == 3
+        assert await queue._redis.hlen(queue._data_key) == 0
+        assert await queue._redis.zcard(queue._processing_key) == 0
+
+    @pytest.mark.asyncio
+    async def test_blocking_consume_returns_whole_batch(self, queue):
+        """A blocked consumer wakes on publish and takes every ready message."""
+        async def publish_later():
+            await asyncio.sleep(0.05)
+            await queue.publish_batch([Message() for _ in range(4)])
+
+        task = asyncio.create_task(publish_later())
+        messages = await queue.consume(count=10, timeout=2.0)
+        await task
+
+        assert len(messages) == 4
+
+    @pytest.mark.asyncio
+    async def test_delayed_promotion(self, queue):
+        """Delayed messages become visible once due, including while blocking."""
+        await queue.publish(Message(payload="later"), delay=0.1)
+
+        assert await queue.consume() == []
+        messages = await queue.consume(timeout=1.0)
+        assert [m.payload for m in messages] == ["later"]
+
+    @pytest.mark.asyncio
+    async def test_nack_requeues_with_delay(self, queue):
+        """A nacked message comes back after retry_delay."""
+        await queue.publish(Message(payload="x"))
+        message = (await queue.consume())[0]
+
+        assert await queue.nack(message.id)
+        messages = await queue.consume(timeout=1.0)
+        assert messages[0].id == message.id
+        assert messages[0].retry_count == 1
+
+    @pytest.mark.asyncio
+    async def test_requeue_stale(self, queue):
+        """Messages past the visibility timeout are returned to the queue."""
+        await queue.publish(Message())
+        await queue.consume()
+        await asyncio.sleep(0.15)
+
+        assert await queue.requeue_stale() == 1
+        assert await queue.size() == 1
+
+    @pytest.mark.asyncio
+    async def test_legacy_inline_bodies_are_consumed(self, queue):
+        """Entries written before the hash layout (JSON body as member) are not dropped."""
+        ready, due = Message(payload="ready"), Message(payload="due")
+        await queue._redis.rpush(queue._queue_key, json.dumps(ready.to_dict()))
+        await queue._redis.zadd(queue._delayed_key, {json.dumps(due.to_dict()): time.time() - 1})
+
+        messages = await queue.consume(count=5)
+
+        assert [m.id for m in messages] == [ready.id, due.id]
+        assert await queue._redis.zscore(queue._processing_key, ready.id) is not None
+        assert await queue.ack_batch([m.id for m in messages]) == 2
+        assert await queue._redis.hlen(queue._data_key) == 0
+        assert await queue._redis.zcard(queue._processing_key) == 0
+
+    @pytest.mark.asyncio
+    async def test_purge(self, queue):
+        await queue.publish_batch([Message() for _ in range(3)])
+        await queue.publish(Message(), delay=10)
+
+        assert await queue.purge() == 4
+        assert await queue.size() == 0
+
+
+class TestRedisQueueStreams:
+    """Streams consumer-group mode."""
+
+    @pytest.mark.asyncio
+    async def test_at_least_once_with_stale_consumer(self, server):
+        """Messages a dead consumer never acked are claimed by another one."""
+        crashed = make_queue(server, stream_mode=True, consumer_name="a", visibility_timeout=0.05)
+        healthy = make_queue(server, stream_mode=True, consumer_name="b", visibility_timeout=0.05)
+        await crashed.connect()
+        await healthy.connect()
+
+        ids = await crashed.publish_batch([Message(payload=i) for i in range(3)])
+        assert len(await crashed.consume(count=3)) == 3
+        assert await healthy.consume(count=3) == []
+
+        await asyncio.sleep(0.1)
+        recovered = await healthy.consume(count=3)
+        assert [m.id for m in recovered] == ids
+
+        assert await healthy.ack_batch(ids) == 3
+        assert await healthy._redis.xlen(healthy._stream_key) == 0
+        assert await healthy.size() == 0
+
+    @pytest.mark.asyncio
+    async def test_poison_message_goes_to_dead_letter(self, server):
+        """Entries redelivered more than max_retries times are dead-lettered."""
+        queue = make_queue(
+            server, stream_mode=True, max_retries=1, visibility_timeout=0.02, dead_letter_queue="jobs.dlq"
+        )
+        await queue.connect()
+        await queue.publish(Message(payload="poison"))
+
+        await queue.consume()
+        await asyncio.sleep(0.05)
+        assert len(await queue.consume()) == 1  # Second delivery
+        await asyncio.sleep(0.05)
+        assert await queue.consume() == []
+
+        assert await queue._redis.llen(queue._dlq_key) == 1
+        assert await queue._redis.xlen(queue._stream_key) == 0
+
+    @pytest.mark.asyncio
+    async def test_delayed_and_blocking_consume(self, server):
+        """Delayed messages are promoted into the stream and wake blocked readers."""
+        queue = make_queue(server, stream_mode=True)
+        await queue.connect()
+        await queue.publish(Message(payload="later"), delay=0.1)
+
+        assert await queue.size() == 1
+        messages = await queue.consume(count=5, timeout=1.0)
+        assert [m.payload for m in messages] == ["later"]
+
+        assert await queue.nack(messages[0].id, requeue=False)
+        assert await queue.size() == 0
+
+    @pytest.mark.asyncio
+    async def test_legacy_delayed_body_is_promoted(self, server):
+        """A delayed member holding the JSON body itself still reaches the stream."""
+        queue = make_queue(server, stream_mode=True)
+        await queue.connect()
+        legacy = Message(payload="legacy")
+        await queue._redis.zadd(queue._delayed_key, {json.dumps(legacy.to_dict()): time.time() - 1})
+
+        messages = await queue.consume(count=5)
+
+        assert [m.id for m in messages] == [legacy.id]
+        assert await queue._redis.zcard(queue._delayed_key) == 0
@@ -0,0 +1,244 @@
+"""
+Tests for the single-pass edit engine and the tools built on it.
+"""
+
+import os
+import stat
+
+import pytest
+
+from jdev_cli.core import edit_engine
+from jdev_cli.core.edit_engine import (
+    EditError,
+    EditTransaction,
+    Replacement,
+    apply_edits,
+    apply_sequential,
+    backup_file,
+    plan_edits,
+    write_text_atomic,
+)
+from jdev_cli.tools.file_ops import EditFileTool
+from jdev_cli.tools.parity.file_tools import MultiEditTool
+
+
+class TestPlanEdits:
+    """Anchors are found in the original and spliced once."""
+
+    def test_matches_sequential_replace(self):
+        content = "".join(f"def f{i}():\n    return {i}\n" for i in range(200))
+        edits = [Replacement(f"return {i}\n", f"return -{i}\n") for i in range(0, 200, 7)]
+
+        result = plan_edits(content, edits)
+        assert result.content == apply_sequential(content, edits).content
+        assert result.changes == len(edits)
+
+    def test_trie_scan_matches_find(self, monkeypatch):
+        content = "aaaa ab abc abcd xabc " * 3 + "".join(f"k{i} " for i in range(20))
+        edits = (
+            [Replacement("ab", "1"), Replacement("abcd", "2"), Replacement("aa", "3", replace_all=True)]
+            + [Replacement(f"k{i} ", f"v{i} ") for i in range(10)]
+            + [Replacement("xabc", "4")]
+        )
+        scanned = plan_edits(content, edits)
+        monkeypatch.setattr(edit_engine, "SCAN_THRESHOLD", 10**6)
+        assert scanned == plan_edits(content, edits)
+
+    def test_repeated_search_takes_successive_occurrences(self):
+        result = plan_edits("x x x", [Replacement("x", "a"), Replacement("x", "b")])
+        assert result.content == "a b x"
+
+    def test_replace_all(self):
+        result = plan_edits("aXbXc", [Replacement("X", "--", replace_all=True), Replacement("c", "C")])
+        assert (result.content, result.changes) == ("a--b--C", 3)
+
+    @pytest.mark.parametrize("edits, kind", [
+        ([Replacement("", "x")], "empty"),
+        ([Replacement("missing", "x")], "not_found"),
+        ([Replacement("abc", "x"), Replacement("bcd", "y")], "overlap"),
+    ])
+    def test_errors(self, edits, kind):
+        with pytest.raises(EditError) as exc:
+            plan_edits("abcdef", edits)
+        assert exc.value.kind == kind
+
+    @pytest.mark.parametrize("content, edits", [
+        ("X foo", [Replacement("X", "foo"), Replacement("foo", "bar")]),
+        ("foo foo", [Replacement("foo", "foo2"), Replacement("foo", "baz")]),
+        ("a-b", [Replacement("-", ""), Replacement("ab", "c")]),  # Deleção junta o texto vizinho
+        ("x = 1\ny = 2\n", [Replacement("1", "2"), Replacement("= 2\ny", "= 3\ny")]),
+    ])
+    def test_chained_edits_keep_sequential_result(self, content, edits):
+        assert apply_edits(content, edits).content == apply_sequential(content, edits).content
+
+    def test_independent_edits_are_spliced(self, monkeypatch):
+        content = "".join(f"v{i} = {i}\n" for i in range(50))
+        edits = [Replacement(f"v{i} = {i}\n", f"v{i} = -{i}\n") for i in range(0, 50, 5)]
+        monkeypatch.setattr(edit_engine, "apply_sequential", None)
+        assert apply_edits(content, edits).content.count("= -") == 10
+
+    def test_unique_rejects_ambiguous(self):
+        with pytest.raises(EditError) as exc:
+            plan_edits("foo foo", [Replacement("foo", "bar")], unique=True)
+        assert (exc.value.kind, exc.value.count) == ("ambiguous", 2)
+
+
+class TestAtomicWrites:
+    """Temp file + rename, mode kept, hard-link backups, multi-file rollback."""
+
+    def test_write_keeps_mode_and_leaves_no_temp(self, tmp_path):
+        target = tmp_path / "run.sh"
+        target.write_text("echo 1\n")
+        target.chmod(0o755)
+
+        write_text_atomic(target, "echo 2\n")
+        assert target.read_text() == "echo 2\n"
+        assert stat.S_IMODE(target.stat().st_mode) == 0o755
+        assert os.listdir(tmp_path) == ["run.sh"]
+
+    def test_write_through_symlink_replaces_target(self, tmp_path):
+        target = tmp_path / "real.py"
+        target.write_text("x = 1\n")
+        link = tmp_path / "link.py"
+        link.symlink_to(target)
+
+        write_text_atomic(link, "x = 2\n")
+        with EditTransaction() as tx:
+            tx.edit(link, [Replacement("x = 2", "x = 3")])
+        assert link.is_symlink()
+        assert target.read_text() == "x = 3\n"
+        assert sorted(os.listdir(tmp_path)) == ["link.py", "real.py"]
+
+    def test_backup_survives_atomic_write(self, tmp_path):
+        target = tmp_path / "a.txt"
+        target.write_text("before")
+        backup = backup_file(target, tmp_path / "backups" / "a.txt.bak")
+        write_text_atomic(target, "after")
+        assert backup.read_text() == "before"
+
+    def test_transaction_is_all_or_nothing(self, tmp_path):
+        a, b = tmp_path / "a.py", tmp_path / "b.py"
+        a.write_text("x = 1\n")
+        b.write_text("y = 1\n")
+
+        with pytest.raises(EditError):
+            with EditTransaction() as tx:
+                tx.edit(a, [Replacement("x = 1", "x = 2")])
+                tx.edit(b, [Replacement("missing", "y = 2")])
+        assert a.read_text() == "x = 1\n"
+
+        with EditTransaction() as tx:
+            tx.edit(a, [Replacement("x = 1", "x = 2")])
+            tx.edit(b, [Replacement("y = 1", "y = 2")])
+        assert (a.read_text(), b.read_text()) == ("x = 2\n", "y = 2\n")
+
+    def test_commit_syncs_the_directories_it_renamed_in(self, tmp_path, monkeypatch):
+        (tmp_path / "sub").mkdir()
+        a, b = tmp_path / "a.py", tmp_path / "sub" / "b.py"
+        a.write_text("a1")
+        b.write_text("b1")
+        synced = []
+        monkeypatch.setattr(edit_engine, "_sync_directory", lambda path: synced.append(path.parent))
+
+        with EditTransaction() as tx:
+            tx.write(a, "a2")
+            tx.write(b, "b2")
+
+        assert sorted(synced) == sorted({tmp_path.resolve(), (tmp_path / "sub").resolve()})
+
+    def test_failed_replace_restores_earlier_files(self, tmp_path, monkeypatch):
+        a, b = tmp_path / "a.py", tmp_path / "b.py"
+        a.write_text("a1")
+        b.write_text("b1")
+        tx = EditTransaction()
+        tx.write(a, "a2")
+        tx.write(b, "b2")
+
+        real_replace = os.replace
+
+        def failing_replace(src, dst):
+            if str(dst) == str(b):
+                raise OSError("disk full")
+            return real_replace(src, dst)
+
+        monkeypatch.setattr(edit_engine.os, "replace", failing_replace)
+        with pytest.raises(OSError):
+            tx.commit()
+        monkeypatch.undo()
+
+        assert (a.read_text(), b.read_text()) == ("a1", "b1")
+        assert sorted(os.listdir(tmp_path)) == ["a.py", "b.py"]
+
+
+class TestEditTools:
+    """EditFileTool and MultiEditTool on top of the engine."""
+
+    async def test_edit_file_chained_edits_fall_back_to_sequential(self, tmp_path):
+        target = tmp_path / "a.py"
+        target.write_text("value = 1\n")
+        result = await EditFileTool()._execute_validated(
+            path=str(target),
+            edits=[{"search": "value = 1", "replace": "value = 2"}, {"search": "value = 2", "replace": "value = 3"}],
+            create_backup=False,
+            preview=False,
+        )
+        assert result.success
+        assert target.read_text() == "value = 3\n"
+
+    @pytest.mark.parametrize("content, edits, expected", [
+        ("X foo", [("X", "foo"), ("foo", "bar")], "bar foo"),
+        ("foo foo", [("foo", "foo2"), ("foo", "baz")], "baz2 foo"),
+    ])
+    async def test_edit_file_chained_edits_match_sequential(self, tmp_path, content, edits, expected):
+        target = tmp_path / "a.txt"
+        target.write_text(content)
+        result = await EditFileTool()._execute_validated(
+            path=str(target),
+            edits=[{"search": a, "replace": b} for a, b in edits],
+            create_backup=False,
+            preview=False,
+        )
+        assert result.success
+        assert target.read_text() == expected
+
+    async def test_multi_edit_chained_edits(self, tmp_path):
+        target = tmp_path / "a.py"
+        target.write_text("def old():\n    pass\n")
+        result = await MultiEditTool()._execute_validated(
+            file_path=str(target),
+            edits=[{"old_string": "def old", "new_string": "def new"}, {"old_string": "new():", "new_string": "new(x):"}],
+            create_backup=False,
+        )
+        assert result.success
+        assert target.read_text() == "def new(x):\n    pass\n"
+
+    async def test_multi_edit_rejects_overlap_without_writing(self, tmp_path):
+        target = tmp_path / "a.py"
+        target.write_text("abcdef")
+        result = await MultiEditTool()._execute_validated(
+            file_path=str(target),
+            edits=[{"old_string": "abc", "new_string": "x"}, {"old_string": "cde", "new_string": "y"}],
+        )
+        assert not result.success
+        assert target.read_text() == "abcdef"
+        assert not (tmp_path / "a.py.bak").exists()
+
+    async def test_multi_edit_files_batch(self, tmp_path):
+        a, b = tmp_path / "a.py", tmp_path / "b.py"
+        a.write_text("import os\n")
+        b.write_text("import sys\n")
+
+        failed = await MultiEditTool()._execute_validated(files=[
+            {"file_path": str(a), "edits": [{"old_string": "os", "new_string": "pathlib"}]},
+            {"file_path": str(b), "edits": [{"old_string": "json", "new_string": "pathlib"}]},
+        ])
+        assert not failed.success and "b.py" in failed.error
+        assert a.read_text() == "import os\n"
+
+        result = await MultiEditTool()._execute_validated(files=[
+            {"file_path": str(a), "edits": [{"old_string": "os", "new_string": "pathlib"}]},
+            {"file_path": str(b), "edits": [{"old_string": "sys", "new_string": "pathlib"}]},
+        ])
+        assert result.success and result.data["edits_applied"] == 2
+        assert a.read_text() == b.read_text() == "import pathlib\n"
+        assert (tmp_path / "a.py.bak").read_text() == "import os\n"
@@ -0,0 +1,262 @@
+"""
+Tests for SessionManager journal persistence and crash recovery.
+"""
+
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from jdev_cli.core.session_manager import SessionManager, SessionState
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+_WRITER = """
+import sys
+import time
+from jdev_cli.core.session_manager import SessionManager
+
+manager = SessionManager(session_dir=sys.argv[1], auto_save_interval=3600)
+manager.start_session()
+i = 0
+while True:
+    manager.add_message("user", f"message {i}")
+    manager.save()
+    print(i, flush=True)  # Acknowledged: save() returned
+    i += 1
+"""
+
+
+@pytest.fixture
+def manager(tmp_path):
+    m = SessionManager(session_dir=str(tmp_path), auto_save_interval=3600)
+    yield m
+    m._stop_auto_save_thread()
+
+
+def reopen(tmp_path, **kwargs):
+    return SessionManager(session_dir=str(tmp_path), auto_save_interval=3600, **kwargs)
+
+
+class TestJournal:
+    """save() appends changes instead of rewriting the session."""
+
+    def test_save_appends_only_changes(self, manager, tmp_path):
+        session = manager.start_session()
+        snapshot = tmp_path / f"{session.session_id}.json"
+        before = snapshot.read_bytes()
+
+        for i in range(3):
+            manager.add_message("user", f"hello {i}")
+        manager.update_context("branch", "main")
+        manager.save()
+
+        assert snapshot.read_bytes() == before
+        journal = manager._get_journal_path(session.session_id).read_text().splitlines()
+        assert len(journal) == 4
+
+    def test_resume_replays_journal(self, manager, tmp_path):
+        session = manager.start_session()
+        manager.add_message("user", "fix the bug")
+        manager.add_message("assistant", "done", metadata={"tool": "edit"})
+        manager.update_context("file", "app.py")
+        manager.add_pending_operation({"op": "write"})
+        manager.save()
+
+        resumed = reopen(tmp_path).resume_session(session.session_id)
+
+        assert [m.content for m in resumed.messages] == ["fix the bug", "done"]
+        assert resumed.messages[1].metadata == {"tool": "edit"}
+        assert resumed.context == {"file": "app.py"}
+        assert resumed.pending_operations == [{"op": "write"}]
+        assert resumed.state == SessionState.RECOVERED
+
+    def test_compaction_folds_journal_into_snapshot(self, tmp_path):
+        manager = reopen(tmp_path, compact_threshold=2000)
+        session = manager.start_session()
+        for i in range(100):
+            manager.add_message("user", f"message {i} " + "x" * 50)
+            manager.save()
+
+        journal = manager._get_journal_path(session.session_id)
+        assert not journal.exists() or journal.stat().st_size < 2000 + 200
+        resumed = reopen(tmp_path).resume_session(session.session_id)
+        assert len(resumed.messages) == 100
+        manager._stop_auto_save_thread()
+
+    def test_end_session_compacts(self, manager, tmp_path):
+        session = manager.start_session()
+        manager.add_message("user", "bye")
+        manager.end_session()
+
+        assert not manager._get_journal_path(session.session_id).exists()
+        loaded = reopen(tmp_path)._load_session(session.session_id)
+        assert loaded.state == SessionState.COMPLETED
+        assert [m.content for m in loaded.messages] == ["bye"]
+
+    def test_direct_snapshot_edits_force_compaction(self, manager, tmp_path):
+        session = manager.start_session()
+        manager.add_message("user", "via manager")
+        session.messages.append(session.messages[0].__class__(role="user", content="direct"))
+        manager.save()
+
+        loaded = reopen(tmp_path)._load_session(session.session_id)
+        assert [m.content for m in loaded.messages] == ["via manager", "direct"]
+
+    def test_index_is_written_atomically(self, manager, tmp_path):
+        manager.start_session()
+        manager.add_message("user", "summarize me")
+        manager.save()
+
+        index = json.loads((tmp_path / SessionManager.INDEX_FILE).read_text())
+        assert list(index.values())[0]["summary"] == "summarize me"
+        assert not list(tmp_path.glob(".*.tmp"))
+
+
+class TestJournalCrashRecovery:
+    """Crashes never lose acknowledged saves or replay anything twice."""
+
+    def test_torn_tail_is_dropped(self, manager, tmp_path):
+        session = manager.start_session()
+        manager.add_message("user", "kept")
+        manager.save()
+        with open(manager._get_journal_path(session.session_id), "ab") as f:
+            f.write(b'1234abcd {"seq": 99, "op": "mess')  # Crash mid-write
+
+        other = reopen(tmp_path)
+        resumed = other.resume_session(session.session_id)
+        assert [m.content for m in resumed.messages] == ["kept"]
+
+        other.add_message("user", "after crash")
+        other.save()
+        again = reopen(tmp_path)._load_session(session.session_id)
+        assert [m.content for m in again.messages] == ["kept", "after crash"]
+        other._stop_auto_save_thread()
+
+    def test_crash_between_snapshot_and_journal_removal(self, manager, tmp_path):
+        session = manager.start_session()
+        manager.add_message("user", "one")
+        manager.save()
+        journal = manager._get_journal_path(session.session_id)
+        stale = journal.read_bytes()
+
+        manager.add_message("user", "two")
+        manager._needs_compaction = True
+        manager.save()
+        journal.write_bytes(stale)  # Journal removal never happened
+
+        loaded = reopen(tmp_path)._load_session(session.session_id)
+        assert [m.content for m in loaded.messages] == ["one", "two"]
+
+    @pytest.mark.skipif(not hasattr(signal, "SIGKILL"), reason="needs SIGKILL")
+    def test_sigkill_mid_save(self, tmp_path):
+        env = {**os.environ, "PYTHONPATH": str(REPO_ROOT)}
+        proc = subprocess.Popen(
+            [sys.executable, "-c", _WRITER, str(tmp_path)],
+            stdout=subprocess.PIPE, text=True, env=env, cwd=REPO_ROOT,
+        )
+        acknowledged = [proc.stdout.readline().strip() for _ in range(100)]
+        proc.send_signal(signal.SIGKILL)
+        proc.wait()
+        proc.stdout.close()
+
+        crashed = reopen(tmp_path).check_for_crash_recovery()
+        assert crashed is not None
+        contents = [m.content for m in crashed.messages]
+        assert contents[:len(acknowledged)] == [f"message {i}" for i in acknowledged]
+        assert contents == [f"message {i}" for i in range(len(contents))]
+
+
+class TestSearchIndex:
+    """search_sessions/search_messages query the incremental FTS index."""
+
+    @pytest.fixture(autouse=True)
+    def _needs_fts5(self):
+        from jdev_cli.core.session_search import FTS5_AVAILABLE
+        if not FTS5_AVAILABLE:
+            pytest.skip("SQLite without FTS5")
+
+    def test_messages_indexed_on_save(self, manager):
+        session = manager.start_session()
+        manager.add_message("user", "the parser crashes on unicode input")
+        manager.add_message("assistant", "fixed the tokenizer")
+        manager.save()
+
+        index = manager._search_index
+        assert index.indexed_count(session.session_id) == 2
+        manager.add_message("user", "thanks")
+        manager.save()
+        assert index.indexed_count(session.session_id) == 3
+
+    def test_ranked_multi_term_search(self, manager):
+        first = manager.start_session()
+        manager.add_message("user", "parser bug in the config loader")
+        manager.add_message("assistant", "parser parser parser: the parser bug is fixed")
+        manager.end_session()
+        second = manager.start_session()
+        manager.add_message("user", "unrelated: parser docs")
+        manager.end_session()
+
+        ids = [s.session_id for s in manager.search_sessions("parser bug")]
+        assert ids == [first.session_id]
+        ids = [s.session_id for s in manager.search_sessions("PARS")]  # Prefix, case-insensitive
+        assert set(ids) == {first.session_id, second.session_id}
+
+        hits = manager.search_messages("parser bug")
+        assert hits[0].position == 1 and hits[0].score >= hits[1].score
+        assert "**parser**" in hits[0].snippet and "**bug**" in hits[0].snippet
+
+    def test_role_time_and_phrase_filters(self, manager):
+        manager.start_session()
+        manager.add_message("user", "deploy the staging server")
+        cutoff = time.time()
+        time.sleep(0.01)
+        manager.add_message("assistant", "server deploy done")
+        manager.save()
+
+        assert [h.role for h in manager.search_messages("deploy", role="user")] == ["user"]
+        assert [h.role for h in manager.search_messages("deploy", since=cutoff)] == ["assistant"]
+        assert [h.role for h in manager.search_messages("deploy", until=cutoff)] == ["user"]
+        assert [h.position for h in manager.search_messages('"staging server"')] == [0]
+        assert manager.search_messages('"server staging"') == []
+        assert manager.search_messages("AND OR NOT (*") == []  # No FTS syntax leaks through
+        assert manager.search_sessions("deploy", role="system") == []
+
+    def test_backfills_sessions_saved_without_index(self, tmp_path):
+        legacy = reopen(tmp_path, search_index=False)
+        session = legacy.start_session()
+        legacy.add_message("user", "legacy session about migrations")
+        legacy.end_session()
+        assert not (tmp_path / SessionManager.SEARCH_INDEX_FILE).exists()
+
+        manager = reopen(tmp_path)
+        assert [s.session_id for s in manager.search_sessions("migration")] == [session.session_id]
+        assert manager._search_index.indexed_count(session.session_id) == 1
+        legacy._stop_auto_save_thread()
+
+    def test_pruned_sessions_leave_index(self, tmp_path):
+        manager = reopen(tmp_path, max_sessions=2)
+        ids = []
+        for i in range(3):
+            ids.append(manager.start_session().session_id)
+            manager.add_message("user", f"topic{i} shared")
+            manager.end_session()
+
+        assert ids[0] not in manager._search_index.indexed_counts()
+        assert {s.session_id for s in manager.search_sessions("shared")} == set(ids[1:])
+        manager._stop_auto_save_thread()
+
+    def test_fallback_scan_without_index(self, tmp_path):
+        manager = reopen(tmp_path, search_index=False)
+        session = manager.start_session()
+        manager.add_message("user", "find the needle here")
+        manager.save()
+
+        assert [s.session_id for s in manager.search_sessions("needle")] == [session.session_id]
+        assert manager.search_messages("needle")[0].snippet == "find the **needle** here"
+        manager._stop_auto_save_thread()
@@ -0,0 +1,209 @@
+"""
+Tests for UndoManager blob storage and journaled state.
+"""
+
+import random
+
+import pytest
+
+from jdev_cli.core.blob_store import BlobStore, apply_delta, make_delta
+from jdev_cli.core.undo_manager import UndoManager
+
+
+def make_text(lines: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    return "".join(f"line {i}: value = {rng.randint(0, 10**6)}\n" for i in range(lines))
+
+
+def edit(text: str, rng: random.Random) -> str:
+    lines = text.splitlines(keepends=True)
+    lines[rng.randrange(len(lines))] = f"edited {rng.random()}\n"
+    return "".join(lines)
+
+
+@pytest.fixture
+def workdir(tmp_path):
+    return tmp_path
+
+
+def manager_for(workdir, **kwargs):
+    return UndoManager(working_dir=str(workdir), **kwargs)
+
+
+class TestBlobStore:
+    """Content addressing, reverse deltas and GC."""
+
+    @pytest.mark.parametrize("base, target", [
+        (b"", b"abc"),
+        (b"abc", b""),
+        (b"same", b"same"),
+        (b"hello world", b"hello brave world"),
+        (make_text(2000).encode(), make_text(2000, seed=1).encode()),
+    ])
+    def test_delta_round_trip(self, base, target):
+        assert apply_delta(make_delta(target, base), base) == target
+
+    def test_multi_hunk_delta_copies_unchanged_lines(self):
+        base = make_text(5000).encode()
+        lines = base.splitlines(keepends=True)
+        lines[10] = b"first change\n"
+        lines[4000] = b"second change\n"
+        target = b"".join(lines)
+
+        ops = make_delta(target, base)
+        assert apply_delta(ops, base) == target
+        assert len(ops) < 500
+
+    def test_dedup_and_reverse_delta(self, tmp_path):
+        store = BlobStore(tmp_path)
+        v1 = store.put(make_text(1000))
+        v2 = store.put(edit(make_text(1000), random.Random(1)), previous=v1)
+
+        assert store.put(make_text(1000)) == v1
+        stats = store.get_stats()
+        assert (stats["full"], stats["deltas"]) == (1, 1)
+        assert BlobStore(tmp_path).get_text(v1) == make_text(1000)
+        assert BlobStore(tmp_path).get_text(v2) == edit(make_text(1000), random.Random(1))
+
+    def test_full_run_is_reversed(self, tmp_path):
+        store = BlobStore(tmp_path, chain_limit=4)
+        rng = random.Random(2)
+        text = make_text(200)
+        versions, previous = [], None
+        for _ in range(10):
+            previous = store.put(text, previous=previous)
+            versions.append((previous, text))
+            text = edit(text, rng)
+
+        index = store._index()
+        hashes = [h for h, _ in versions]
+        assert [h for h in hashes if index[h] is None] == [hashes[0], hashes[4], hashes[8]]
+        assert index[hashes[3]] == hashes[4]  # Reversed: older points at newer
+        assert index[hashes[9]] == hashes[8]  # Current run: newer points at older
+        reopened = BlobStore(tmp_path)
+        for blob, content in versions:
+            assert reopened.get_text(blob) == content
+
+    def test_gc_keeps_bases_of_reachable_deltas(self, tmp_path):
+        store = BlobStore(tmp_path)
+        v1 = store.put("a" * 100)
+        v2 = store.put("a" * 99 + "b", previous=v1)
+        v3 = store.put("c" * 100)
+
+        assert store.gc(reachable=[v2]) == 1  # v3; v1 is v2's base
+        assert v1 in store and v3 not in store
+        assert BlobStore(tmp_path).get_text(v2) == "a" * 99 + "b"
+        assert store.gc(reachable=[]) == 2
+
+
+class TestUndoManagerStorage:
+    """Edits are stored once, deltas for old versions, state journaled."""
+
+    def test_edit_undo_redo_round_trip(self, workdir):
+        target = workdir / "app.py"
+        manager = manager_for(workdir)
+        rng = random.Random(3)
+        versions = [make_text(500)]
+        target.write_text(versions[0])
+        for _ in range(5):
+            versions.append(edit(versions[-1], rng))
+            manager.record_file_edit(str(target), versions[-2], versions[-1])
+            target.write_text(versions[-1])
+
+        for expected in reversed(versions[:-1]):
+            assert manager.undo().success
+            assert target.read_text() == expected
+        assert manager.redo().success
+        assert target.read_text() == versions[1]
+
+        stats = manager._store.get_stats()
+        assert stats["blobs"] == 6 and stats["full"] == 1
+
+    def test_state_is_journaled_and_compacted(self, workdir, monkeypatch):
+        target = workdir / "a.txt"
+        manager = manager_for(workdir)
+        manager.record_file_edit(str(target), "one", "two")
+        manager.record_file_edit(str(target), "two", "three")
+
+        state = workdir / UndoManager.STATE_FILE
+        journal = workdir / UndoManager.JOURNAL_FILE
+        assert not state.exists()
+        assert len(journal.read_text().splitlines()) == 2
+
+        monkeypatch.setattr(UndoManager, "COMPACT_EVERY", 3)
+        target.write_text("three")
+        manager.undo()  # Third record: compacts
+        assert state.exists() and not journal.exists()
+
+        reopened = manager_for(workdir)
+        assert [op.description for op in reopened.get_history()] == ["Edit a.txt"]
+        assert reopened.redo().success
+        assert target.read_text() == "three"
+
+    def test_reload_survives_torn_journal(self, workdir):
+        target = workdir / "a.txt"
+        manager = manager_for(workdir)
+        manager.record_file_edit(str(target), "v1", "v2")
+        with open(workdir / UndoManager.JOURNAL_FILE, "ab") as f:
+            f.write(b'0badc0de {"seq": 9, "op": "pu')
+
+        reopened = manager_for(workdir)
+        reopened.record_file_edit(str(target), "v2", "v3")
+        again = manager_for(workdir)
+        assert len(again.get_history()) == 2
+        target.write_text("v3")
+        assert again.undo().success and again.undo().success
+        assert target.read_text() == "v1"
+
+    def test_history_trim_and_branching_collect_blobs(self, workdir):
+        target = workdir / "a.txt"
+        manager = manager_for(workdir, max_size=3)
+        for i in range(6):
+            manager.record_file_edit(str(target), f"v{i}", f"v{i + 1}")
+        # v0..v2 left the history but stay until their run is reversed:
+        # v3..v6 are deltas against them
+        assert manager._store.get_stats()["blobs"] == 7
+
+        target.write_text("v6")
+        manager.undo()
+        manager.record_file_edit(str(target), "v5", "branch")  # Drops v6 from redo
+        store = BlobStore(manager._store.root)
+        assert {store.get_text(h) for h in store._index()} == {"v0", "v1", "v2", "v3", "v4", "v5", "branch"}
+
+        manager.clear_history()
+        assert not manager._store.root.exists()
+
+    def test_gc_spares_other_managers_in_shared_snapshot_dir(self, tmp_path):
+        shared = str(tmp_path / "snapshots")
+        (tmp_path / "a").mkdir()
+        (tmp_path / "b").mkdir()
+        first = manager_for(tmp_path / "a", snapshot_dir=shared)
+        second = manager_for(tmp_path / "b", snapshot_dir=shared)
+        target = tmp_path / "a" / "a.txt"
+        first.record_file_edit(str(target), "before", "after")
+        second.record_file_edit(str(tmp_path / "b" / "b.txt"), "old", "new")
+        second._undo_stack.clear()
+
+        assert second.gc() == 2  # Only its own "old" and "new"
+        target.write_text("after")
+        assert first.undo().success
+        assert target.read_text() == "before"
+
+    def test_legacy_snapshot_state_still_undoes(self, workdir):
+        import json
+
+        backup = workdir / "old.snapshot"
+        backup.write_text("before")
+        target = workdir / "a.txt"
+        target.write_text("after")
+        (workdir / UndoManager.STATE_FILE).write_text(json.dumps({
+            "undo_stack": [{
+                "id": "undo_1", "op_type": "file_edit", "description": "Edit a.txt",
+                "timestamp": 0, "target_path": str(target), "backup_path": str(backup),
+            }],
+            "redo_stack": [],
+            "counter": 1,
+        }, indent=2))
+
+        assert manager_for(workdir).undo().success
+        assert target.read_text() == "before"
@@ -447,3 +447,152 @@ class TestConcurrentStressTest:
         # Wave 2: reads a,b,c + write d
         assert result.wave_count <= 3
         assert all(r["success"] for r in result.results.values())
+
+
+class TestReadyQueueScheduling:
+    """Test ready-queue scheduling, resource limits and path normalization."""
+
+    @staticmethod
+    def _sleeping_executor(durations, log):
+        """Fake tool runner: sleeps per tool and logs (event, key, time)."""
+        async def execute(tool_name, **kwargs):
+            key = kwargs.get("path") or kwargs.get("url") or tool_name
+            log.append(("start", key, time.perf_counter()))
+            await asyncio.sleep(durations.get(key, 0.01))
+            log.append(("end", key, time.perf_counter()))
+            return {"success": True}
+        return execute
+
+    @pytest.mark.asyncio
+    async def test_slow_call_does_not_block_dependent_chain(self):
+        """A chain starts its next call as soon as its own dependency finishes."""
+        from jdev_tui.core.parallel_executor import ParallelToolExecutor
+
+        log = []
+        executor = ParallelToolExecutor(self._sleeping_executor({"/tmp/slow.txt": 0.3}, log))
+        tool_calls = [
+            ("read_file", {"path": "/tmp/slow.txt"}),
+            ("write_file", {"path": "/tmp/a.txt", "content": "1"}),
+            ("edit_file", {"path": "/tmp/a.txt", "edits": []}),
+            ("read_file", {"path": "/tmp/a.txt"}),
+        ]
+
+        result = await executor.execute(tool_calls)
+
+        ends = [key for event, key, _ in log if event == "end"]
+        assert ends[-1] == "/tmp/slow.txt"  # Chain finished while slow read ran
+        assert result.wave_count == 3
+        assert result.execution_time_ms < 380  # Waves would take 0.3s + two more steps
+
+    @pytest.mark.asyncio
+    async def test_critical_path_reported(self):
+        """Critical path is the chain with the largest summed time."""
+        from jdev_tui.core.parallel_executor import ParallelToolExecutor
+
+        log = []
+        durations = {"/tmp/a.txt": 0.05, "/tmp/b.txt": 0.01}
+        executor = ParallelToolExecutor(self._sleeping_executor(durations, log))
+        tool_calls = [
+            ("write_file", {"path": "/tmp/a.txt", "content": "1"}),
+            ("read_file", {"path": "/tmp/a.txt"}),
+            ("write_file", {"path": "/tmp/b.txt", "content": "2"}),
+        ]
+
+        result = await executor.execute(tool_calls)
+
+        assert result.critical_path == ["tool_0", "tool_1"]
+        assert result.critical_path_ms >= 100
+
+    @pytest.mark.asyncio
+    async def test_network_calls_limited_per_host(self):
+        """At most RESOURCE_LIMITS[NETWORK] calls hit the same host at once."""
+        from jdev_tui.core.parallel_executor import ParallelToolExecutor, ResourceClass
+
+        log = []
+        executor = ParallelToolExecutor(self._sleeping_executor({}, log), max_parallel=10)
+        tool_calls = [("web_fetch", {"url": f"https://a.example/{i}"}) for i in range(6)]
+        tool_calls += [("web_fetch", {"url": f"https://b.example/{i}"}) for i in range(2)]
+
+        await executor.execute(tool_calls)
+
+        running = peak = 0
+        for event, key, _ in sorted(log, key=lambda entry: entry[2]):
+            if "a.example" in key:
+                running += 1 if event == "start" else -1
+                peak = max(peak, running)
+        assert peak == ParallelToolExecutor.RESOURCE_LIMITS[ResourceClass.NETWORK]
+
+    def test_paths_are_normalized(self, temp_project, monkeypatch):
+        """'./a.txt', 'a.txt' and the absolute path are the same file."""
+        from jdev_tui.core.parallel_executor import detect_tool_dependencies
+
+        monkeypatch.chdir(temp_project)
+        tool_calls = [
+            ("write_file", {"path": "./a.txt", "content": "a"}),
+            ("read_file", {"path": str(temp_project / "a.txt")}),
+            ("edit_file", {"file_path": "sub/../a.txt", "edits": []}),
+        ]
+
+        deps = detect_tool_dependencies(tool_calls)
+
+        assert deps[1].depends_on == {"tool_0"}
+        assert deps[2].depends_on == {"tool_0", "tool_1"}
+
+    def test_bash_matches_tokens_not_substrings(self, temp_project, monkeypatch):
+        """bash depends on written files it names (or their directory), not on substrings."""
+        from jdev_tui.core.parallel_executor import detect_tool_dependencies
+
+        monkeypatch.chdir(temp_project)
+        tool_calls = [
+            ("write_file", {"path": "src/data.py", "content": "x = 1"}),
+            ("bash_command", {"command": "python a.py"}),
+            ("bash_command", {"command": "pytest src -q"}),
+            ("bash_command", {"command": "echo done > out.log"}),
+            ("read_file", {"path": "out.log"}),
+        ]
+
+        deps = detect_tool_dependencies(tool_calls)
+
+        assert deps[1].depends_on == set()
+        assert deps[2].depends_on == {"tool_0"}
+        assert deps[4].depends_on == {"tool_3"}
+
+    @pytest.mark.parametrize("command", [
+        "pytest tests/test_x.py::test_foo -q",
+        "python run.py --config=conf.yaml",
+        "python -c \"import yaml; yaml.safe_load(open('conf.yaml'))\"",
+        "python run.py --config ./conf.yaml",
+    ])
+    def test_bash_finds_paths_inside_tokens(self, temp_project, monkeypatch, command):
+        """Paths inside node ids, --opt=path and inline code are still dependencies."""
+        from jdev_tui.core.parallel_executor import detect_tool_dependencies
+
+        monkeypatch.chdir(temp_project)
+        tool_calls = [
+            ("write_file", {"path": "tests/test_x.py", "content": "def test_foo(): pass"}),
+            ("write_file", {"path": "conf.yaml", "content": "a: 1"}),
+            ("write_file", {"path": "data.yaml", "content": "b: 2"}),
+            ("bash_command", {"command": command}),
+        ]
+
+        deps = detect_tool_dependencies(tool_calls)
+
+        expected = "tool_0" if "test_x" in command else "tool_1"
+        assert deps[3].depends_on == {expected}
+
+    def test_git_sequential_per_repository(self, temp_project):
+        """Git calls in different repositories do not wait for each other."""
+        from jdev_tui.core.parallel_executor import detect_tool_dependencies
+
+        for name in ("one", "two"):
+            (temp_project / name / ".git").mkdir(parents=True)
+        tool_calls = [
+            ("git_status", {"path": str(temp_project / "one")}),
+            ("git_status", {"path": str(temp_project / "two")}),
+            ("git_diff", {"path": str(temp_project / "one" / "src")}),
+        ]
+
+        deps = detect_tool_dependencies(tool_calls)
+
+        assert deps[1].depends_on == set()
+        assert deps[2].depends_on == {"tool_0"}
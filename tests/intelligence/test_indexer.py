@@ -0,0 +1,279 @@
+"""
+Tests for SemanticIndexer: incremental indexing and symbol extraction.
+"""
+
+import os
+
+import pytest
+
+from jdev_cli.intelligence import indexer as indexer_module
+from jdev_cli.intelligence.indexer import SemanticIndexer
+
+
+@pytest.fixture
+def temp_project(tmp_path):
+    """Create a small project with two modules."""
+    (tmp_path / "alpha.py").write_text("""
+def alpha():
+    '''Alpha function.'''
+    pass
+
+class Alpha:
+    def run(self):
+        pass
+""")
+    (tmp_path / "beta.py").write_text("""
+import os
+
+def beta():
+    pass
+""")
+    return tmp_path
+
+
+def _bump_mtime(path):
+    """Force a distinct mtime so the stat fast-path sees a change."""
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+class TestIncrementalIndexing:
+    """Test per-file invalidation and the stat fast-path."""
+
+    def test_reindex_does_not_duplicate_symbols(self, temp_project):
+        """Force re-indexing replaces symbols instead of appending."""
+        indexer = SemanticIndexer(root_path=str(temp_project))
+        indexer.index_codebase()
+        indexer.index_codebase(force=True)
+
+        assert len(indexer.find_symbol("alpha")) == 1
+        assert len(indexer.find_symbol("Alpha")) == 1
+
+    def test_unchanged_files_skip_hashing(self, temp_project, monkeypatch):
+        """Files with an identical stat fingerprint are never hashed."""
+        indexer = SemanticIndexer(root_path=str(temp_project))
+        assert indexer.index_codebase() == 2
+
+        def fail_hash(path):
+            raise AssertionError(f"unexpected hash of {path}")
+
+        monkeypatch.setattr(indexer, "compute_file_hash", fail_hash)
+        assert indexer.index_codebase() == 0
+
+    def test_touched_file_with_same_content_is_not_reparsed(self, temp_project):
+        """A new mtime with identical content only refreshes the fingerprint."""
+        indexer = SemanticIndexer(root_path=str(temp_project))
+        indexer.index_codebase()
+
+        _bump_mtime(temp_project / "alpha.py")
+
+        assert indexer.index_codebase() == 0
+        entry = indexer.file_index["alpha.py"]
+        assert entry.mtime_ns == (temp_project / "alpha.py").stat().st_mtime_ns
+
+    def test_changed_file_replaces_stale_symbols(self, temp_project):
+        """Renamed symbols disappear from the index when a file changes."""
+        indexer = SemanticIndexer(root_path=str(temp_project))
+        indexer.index_codebase()
+
+        target = temp_project / "beta.py"
+        target.write_text("import sys\n\ndef gamma():\n    pass\n")
+        _bump_mtime(target)
+
+        assert indexer.index_codebase() == 1
+        assert indexer.find_symbol("beta") == []
+        assert len(indexer.find_symbol("gamma")) == 1
+        assert indexer.import_graph["beta.py"] == {"sys"}
+
+    def test_deleted_file_is_dropped(self, temp_project):
+        """Symbols and import edges of deleted files are removed."""
+        indexer = SemanticIndexer(root_path=str(temp_project))
+        indexer.index_codebase()
+
+        (temp_project / "beta.py").unlink()
+        indexer.index_codebase()
+
+        assert "beta.py" not in indexer.file_index
+        assert "beta.py" not in indexer.import_graph
+        assert indexer.find_symbol("beta") == []
+
+    def test_cache_roundtrip_keeps_fast_path(self, temp_project, monkeypatch):
+        """A reloaded index skips unchanged files without hashing."""
+        SemanticIndexer(root_path=str(temp_project)).index_codebase()
+
+        reloaded = SemanticIndexer(root_path=str(temp_project))
+        assert reloaded.load_cache() is True
+
+        monkeypatch.setattr(reloaded, "compute_file_hash", lambda path: pytest.fail("hashed"))
+        assert reloaded.index_codebase() == 0
+        assert len(reloaded.find_symbol("alpha")) == 1
+
+    def test_process_pool_matches_serial(self, tmp_path, monkeypatch):
+        """Parallel parsing yields the same index as serial parsing."""
+        for i in range(8):
+            (tmp_path / f"mod{i}.py").write_text(f"class C{i}:\n    def m{i}(self):\n        pass\n")
+
+        monkeypatch.setattr(indexer_module, "PARALLEL_PARSE_THRESHOLD", 1)
+
+        serial = SemanticIndexer(root_path=str(tmp_path), cache_dir=str(tmp_path / "serial"))
+        parallel = SemanticIndexer(root_path=str(tmp_path), cache_dir=str(tmp_path / "parallel"))
+
+        assert serial.index_codebase(workers=1) == 8
+        assert parallel.index_codebase(workers=2) == 8
+        assert serial.get_stats() == parallel.get_stats()
+        assert parallel.find_symbol("m3")[0].parent == "C3"
+
+
+class TestSymbolExtraction:
+    """Test the single-pass symbol visitor."""
+
+    @pytest.fixture
+    def parsed(self, tmp_path):
+        """Parse a module exercising every scope kind."""
+        pkg = tmp_path / "pkg" / "sub"
+        pkg.mkdir(parents=True)
+        source = pkg / "module.py"
+        source.write_text('''
+from . import sibling
+from .. import config
+from ..core.base import Base
+import json
+
+class Outer(Base, metaclass=Meta):
+    """Outer class."""
+
+    def method(self, x: int, y=2, *args, flag: bool = False, **kw) -> int:
+        def inner(z):
+            return z
+        return x
+
+    async def fetch(self, /, key: str = "k") -> str:
+        return key
+
+    class Inner:
+        def deep(self):
+            pass
+
+async def top_level(*, timeout: float = 1.0):
+    pass
+''')
+        indexer = SemanticIndexer(root_path=str(tmp_path))
+        file_idx = indexer.parse_file(source)
+        assert file_idx is not None
+        return {s.name: s for s in file_idx.symbols}, file_idx.imports
+
+    def test_methods_and_nested_scopes(self, parsed):
+        symbols, _ = parsed
+
+        assert symbols["Outer"].type == "class"
+        assert symbols["Outer"].parent is None
+        assert symbols["method"].type == "method"
+        assert symbols["method"].parent == "Outer"
+        assert symbols["inner"].type == "function"
+        assert symbols["inner"].parent == "Outer.method"
+        assert symbols["Inner"].parent == "Outer"
+        assert symbols["deep"].type == "method"
+        assert symbols["deep"].parent == "Outer.Inner"
+
+    def test_async_functions_are_indexed(self, parsed):
+        symbols, _ = parsed
+
+        assert symbols["fetch"].type == "method"
+        assert symbols["top_level"].type == "function"
+        assert symbols["top_level"].signature == "async top_level(*, timeout: float = 1.0)"
+
+    def test_full_signatures(self, parsed):
+        symbols, _ = parsed
+
+        assert symbols["method"].signature == (
+            "method(self, x: int, y=2, *args, flag: bool = False, **kw) -> int"
+        )
+        assert symbols["fetch"].signature == 'async fetch(self, /, key: str = \'k\') -> str'
+        assert symbols["Outer"].signature == "Outer(Base, metaclass=Meta)"
+
+    def test_relative_imports_are_resolved(self, parsed):
+        _, imports = parsed
+
+        assert imports == ["pkg.sub.sibling", "pkg.config", "pkg.core.base", "json"]
+
+
+class TestBinaryIndex:
+    """Test the memory-mapped on-disk index."""
+
+    def test_roundtrip_preserves_symbols_and_stats(self, temp_project):
+        """A reloaded index answers lookups exactly like the original."""
+        original = SemanticIndexer(root_path=str(temp_project))
+        original.index_codebase()
+
+        reloaded = SemanticIndexer(root_path=str(temp_project))
+        assert reloaded.load_cache() is True
+
+        assert reloaded.get_stats() == original.get_stats()
+        assert reloaded.find_symbol("alpha") == original.find_symbol("alpha")
+        assert reloaded.find_symbol("run", type="method")[0].parent == "Alpha"
+        assert list(reloaded.file_index["beta.py"].imports) == ["os"]
+        assert reloaded.search_symbols("alp") == original.search_symbols("alp")
+
+    def test_load_does_not_materialize_symbols(self, temp_project, monkeypatch):
+        """Opening the index only reads file fingerprints."""
+        SemanticIndexer(root_path=str(temp_project)).index_codebase()
+
+        def fail_symbol(*args, **kwargs):
+            raise AssertionError("Symbol built during load")
+
+        monkeypatch.setattr(indexer_module, "Symbol", fail_symbol)
+        reloaded = SemanticIndexer(root_path=str(temp_project))
+        assert reloaded.load_cache() is True
+        assert len(reloaded.file_index) == 2
+
+    def test_changes_after_load_shadow_stored_symbols(self, temp_project):
+        """Re-parsed and deleted files hide their stored symbols."""
+        SemanticIndexer(root_path=str(temp_project)).index_codebase()
+
+        reloaded = SemanticIndexer(root_path=str(temp_project))
+        reloaded.load_cache()
+
+        target = temp_project / "alpha.py"
+        target.write_text("def omega():\n    pass\n")
+        _bump_mtime(target)
+        (temp_project / "beta.py").unlink()
+
+        assert reloaded.index_codebase() == 1
+        assert reloaded.find_symbol("alpha") == []
+        assert reloaded.find_symbol("beta") == []
+        assert len(reloaded.find_symbol("omega")) == 1
+        assert reloaded.get_stats()["total_symbols"] == 1
+
+        # The rewritten index merges stored and fresh data
+        again = SemanticIndexer(root_path=str(temp_project))
+        again.load_cache()
+        assert again.get_stats() == reloaded.get_stats()
+
+    def test_write_is_atomic(self, temp_project):
+        """No temp files are left next to the index."""
+        indexer = SemanticIndexer(root_path=str(temp_project))
+        indexer.index_codebase()
+
+        assert sorted(p.name for p in indexer.cache_dir.iterdir()) == [indexer_module.INDEX_FILE]
+
+    def test_incompatible_version_is_rejected(self, temp_project):
+        """An index from another format version triggers a rebuild."""
+        indexer = SemanticIndexer(root_path=str(temp_project))
+        indexer.index_codebase()
+
+        index_file = indexer.cache_dir / indexer_module.INDEX_FILE
+        data = bytearray(index_file.read_bytes())
+        data[4] = 0xEE
+        index_file.write_bytes(bytes(data))
+
+        assert SemanticIndexer(root_path=str(temp_project)).load_cache() is False
+
+    def test_truncated_index_is_rejected(self, temp_project):
+        """A partially written index is ignored instead of crashing."""
+        indexer = SemanticIndexer(root_path=str(temp_project))
+        indexer.index_codebase()
+
+        index_file = indexer.cache_dir / indexer_module.INDEX_FILE
+        index_file.write_bytes(index_file.read_bytes()[:64])
+
+        assert SemanticIndexer(root_path=str(temp_project)).load_cache() is False
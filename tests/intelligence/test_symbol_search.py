@@ -0,0 +1,134 @@
+"""
+Tests for SymbolNameIndex fuzzy symbol lookup.
+"""
+
+import pytest
+
+from jdev_cli.intelligence import symbol_search
+from jdev_cli.intelligence.indexer import SemanticIndexer
+from jdev_cli.intelligence.symbol_search import SymbolNameIndex, split_words
+
+
+NAMES = [
+    "SemanticIndexer", "get_file_context", "getFileContext", "index_codebase",
+    "Index", "reindex", "HTTPServer", "server_start", "indexer", "parse_file",
+]
+
+
+@pytest.fixture
+def index():
+    """Index over a small vocabulary of realistic names."""
+    return SymbolNameIndex.from_counts((name, 1) for name in NAMES)
+
+
+class TestSplitWords:
+    """Test identifier splitting."""
+
+    def test_camel_snake_and_acronyms(self):
+        assert split_words("get_file_context") == ["get", "file", "context"]
+        assert split_words("SemanticIndexer") == ["semantic", "indexer"]
+        assert split_words("HTTPServer2") == ["http", "server", "2"]
+        assert split_words("__init__") == ["init"]
+
+
+class TestRanking:
+    """Test tiered ranking."""
+
+    def test_exact_then_prefix_then_boundary_then_substring(self, index):
+        assert index.search("index") == [
+            "Index", "index_codebase", "indexer", "SemanticIndexer", "reindex",
+        ]
+
+    def test_query_is_case_insensitive(self, index):
+        assert index.search("INDEX") == index.search("index")
+
+    def test_acronym_boundary_counts_as_word_start(self, index):
+        assert index.search("server") == ["server_start", "HTTPServer"]
+
+    def test_plain_abbreviation(self, index):
+        assert index.search("gfc") == ["get_file_context", "getFileContext"]
+
+    def test_camel_case_abbreviation(self, index):
+        assert index.search("semInd") == ["SemanticIndexer"]
+        assert index.search("sem_ind") == ["SemanticIndexer"]
+
+    def test_explicit_hump_must_start_a_word(self, index):
+        assert index.search("semNtic") == []
+
+    def test_short_queries_match_substrings(self, index):
+        assert index.search("in") == ["Index", "index_codebase", "indexer", "SemanticIndexer", "reindex"]
+        assert index.search("fi") == ["get_file_context", "getFileContext", "parse_file"]
+
+    def test_limit_keeps_best_ranked(self, index):
+        assert index.search("index", limit=2) == ["Index", "index_codebase"]
+
+    def test_no_match(self, index):
+        assert index.search("zzz") == []
+
+
+class TestIncrementalUpdates:
+    """Test reference counting and compaction."""
+
+    def test_name_survives_until_last_reference(self, index):
+        index.add("parse_file")
+        index.discard("parse_file")
+        assert index.search("parse_file") == ["parse_file"]
+
+        index.discard("parse_file")
+        assert index.search("parse_file") == []
+        assert "parse_file" not in index
+
+    def test_revived_name_is_searchable(self, index):
+        index.discard("reindex")
+        index.add("reindex")
+        assert index.search("reind") == ["reindex"]
+        assert index.search("eind") == ["reindex"]
+
+    def test_compaction_preserves_live_names(self, monkeypatch):
+        monkeypatch.setattr(symbol_search, "_COMPACT_MIN_DEAD", 2)
+        index = SymbolNameIndex()
+        for i in range(10):
+            index.add(f"temp_{i}")
+        index.add("keeper")
+
+        for i in range(10):
+            index.discard(f"temp_{i}")
+
+        assert len(index) == 1
+        assert len(index._names) < 11
+        assert index.search("keep") == ["keeper"]
+        assert index.search("temp") == []
+
+
+class TestIndexerIntegration:
+    """Test the name index stays in sync with re-indexing."""
+
+    def test_search_reflects_reindexed_files(self, tmp_path):
+        source = tmp_path / "mod.py"
+        source.write_text("def old_handler():\n    pass\n")
+
+        indexer = SemanticIndexer(root_path=str(tmp_path))
+        indexer.index_codebase()
+        assert [s.name for s in indexer.search_symbols("handler")] == ["old_handler"]
+
+        source.write_text("def new_handler():\n    pass\n")
+        indexer.index_codebase(force=True)
+
+        assert [s.name for s in indexer.search_symbols("handler")] == ["new_handler"]
+
+    def test_short_query_finds_substrings(self, tmp_path):
+        (tmp_path / "mod.py").write_text("def get_db():\n    pass\n")
+
+        indexer = SemanticIndexer(root_path=str(tmp_path))
+        indexer.index_codebase()
+
+        assert [s.name for s in indexer.search_symbols("db")] == ["get_db"]
+
+    def test_search_over_loaded_index(self, tmp_path):
+        (tmp_path / "mod.py").write_text("class SemanticIndexer:\n    pass\n")
+        SemanticIndexer(root_path=str(tmp_path)).index_codebase()
+
+        reloaded = SemanticIndexer(root_path=str(tmp_path))
+        reloaded.load_cache()
+
+        assert [s.name for s in reloaded.search_symbols("semInd")] == ["SemanticIndexer"]
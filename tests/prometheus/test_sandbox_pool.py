@@ -0,0 +1,154 @@
+"""Tests for the warm interpreter pool behind SandboxExecutor."""
+
+import pytest
+
+from prometheus.sandbox.executor import SandboxConfig, SandboxExecutor
+from prometheus.sandbox.pool import POOL_AVAILABLE, InterpreterPool
+
+pytestmark = pytest.mark.skipif(not POOL_AVAILABLE, reason="interpreter pool needs POSIX")
+
+
+@pytest.fixture
+def pool():
+    pool = InterpreterPool(size=1, max_executions=5, preload=["json"])
+    pool.start()
+    yield pool
+    pool.close()
+
+
+@pytest.fixture
+def executor():
+    executor = SandboxExecutor(SandboxConfig(pool_size=1))
+    yield executor
+    executor.close()
+
+
+class TestInterpreterPool:
+    """Worker reuse, isolation and recycling."""
+
+    def test_reuses_warm_worker_with_fresh_namespace(self, pool):
+        first = pool.run("x = 41\nprint(x + 1)", timeout=5)
+        second = pool.run("print('x' in globals())", timeout=5)
+
+        assert first.stdout == "42\n"
+        assert second.stdout == "False\n"
+        assert pool.get_stats()["spawned"] == 1
+
+    def test_exceptions_and_exit_codes(self, pool):
+        error = pool.run("raise ValueError('boom')", timeout=5)
+        exited = pool.run("import sys\nsys.exit(3)", timeout=5)
+
+        assert error.returncode == 1
+        assert error.stderr.startswith("Traceback")
+        assert "ValueError: boom" in error.stderr
+        assert "worker.py" not in error.stderr
+        assert exited.returncode == 3
+
+    def test_recycles_after_max_executions(self, pool):
+        for _ in range(6):
+            pool.run("pass", timeout=5)
+
+        stats = pool.get_stats()
+        assert stats["recycled"] == 1
+        assert stats["spawned"] == 2
+
+    def test_patched_modules_do_not_leak(self, pool):
+        result = pool.run("import json\njson.dumps = lambda *a, **k: 'hacked'", timeout=5)
+        clean = pool.run("import json\nprint(json.dumps([1]))", timeout=5)
+
+        assert result.returncode == 0
+        assert clean.stdout == "[1]\n"
+        assert pool.get_stats()["spawned"] == 1
+
+    def test_unwatched_module_patch_does_not_leak(self, pool):
+        pool.run("import textwrap\ntextwrap.dedent = lambda s: 'EVIL'", timeout=5)
+        clean = pool.run("import textwrap\nprint(textwrap.dedent('  x'))", timeout=5)
+
+        assert clean.stdout == "x\n"
+
+    def test_snippet_cannot_disable_isolation(self, pool):
+        pool.run(
+            "import gc, os, sys\n"
+            "main = sys.modules['__main__']\n"
+            "for obj in list(vars(main).values()) + gc.get_objects():\n"
+            "    if hasattr(obj, 'changed'):\n"
+            "        type(obj).changed = lambda self: False\n"
+            "os.environ['SANDBOX_LEAK'] = '1'\n"
+            "os.chdir('/')",
+            timeout=5,
+        )
+        clean = pool.run("import os\nprint(os.environ.get('SANDBOX_LEAK'), os.getcwd() == '/')", timeout=5)
+
+        assert clean.stdout == "None False\n"
+
+    def test_timeout_even_when_snippet_swallows_exceptions(self, pool):
+        result = pool.run("while True:\n    try:\n        pass\n    except Exception:\n        pass", timeout=0.5)
+
+        assert result.timed_out
+        assert pool.run("print('alive')", timeout=5).stdout == "alive\n"
+
+    def test_crashed_snippet_does_not_stop_batch(self, pool):
+        results = pool.run_batch(["print(1)", "import os\nos._exit(7)", "print(3)"], timeout=5)
+
+        assert [r.stdout for r in results] == ["1\n", "", "3\n"]
+        assert results[1].returncode == 7
+        assert pool.get_stats()["crashed"] == 1
+        assert pool.get_stats()["spawned"] == 1
+
+    def test_killed_worker_is_replaced_mid_batch(self, pool):
+        results = pool.run_batch(["print(1)", "import os, signal\nos.kill(os.getppid(), signal.SIGKILL)", "print(3)"], timeout=5)
+
+        assert [r.stdout for r in results] == ["1\n", "", "3\n"]
+        assert results[1].returncode != 0
+        assert pool.get_stats()["spawned"] == 2
+
+    def test_memory_limit(self):
+        pool = InterpreterPool(size=1, max_memory_mb=256)
+        try:
+            result = pool.run("x = bytearray(1024 ** 3)", timeout=5)
+            assert "MemoryError" in result.stderr
+            assert pool.run("print('ok')", timeout=5).stdout == "ok\n"
+        finally:
+            pool.close()
+
+
+class TestExecutorPool:
+    """SandboxExecutor behaviour on top of the pool."""
+
+    async def test_execute_captures_return_value(self, executor):
+        result = await executor.execute("print('hi')\n6 * 7")
+
+        assert result.success
+        assert result.return_value == 42
+        assert result.stdout == "hi"
+
+    async def test_execute_batch_keeps_order_and_validation(self, executor):
+        results = await executor.execute_batch(["1 + 1", "import socket", "2 + 2"])
+
+        assert [r.return_value for r in results] == [2, None, 4]
+        assert results[1].error_type == "ValidationError"
+
+    async def test_test_code_runs_cases_in_one_worker(self, executor):
+        report = await executor.test_code(
+            "def test_function(x):\n    return x * 2",
+            [{"input": {"x": i}, "expected": i * 2} for i in range(20)] + [{"input": {"x": 1}, "expected": 0}],
+        )
+
+        assert report["passed"] == 20
+        assert report["failed"] == 1
+        assert executor.pool.get_stats()["spawned"] == 1
+
+    async def test_timeout_result(self, executor):
+        result = await executor.execute("while True:\n    pass", timeout=0.5)
+
+        assert result.error_type == "TimeoutError"
+
+    async def test_subprocess_fallback_matches(self):
+        executor = SandboxExecutor(SandboxConfig(use_pool=False))
+        result = await executor.execute("print('hi')\n6 * 7")
+        batch = await executor.execute_batch(["1 + 1", "raise ValueError('x')"])
+
+        assert executor.pool is None
+        assert (result.stdout, result.return_value) == ("hi", 42)
+        assert batch[0].return_value == 2
+        assert batch[1].error_type == "RuntimeError"
@@ -0,0 +1,157 @@
+"""
+Tests for the indexed, group-commit audit backend and the batching AuditLogger.
+"""
+
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from jdev_governance.justica.audit import (
+    AuditBackend,
+    AuditCategory,
+    AuditEntry,
+    AuditLevel,
+    AuditLogger,
+    InMemoryBackend,
+)
+from jdev_governance.justica.audit_store import IndexedFileBackend
+
+T0 = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def make_entries(n, traces=5, agents=3, start=0):
+    trace_ids = [uuid4() for _ in range(traces)]
+    categories = [AuditCategory.CLASSIFICATION_INPUT, AuditCategory.ENFORCEMENT_BLOCK, AuditCategory.TRUST_UPDATE]
+    return [
+        AuditEntry(
+            timestamp=T0 + timedelta(seconds=start + i),
+            level=AuditLevel.SECURITY if i % 7 == 0 else AuditLevel.INFO,
+            category=categories[i % len(categories)],
+            agent_id=f"agent-{i % agents}",
+            action=f"action {start + i}",
+            context={"i": start + i, "pad": "x" * 200},
+            trace_id=trace_ids[i % traces],
+        )
+        for i in range(n)
+    ]
+
+
+def brute_force(entries, level=None, category=None, agent_id=None, trace_id=None, since=None, until=None, limit=100):
+    matches = [
+        e for e in entries
+        if (level is None or e.level == level)
+        and (category is None or e.category == category)
+        and (agent_id is None or e.agent_id == agent_id)
+        and (trace_id is None or e.trace_id == trace_id)
+        and (since is None or e.timestamp >= since)
+        and (until is None or e.timestamp <= until)
+    ]
+    return [e.id for e in matches[-limit:]]
+
+
+class TestIndexedFileBackend:
+    """Segments, compression, sidecar indexes and queries."""
+
+    def test_queries_match_brute_force_across_segments(self, tmp_path):
+        backend = IndexedFileBackend(tmp_path, max_segment_bytes=40_000, block_bytes=4_000)
+        entries = make_entries(1000)
+        entries[500].context["agent_id"] = "agent-1"  # Falso positivo do filtro por bytes
+        for i in range(0, len(entries), 64):
+            assert backend.write_batch(entries[i:i + 64]) == len(entries[i:i + 64])
+
+        names = sorted(os.listdir(tmp_path))
+        assert any(n.endswith(".seg") for n in names) and any(n.endswith(".idx") for n in names)
+        assert sum(n.endswith(".jsonl") for n in names) == 1  # Só o segmento ativo
+
+        trace = entries[3].trace_id
+        queries = [
+            {},
+            {"agent_id": "agent-1", "limit": 10_000},
+            {"trace_id": trace, "limit": 10_000},
+            {"trace_id": trace, "category": AuditCategory.ENFORCEMENT_BLOCK, "limit": 10_000},
+            {"level": AuditLevel.SECURITY, "limit": 7},
+            {"level": AuditLevel.SECURITY, "agent_id": "agent-1", "limit": 10_000},
+            {"since": T0 + timedelta(seconds=100), "until": T0 + timedelta(seconds=130), "limit": 10_000},
+            {"agent_id": "nobody"},
+        ]
+        for query in queries:
+            got = [e.id for e in backend.get_entries(**query)]
+            assert got == brute_force(entries, **query), query
+
+    def test_reopen_recovers_active_segment_and_drops_partial_line(self, tmp_path):
+        backend = IndexedFileBackend(tmp_path, max_segment_bytes=20_000, block_bytes=2_000)
+        entries = make_entries(200)
+        backend.write_batch(entries)
+        backend.close()
+
+        active = [n for n in os.listdir(tmp_path) if n.endswith(".jsonl")][0]
+        with open(tmp_path / active, "ab") as fh:
+            fh.write(b'{"id": "torn')  # Crash no meio de uma escrita
+
+        reopened = IndexedFileBackend(tmp_path, max_segment_bytes=20_000, block_bytes=2_000)
+        more = make_entries(10, start=200)
+        reopened.write_batch(more)
+        got = [e.id for e in reopened.get_entries(limit=10_000)]
+        assert got == [e.id for e in entries + more]
+
+    def test_retention_and_fsync_bound(self, tmp_path):
+        backend = IndexedFileBackend(tmp_path, max_segment_bytes=10_000, block_bytes=2_000, max_segments=2, fsync_interval=0)
+        for i in range(10):
+            backend.write_batch(make_entries(20, start=i * 20))
+        assert sum(n.endswith(".seg") for n in os.listdir(tmp_path)) == 2
+        assert backend.fsyncs == backend.batches_written  # fsync_interval=0: todo lote
+
+
+class RecordingBackend(AuditBackend):
+    def __init__(self):
+        self.batches = []
+        self.gate = threading.Event()
+
+    def write(self, entry):
+        return True
+
+    def write_batch(self, entries):
+        self.gate.wait(5)
+        self.batches.append(len(entries))
+        return len(entries)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class TestBatchingLogger:
+    """Worker drains in batches; backpressure is visible in the metrics."""
+
+    def test_worker_drains_in_batches(self):
+        backend = RecordingBackend()
+        logger = AuditLogger(backends=[backend], queue_size=100, batch_size=32, backpressure_threshold=0.5)
+        for i in range(90):  # O worker segura no máximo um lote: >= 58 na queue
+            logger.log(AuditLevel.INFO, AuditCategory.MONITOR_EVENT, f"event {i}")
+
+        metrics = logger.get_metrics()
+        assert metrics["backpressure"] and metrics["backpressure_events"] == 1
+        assert metrics["queue_high_water"] >= 58 and metrics["sync_fallbacks"] == 0
+
+        backend.gate.set()
+        logger.flush()
+        assert sum(backend.batches) == 90
+        assert max(backend.batches) == 32
+        assert logger.get_metrics()["avg_batch_size"] > 1
+        logger.close()
+
+    def test_full_queue_falls_back_to_sync_write(self):
+        backend = RecordingBackend()
+        memory = InMemoryBackend()
+        logger = AuditLogger(backends=[backend, memory], queue_size=4, batch_size=2)
+        for i in range(20):
+            logger.log(AuditLevel.INFO, AuditCategory.MONITOR_EVENT, f"event {i}")
+        backend.gate.set()
+        logger.flush()
+
+        assert logger.get_metrics()["sync_fallbacks"] > 0
+        assert len(memory.entries) == 20
+        logger.close()
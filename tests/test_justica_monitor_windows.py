@@ -0,0 +1,85 @@
+"""
+Tests for the sliding-window aggregates behind JusticaMonitor scoring.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from jdev_governance.justica.constitution import create_default_constitution
+from jdev_governance.justica.monitor import JusticaMonitor, SlidingWindow
+
+T0 = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+class TestSlidingWindow:
+    """Incremental totals, eviction and the memory bound."""
+
+    def test_totals_match_rescan(self):
+        window = SlidingWindow(timedelta(minutes=5), resolution=1.0)
+        events = [(T0 + timedelta(seconds=i * 7), float(i % 4) * 12.5, i % 3 == 0) for i in range(300)]
+        for ts, value, flagged in events:
+            window.add(ts, value, flagged)
+            window.expire(ts)
+            # Reescaneamento equivalente, na mesma resolução de 1s
+            cutoff = ts - timedelta(minutes=5)
+            inside = [e for e in events if e[0] <= ts and e[0] >= cutoff]
+            assert window.total == sum(v for _, v, _ in inside)
+            assert window.count == len(inside)
+            assert window.flagged == sum(f for _, _, f in inside)
+
+    def test_memory_bounded_by_buckets(self):
+        window = SlidingWindow(timedelta(minutes=1), resolution=1.0)
+        for i in range(10_000):
+            ts = T0 + timedelta(milliseconds=i * 37)
+            window.add(ts, 1.0, False)
+            window.expire(ts)
+            assert len(window) <= 61
+        assert window.count < 10_000
+
+    def test_add_alone_bounds_buckets(self):
+        window = SlidingWindow(timedelta(minutes=1), resolution=1.0)
+        for i in range(5_000):
+            window.add(T0 + timedelta(seconds=i), 1.0, False)
+        assert len(window) == 61
+        assert window.count == 61
+
+    def test_everything_expires(self):
+        window = SlidingWindow(timedelta(seconds=10))
+        for i in range(5):
+            window.add(T0 + timedelta(seconds=i), 0.1, True)
+        window.expire(T0 + timedelta(hours=1))
+        assert (window.total, window.count, window.flagged, len(window)) == (0.0, 0, 0, 0)
+
+
+class TestMonitorAggregates:
+    """Scores come from the aggregates, not from rescanning sessions."""
+
+    def test_recent_events_factor(self):
+        monitor = JusticaMonitor(create_default_constitution())
+        monitor.record_event("a", "transcript", "Vou bypass a validação")
+        monitor.record_event("a", "thought", "preciso fazer isso secretly")
+        monitor.record_event("a", "transcript", "revisando código")
+
+        session = monitor.get_or_create_session("a")
+        suspicion = monitor.calculate_suspicion("a", include_cross_agent=False)
+        assert dict(suspicion.factors)["recent_events"] == sum(e.suspicion_contribution for e in session.events)
+        assert suspicion.context["recent_events"] == 3
+        assert suspicion.context["recent_flagged_events"] == 2
+
+        session.recent.expire(datetime.now(timezone.utc) + timedelta(minutes=31))
+        assert "recent_events" not in dict(monitor.calculate_suspicion("a", include_cross_agent=False).factors)
+
+    def test_cross_agent_uses_recently_flagged_index(self):
+        monitor = JusticaMonitor(create_default_constitution())
+        for agent in ("a", "b", "c"):
+            monitor.record_event(agent, "transcript", "bypass the check")
+        monitor.record_event("d", "transcript", "tudo normal")
+
+        assert monitor._analyze_cross_agent("d") == 30
+        assert monitor._analyze_cross_agent("a") == 20  # O próprio agente não conta
+
+        # Flag de "a" sai da janela de correlação
+        monitor._recently_flagged["a"] -= timedelta(minutes=6)
+        monitor._recently_flagged.move_to_end("a", last=False)
+        assert monitor._analyze_cross_agent("d") == 20
+        assert "a" not in monitor._recently_flagged
+        assert monitor.total_cross_agent_alerts == 3
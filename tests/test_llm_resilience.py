@@ -8,14 +8,19 @@ Tests all resilience patterns:
 - Telemetry and observability (Codex strategy)
 """
 
+import asyncio
 import pytest
 import time
 from jdev_cli.core.llm import (
     LLMClient,
     CircuitBreaker,
     CircuitState,
+    CONTINUE_PROMPT,
+    ProviderLatency,
     RateLimiter,
-    RequestMetrics
+    RequestMetrics,
+    StreamSession,
+    count_tokens
 )
 
 
@@ -299,5 +304,248 @@ class TestLLMClientFailover:
         providers = client._get_failover_providers()
         assert len(providers) >= 1
 
+class FakeProviderClient(LLMClient):
+    """LLMClient over in-process fake providers: name -> (ttft_seconds, tokens, error)."""
+
+    def __init__(self, providers, **kwargs):
+        super().__init__(base_delay=0.01, max_retries=0, **kwargs)
+        self.fake_providers = providers
+        self.provider_priority = list(providers)
+        self.default_provider = self.provider_priority[0]
+        self.cancelled = []
+
+    def _available_providers(self):
+        return list(self.fake_providers)
+
+    async def _open_stream(self, provider, messages, max_tokens, temperature):
+        ttft, tokens, error = self.fake_providers[provider]
+        try:
+            await asyncio.sleep(ttft)
+            if error:
+                raise RuntimeError(error)
+            for i in range(tokens):
+                yield f"{provider}{i} "
+        except asyncio.CancelledError:
+            self.cancelled.append(provider)
+            raise
+
+
+class TestPerProviderResilience:
+    """Per-provider breakers and latency-based routing."""
+
+    async def test_failing_provider_does_not_block_others(self):
+        """One provider's open breaker leaves the others closed."""
+        client = FakeProviderClient({"bad": (0, 1, "400 bad request"), "good": (0, 2, None)})
+
+        for _ in range(5):
+            with pytest.raises(RuntimeError):
+                async for _ in client.stream_chat("hi", provider="bad", enable_failover=False):
+                    pass
+
+        assert client.get_circuit_breaker("bad").state == CircuitState.OPEN
+        assert client.get_circuit_breaker("good").state == CircuitState.CLOSED
+        chunks = [c async for c in client.stream_chat("hi", provider="good", enable_failover=False)]
+        assert chunks == ["good0 ", "good1 "]
+        assert client._get_failover_providers()[-1] == "bad"
+
+    async def test_routes_to_fastest_first_token(self):
+        """Measured providers are ranked by rolling TTFT/throughput; unmeasured ones get the fleet median."""
+        client = FakeProviderClient({"slow": (0.05, 3, None), "fast": (0.0, 3, None), "new": (0, 3, None)})
+        assert client._get_failover_providers() == ["slow", "fast", "new"]  # Sem medições: prioridade
+
+        for provider in ("slow", "fast"):
+            async for _ in client.stream_chat("hi", provider=provider, enable_failover=False):
+                pass
+
+        assert client._get_failover_providers() == ["fast", "slow", "new"]
+        assert "routing" in client.get_metrics()
+
+    async def test_unmeasured_failing_provider_ranks_last(self):
+        """A provider that never completes a stream is not ranked as if it were instant."""
+        client = FakeProviderClient(
+            {"nebius": (0, 1, "500 internal error"), "hf": (0.02, 3, None), "gemini": (0.0, 3, None)},
+            enable_telemetry=True,
+        )
+        for _ in range(3):
+            with pytest.raises(RuntimeError):
+                async for _ in client.stream_chat("hi", provider="nebius", enable_failover=False):
+                    pass
+        for provider in ("hf", "gemini"):
+            async for _ in client.stream_chat("hi", provider=provider, enable_failover=False):
+                pass
+
+        assert client.provider_latency.get("nebius") is None or client.provider_latency["nebius"].ttft_ewma is None
+        assert client._get_failover_providers() == ["gemini", "hf", "nebius"]
+
+    def test_provider_latency_ewma(self):
+        """EWMA blends new samples; quantiles come from the sample window."""
+        latency = ProviderLatency(alpha=0.5)
+        latency.record(ttft=1.0, tokens=11, duration=2.0)
+        latency.record(ttft=3.0, tokens=11, duration=4.0)
+
+        assert latency.ttft_ewma == pytest.approx(2.0)
+        assert latency.tps_ewma == pytest.approx(10.0)
+        assert latency.ttft_quantile(0.95) == 3.0
+        assert ProviderLatency().expected_seconds() == float("inf")
+
+
+class TestHedgedRequests:
+    """Hedged streaming across two providers."""
+
+    async def test_backup_wins_when_primary_stalls(self):
+        """A stalled primary is raced by the backup, and the loser is cancelled."""
+        client = FakeProviderClient(
+            {"stalled": (2.0, 3, None), "backup": (0.0, 3, None)},
+            enable_hedging=True, hedge_delay=0.05,
+        )
+
+        start = time.monotonic()
+        chunks = [c async for c in client.stream_chat("hi", provider="stalled")]
+
+        assert time.monotonic() - start < 1.0
+        assert chunks == ["backup0 ", "backup1 ", "backup2 "]
+        assert client.metrics.hedged_requests == 1
+        assert client.metrics.hedge_wins == 1
+        await asyncio.sleep(0)
+        assert client.cancelled == ["stalled"]
+
+    async def test_no_hedge_when_primary_is_fast(self):
+        """The backup is never started when the first token beats the deadline."""
+        client = FakeProviderClient(
+            {"primary": (0.0, 2, None), "backup": (0.0, 2, None)},
+            enable_hedging=True, hedge_delay=0.5,
+        )
+
+        chunks = [c async for c in client.stream_chat("hi", provider="primary")]
+
+        assert chunks == ["primary0 ", "primary1 "]
+        assert client.metrics.hedged_requests == 0
+
+    async def test_primary_error_fails_over_immediately(self):
+        """A primary that errors before the deadline hands over to the backup."""
+        client = FakeProviderClient(
+            {"broken": (0.0, 1, "400 bad request"), "backup": (0.0, 1, None)},
+            enable_hedging=True, hedge_delay=5.0,
+        )
+
+        start = time.monotonic()
+        chunks = [c async for c in client.stream_chat("hi", provider="broken")]
+
+        assert chunks == ["backup0 "]
+        assert time.monotonic() - start < 1.0
+        assert client.metrics.hedge_wins == 0
+
+    async def test_winner_failing_mid_stream_resumes_on_backup(self):
+        """A backup cancelled after losing the race is still there to resume on."""
+        client = ScriptedClient(
+            {"a": [(["a0 "], "503 unavailable"), ([], "503 unavailable")], "b": [(["b0"], None)]},
+            enable_hedging=True, hedge_delay=0.5,
+        )
+
+        chunks = [c async for c in client.stream_chat("hi", provider="a")]
+
+        assert chunks == ["a0 ", "b0"]
+        assert client.requests[-1][0] == "b"
+
+    def test_hedge_deadline_uses_ttft_quantile(self):
+        """After enough samples the deadline is the primary's TTFT quantile."""
+        client = LLMClient(hedge_delay=9.0, hedge_quantile=0.95)
+        assert client._hedge_deadline("gemini") == 9.0
+
+        latency = client.provider_latency.setdefault("gemini", ProviderLatency())
+        for i in range(100):
+            latency.record(ttft=i / 100, tokens=1, duration=i / 100)
+
+        assert client._hedge_deadline("gemini") == pytest.approx(0.95)
+
+
+class ScriptedClient(LLMClient):
+    """Providers replay scripted attempts: each is (chunks, error raised after them)."""
+
+    def __init__(self, scripts, **kwargs):
+        super().__init__(base_delay=0.0, max_retries=1, enable_rate_limiting=False, **kwargs)
+        self.scripts = {name: list(attempts) for name, attempts in scripts.items()}
+        self.provider_priority = list(scripts)
+        self.default_provider = self.provider_priority[0]
+        self.requests = []
+
+    def _available_providers(self):
+        return list(self.scripts)
+
+    async def _open_stream(self, provider, messages, max_tokens, temperature):
+        self.requests.append((provider, messages))
+        chunks, error = self.scripts[provider].pop(0)
+        for chunk in chunks:
+            yield chunk
+        if error:
+            raise RuntimeError(error)
+
+
+class TestResumableStreaming:
+    """Retries and failover never repeat delivered text."""
+
+    async def test_retry_continues_after_partial_output(self):
+        """A retry asks the provider to continue instead of starting over."""
+        usage = []
+        client = ScriptedClient(
+            {"p": [(["Hello", " wor"], "503 unavailable"), (["ld!"], None)]},
+            token_callback=lambda i, o: usage.append((i, o)),
+        )
+
+        chunks = [c async for c in client.stream_chat("greet", provider="p", enable_failover=False)]
+
+        assert "".join(chunks) == "Hello world!"
+        _, resumed = client.requests[1]
+        assert resumed[-2] == {"role": "assistant", "content": "Hello wor"}
+        assert resumed[-1]["content"] == CONTINUE_PROMPT
+        assert [o for _, o in usage] == [count_tokens("Hello") + count_tokens(" wor"), count_tokens("ld!")]
+        assert usage[1][0] > usage[0][0]  # Continuation prompt carries the partial answer
+        assert client.metrics.resumed_streams == 1
+        assert client.metrics.wasted_tokens == 0
+
+    async def test_suppress_mode_drops_regenerated_prefix(self):
+        """In suppress mode the original request is re-sent and the prefix dropped."""
+        client = ScriptedClient(
+            {"p": [(["def f", "(x):"], "timeout"), (["def f(x", "):", " return x"], None)]},
+            resume_mode="suppress",
+        )
+
+        chunks = [c async for c in client.stream_chat("code", provider="p", enable_failover=False)]
+
+        assert chunks == ["def f", "(x):", " return x"]
+        assert client.requests[0][1] == client.requests[1][1]
+        assert client.metrics.wasted_tokens == count_tokens("def f(x") + count_tokens("):")
+
+    async def test_failover_resumes_on_next_provider(self):
+        """Failing over mid-stream continues on the next provider."""
+        client = ScriptedClient({
+            "a": [(["one ", "two "], "400 bad request")],
+            "b": [(["three"], None)],
+        })
+
+        chunks = [c async for c in client.stream_chat("count", provider="a")]
+
+        assert "".join(chunks) == "one two three"
+        provider, messages = client.requests[-1]
+        assert provider == "b"
+        assert messages[-2]["content"] == "one two "
+
+    def test_session_fork_and_absorb(self):
+        """A hedge loser's output counts as wasted."""
+        session = StreamSession([{"role": "user", "content": "x"}])
+        winner, loser = session.fork(), session.fork()
+        winner.chunks, winner.tokens = ["a"], 1
+        loser.tokens = 5
+
+        session.absorb(winner, [loser])
+
+        assert session.text == "a"
+        assert session.wasted_tokens == 5
+
+    def test_count_tokens(self):
+        assert count_tokens("") == 0
+        assert count_tokens("hello, world") >= 3
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v", "--tb=short"])
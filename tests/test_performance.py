@@ -2,6 +2,8 @@
 
 import pytest
 import asyncio
+import hashlib
+import os
 import tempfile
 from pathlib import Path
 import time
@@ -13,7 +15,7 @@ from jdev_cli.core.async_executor import (
     AsyncExecutor, ToolCall, detect_dependencies
 )
 from jdev_cli.core.file_watcher import (
-    FileWatcher, RecentFilesTracker
+    FileWatcher, RecentFilesTracker, InotifyBackend
 )
 
 
@@ -77,6 +79,71 @@ class TestDiskCache:
             time.sleep(0.2)
             assert cache.get("key1") is None
 
+    def test_write_behind_persists_on_close(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = DiskCache(f"{tmpdir}/test.db", flush_interval=60)
+            cache.set_many({f"k{i}": {"n": i} for i in range(100)})
+            assert cache.get("k5") == {"n": 5}  # Served from the write queue
+            cache.close()
+
+            reopened = DiskCache(f"{tmpdir}/test.db")
+            assert reopened.get_many(["k1", "k99", "absent"]) == {"k1": {"n": 1}, "k99": {"n": 99}}
+            reopened.close()
+
+    def test_value_encoding(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = DiskCache(f"{tmpdir}/test.db", compress_threshold=16)
+            values = {
+                "bytes": b"\x00\x01" * 100,
+                "text": "ação " * 100,
+                "json": {"list": [1, 2.5, None], "nested": {"a": "b" * 500}},
+                "small": 7,
+            }
+            cache.set_many(values)
+            cache.flush()
+
+            assert cache.get_many(values) == values
+            assert cache.get_stats()["bytes"] < len(str(values))  # Compressed
+            cache.close()
+
+    def test_size_bounded_lru_eviction(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = DiskCache(f"{tmpdir}/test.db", max_bytes=20_000, compress=False)
+            cache.set("hot", "x" * 1000)
+            cache.flush()
+            for i in range(50):
+                cache.get("hot")  # Keep it recently used
+                cache.set(f"cold{i}", "y" * 1000)
+                cache.flush()
+
+            stats = cache.get_stats()
+            assert stats["bytes"] <= 20_000
+            assert cache.get("hot") == "x" * 1000
+            assert cache.get("cold0") is None
+            assert cache.get("cold49") == "y" * 1000
+            cache.close()
+
+    def test_delete_and_concurrent_writers(self):
+        import threading
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = DiskCache(f"{tmpdir}/test.db")
+
+            def writer(n):
+                for i in range(200):
+                    cache.set(f"{n}:{i}", i)
+
+            threads = [threading.Thread(target=writer, args=(n,)) for n in range(4)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            cache.delete("0:0")
+
+            assert cache.get("0:0") is None
+            assert cache.get_stats()["entries"] == 799
+            cache.close()
+
 
 class TestPerformanceCache:
     """Test 3-tier cache."""
@@ -206,6 +273,97 @@ class TestFileWatcher:
             events = watcher.recent_events
             assert len(events) == 1
             assert events[0].event_type == 'modified'
+            assert events[0].file_hash == hashlib.md5(b"print('world')").hexdigest()
+
+    @pytest.mark.parametrize("backend", ["polling", "inotify"])
+    def test_create_modify_delete(self, backend):
+        if backend == "inotify" and not InotifyBackend.available():
+            pytest.skip("inotify not available")
+        with tempfile.TemporaryDirectory() as tmpdir:
+            existing = Path(tmpdir) / "keep.py"
+            existing.write_text("x = 1")
+
+            watcher = FileWatcher(tmpdir, backend=backend)
+            watcher.start()
+            assert watcher.backend_name == backend
+
+            time.sleep(0.01)
+            new_dir = Path(tmpdir) / "pkg"
+            new_dir.mkdir()
+            (new_dir / "new.py").write_text("y = 2")
+            existing.write_text("x = 10")
+            watcher.check_updates()
+            existing.unlink()
+            watcher.check_updates()
+
+            seen = {(Path(e.path).name, e.event_type) for e in watcher.recent_events}
+            assert seen == {("new.py", "created"), ("keep.py", "modified"), ("keep.py", "deleted")}
+            assert watcher.get_stats()["tracked_count"] == 1
+            watcher.stop()
+
+    def test_polling_sees_changes_past_first_8kb(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            test_file = Path(tmpdir) / "big.py"
+            test_file.write_text("#" * 10_000 + "a")
+
+            watcher = FileWatcher(tmpdir, backend="polling")
+            watcher.start()
+
+            time.sleep(0.01)
+            test_file.write_text("#" * 10_000 + "b")
+            events = watcher.check_updates()
+            assert [e.event_type for e in events] == ['modified']
+            assert events[0].file_hash == hashlib.md5(("#" * 10_000 + "b").encode()).hexdigest()
+
+    def test_polling_skips_touch_without_content_change(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            test_file = Path(tmpdir) / "test.py"
+            test_file.write_text("print('hello')")
+
+            watcher = FileWatcher(tmpdir, backend="polling")
+            watcher.start()
+
+            st = test_file.stat()
+            os.utime(test_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+            assert watcher.check_updates() == []
+            os.utime(test_file, ns=(st.st_atime_ns, st.st_mtime_ns + 2_000_000_000))
+            assert watcher.check_updates() == []
+
+    def test_debounce_coalesces_bursts(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            watcher = FileWatcher(tmpdir, backend="polling", debounce=60)
+            batches = []
+            watcher.add_batch_callback(batches.append)
+            watcher.start()
+
+            scratch = Path(tmpdir) / "scratch.py"
+            scratch.write_text("tmp")
+            watcher.check_updates()
+            scratch.unlink()
+            target = Path(tmpdir) / "target.py"
+            target.write_text("a")
+            watcher.check_updates()
+
+            # Still inside the window; created+deleted cancelled out
+            assert batches == []
+            assert watcher.get_stats()["pending_count"] == 1
+
+            watcher._debounce = 0
+            watcher.check_updates()
+            assert [[(Path(e.path).name, e.event_type) for e in b] for b in batches] == [
+                [("target.py", "created")]
+            ]
+
+    def test_max_files_bounds_tracking(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for i in range(5):
+                (Path(tmpdir) / f"f{i}.py").write_text("")
+
+            watcher = FileWatcher(tmpdir, backend="polling", max_files=3)
+            watcher.start()
+
+            assert watcher.tracked_files == 3
+            assert watcher.check_updates() == []
 
 
 class TestRecentFilesTracker:
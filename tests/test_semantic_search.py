@@ -163,7 +163,7 @@ class Class{i}:
 
             # Verify: Text search works
             assert result.success is True
-            assert result.metadata['tool'] in ['ripgrep', 'grep']
+            assert result.metadata['tool'] in ['ripgrep', 'builtin']
 
     @pytest.mark.asyncio
     async def test_semantic_search_empty_query(self):
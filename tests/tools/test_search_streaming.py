@@ -0,0 +1,185 @@
+"""Tests for streaming ripgrep execution in SearchFilesTool.
+
+A fake `rg` on PATH replays canned `--json` output so the tests do not
+depend on ripgrep being installed.
+"""
+
+import asyncio
+import json
+import os
+import shutil
+import stat
+import sys
+import textwrap
+import time
+
+import pytest
+
+from jdev_cli.tools.search import SearchFilesTool, ripgrep_stream
+
+
+def _match(path, line, text, offset, start, end):
+    return {"type": "match", "data": {
+        "path": {"text": path}, "lines": {"text": text + "\n"},
+        "line_number": line, "absolute_offset": offset,
+        "submatches": [{"match": {"text": text[start:end]}, "start": start, "end": end}],
+    }}
+
+
+def _context(path, line, text):
+    return {"type": "context", "data": {
+        "path": {"text": path}, "lines": {"text": text + "\n"}, "line_number": line,
+    }}
+
+
+@pytest.fixture
+def fake_rg(tmp_path, monkeypatch):
+    """Install a fake rg that prints given events, then optionally hangs."""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+
+    def install(events, hang=False, exit_code=0):
+        events_file = tmp_path / "events.json"
+        events_file.write_text(json.dumps(events))
+        script = bin_dir / "rg"
+        script.write_text(textwrap.dedent(f"""\
+            #!{sys.executable}
+            import json, os, sys, time
+            with open({str(tmp_path / "argv.json")!r}, "w") as f:
+                json.dump({{"argv": sys.argv[1:], "pid": os.getpid()}}, f)
+            for event in json.load(open({str(events_file)!r})):
+                print(json.dumps(event), flush=True)
+            if {hang!r}:
+                while True:
+                    print(json.dumps({{"type": "match", "data": {{"path": {{"text": "spam"}},
+                        "lines": {{"text": "x"}}, "line_number": 1, "absolute_offset": 0,
+                        "submatches": []}}}}), flush=True)
+                    time.sleep(0.001)
+            sys.exit({exit_code})
+        """))
+        script.chmod(script.stat().st_mode | stat.S_IEXEC)
+        monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+        return tmp_path / "argv.json"
+
+    return install
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    # Reaped children disappear; zombies would still answer
+    try:
+        return os.waitpid(pid, os.WNOHANG) == (0, 0)
+    except ChildProcessError:
+        return False
+
+
+class TestRipgrepStreaming:
+    """Streaming rg --json execution."""
+
+    async def test_structured_matches(self, fake_rg):
+        fake_rg([
+            {"type": "begin", "data": {"path": {"text": "a.py"}}},
+            _match("a.py", 3, "def foo():", 20, 4, 7),
+            {"type": "end", "data": {}},
+        ], exit_code=0)
+
+        result = await SearchFilesTool()._execute_validated(pattern="foo", path=".")
+
+        assert result.success
+        assert result.metadata["tool"] == "ripgrep"
+        assert result.data["matches"] == [{
+            "file": "a.py", "line": 3, "text": "def foo():", "byte_offset": 20,
+            "submatches": [{"start": 4, "end": 7, "text": "foo"}],
+        }]
+
+    async def test_context_lines_are_attached(self, fake_rg):
+        fake_rg([
+            {"type": "begin", "data": {"path": {"text": "a.py"}}},
+            _context("a.py", 1, "import os"),
+            _match("a.py", 2, "x = foo", 10, 4, 7),
+            _context("a.py", 3, "y = 1"),
+            _match("a.py", 4, "z = foo", 22, 4, 7),
+            _context("a.py", 5, "w = 2"),
+            {"type": "end", "data": {}},
+        ])
+
+        result = await SearchFilesTool()._execute_validated(pattern="foo", context_lines=1)
+
+        first, second = result.data["matches"]
+        assert first["context_before"] == ["import os"]
+        assert first["context_after"] == ["y = 1"]
+        assert second["context_before"] == ["y = 1"]
+        assert second["context_after"] == ["w = 2"]
+
+    async def test_limits_are_pushed_down(self, fake_rg):
+        argv_file = fake_rg([])
+
+        result = await SearchFilesTool()._execute_validated(
+            pattern="-dash", path="src", max_results=7, file_pattern="*.py"
+        )
+
+        argv = json.loads(argv_file.read_text())["argv"]
+        assert result.success and result.data["count"] == 0
+        assert argv[argv.index("--max-count") + 1] == "7"
+        assert "--max-filesize" in argv
+        assert argv[-4:] == ["-e", "-dash", "--", "src"]
+
+    async def test_stops_rg_once_max_results_reached(self, fake_rg):
+        argv_file = fake_rg([_match("a.py", i, "hit", i * 10, 0, 3) for i in range(1, 4)], hang=True)
+
+        started = time.monotonic()
+        result = await SearchFilesTool()._execute_validated(pattern="hit", max_results=5)
+
+        assert time.monotonic() - started < 5
+        assert result.data["count"] == 5
+        assert result.metadata["truncated"] is True
+        assert not _pid_alive(json.loads(argv_file.read_text())["pid"])
+
+    async def test_cancellation_kills_rg(self, fake_rg):
+        argv_file = fake_rg([], hang=True)
+
+        async def consume():
+            async for _ in ripgrep_stream("x", "."):
+                pass
+
+        task = asyncio.create_task(consume())
+        while not argv_file.exists():
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert not _pid_alive(json.loads(argv_file.read_text())["pid"])
+
+    async def test_oversized_line_is_skipped_whole(self, fake_rg, monkeypatch):
+        monkeypatch.setattr("jdev_cli.tools.search._RG_LINE_LIMIT", 4096)
+        fake_rg([
+            _match("a.py", 1, "foo" + "x" * 50_000, 0, 0, 3),
+            _match("a.py", 2, "foo = 1", 50_005, 0, 3),
+        ])
+
+        matches = [m async for m in ripgrep_stream("foo", ".")]
+
+        assert [m["line"] for m in matches] == [2]
+
+    async def test_rg_error_is_reported(self, fake_rg):
+        fake_rg([], exit_code=2)
+
+        result = await SearchFilesTool()._execute_validated(pattern="(unclosed")
+
+        assert not result.success
+
+    @pytest.mark.skipif(shutil.which("rg") is None, reason="ripgrep not installed")
+    async def test_real_ripgrep_offsets(self, tmp_path):
+        (tmp_path / "m.py").write_text("a = 1\nb = needle\n")
+
+        result = await SearchFilesTool()._execute_validated(pattern="needle", path=str(tmp_path))
+
+        (match,) = result.data["matches"]
+        assert match["line"] == 2
+        assert match["byte_offset"] == 6
+        assert match["submatches"][0]["start"] == 4
@@ -0,0 +1,146 @@
+"""Tests for the built-in text search engine (ripgrep fallback)."""
+
+import os
+
+import pytest
+
+from jdev_cli.tools import text_search
+from jdev_cli.tools.search import SearchFilesTool
+from jdev_cli.tools.text_search import IgnoreFile, iter_files, iter_matches
+
+
+def _files(root, **kwargs):
+    return sorted(rel for _, rel in iter_files(str(root), **kwargs))
+
+
+@pytest.fixture
+def tree(tmp_path):
+    """A small repository with ignored, hidden and binary content."""
+    (tmp_path / ".gitignore").write_text("*.log\nbuild/\n/top_only.py\n!keep.log\nnode_modules/\n")
+    (tmp_path / "main.py").write_text("import os\nneedle = 1\n")
+    (tmp_path / "top_only.py").write_text("needle\n")
+    (tmp_path / "debug.log").write_text("needle\n")
+    (tmp_path / "keep.log").write_text("needle\n")
+    (tmp_path / "blob.bin").write_bytes(b"needle\0\x01\x02")
+    (tmp_path / ".hidden.py").write_text("needle\n")
+
+    (tmp_path / "build").mkdir()
+    (tmp_path / "build" / "out.py").write_text("needle\n")
+    (tmp_path / "node_modules" / "pkg").mkdir(parents=True)
+    (tmp_path / "node_modules" / "pkg" / "index.js").write_text("needle\n")
+
+    sub = tmp_path / "src"
+    sub.mkdir()
+    (sub / "top_only.py").write_text("needle\n")
+    (sub / ".gitignore").write_text("generated_*.py\n")
+    (sub / "generated_a.py").write_text("needle\n")
+    (sub / "util.py").write_text("def helper():\n    return 'NEEDLE'\n")
+    return tmp_path
+
+
+class TestIgnoreRules:
+    """gitignore semantics."""
+
+    def test_walk_honors_gitignore_hidden_and_nesting(self, tree):
+        assert _files(tree) == [
+            "blob.bin", "keep.log", "main.py", "src/top_only.py", "src/util.py",
+        ]
+
+    def test_negation_and_anchoring(self):
+        rules = IgnoreFile("", ["*.py", "!keep.py", "/root_only", "docs/**/draft.md", "cache/"])
+
+        assert rules.match("a/b.py", False) is True
+        assert rules.match("a/keep.py", False) is False
+        assert rules.match("root_only", False) is True
+        assert rules.match("sub/root_only", False) is None
+        assert rules.match("docs/draft.md", False) is True
+        assert rules.match("docs/x/y/draft.md", False) is True
+        assert rules.match("cache", True) is True
+        assert rules.match("cache", False) is None
+
+    def test_glob_filter_semantics(self, tree):
+        assert _files(tree, globs=["*.py"]) == ["main.py", "src/top_only.py", "src/util.py"]
+        assert _files(tree, globs=["src/*.py", "!util.py"]) == ["src/top_only.py"]
+
+
+class TestMatching:
+    """Line matching over read and mmap buffers."""
+
+    def test_structured_matches(self, tree):
+        (match,) = iter_matches("needle =", str(tree))
+
+        assert match["file"] == os.path.join(str(tree), "main.py")
+        assert match["line"] == 2
+        assert match["byte_offset"] == len("import os\n")
+        assert match["submatches"] == [{"start": 0, "end": 8, "text": "needle ="}]
+
+    def test_binary_files_are_skipped_and_case_folding(self, tree):
+        found = {os.path.basename(m["file"]) for m in iter_matches("needle", str(tree), ignore_case=True)}
+
+        assert found == {"main.py", "keep.log", "top_only.py", "util.py"}
+
+    def test_large_file_uses_mmap(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(text_search, "MMAP_THRESHOLD", 16)
+        lines = [f"line {i}" for i in range(1000)]
+        lines[700] = "the needle here"
+        (tmp_path / "big.txt").write_text("\n".join(lines) + "\n")
+
+        (match,) = iter_matches("needle", str(tmp_path), context_lines=1)
+
+        assert match["line"] == 701
+        assert match["context_before"] == ["line 699"]
+        assert match["context_after"] == ["line 701"]
+
+    def test_one_result_per_line_and_max_count(self, tmp_path):
+        (tmp_path / "a.txt").write_text("x x x\nx\nx\n")
+
+        matches = list(iter_matches("x", str(tmp_path), max_count=2))
+
+        assert [m["line"] for m in matches] == [1, 2]
+        assert len(matches[0]["submatches"]) == 3
+
+    def test_matches_never_span_lines(self, tmp_path):
+        (tmp_path / "a.txt").write_text("foo\nbar\nfoo bar\nxyz\n")
+
+        assert [m["line"] for m in iter_matches(r"foo\sbar", str(tmp_path))] == [3]
+        assert [m["line"] for m in iter_matches(r"o[^x]*", str(tmp_path))] == [1, 3]
+        assert list(iter_matches(r"bar.*\n", str(tmp_path))) == []
+
+    def test_results_stream_lazily(self, tmp_path, monkeypatch):
+        for i in range(200):
+            (tmp_path / f"f{i:03}.txt").write_text("hit\n")
+        searched = []
+        real = text_search.search_file
+        monkeypatch.setattr(text_search, "search_file",
+                            lambda path, *a: searched.append(path) or real(path, *a))
+
+        matches = iter_matches("hit", str(tmp_path), workers=2)
+        first = next(matches)
+        matches.close()
+
+        assert first["file"].endswith("f000.txt")
+        assert len(searched) < 200
+
+
+class TestSearchFilesFallback:
+    """SearchFilesTool without ripgrep."""
+
+    async def test_uses_builtin_engine_without_rg(self, tree, monkeypatch):
+        monkeypatch.setenv("PATH", str(tree / "no-bin"))
+
+        result = await SearchFilesTool()._execute_validated(
+            pattern="needle", path=str(tree), file_pattern="*.py", max_results=1
+        )
+
+        assert result.success
+        assert result.metadata["tool"] == "builtin"
+        assert result.metadata["truncated"] is True
+        assert [os.path.basename(m["file"]) for m in result.data["matches"]] == ["main.py"]
+
+    async def test_invalid_pattern_is_reported(self, tree, monkeypatch):
+        monkeypatch.setenv("PATH", str(tree / "no-bin"))
+
+        result = await SearchFilesTool()._execute_validated(pattern="(unclosed", path=str(tree))
+
+        assert not result.success
+        assert "Invalid pattern" in result.error
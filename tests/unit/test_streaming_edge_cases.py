@@ -238,6 +238,50 @@ class TestStreamingWidgetEdgeCases:
         widget = StreamingResponseWidget(enable_markdown=False)
         assert widget._enable_markdown is False
 
+    def test_tool_call_split_across_chunks(self):
+        """JSON tool call and markup split between chunks are still sanitized."""
+        from jdev_tui.components.streaming_adapter import StreamingResponseWidget
+        widget = StreamingResponseWidget(enable_markdown=True)
+        widget._update_display = lambda: None
+
+        text = 'Run {"tool": "bash_command", "args": {"command": "ls -la"}} and [bold red]go[/bold red]'
+        for i in range(0, len(text), 3):
+            widget.append_chunk(text[i:i + 3])
+        widget._flush_pending()
+
+        assert widget.get_content() == "Run ```bash\nls -la\n``` and go"
+
+    def test_finalized_blocks_render_once(self):
+        """Finalized blocks are memoized; only the open block re-renders."""
+        from jdev_tui.components.streaming_adapter import StreamingResponseWidget
+        widget = StreamingResponseWidget(enable_markdown=True)
+        widget._update_display = lambda: None
+        widget.append_chunk("# Title\n\nSome text\n\n```python\nx = 1\n")
+
+        factory = widget._widget_factory
+        first = factory.render_blocks(widget._block_detector.get_all_blocks())
+        widget.append_chunk("y = 2\n")
+        second = factory.render_blocks(widget._block_detector.get_all_blocks())
+
+        assert first[:2] == second[:2]  # Same objects: heading + paragraph
+        assert first[2] is not second[2]  # Open code fence
+
+    def test_cached_renderable_matches_original(self):
+        """CachedRenderable renders exactly like the wrapped renderable."""
+        import io
+        from rich.console import Console
+        from rich.markdown import Markdown
+        from jdev_cli.tui.components.streaming_markdown import CachedRenderable
+
+        markdown = Markdown("# Title\n\n- **one**\n- two\n\n```python\nx = 1\n```")
+        cached = CachedRenderable(markdown)
+        outputs = []
+        for renderable in (markdown, cached, cached):
+            console = Console(file=io.StringIO(), width=60, force_terminal=True, color_system="truecolor")
+            console.print(renderable)
+            outputs.append(console.file.getvalue())
+        assert outputs[0] == outputs[1] == outputs[2]
+
 
 class TestBridgeStreamingSafety:
     """Tests for bridge streaming output safety."""